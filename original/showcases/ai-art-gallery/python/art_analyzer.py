@@ -14,6 +14,7 @@ Features:
 - Technical quality assessment
 - Similarity detection
 - Artwork metadata extraction
+- Batch analysis (batched networks, vectorized metrics, pooled clustering)
 
 Author: AI Art Gallery Team
 License: MIT
@@ -27,10 +28,33 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple, Union
 from PIL import Image
 import io
+import os
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from scipy import ndimage
 from sklearn.cluster import KMeans
 
 
+def _cluster_colors(image: np.ndarray, sizes: Tuple[int, ...] = (5, 10)) -> Dict[int, List[str]]:
+    """
+    K-means colour clusters of an image for several cluster counts
+
+    Module-level so it can run in a process pool.
+
+    Returns:
+        Mapping of cluster count to hex colours
+    """
+    pixels = image.reshape(-1, 3)
+    clusters = {}
+
+    for n in sizes:
+        kmeans = KMeans(n_clusters=n, random_state=42, n_init=10)
+        kmeans.fit(pixels)
+        clusters[n] = [ArtAnalyzer._rgb_to_hex(c) for c in kmeans.cluster_centers_.astype(int)]
+
+    return clusters
+
+
 class AestheticPredictor(nn.Module):
     """Neural network for aesthetic quality prediction"""
 
@@ -102,6 +126,12 @@ class ArtAnalyzer:
         'anime', 'concept-art', 'fantasy', 'sci-fi'
     ]
 
+    # Working memory of _batch_metrics per input pixel (uint8 stack,
+    # float64 gray, uint8 gray, int32 Laplacian and its input, int16
+    # symmetry difference), and the budget for one metric stack
+    METRIC_BYTES_PER_PIXEL = 36
+    METRIC_STACK_BYTES = 256 * 1024 ** 2
+
     def __init__(self, config: Dict):
         """
         Initialize art analyzer
@@ -189,6 +219,224 @@ class ArtAnalyzer:
 
         return results
 
+    def analyze_batch(
+        self,
+        images: List[Union[bytes, Image.Image, np.ndarray]],
+        options: Optional[Dict] = None,
+        batch_size: int = 32,
+        workers: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Analyze a collection of artworks at once
+
+        Produces the same results as calling analyze() per image, but
+        decodes and preprocesses each image once, runs both networks on
+        batches of the shared 224x224 tensors, computes the NumPy metrics
+        on stacks of same-shape images, and clusters each image's colours
+        once (for the 5- and 10-colour palettes) on a process pool while
+        the networks run.
+
+        Args:
+            images: Input artworks
+            options: Same options as analyze()
+            batch_size: Images per forward pass (metric stacks are
+                bounded by METRIC_STACK_BYTES instead)
+            workers: Process pool size for colour clustering (default: CPU count)
+
+        Returns:
+            Analysis results per image, in input order
+        """
+        options = options or {}
+        include_style = options.get('includeStyle', True)
+        include_aesthetic = options.get('includeAesthetic', True)
+        include_composition = options.get('includeComposition', True)
+        include_colors = options.get('includeColors', True)
+        include_technical = options.get('includeTechnical', True)
+
+        pil_images = [self._prepare_image(image) for image in images]
+        arrays = [np.asarray(image) for image in pil_images]
+        results: List[Dict] = [{} for _ in arrays]
+
+        # Colour clustering is the slowest step; start it first
+        needs_clusters = include_colors or include_aesthetic
+        workers = workers or os.cpu_count() or 1
+        pool = None
+        clusters: List = []
+        if needs_clusters:
+            if workers > 1 and len(arrays) > 1:
+                pool = ProcessPoolExecutor(max_workers=workers)
+                clusters = [pool.submit(_cluster_colors, array) for array in arrays]
+            else:
+                clusters = [None] * len(arrays)
+
+        try:
+            # Shared preprocessing and batched forward passes
+            if include_style or include_aesthetic:
+                for start in range(0, len(pil_images), batch_size):
+                    chunk = range(start, min(start + batch_size, len(pil_images)))
+                    tensor = torch.stack([self.transform(pil_images[i]) for i in chunk]).to(self.device)
+
+                    with torch.no_grad():
+                        style_probs = (
+                            torch.softmax(self.style_classifier(tensor), dim=1).cpu()
+                            if include_style else None
+                        )
+                        aesthetic_scores = (
+                            self.aesthetic_model(tensor).view(-1).cpu()
+                            if include_aesthetic else None
+                        )
+
+                    for offset, i in enumerate(chunk):
+                        if include_style:
+                            results[i]['style'] = self._style_result(style_probs[offset])
+                        if include_aesthetic:
+                            results[i]['aesthetic'] = {'score': aesthetic_scores[offset].item() * 10}
+
+            # Vectorized metrics over stacks of same-shape images
+            metrics: List[Dict[str, float]] = [{} for _ in arrays]
+            groups: Dict[Tuple[int, ...], List[int]] = {}
+            for i, array in enumerate(arrays):
+                groups.setdefault(array.shape, []).append(i)
+
+            for shape, indices in groups.items():
+                pixels = shape[0] * shape[1]
+                stack_size = max(1, self.METRIC_STACK_BYTES // (pixels * self.METRIC_BYTES_PER_PIXEL))
+                for start in range(0, len(indices), stack_size):
+                    chunk = indices[start:start + stack_size]
+                    values = self._batch_metrics(np.stack([arrays[i] for i in chunk]))
+                    for offset, i in enumerate(chunk):
+                        metrics[i] = {name: float(v[offset]) for name, v in values.items()}
+
+            # Assemble per-image results
+            for i, m in enumerate(metrics):
+                palettes = None
+                if needs_clusters:
+                    palettes = clusters[i].result() if pool is not None else _cluster_colors(arrays[i])
+                    dominant = palettes[5]
+                    harmony = self._harmony_from_colors(dominant)
+
+                if include_aesthetic:
+                    aesthetic = results[i]['aesthetic']
+                    aesthetic['rating'] = self._score_to_rating(aesthetic['score'])
+                    aesthetic['aspects'] = {
+                        'composition': (m['thirds'] + m['balance']) / 2,
+                        'colorHarmony': harmony,
+                        'lighting': (m['contrast'] + m['dynamic_range']) / 2,
+                        'detail': m['sharpness']
+                    }
+
+                if include_composition:
+                    results[i]['composition'] = {
+                        'ruleOfThirds': m['thirds'],
+                        'goldenRatio': self._check_golden_ratio(arrays[i]),
+                        'balance': m['balance'],
+                        'symmetry': m['symmetry'],
+                        'leadingLines': self._detect_leading_lines(arrays[i])
+                    }
+
+                if include_colors:
+                    results[i]['colors'] = {
+                        'dominant': dominant,
+                        'palette': palettes[10],
+                        'mood': self._determine_color_mood(dominant),
+                        'contrast': m['contrast'],
+                        'distribution': self._entropy_to_distribution(m['entropy']),
+                        'harmony': harmony
+                    }
+
+                if include_technical:
+                    results[i]['technical'] = {
+                        'sharpness': m['sharpness'],
+                        'noise': m['noise'],
+                        'artifacts': self._detect_artifacts(arrays[i]),
+                        'dynamicRange': m['dynamic_range']
+                    }
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        return results
+
+    def _style_result(self, probs: torch.Tensor) -> Dict:
+        """Style result from one image's class probabilities"""
+        top3_probs, top3_indices = torch.topk(probs, 3)
+        top3_styles = [(self.STYLES[idx.item()], prob.item())
+                       for idx, prob in zip(top3_indices, top3_probs)]
+
+        return {
+            'primary': top3_styles[0][0],
+            'confidence': top3_styles[0][1],
+            'secondary': top3_styles[1][0] if len(top3_styles) > 1 else None,
+            'top_styles': top3_styles
+        }
+
+    def _batch_metrics(self, stack: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        NumPy quality/composition metrics for a stack of same-shape images
+
+        Vectorized equivalents of the per-image helpers, sharing the
+        grayscale conversion between them.
+
+        Args:
+            stack: (B, H, W, 3) uint8 images
+
+        Returns:
+            Mapping of metric name to (B,) values
+        """
+        count, h, w = stack.shape[:3]
+        axes = (1, 2)
+
+        gray = np.dot(stack[..., :3], [0.299, 0.587, 0.114])
+        gray_u8 = gray.astype(np.uint8)
+
+        # Lighting and technical quality
+        contrast = np.minimum(np.std(gray, axis=axes) / 128, 1.0)
+        del gray
+        flat = stack.reshape(count, -1)
+        dynamic_range = (flat.max(axis=1) - flat.min(axis=1)) / 255
+
+        laplacian = np.array([[[0, 1, 0], [1, -4, 1], [0, 1, 0]]])
+        convolved = ndimage.convolve(gray_u8.astype(np.int32), laplacian, mode='constant', cval=0)
+        sharpness = np.minimum(np.var(convolved, axis=axes) / 1000, 1.0)
+
+        hh, hw = h // 2, w // 2
+        noise = np.std(
+            gray_u8[:, 0:2 * hh:2, 0:2 * hw:2] - gray_u8[:, 1:2 * hh:2, 1:2 * hw:2], axis=axes
+        ) / 128
+        noise = np.minimum(noise, 1.0)
+
+        # Composition
+        third_h, third_w = h // 3, w // 3
+        points = stack[:, [third_h, third_h, 2 * third_h, 2 * third_h],
+                       [third_w, 2 * third_w, third_w, 2 * third_w]]
+        thirds = np.minimum(np.var(points.mean(axis=2), axis=1) / 1000, 1.0)
+
+        left = stack[:, :, :w // 2].reshape(count, -1).mean(axis=1)
+        right = stack[:, :, w // 2:].reshape(count, -1).mean(axis=1)
+        balance = 1 - np.abs(left - right) / 255
+
+        diff = stack.astype(np.int16)
+        diff -= stack[:, :, ::-1]
+        np.abs(diff, out=diff)
+        diff = diff.reshape(count, -1).mean(axis=1)
+        symmetry = 1 - np.minimum(diff / 128, 1.0)
+
+        # Colour distribution entropy (256-bin histogram per image)
+        hist = np.stack([np.bincount(values, minlength=256) for values in flat])
+        hist_norm = hist / hist.sum(axis=1, keepdims=True)
+        entropy = -np.sum(hist_norm * np.log2(hist_norm + 1e-7), axis=1)
+
+        return {
+            'contrast': contrast,
+            'dynamic_range': dynamic_range,
+            'sharpness': sharpness,
+            'noise': noise,
+            'thirds': thirds,
+            'balance': balance,
+            'symmetry': symmetry,
+            'entropy': entropy
+        }
+
     def _analyze_style(self, image: Image.Image) -> Dict:
         """Classify art style"""
         tensor = self.transform(image).unsqueeze(0).to(self.device)
@@ -415,7 +663,10 @@ class ArtAnalyzer:
     def _calculate_color_harmony(self, image: np.ndarray) -> float:
         """Calculate color harmony score"""
         # Extract colors
-        colors = self._extract_dominant_colors(image, 5)
+        return self._harmony_from_colors(self._extract_dominant_colors(image, 5))
+
+    def _harmony_from_colors(self, colors: List[str]) -> float:
+        """Color harmony score from dominant colors"""
         rgb_colors = np.array([self._hex_to_rgb(c) for c in colors])
 
         # Calculate variance in hue
@@ -444,6 +695,11 @@ class ArtAnalyzer:
         hist_norm = hist / hist.sum()
         entropy = -np.sum(hist_norm * np.log2(hist_norm + 1e-7))
 
+        return self._entropy_to_distribution(entropy)
+
+    @staticmethod
+    def _entropy_to_distribution(entropy: float) -> str:
+        """Describe a histogram entropy"""
         if entropy > 7:
             return 'diverse'
         elif entropy > 5:
@@ -547,8 +803,10 @@ class ArtAnalyzer:
         gray = np.dot(image[..., :3], [0.299, 0.587, 0.114]).astype(np.uint8)
 
         # Estimate noise from high-frequency components
+        # Pair each even pixel with its diagonal neighbour (odd sizes drop the last row/column)
         h, w = gray.shape
-        noise = np.std(gray[::2, ::2] - gray[1::2, 1::2]) / 128
+        hh, hw = h // 2, w // 2
+        noise = np.std(gray[0:2 * hh:2, 0:2 * hw:2] - gray[1:2 * hh:2, 1:2 * hw:2]) / 128
 
         return min(noise, 1.0)
 
@@ -8,13 +8,14 @@ Called directly from TypeScript via Elide's polyglot runtime!
 
 Features:
 - Super-resolution (ESRGAN, Real-ESRGAN)
+- Tiled upscaling with blended overlaps and a memory cap
 - Image colorization (DeOldify-style)
 - Denoising
 - Sharpening
 - HDR enhancement
 - Face restoration
 - Artifact removal
-- Batch processing
+- Batch processing on decoded arrays (process pool + stacked model passes)
 
 Author: AI Art Gallery Team
 License: MIT
@@ -22,13 +23,18 @@ License: MIT
 
 import torch
 import torch.nn as nn
-import torch.nn.functional as F
 import numpy as np
 from typing import Dict, List, Optional, Tuple, Union
 from PIL import Image
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import io
+import os
+from itertools import repeat
 import cv2
+import struct
+import tempfile
 import time
+import zlib
 
 
 class ResidualBlock(nn.Module):
@@ -151,6 +157,425 @@ class ColorizationModel(nn.Module):
         return ab
 
 
+def denoise_array(array: np.ndarray, strength: float = 0.5) -> np.ndarray:
+    """Non-local means denoising of an RGB uint8 array"""
+    h = int(strength * 20) + 1
+    return cv2.fastNlMeansDenoisingColored(array, None, h, h, 7, 21)
+
+
+def sharpen_array(array: np.ndarray, amount: float = 0.5) -> np.ndarray:
+    """Unsharp mask on an RGB uint8 array"""
+    array = array.astype(np.float32)
+    blurred = cv2.GaussianBlur(array, (0, 0), 3)
+    sharpened = array + amount * (array - blurred)
+    return np.clip(sharpened, 0, 255).astype(np.uint8)
+
+
+def hdr_array(array: np.ndarray) -> np.ndarray:
+    """Tone mapping plus CLAHE local contrast on an RGB uint8 array"""
+    array = array.astype(np.float32) / 255.0
+
+    # Apply tone mapping
+    hdr = cv2.createTonemap(gamma=2.2)
+    enhanced = hdr.process(array)
+
+    # Enhance local contrast
+    lab = cv2.cvtColor((enhanced * 255).astype(np.uint8), cv2.COLOR_RGB2LAB)
+    l, a, b = cv2.split(lab)
+
+    # CLAHE on L channel
+    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+    l_enhanced = clahe.apply(l)
+
+    # Merge back
+    enhanced_lab = cv2.merge([l_enhanced, a, b])
+    return cv2.cvtColor(enhanced_lab, cv2.COLOR_LAB2RGB)
+
+
+def artifacts_array(array: np.ndarray) -> np.ndarray:
+    """Edge-preserving bilateral filter on an RGB uint8 array"""
+    return cv2.bilateralFilter(array, 9, 75, 75)
+
+
+def encode_array(array: np.ndarray, format: str = 'PNG', quality: int = 95) -> bytes:
+    """Encode an RGB uint8 array as image bytes"""
+    buffer = io.BytesIO()
+    format = format.upper()
+    if format in ('JPEG', 'WEBP'):
+        Image.fromarray(array).save(buffer, format=format, quality=quality)
+    else:
+        Image.fromarray(array).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def encode_png_rows(array: np.ndarray, rows: int = 256, level: int = 6) -> bytes:
+    """
+    Encode an RGB uint8 array as PNG, one band of rows at a time
+
+    Reads `array` (usually a disk-backed upscale result) band by band, so
+    only the compressed stream and one band of pixels are held in memory.
+    Rows use PNG's Sub filter.
+
+    Args:
+        array: (H, W, 3) uint8 array or memmap
+        rows: Rows encoded per band
+        level: zlib compression level
+
+    Returns:
+        PNG bytes
+    """
+    height, width = array.shape[:2]
+    buffer = io.BytesIO()
+
+    def chunk(kind: bytes, data: bytes):
+        buffer.write(struct.pack('>I', len(data)))
+        buffer.write(kind)
+        buffer.write(data)
+        buffer.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(kind))))
+
+    buffer.write(b'\x89PNG\r\n\x1a\n')
+    chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+
+    compressor = zlib.compressobj(level)
+    scanlines = np.empty((min(rows, height), width * 3 + 1), dtype=np.uint8)
+    scanlines[:, 0] = 1  # Sub filter: each byte minus the pixel to its left
+    for y0 in range(0, height, rows):
+        band = np.asarray(array[y0:y0 + rows]).reshape(-1, width * 3)
+        count = band.shape[0]
+        scanlines[:count, 1:4] = band[:, :3]
+        np.subtract(band[:, 3:], band[:, :-3], out=scanlines[:count, 4:])
+        data = compressor.compress(scanlines[:count].tobytes())
+        if data:
+            chunk(b'IDAT', data)
+
+    chunk(b'IDAT', compressor.flush())
+    chunk(b'IEND', b'')
+    return buffer.getvalue()
+
+
+def discard_output(array: np.ndarray):
+    """Delete the temp file behind a disk-backed upscale result, if any"""
+    path = getattr(array, 'filename', None)
+    if isinstance(array, np.memmap) and path:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+# Batch operations that run on arrays with OpenCV/PIL (no model needed)
+CPU_OPERATIONS = {
+    'denoise': denoise_array,
+    'sharpen': sharpen_array,
+    'hdr': hdr_array,
+    'artifacts': artifacts_array
+}
+
+# Batch operations that run a neural model in the parent process
+MODEL_OPERATIONS = {'colorize'}
+
+
+def _run_cpu_operations(
+    array: np.ndarray,
+    operations: List[str],
+    output_format: Optional[str] = None,
+    quality: int = 95
+) -> Union[np.ndarray, bytes]:
+    """Process-pool worker: apply CPU operations in order, optionally encode"""
+    for operation in operations:
+        array = CPU_OPERATIONS[operation](array)
+    if output_format:
+        return encode_array(array, output_format, quality)
+    return array
+
+
+def blend_ramp(size: int, left: int, right: int, mode: str = 'feather') -> np.ndarray:
+    """
+    1-D blending weights for a tile along one axis
+
+    Args:
+        size: Tile length in pixels
+        left: Pixels overlapping the previous tile (ramp up)
+        right: Pixels overlapping the next tile (ramp down)
+        mode: 'feather' (raised cosine) or 'linear'
+
+    Returns:
+        float32 weights, 1 outside the overlaps and > 0 everywhere
+    """
+    weights = np.ones(size, dtype=np.float32)
+
+    def ramp(length: int) -> np.ndarray:
+        t = (np.arange(length, dtype=np.float32) + 0.5) / length
+        if mode == 'linear':
+            return t
+        return 0.5 - 0.5 * np.cos(np.pi * t)
+
+    if left > 0:
+        weights[:left] *= ramp(left)
+    if right > 0:
+        weights[size - right:] *= ramp(right)[::-1]
+
+    return weights
+
+
+class TiledUpscaler:
+    """
+    Tiled super-resolution with blended overlaps and bounded memory
+
+    The image is cut into overlapping tiles that run through the model in
+    batches (several batches at once on a thread pool). Tile outputs are
+    weighted with separable blending ramps and accumulated into a band
+    one tile-row high; rows no later tile touches are normalised and
+    written out, so peak memory is the band, the in-flight batches and
+    the output image. The plan shrinks batches, workers and finally the
+    tile size until that estimate fits `max_memory_bytes`, and moves the
+    output to a memory-mapped temp file when it alone would not fit; the
+    caller owns that file and removes it with `discard_output`.
+    """
+
+    # float32 activations alive per input pixel in SimpleESRGAN with
+    # no_grad, per unit of scale**2 (64 channels, ~2.5 tensors at peak)
+    ACTIVATION_BYTES_PER_PIXEL = 4 * 64 * 2.5
+
+    MIN_TILE = 64
+
+    def __init__(
+        self,
+        model: nn.Module,
+        device: str = 'cpu',
+        tile_size: int = 256,
+        overlap: int = 16,
+        blend: str = 'feather',
+        batch_size: int = 4,
+        workers: int = 2,
+        max_memory_bytes: int = 8 * 1024 ** 3
+    ):
+        """
+        Initialize tiled upscaler
+
+        Args:
+            model: Super-resolution model with a `scale_factor` attribute
+            device: Device the model runs on
+            tile_size: Input tile edge in pixels
+            overlap: Input pixels shared by neighbouring tiles
+            blend: Overlap blending, 'feather' or 'linear'
+            batch_size: Tiles per forward pass
+            workers: Batches run concurrently
+            max_memory_bytes: Peak memory budget for one upscale
+        """
+        self.model = model
+        self.device = device
+        self.scale = getattr(model, 'scale_factor', 4)
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.blend = blend
+        self.batch_size = batch_size
+        self.workers = workers
+        self.max_memory_bytes = max_memory_bytes
+
+    def plan(self, height: int, width: int, factor: int) -> Dict:
+        """
+        Choose tile size, batch size and workers that fit the memory cap
+
+        Args:
+            height: Input height
+            width: Input width
+            factor: Output scale factor
+
+        Returns:
+            Plan dict with tile_size, batch_size, workers, output_on_disk
+            and estimated_bytes
+        """
+        output_bytes = height * factor * width * factor * 3
+        output_on_disk = output_bytes > self.max_memory_bytes // 2
+        resident_output = 0 if output_on_disk else output_bytes
+
+        tile = self.tile_size
+        batch = self.batch_size
+        workers = self.workers
+
+        def estimate(tile: int, batch: int, workers: int) -> int:
+            th, tw = min(tile, height), min(tile, width)
+            band = th * factor * width * factor * 3 * 4
+            tile_inputs = th * tw * 3 * 4
+            activations = th * tw * self.ACTIVATION_BYTES_PER_PIXEL * self.scale ** 2
+            return int(resident_output + band + workers * batch * (tile_inputs + activations))
+
+        while estimate(tile, batch, workers) > self.max_memory_bytes:
+            if batch > 1:
+                batch //= 2
+            elif workers > 1:
+                workers -= 1
+            elif tile // 2 >= max(self.MIN_TILE, 2 * self.overlap + 1):
+                tile //= 2
+            else:
+                raise MemoryError(
+                    f"Upscaling {width}x{height} by {factor}x needs more than "
+                    f"{self.max_memory_bytes / 1024 ** 3:.1f} GB"
+                )
+
+        return {
+            'tile_size': tile,
+            'batch_size': batch,
+            'workers': workers,
+            'output_on_disk': output_on_disk,
+            'estimated_bytes': estimate(tile, batch, workers)
+        }
+
+    def upscale(self, image: np.ndarray, factor: Optional[int] = None) -> np.ndarray:
+        """
+        Upscale an RGB uint8 image
+
+        Args:
+            image: (H, W, 3) uint8 array
+            factor: Output scale (defaults to the model's scale); other
+                factors resize each tile's model output
+
+        Returns:
+            (H*factor, W*factor, 3) uint8 array (a memmap over a temp file
+            when the output does not fit the budget; pass it to
+            `discard_output` when done)
+        """
+        factor = factor or self.scale
+        height, width = image.shape[:2]
+        plan = self.plan(height, width, factor)
+        out_h, out_w = height * factor, width * factor
+
+        if plan['output_on_disk']:
+            fd, path = tempfile.mkstemp(suffix='.npy')
+            os.close(fd)
+            output = np.lib.format.open_memmap(
+                path, mode='w+', dtype=np.uint8, shape=(out_h, out_w, 3)
+            )
+        else:
+            output = np.empty((out_h, out_w, 3), dtype=np.uint8)
+
+        try:
+            self._fill(image, output, plan, factor)
+        except BaseException:
+            discard_output(output)
+            raise
+
+        return output
+
+    def _fill(self, image: np.ndarray, output: np.ndarray, plan: Dict, factor: int):
+        """Run the tiles of `plan` and write the blended result to `output`"""
+        height, width = image.shape[:2]
+        out_h, out_w = output.shape[:2]
+
+        tile = plan['tile_size']
+        th, tw = min(tile, height), min(tile, width)
+        overlap = min(self.overlap, tile // 2)
+
+        ys = self._tile_starts(height, th, overlap)
+        xs = self._tile_starts(width, tw, overlap)
+        wy, wy_sum = self._axis_weights(ys, th, height, factor)
+        wx, wx_sum = self._axis_weights(xs, tw, width, factor)
+
+        band = np.zeros((th * factor, out_w, 3), dtype=np.float32)
+        origin = 0
+
+        def finalize(rows: int):
+            rows_slice = slice(origin, origin + rows)
+            norm = wy_sum[rows_slice, None, None] * wx_sum[None, :, None]
+            block = band[:rows] / norm
+            block *= 255.0
+            np.rint(block, out=block)
+            np.clip(block, 0, 255, out=block)
+            output[rows_slice] = block.astype(np.uint8)
+
+        batch_size = plan['batch_size']
+        print(f"Tiled upscale {width}x{height} -> {out_w}x{out_h}: "
+              f"{len(ys)}x{len(xs)} tiles of {tw}x{th}, batch {batch_size}, "
+              f"{plan['workers']} workers, ~{plan['estimated_bytes'] / 1024 ** 3:.2f} GB")
+
+        with ThreadPoolExecutor(max_workers=plan['workers']) as pool:
+            for row, y0 in enumerate(ys):
+                # Rows above this tile row are complete
+                shift = y0 * factor - origin
+                if shift:
+                    finalize(shift)
+                    band[:-shift] = band[shift:].copy()
+                    band[-shift:] = 0
+                    origin = y0 * factor
+
+                batches = [
+                    list(range(start, min(start + batch_size, len(xs))))
+                    for start in range(0, len(xs), batch_size)
+                ]
+                futures = [
+                    pool.submit(self._infer, image, y0, [xs[c] for c in cols], th, tw, factor)
+                    for cols in batches
+                ]
+
+                for cols, future in zip(batches, futures):
+                    upscaled = future.result()
+                    for tile_out, col in zip(upscaled, cols):
+                        x0 = xs[col] * factor
+                        weights = wy[row][:, None, None] * wx[col][None, :, None]
+                        band[:, x0:x0 + tw * factor] += tile_out * weights
+
+        finalize(out_h - origin)
+
+        if isinstance(output, np.memmap):
+            output.flush()
+
+    def _infer(
+        self,
+        image: np.ndarray,
+        y0: int,
+        xs: List[int],
+        th: int,
+        tw: int,
+        factor: int
+    ) -> np.ndarray:
+        """Run one batch of tiles; returns (B, th*factor, tw*factor, 3) floats"""
+        tiles = np.stack([image[y0:y0 + th, x0:x0 + tw] for x0 in xs])
+        tensor = torch.from_numpy(tiles).permute(0, 3, 1, 2).float().div_(255.0).to(self.device)
+
+        with torch.no_grad():
+            upscaled = self.model(tensor)
+
+        result = upscaled.permute(0, 2, 3, 1).float().cpu().numpy()
+
+        if factor != self.scale:
+            result = np.stack([
+                cv2.resize(tile, (tw * factor, th * factor), interpolation=cv2.INTER_AREA
+                           if factor < self.scale else cv2.INTER_CUBIC)
+                for tile in result
+            ])
+
+        return result
+
+    @staticmethod
+    def _tile_starts(length: int, tile: int, overlap: int) -> List[int]:
+        """Evenly spread tile origins covering [0, length) with >= overlap"""
+        if length <= tile:
+            return [0]
+        count = int(np.ceil((length - overlap) / (tile - overlap)))
+        return [int(round(v)) for v in np.linspace(0, length - tile, count)]
+
+    def _axis_weights(
+        self,
+        starts: List[int],
+        tile: int,
+        length: int,
+        factor: int
+    ) -> Tuple[List[np.ndarray], np.ndarray]:
+        """Per-tile blending ramps along one axis (output pixels) and their sum"""
+        weights = []
+        total = np.zeros(length * factor, dtype=np.float32)
+
+        for i, start in enumerate(starts):
+            left = starts[i - 1] + tile - start if i > 0 else 0
+            right = start + tile - starts[i + 1] if i + 1 < len(starts) else 0
+            w = blend_ramp(tile * factor, left * factor, right * factor, self.blend)
+            weights.append(w)
+            total[start * factor:(start + tile) * factor] += w
+
+        return weights, total
+
+
 class ImageEnhancement:
     """
     Comprehensive image enhancement system
@@ -164,10 +589,25 @@ class ImageEnhancement:
             config: Configuration dict with:
                 - device: Device to use (default: 'cuda:0')
                 - models: List of models to load
+                - tile_size: Super-resolution tile edge (default: 256)
+                - tile_overlap: Pixels shared by neighbouring tiles (default: 16)
+                - tile_blend: 'feather' or 'linear' (default: 'feather')
+                - tile_batch_size: Tiles per forward pass (default: 4)
+                - tile_workers: Concurrent tile batches (default: 2)
+                - max_memory_gb: Peak memory for one upscale (default: 8)
         """
         self.device = config.get('device', 'cuda:0' if torch.cuda.is_available() else 'cpu')
         self.models_to_load = config.get('models', ['esrgan', 'deoldify'])
 
+        self.tiling = {
+            'tile_size': config.get('tile_size', 256),
+            'overlap': config.get('tile_overlap', 16),
+            'blend': config.get('tile_blend', 'feather'),
+            'batch_size': config.get('tile_batch_size', 4),
+            'workers': config.get('tile_workers', 2),
+            'max_memory_bytes': int(config.get('max_memory_gb', 8) * 1024 ** 3)
+        }
+
         self.esrgan = None
         self.colorization = None
 
@@ -206,6 +646,8 @@ class ImageEnhancement:
                 - method: 'esrgan', 'real-esrgan', 'lanczos'
                 - factor: Upscale factor (2, 4)
                 - preset: 'fast', 'balanced', 'quality'
+                - tile_size, tile_overlap, tile_blend, max_memory_gb:
+                  per-call overrides of the tiling settings
 
         Returns:
             Upscaled image as bytes
@@ -215,14 +657,17 @@ class ImageEnhancement:
 
         pil_image = self._prepare_image(image)
 
-        if method == 'esrgan' and self.esrgan:
-            result = self._upscale_esrgan(pil_image, factor)
-        elif method == 'lanczos':
-            result = self._upscale_lanczos(pil_image, factor)
-        else:
-            result = self._upscale_esrgan(pil_image, factor)
+        if method == 'lanczos':
+            return self._image_to_bytes(self._upscale_lanczos(pil_image, factor))
 
-        return self._image_to_bytes(result)
+        result = self._upscale_esrgan(pil_image, factor, config)
+        try:
+            if isinstance(result, np.memmap):
+                # Encode straight from the disk-backed output
+                return encode_png_rows(result)
+            return encode_array(result)
+        finally:
+            discard_output(result)
 
     def colorize(self, image: Union[bytes, Image.Image, np.ndarray]) -> bytes:
         """
@@ -240,34 +685,57 @@ class ImageEnhancement:
         print("Colorizing image...")
         start_time = time.time()
 
-        pil_image = self._prepare_image(image)
+        colorized = self._colorize_arrays([self._prepare_array(image)])[0]
 
-        # Convert to grayscale if needed
-        if pil_image.mode != 'L':
-            gray = pil_image.convert('L')
-        else:
-            gray = pil_image
+        elapsed = time.time() - start_time
+        print(f"✓ Colorization completed in {elapsed:.2f}s")
 
-        # Prepare tensor
-        gray_array = np.array(gray).astype(np.float32) / 255.0
-        gray_tensor = torch.from_numpy(gray_array).unsqueeze(0).unsqueeze(0).to(self.device)
+        return encode_array(colorized)
 
-        # Colorize
-        with torch.no_grad():
-            ab_channels = self.colorization(gray_tensor)
+    def _colorize_arrays(self, arrays: List[np.ndarray], batch_size: int = 8) -> List[np.ndarray]:
+        """
+        Colorize RGB arrays, stacking same-shape images into one tensor
 
-        # Combine L and ab channels
-        l_channel = gray_tensor.squeeze(0)
-        ab = ab_channels.squeeze(0)
+        Args:
+            arrays: RGB uint8 arrays
+            batch_size: Maximum images per forward pass
+
+        Returns:
+            Colorized RGB uint8 arrays, in input order
+        """
+        if not self.colorization:
+            raise ValueError("Colorization model not loaded")
 
-        # Convert to RGB
-        lab = torch.cat([l_channel, ab], dim=0)
-        rgb = self._lab_to_rgb(lab)
+        results: List[Optional[np.ndarray]] = [None] * len(arrays)
 
-        elapsed = time.time() - start_time
-        print(f"✓ Colorization completed in {elapsed:.2f}s")
+        groups: Dict[Tuple[int, ...], List[int]] = {}
+        for index, array in enumerate(arrays):
+            groups.setdefault(array.shape, []).append(index)
 
-        return self._tensor_to_bytes(rgb)
+        for indices in groups.values():
+            for start in range(0, len(indices), batch_size):
+                chunk = indices[start:start + batch_size]
+
+                # Convert to grayscale
+                gray = np.stack([
+                    np.asarray(Image.fromarray(arrays[i]).convert('L')) for i in chunk
+                ]).astype(np.float32) / 255.0
+                gray_tensor = torch.from_numpy(gray).unsqueeze(1).to(self.device)
+
+                # Colorize
+                with torch.no_grad():
+                    ab_channels = self.colorization(gray_tensor)
+
+                # Combine L and ab channels, then convert to RGB
+                lab = torch.cat([gray_tensor, ab_channels], dim=1)
+                rgb = self._lab_to_rgb(lab)
+
+                batch = rgb.cpu().numpy().transpose(0, 2, 3, 1)
+                batch = np.clip(batch * 255, 0, 255).astype(np.uint8)
+                for i, colorized in zip(chunk, batch):
+                    results[i] = colorized
+
+        return results
 
     def denoise(
         self,
@@ -284,15 +752,8 @@ class ImageEnhancement:
         Returns:
             Denoised image
         """
-        pil_image = self._prepare_image(image)
-        array = np.array(pil_image)
-
-        # Use OpenCV denoising
-        h = int(strength * 20) + 1
-        denoised = cv2.fastNlMeansDenoisingColored(array, None, h, h, 7, 21)
-
-        result = Image.fromarray(denoised)
-        return self._image_to_bytes(result)
+        array = self._prepare_array(image)
+        return encode_array(denoise_array(array, strength))
 
     def sharpen(
         self,
@@ -309,16 +770,8 @@ class ImageEnhancement:
         Returns:
             Sharpened image
         """
-        pil_image = self._prepare_image(image)
-        array = np.array(pil_image).astype(np.float32)
-
-        # Unsharp mask
-        blurred = cv2.GaussianBlur(array, (0, 0), 3)
-        sharpened = array + amount * (array - blurred)
-        sharpened = np.clip(sharpened, 0, 255).astype(np.uint8)
-
-        result = Image.fromarray(sharpened)
-        return self._image_to_bytes(result)
+        array = self._prepare_array(image)
+        return encode_array(sharpen_array(array, amount))
 
     def enhance_hdr(
         self,
@@ -333,27 +786,8 @@ class ImageEnhancement:
         Returns:
             HDR enhanced image
         """
-        pil_image = self._prepare_image(image)
-        array = np.array(pil_image).astype(np.float32) / 255.0
-
-        # Apply tone mapping
-        hdr = cv2.createTonemap(gamma=2.2)
-        enhanced = hdr.process(array)
-
-        # Enhance local contrast
-        lab = cv2.cvtColor((enhanced * 255).astype(np.uint8), cv2.COLOR_RGB2LAB)
-        l, a, b = cv2.split(lab)
-
-        # CLAHE on L channel
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        l_enhanced = clahe.apply(l)
-
-        # Merge back
-        enhanced_lab = cv2.merge([l_enhanced, a, b])
-        enhanced_rgb = cv2.cvtColor(enhanced_lab, cv2.COLOR_LAB2RGB)
-
-        result = Image.fromarray(enhanced_rgb)
-        return self._image_to_bytes(result)
+        array = self._prepare_array(image)
+        return encode_array(hdr_array(array))
 
     def restore_face(
         self,
@@ -388,49 +822,91 @@ class ImageEnhancement:
         Returns:
             Cleaned image
         """
-        pil_image = self._prepare_image(image)
-        array = np.array(pil_image)
-
         # Bilateral filter to remove artifacts while preserving edges
-        cleaned = cv2.bilateralFilter(array, 9, 75, 75)
-
-        result = Image.fromarray(cleaned)
-        return self._image_to_bytes(result)
+        array = self._prepare_array(image)
+        return encode_array(artifacts_array(array))
 
     def enhance_batch(
         self,
-        images: List[Union[bytes, Image.Image]],
-        operations: List[str]
-    ) -> List[bytes]:
+        images: List[Union[bytes, Image.Image, np.ndarray]],
+        operations: List[str],
+        output_format: Optional[str] = 'PNG',
+        quality: int = 95,
+        workers: Optional[int] = None
+    ) -> List[Union[bytes, np.ndarray]]:
         """
         Batch enhance multiple images
 
+        Images are decoded once and the whole chain runs on arrays.
+        Consecutive OpenCV/PIL operations ('denoise', 'sharpen', 'hdr',
+        'artifacts') run per image on a process pool; model operations
+        ('colorize') run in this process with same-shape images stacked
+        into one tensor. Results are encoded once at the end.
+
         Args:
             images: List of input images
-            operations: List of operations to apply
+            operations: List of operations to apply, in order
+            output_format: 'PNG', 'JPEG' or 'WEBP'; None returns RGB arrays
+            quality: JPEG/WEBP quality
+            workers: Process pool size (default: CPU count, 1 disables)
 
         Returns:
-            List of enhanced images
+            List of enhanced images, in input order
         """
-        results = []
+        known = [op for op in operations if op in CPU_OPERATIONS or op in MODEL_OPERATIONS]
+        if len(known) != len(operations):
+            print(f"Skipping unknown operations: {[op for op in operations if op not in known]}")
+        operations = known
 
-        for i, image in enumerate(images):
-            print(f"Enhancing image {i+1}/{len(images)}...")
+        print(f"Enhancing {len(images)} images ({', '.join(operations) or 'no operations'})...")
+        start_time = time.time()
 
-            enhanced = image
-            for operation in operations:
-                if operation == 'denoise':
-                    enhanced = self.denoise(enhanced)
-                elif operation == 'sharpen':
-                    enhanced = self.sharpen(enhanced)
-                elif operation == 'hdr':
-                    enhanced = self.enhance_hdr(enhanced)
-                elif operation == 'colorize':
-                    enhanced = self.colorize(enhanced)
+        arrays: List[Union[np.ndarray, bytes]] = [self._prepare_array(image) for image in images]
 
-            results.append(enhanced)
+        # Split the chain into runs of CPU operations and model operations
+        segments: List[Tuple[str, List[str]]] = []
+        for operation in operations:
+            kind = 'model' if operation in MODEL_OPERATIONS else 'cpu'
+            if segments and segments[-1][0] == kind == 'cpu':
+                segments[-1][1].append(operation)
+            else:
+                segments.append((kind, [operation]))
+
+        # Encoding rides along with the last CPU segment when it ends the chain
+        encode_in_pool = bool(segments) and segments[-1][0] == 'cpu'
+
+        workers = workers or os.cpu_count() or 1
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(arrays) > 1 else None
+
+        try:
+            for position, (kind, ops) in enumerate(segments):
+                if kind == 'model':
+                    for operation in ops:
+                        if operation == 'colorize':
+                            arrays = self._colorize_arrays(arrays)
+                    continue
+
+                encode = output_format if encode_in_pool and position == len(segments) - 1 else None
+                if pool is not None:
+                    count = len(arrays)
+                    arrays = list(pool.map(
+                        _run_cpu_operations, arrays,
+                        repeat(ops, count), repeat(encode, count), repeat(quality, count),
+                        chunksize=max(1, count // (workers * 4))
+                    ))
+                else:
+                    arrays = [_run_cpu_operations(a, ops, encode, quality) for a in arrays]
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        if output_format and not encode_in_pool:
+            arrays = [encode_array(array, output_format, quality) for array in arrays]
 
-        return results
+        elapsed = time.time() - start_time
+        print(f"✓ Enhanced {len(arrays)} images in {elapsed:.2f}s")
+
+        return arrays
 
     def crop(
         self,
@@ -447,19 +923,31 @@ class ImageEnhancement:
         tiles: List[Dict],
         width: int,
         height: int,
-        overlap: int
+        overlap: int,
+        blend: str = 'feather'
     ) -> bytes:
-        """Merge image tiles with overlap blending"""
-        result = Image.new('RGB', (width, height))
+        """Merge image tiles, blending overlaps with feathered/linear ramps"""
+        accumulator = np.zeros((height, width, 3), dtype=np.float32)
+        weight_sum = np.zeros((height, width), dtype=np.float32)
 
         for tile_info in tiles:
-            tile_img = Image.open(io.BytesIO(tile_info['data']))
+            tile = np.asarray(self._prepare_image(tile_info['data']), dtype=np.float32)
             x, y = tile_info['x'], tile_info['y']
+            tile = tile[:max(0, height - y), :max(0, width - x)]
+            th, tw = tile.shape[:2]
 
-            # Simple paste (in production, would blend overlaps)
-            result.paste(tile_img, (x, y))
+            # Ramp only on sides that have a neighbour
+            wy = blend_ramp(th, overlap if y > 0 else 0, overlap if y + th < height else 0, blend)
+            wx = blend_ramp(tw, overlap if x > 0 else 0, overlap if x + tw < width else 0, blend)
+            weights = wy[:, None] * wx[None, :]
 
-        return self._image_to_bytes(result)
+            accumulator[y:y + th, x:x + tw] += tile * weights[:, :, None]
+            weight_sum[y:y + th, x:x + tw] += weights
+
+        merged = accumulator / np.maximum(weight_sum, 1e-6)[:, :, None]
+        merged = np.clip(np.rint(merged), 0, 255).astype(np.uint8)
+
+        return self._image_to_bytes(Image.fromarray(merged))
 
     def convert_format(self, image: Union[bytes, Image.Image], config: Dict) -> bytes:
         """Convert image format"""
@@ -527,34 +1015,54 @@ class ImageEnhancement:
 
         return self._image_to_bytes(grid)
 
-    def _upscale_esrgan(self, image: Image.Image, factor: int) -> Image.Image:
-        """Upscale using ESRGAN"""
+    def _upscale_esrgan(self, image: Image.Image, factor: int, config: Optional[Dict] = None) -> np.ndarray:
+        """
+        Upscale using ESRGAN, tile by tile
+
+        Returns an RGB uint8 array; large results are a memmap over a temp
+        file that the caller must release with `discard_output`.
+        """
         if not self.esrgan:
             raise ValueError("ESRGAN model not loaded")
 
         print(f"Upscaling {factor}x with ESRGAN...")
         start_time = time.time()
 
-        # Prepare tensor
-        array = np.array(image).astype(np.float32) / 255.0
-        tensor = torch.from_numpy(array).permute(2, 0, 1).unsqueeze(0).to(self.device)
+        array = np.asarray(image)
 
-        # Upscale
-        with torch.no_grad():
-            if factor == 4:
-                upscaled = self.esrgan(tensor)
-            elif factor == 2:
-                # Use 4x model and downscale
-                upscaled = self.esrgan(tensor)
-                upscaled = F.interpolate(upscaled, scale_factor=0.5, mode='bicubic')
-            else:
-                # Fallback to interpolation
-                upscaled = F.interpolate(tensor, scale_factor=factor, mode='bicubic')
+        if factor in (2, 4):
+            # 2x runs the 4x model and downsamples each tile
+            upscaled = self._tiler(config or {}).upscale(array, factor)
+        else:
+            # Fallback to interpolation
+            upscaled = cv2.resize(
+                array,
+                (image.width * factor, image.height * factor),
+                interpolation=cv2.INTER_CUBIC
+            )
 
         elapsed = time.time() - start_time
         print(f"✓ Upscaling completed in {elapsed:.2f}s")
 
-        return self._tensor_to_image(upscaled.squeeze(0))
+        return upscaled
+
+    def _tiler(self, config: Dict) -> TiledUpscaler:
+        """Tiled upscaler with per-call overrides applied"""
+        settings = dict(self.tiling)
+        overrides = {
+            'tile_size': 'tile_size',
+            'tile_overlap': 'overlap',
+            'tile_blend': 'blend',
+            'tile_batch_size': 'batch_size',
+            'tile_workers': 'workers'
+        }
+        for key, name in overrides.items():
+            if key in config:
+                settings[name] = config[key]
+        if 'max_memory_gb' in config:
+            settings['max_memory_bytes'] = int(config['max_memory_gb'] * 1024 ** 3)
+
+        return TiledUpscaler(self.esrgan, self.device, **settings)
 
     def _upscale_lanczos(self, image: Image.Image, factor: int) -> Image.Image:
         """Upscale using Lanczos interpolation"""
@@ -570,6 +1078,13 @@ class ImageEnhancement:
         else:
             return image.convert('RGB')
 
+    def _prepare_array(self, image: Union[bytes, np.ndarray, Image.Image]) -> np.ndarray:
+        """Decode image into an RGB uint8 array"""
+        if isinstance(image, np.ndarray) and image.ndim == 3 and image.shape[2] == 3 \
+                and image.dtype == np.uint8:
+            return image
+        return np.asarray(self._prepare_image(image))
+
     def _tensor_to_image(self, tensor: torch.Tensor) -> Image.Image:
         """Convert tensor to PIL Image"""
         array = tensor.cpu().detach().numpy()
@@ -617,4 +1132,4 @@ class ImageEnhancement:
 
 
 # Export for Elide polyglot runtime
-__all__ = ['ImageEnhancement', 'SimpleESRGAN', 'ColorizationModel']
+__all__ = ['ImageEnhancement', 'SimpleESRGAN', 'ColorizationModel', 'TiledUpscaler']
@@ -20,6 +20,7 @@ Features:
 - Seed control and reproducibility
 - Batch generation
 - Progressive generation with callbacks
+- Prompt-embedding cache (LRU in memory, optional on-disk tier)
 
 Author: AI Art Gallery Team
 License: MIT
@@ -30,7 +31,14 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple, Union, Callable
 from dataclasses import dataclass
 from PIL import Image
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
 import io
+import json
+import os
+import tempfile
+import threading
 import time
 import gc
 
@@ -64,6 +72,8 @@ class GenerationConfig:
     scheduler: str = "ddim"
     eta: float = 0.0
     clip_skip: int = 0
+    prompt_embeds: Optional[torch.Tensor] = None
+    negative_prompt_embeds: Optional[torch.Tensor] = None
 
 
 @dataclass
@@ -151,6 +161,147 @@ class PromptParser:
         return tokens, weights
 
 
+class PromptEmbeddingCache:
+    """
+    Content-addressed cache of text-encoder outputs
+
+    Keys hash the prompt, its PromptParser weights, the model, the loaded
+    LoRA set and clip_skip, so anything that changes the encoder output
+    changes the key. Entries live on the CPU in an LRU dict and, when a
+    cache directory is given, are also written to disk so they survive
+    restarts and can be shared between workers.
+    """
+
+    def __init__(self, max_entries: int = 8192, cache_dir: Optional[str] = None):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Embeddings kept in memory
+            cache_dir: Optional directory for the on-disk tier
+        """
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._entries: 'OrderedDict[str, torch.Tensor]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        prompt: str,
+        model: str,
+        loras: Optional[Dict[str, Dict]] = None,
+        clip_skip: int = 0
+    ) -> str:
+        """Hash everything that determines the encoder output for a prompt"""
+        tokens, weights = PromptParser.parse(prompt)
+        payload = json.dumps({
+            'prompt': prompt,
+            'tokens': tokens,
+            'weights': [round(w, 6) for w in weights],
+            'model': model,
+            'loras': sorted(
+                (name, lora.get('path'), lora.get('weight')) for name, lora in (loras or {}).items()
+            ),
+            'clip_skip': clip_skip
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[torch.Tensor]:
+        """Look up an embedding (memory first, then disk)"""
+        with self._lock:
+            tensor = self._entries.get(key)
+            if tensor is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return tensor
+
+        path = self._path(key)
+        if path is not None and path.exists():
+            try:
+                tensor = torch.load(path, map_location='cpu')
+            except Exception as e:
+                print(f"Warning: dropping unreadable cached embedding {path.name}: {e}")
+                path.unlink(missing_ok=True)
+            else:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._insert(key, tensor)
+                return tensor
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, tensor: torch.Tensor) -> torch.Tensor:
+        """Store an embedding (kept on the CPU)"""
+        tensor = tensor.detach().to('cpu')
+
+        with self._lock:
+            self._insert(key, tensor)
+
+        path = self._path(key)
+        if path is not None and not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            # Unique temp file in the target directory, so concurrent
+            # writers never share it and the rename stays atomic
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{key}.", suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    torch.save(tensor, f)
+                os.replace(tmp, path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+
+        return tensor
+
+    def get_or_compute(self, key: str, compute: Callable[[], torch.Tensor]) -> torch.Tensor:
+        """Return the cached embedding or compute and store it"""
+        tensor = self.get(key)
+        if tensor is None:
+            tensor = self.put(key, compute())
+        return tensor
+
+    def clear(self, disk: bool = False):
+        """Drop in-memory entries (and the disk tier if requested)"""
+        with self._lock:
+            self._entries.clear()
+        if disk and self.cache_dir:
+            for path in self.cache_dir.glob('*/*.pt'):
+                path.unlink(missing_ok=True)
+
+    def get_stats(self) -> Dict:
+        """Cache statistics"""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            'cache_dir': str(self.cache_dir) if self.cache_dir else None
+        }
+
+    def _insert(self, key: str, tensor: torch.Tensor):
+        self._entries[key] = tensor
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / key[:2] / f"{key}.pt"
+
+
 class StableDiffusion:
     """
     Stable Diffusion model wrapper with advanced features.
@@ -169,6 +320,8 @@ class StableDiffusion:
                 - precision: 'fp16' or 'fp32' (default: 'fp16')
                 - safety_checker: Enable safety checker (default: False)
                 - vae: Optional custom VAE path
+                - embedding_cache_size: Prompt embeddings kept in memory (default: 8192)
+                - embedding_cache_dir: Optional directory for cached embeddings
         """
         self.model_name = config.get('model', 'stabilityai/stable-diffusion-2-1')
         self.device = config.get('device', 'cuda:0' if torch.cuda.is_available() else 'cpu')
@@ -181,6 +334,11 @@ class StableDiffusion:
         self.pipe_inpaint = None
         self.loaded_loras = {}
 
+        self.embedding_cache = PromptEmbeddingCache(
+            max_entries=config.get('embedding_cache_size', 8192),
+            cache_dir=config.get('embedding_cache_dir')
+        )
+
         print(f"Initializing Stable Diffusion: {self.model_name}")
         print(f"Device: {self.device}, Precision: {self.precision}")
 
@@ -239,17 +397,16 @@ class StableDiffusion:
         # Set scheduler
         self._set_scheduler(self.pipe_txt2img, config.scheduler)
 
-        # Parse prompt for weighting (if needed)
-        prompt = config.prompt
-        negative_prompt = config.negative_prompt or ""
+        # Text embeddings (cached, or precomputed by the caller)
+        prompt_embeds, negative_embeds = self._prompt_embeddings(config, self.pipe_txt2img)
 
         # Generate
-        print(f"Generating: {prompt[:50]}...")
+        print(f"Generating: {config.prompt[:50]}...")
         start_time = time.time()
 
         result = self.pipe_txt2img(
-            prompt=prompt,
-            negative_prompt=negative_prompt,
+            prompt_embeds=prompt_embeds,
+            negative_prompt_embeds=negative_embeds,
             width=config.width,
             height=config.height,
             num_inference_steps=config.num_inference_steps,
@@ -327,9 +484,11 @@ class StableDiffusion:
         print(f"Transforming image: {config.prompt[:50]}...")
         start_time = time.time()
 
+        prompt_embeds, negative_embeds = self._prompt_embeddings(config, self.pipe_img2img)
+
         result = self.pipe_img2img(
-            prompt=config.prompt,
-            negative_prompt=config.negative_prompt or "",
+            prompt_embeds=prompt_embeds,
+            negative_prompt_embeds=negative_embeds,
             image=init_image,
             strength=config.strength,
             num_inference_steps=config.num_inference_steps,
@@ -373,9 +532,11 @@ class StableDiffusion:
         print(f"Inpainting: {config.prompt[:50]}...")
         start_time = time.time()
 
+        prompt_embeds, negative_embeds = self._prompt_embeddings(config, self.pipe_inpaint)
+
         result = self.pipe_inpaint(
-            prompt=config.prompt,
-            negative_prompt=config.negative_prompt or "",
+            prompt_embeds=prompt_embeds,
+            negative_prompt_embeds=negative_embeds,
             image=init_image,
             mask_image=mask_image,
             strength=config.strength,
@@ -529,22 +690,22 @@ class StableDiffusion:
         """
         results = []
         base_config = config or {}
+        clip_skip = base_config.get('clip_skip', 0)
 
         # Use same seed for consistency
         seed = base_config.get('seed', 42)
 
-        for i in range(steps):
-            t = i / (steps - 1)
+        # Encode both ends once and interpolate in embedding space
+        start = self.encode_prompt(prompt1, clip_skip)
+        end = self.encode_prompt(prompt2, clip_skip)
 
-            # Simple prompt blending (in production would use embedding interpolation)
-            if t < 0.5:
-                prompt = f"({prompt1}:{1-t*2}) ({prompt2}:{t*2})"
-            else:
-                prompt = f"({prompt1}:{(1-t)*2}) ({prompt2}:{(t-0.5)*2})"
+        for i in range(steps):
+            t = i / (steps - 1) if steps > 1 else 0.0
 
             gen_config = {
                 **base_config,
-                'prompt': prompt,
+                'prompt': f"{prompt1} -> {prompt2} ({t:.2f})",
+                'prompt_embeds': torch.lerp(start.float(), end.float(), t),
                 'seed': seed
             }
 
@@ -625,6 +786,92 @@ class StableDiffusion:
 
         return self.img2img(img2img_config)
 
+    def encode_prompt(
+        self,
+        prompt: str,
+        clip_skip: int = 0,
+        pipe=None
+    ) -> torch.Tensor:
+        """
+        Text-encoder output for a prompt, through the embedding cache
+
+        The result can be passed back as `prompt_embeds` /
+        `negative_prompt_embeds` in a generation config.
+
+        Args:
+            prompt: Prompt text (empty string for the unconditional prompt)
+            clip_skip: Number of final CLIP layers to skip
+            pipe: Pipeline whose tokenizer/text encoder to use (default: txt2img)
+
+        Returns:
+            Embedding tensor of shape (1, tokens, dim) on the CPU
+        """
+        pipe = pipe or self.pipe_txt2img
+        key = PromptEmbeddingCache.make_key(prompt, self.model_name, self.loaded_loras, clip_skip)
+        return self.embedding_cache.get_or_compute(
+            key, lambda: self._run_text_encoder(pipe, prompt, clip_skip)
+        )
+
+    def precompute_embeddings(self, prompts: List[str], clip_skip: int = 0) -> int:
+        """
+        Warm the embedding cache
+
+        Args:
+            prompts: Prompts (and negative prompts) to encode
+            clip_skip: Number of final CLIP layers to skip
+
+        Returns:
+            Number of prompts that had to be encoded
+        """
+        misses_before = self.embedding_cache.misses
+        for prompt in dict.fromkeys(prompts):
+            self.encode_prompt(prompt, clip_skip)
+        return self.embedding_cache.misses - misses_before
+
+    def _prompt_embeddings(self, config: GenerationConfig, pipe) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Prompt and negative-prompt embeddings for a config, on the pipeline's device"""
+        prompt_embeds = config.prompt_embeds
+        if prompt_embeds is None:
+            prompt_embeds = self.encode_prompt(config.prompt, config.clip_skip, pipe)
+
+        negative_embeds = config.negative_prompt_embeds
+        if negative_embeds is None:
+            negative_embeds = self.encode_prompt(config.negative_prompt or "", config.clip_skip, pipe)
+
+        dtype = pipe.text_encoder.dtype
+        return (
+            prompt_embeds.to(device=self.device, dtype=dtype),
+            negative_embeds.to(device=self.device, dtype=dtype)
+        )
+
+    def _run_text_encoder(self, pipe, prompt: str, clip_skip: int = 0) -> torch.Tensor:
+        """Encode a prompt the way the diffusers pipelines do"""
+        tokenizer = pipe.tokenizer
+        text_encoder = pipe.text_encoder
+
+        text_inputs = tokenizer(
+            prompt,
+            padding='max_length',
+            max_length=tokenizer.model_max_length,
+            truncation=True,
+            return_tensors='pt'
+        )
+        input_ids = text_inputs.input_ids.to(text_encoder.device)
+
+        attention_mask = None
+        if getattr(text_encoder.config, 'use_attention_mask', False):
+            attention_mask = text_inputs.attention_mask.to(text_encoder.device)
+
+        with torch.no_grad():
+            if clip_skip:
+                output = text_encoder(input_ids, attention_mask=attention_mask, output_hidden_states=True)
+                hidden = output.hidden_states[-(clip_skip + 1)]
+                embeds = text_encoder.text_model.final_layer_norm(hidden)
+            else:
+                embeds = text_encoder(input_ids, attention_mask=attention_mask)[0]
+
+        return embeds.to(dtype=text_encoder.dtype)
+
     def _load_img2img_pipeline(self):
         """Load image-to-image pipeline"""
         print("Loading image-to-image pipeline...")
@@ -733,6 +980,7 @@ class StableDiffusion:
             'device': self.device,
             'precision': self.precision,
             'loaded_loras': list(self.loaded_loras.keys()),
+            'embedding_cache': self.embedding_cache.get_stats(),
             'pipelines': {
                 'txt2img': self.pipe_txt2img is not None,
                 'img2img': self.pipe_img2img is not None,
@@ -742,4 +990,4 @@ class StableDiffusion:
 
 
 # Export for Elide polyglot runtime
-__all__ = ['StableDiffusion', 'GenerationConfig', 'Img2ImgConfig', 'InpaintConfig']
+__all__ = ['StableDiffusion', 'GenerationConfig', 'Img2ImgConfig', 'InpaintConfig', 'PromptEmbeddingCache']
@@ -14,6 +14,7 @@ Features:
 - Custom style model training
 - Perceptual loss optimization
 - Content/style weight balancing
+- Cached style statistics (AdaIN mean/std, per-layer Gram matrices)
 - GPU acceleration
 
 Author: AI Art Gallery Team
@@ -25,9 +26,16 @@ import torch.nn as nn
 import torch.nn.functional as F
 import torchvision.models as models
 import torchvision.transforms as transforms
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from PIL import Image
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
 import io
+import json
+import os
+import tempfile
+import threading
 import numpy as np
 import time
 
@@ -145,24 +153,40 @@ class AdaINModel(nn.Module):
 
     def forward(self, content: torch.Tensor, style: torch.Tensor, alpha: float = 1.0) -> torch.Tensor:
         """Apply AdaIN and decode"""
-        content_features = self.encoder(content)
-        style_features = self.encoder(style)
+        style_mean, style_std = self.statistics(self.encoder(style))
+        return self.stylize(content, style_mean, style_std, alpha)
 
-        # Apply AdaIN
-        normalized = self.adain(content_features, style_features, alpha)
+    def stylize(
+        self,
+        content: torch.Tensor,
+        style_mean: torch.Tensor,
+        style_std: torch.Tensor,
+        alpha: float = 1.0
+    ) -> torch.Tensor:
+        """Apply AdaIN with precomputed style statistics and decode"""
+        content_features = self.encoder(content)
+        return self.decoder(self.adain_from_statistics(content_features, style_mean, style_std, alpha))
 
-        # Decode
-        return self.decoder(normalized)
+    @staticmethod
+    def statistics(features: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Channel-wise mean and std (plus epsilon) of encoder features"""
+        return features.mean([2, 3], keepdim=True), features.std([2, 3], keepdim=True) + 1e-5
 
     @staticmethod
     def adain(content_features: torch.Tensor, style_features: torch.Tensor, alpha: float = 1.0) -> torch.Tensor:
         """Adaptive Instance Normalization"""
-        # Calculate statistics
-        content_mean = content_features.mean([2, 3], keepdim=True)
-        content_std = content_features.std([2, 3], keepdim=True) + 1e-5
+        style_mean, style_std = AdaINModel.statistics(style_features)
+        return AdaINModel.adain_from_statistics(content_features, style_mean, style_std, alpha)
 
-        style_mean = style_features.mean([2, 3], keepdim=True)
-        style_std = style_features.std([2, 3], keepdim=True) + 1e-5
+    @staticmethod
+    def adain_from_statistics(
+        content_features: torch.Tensor,
+        style_mean: torch.Tensor,
+        style_std: torch.Tensor,
+        alpha: float = 1.0
+    ) -> torch.Tensor:
+        """Adaptive Instance Normalization with precomputed style statistics"""
+        content_mean, content_std = AdaINModel.statistics(content_features)
 
         # Normalize content features
         normalized = (content_features - content_mean) / content_std
@@ -174,6 +198,147 @@ class AdaINModel(nn.Module):
         return alpha * stylized + (1 - alpha) * content_features
 
 
+class StyleFeatureCache:
+    """
+    Cache of style-side statistics
+
+    Entries are dicts of tensors (AdaIN encoder mean/std, or VGG Gram
+    matrices per layer) keyed by the style's identity (file path, mtime
+    and size, or a hash of in-memory pixels), the statistic kind and the
+    resolution the style was encoded at. Entries live on the CPU in an
+    LRU dict and, when a cache directory is given, are also written to
+    disk so they survive restarts and can be shared between workers.
+    """
+
+    def __init__(self, max_entries: int = 256, cache_dir: Optional[str] = None):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Statistic sets kept in memory
+            cache_dir: Optional directory for the on-disk tier
+        """
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._entries: 'OrderedDict[str, Dict[str, torch.Tensor]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        style_id: str,
+        kind: str,
+        size: Tuple[int, int],
+        layers: Optional[List[str]] = None
+    ) -> str:
+        """Hash everything that determines a style's statistics"""
+        payload = json.dumps({
+            'style': style_id,
+            'kind': kind,
+            'size': list(size),
+            'layers': layers or []
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, torch.Tensor]]:
+        """Look up statistics (memory first, then disk)"""
+        with self._lock:
+            stats = self._entries.get(key)
+            if stats is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return stats
+
+        path = self._path(key)
+        if path is not None and path.exists():
+            try:
+                stats = torch.load(path, map_location='cpu')
+            except Exception as e:
+                print(f"Warning: dropping unreadable cached style statistics {path.name}: {e}")
+                path.unlink(missing_ok=True)
+            else:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._insert(key, stats)
+                return stats
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, stats: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+        """Store statistics (kept on the CPU)"""
+        stats = {name: tensor.detach().to('cpu') for name, tensor in stats.items()}
+
+        with self._lock:
+            self._insert(key, stats)
+
+        path = self._path(key)
+        if path is not None and not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            # Unique temp file in the target directory, so concurrent
+            # writers never share it and the rename stays atomic
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{key}.", suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    torch.save(stats, f)
+                os.replace(tmp, path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+
+        return stats
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Dict[str, torch.Tensor]]
+    ) -> Dict[str, torch.Tensor]:
+        """Return cached statistics or compute and store them"""
+        stats = self.get(key)
+        if stats is None:
+            stats = self.put(key, compute())
+        return stats
+
+    def clear(self, disk: bool = False):
+        """Drop in-memory entries (and the disk tier if requested)"""
+        with self._lock:
+            self._entries.clear()
+        if disk and self.cache_dir:
+            for path in self.cache_dir.glob('*/*.pt'):
+                path.unlink(missing_ok=True)
+
+    def get_stats(self) -> Dict:
+        """Cache statistics"""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            'cache_dir': str(self.cache_dir) if self.cache_dir else None
+        }
+
+    def _insert(self, key: str, stats: Dict[str, torch.Tensor]):
+        self._entries[key] = stats
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / key[:2] / f"{key}.pt"
+
+
 class StyleTransfer:
     """
     Main style transfer class with multiple methods
@@ -187,13 +352,22 @@ class StyleTransfer:
             config: Configuration dict with:
                 - device: Device to use (default: 'cuda:0')
                 - models: List of models to load ['vgg19', 'adain']
+                - style_size: Longest edge style images are encoded at
+                  (default: native resolution)
+                - style_cache_size: Style statistic sets kept in memory (default: 256)
+                - style_cache_dir: Optional directory for cached style statistics
         """
         self.device = config.get('device', 'cuda:0' if torch.cuda.is_available() else 'cpu')
         self.models_to_load = config.get('models', ['vgg19', 'adain'])
+        self.style_size = config.get('style_size')
 
         self.vgg_features = None
         self.adain_model = None
         self.style_images = {}  # Cache for style images
+        self.style_cache = StyleFeatureCache(
+            max_entries=config.get('style_cache_size', 256),
+            cache_dir=config.get('style_cache_dir')
+        )
 
         # Image preprocessing
         self.transform = transforms.Compose([
@@ -255,15 +429,13 @@ class StyleTransfer:
         method = options.get('method', 'adain')
         intensity = options.get('intensity', 1.0)
 
-        # Load images
         content = self._prepare_image(content_image)
-        style_image = self._load_style_image(style)
 
-        # Apply transfer
+        # Apply transfer with the (cached) style statistics
         if method == 'adain' and self.adain_model:
-            result = self._apply_adain(content, style_image, intensity)
+            result = self._apply_adain(content, self.style_statistics(style, 'adain'), intensity)
         elif method == 'vgg' and self.vgg_features:
-            result = self._apply_vgg_transfer(content, style_image, options)
+            result = self._apply_vgg_transfer(content, self.style_statistics(style, 'vgg'), options)
         else:
             raise ValueError(f"Unsupported method or model not loaded: {method}")
 
@@ -272,62 +444,182 @@ class StyleTransfer:
     def blend(
         self,
         content_image: Union[bytes, Image.Image],
-        styles: List[Dict]
+        styles: List[Dict],
+        options: Optional[Dict] = None
     ) -> bytes:
         """
         Blend multiple styles
 
+        The styles' cached statistics are mixed by weight and applied in a
+        single transfer: AdaIN means/stds are interpolated (equivalent to
+        interpolating the AdaIN feature maps), and for VGG the weighted
+        Gram matrices become one style target.
+
         Args:
             content_image: Input image
             styles: List of style dicts with:
                 - style: Style name
                 - weight: Style weight
-                - params: Optional transfer params
+                - params: Optional transfer params (VGG options)
+            options: Transfer options as for apply(); method defaults to
+                'adain' when the AdaIN model is loaded
 
         Returns:
             Blended stylized image
         """
+        options = options or {}
         content = self._prepare_image(content_image)
 
         if not styles:
             return self._image_to_bytes(content)
 
+        method = options.get('method', 'adain' if self.adain_model else 'vgg')
+        if (method == 'adain' and not self.adain_model) or (method == 'vgg' and not self.vgg_features):
+            raise ValueError(f"Unsupported method or model not loaded: {method}")
+
         # Normalize weights
         total_weight = sum(s['weight'] for s in styles)
-        normalized_styles = [
-            {**s, 'weight': s['weight'] / total_weight}
-            for s in styles
-        ]
-
-        # Apply each style and blend
-        results = []
-        weights = []
-
-        for style_config in normalized_styles:
-            style_img = self._load_style_image(style_config['style'])
-            params = style_config.get('params', {})
-
-            # Apply style
-            if self.adain_model:
-                result = self._apply_adain(
-                    content,
-                    style_img,
-                    style_config['weight']
-                )
-            else:
-                result = self._apply_vgg_transfer(
-                    content,
-                    style_img,
-                    {**params, 'style_weight': params.get('style_weight', 1e6) * style_config['weight']}
-                )
+        weights = [s['weight'] / total_weight for s in styles]
+
+        # Mix the cached statistics
+        blended = self.blend_statistics(
+            [self.style_statistics(s['style'], method) for s in styles],
+            weights
+        )
+
+        if method == 'adain':
+            result = self._apply_adain(content, blended, options.get('intensity', 1.0))
+        else:
+            params = {**styles[0].get('params', {}), **options}
+            result = self._apply_vgg_transfer(content, blended, params)
+
+        return self._image_to_bytes(result)
+
+    def mosaic(
+        self,
+        content_image: Union[bytes, Image.Image, np.ndarray],
+        styles: List[Union[str, Image.Image]],
+        grid_size: Tuple[int, int] = (3, 3),
+        intensity: float = 1.0
+    ) -> Image.Image:
+        """
+        Apply a different style to each cell of a grid (AdaIN)
+
+        The content is encoded once; each cell of the feature map is
+        re-normalized with its style's cached statistics and the whole map
+        is decoded once.
+
+        Args:
+            content_image: Input image
+            styles: Style names, paths or images, cycled over the cells
+            grid_size: Grid size (rows, cols)
+            intensity: Style intensity (0-1)
+
+        Returns:
+            Mosaic image at the content's size
+        """
+        if not self.adain_model:
+            raise ValueError("Style mosaic requires the AdaIN model")
+
+        content = self._prepare_image(content_image)
+        rows, cols = grid_size
+        stats = [self.style_statistics(style, 'adain') for style in styles]
+
+        content_tensor = self.transform(content).unsqueeze(0).to(self.device)
+
+        with torch.no_grad():
+            features = self.adain_model.encoder(content_tensor)
+            stylized = torch.empty_like(features)
+            fh, fw = features.shape[2:]
+
+            for i in range(rows):
+                for j in range(cols):
+                    ys = slice(i * fh // rows, (i + 1) * fh // rows)
+                    xs = slice(j * fw // cols, (j + 1) * fw // cols)
+                    cell_stats = stats[(i * cols + j) % len(stats)]
+                    stylized[:, :, ys, xs] = AdaINModel.adain_from_statistics(
+                        features[:, :, ys, xs], cell_stats['mean'], cell_stats['std'], intensity
+                    )
+
+            output = self.adain_model.decoder(stylized)
+
+        output = self.denormalize(output.squeeze(0)).clamp(0, 1)
+        result = self._tensor_to_image(output)
+
+        if result.size != content.size:
+            result = result.resize(content.size, Image.LANCZOS)
+
+        return result
+
+    def style_statistics(self, style: Union[str, Image.Image], method: str = 'adain') -> Dict[str, torch.Tensor]:
+        """
+        Style-side statistics, from the cache when possible
 
-            results.append(result)
-            weights.append(style_config['weight'])
+        Args:
+            style: Style name, path or image
+            method: 'adain' (encoder 'mean'/'std') or 'vgg' (Gram matrix per layer)
+
+        Returns:
+            Dict of statistics on the model device
+        """
+        style_id, native_size = self._style_identity(style)
+        size = self._style_resolution(native_size)
+        layers = self.vgg_features.layers if method == 'vgg' and self.vgg_features else None
+        key = self.style_cache.make_key(style_id, method, size, layers)
+
+        def compute() -> Dict[str, torch.Tensor]:
+            image = style if isinstance(style, Image.Image) else self._load_style_image(style)
+            image = self._prepare_image(image, size if size != image.size else None)
+            tensor = self.transform(image).unsqueeze(0).to(self.device)
+
+            with torch.no_grad():
+                if method == 'adain':
+                    mean, std = AdaINModel.statistics(self.adain_model.encoder(tensor))
+                    return {'mean': mean, 'std': std}
+                if method == 'vgg':
+                    return {
+                        layer: self._gram_matrix(features)
+                        for layer, features in self.vgg_features(tensor).items()
+                    }
+
+            raise ValueError(f"Unknown style statistics method: {method}")
+
+        stats = self.style_cache.get_or_compute(key, compute)
+        return {name: tensor.to(self.device) for name, tensor in stats.items()}
+
+    def precompute_styles(
+        self,
+        styles: Optional[List[Union[str, Image.Image]]] = None,
+        methods: Optional[List[str]] = None
+    ) -> int:
+        """
+        Warm the style statistics cache
+
+        Args:
+            styles: Styles to encode (default: all registered styles)
+            methods: Statistic kinds (default: those of the loaded models)
+
+        Returns:
+            Number of statistic sets that had to be computed
+        """
+        if styles is None:
+            styles = list(self.style_images.keys())
+        if methods is None:
+            methods = [m for m, model in (('adain', self.adain_model), ('vgg', self.vgg_features)) if model]
 
-        # Blend results
-        blended = self._blend_images(results, weights)
+        misses_before = self.style_cache.misses
+        for style in styles:
+            for method in methods:
+                self.style_statistics(style, method)
+        return self.style_cache.misses - misses_before
 
-        return self._image_to_bytes(blended)
+    @staticmethod
+    def blend_statistics(stats: List[Dict[str, torch.Tensor]], weights: List[float]) -> Dict[str, torch.Tensor]:
+        """Weighted mix of statistic dicts (weights should sum to 1)"""
+        return {
+            name: sum(weight * s[name] for s, weight in zip(stats, weights))
+            for name in stats[0]
+        }
 
     def train_style(self, config: Dict):
         """
@@ -354,19 +646,18 @@ class StyleTransfer:
     def _apply_adain(
         self,
         content: Image.Image,
-        style: Image.Image,
+        style_stats: Dict[str, torch.Tensor],
         alpha: float = 1.0
     ) -> Image.Image:
-        """Apply AdaIN style transfer"""
+        """Apply AdaIN style transfer with precomputed style statistics"""
         start_time = time.time()
 
         # Prepare tensors
         content_tensor = self.transform(content).unsqueeze(0).to(self.device)
-        style_tensor = self.transform(style).unsqueeze(0).to(self.device)
 
         # Apply style transfer
         with torch.no_grad():
-            output = self.adain_model(content_tensor, style_tensor, alpha)
+            output = self.adain_model.stylize(content_tensor, style_stats['mean'], style_stats['std'], alpha)
 
         # Convert back to image
         output = self.denormalize(output.squeeze(0))
@@ -380,10 +671,10 @@ class StyleTransfer:
     def _apply_vgg_transfer(
         self,
         content: Image.Image,
-        style: Image.Image,
+        style_grams: Dict[str, torch.Tensor],
         options: Dict
     ) -> Image.Image:
-        """Apply VGG-based neural style transfer with optimization"""
+        """Apply VGG-based neural style transfer with optimization (precomputed Gram matrices)"""
         iterations = options.get('iterations', 300)
         content_weight = options.get('content_weight', 1.0)
         style_weight = options.get('style_weight', 1e6)
@@ -393,20 +684,12 @@ class StyleTransfer:
 
         # Prepare tensors
         content_tensor = self.transform(content).unsqueeze(0).to(self.device)
-        style_tensor = self.transform(style).unsqueeze(0).to(self.device)
 
         # Initialize output from content
         output = content_tensor.clone().requires_grad_(True)
 
         # Extract features
         content_features = self.vgg_features(content_tensor)
-        style_features = self.vgg_features(style_tensor)
-
-        # Calculate style grams
-        style_grams = {
-            layer: self._gram_matrix(features)
-            for layer, features in style_features.items()
-        }
 
         # Optimizer
         optimizer = torch.optim.LBFGS([output], max_iter=20)
@@ -460,6 +743,30 @@ class StyleTransfer:
         gram = torch.bmm(features, features.transpose(1, 2))
         return gram / (c * h * w)
 
+    def _style_identity(self, style: Union[str, Image.Image]) -> Tuple[str, Tuple[int, int]]:
+        """Cache identity and native size of a style, without decoding files"""
+        if isinstance(style, Image.Image):
+            digest = hashlib.sha256(style.tobytes())
+            digest.update(f"{style.mode}{style.size}".encode('utf-8'))
+            return f"image:{digest.hexdigest()}", style.size
+
+        path = self.style_images.get(style) or style
+        if isinstance(path, str) and os.path.isfile(path):
+            stat = os.stat(path)
+            with Image.open(path) as image:
+                size = image.size
+            return f"file:{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}", size
+
+        # _load_style_image falls back to a placeholder
+        return 'placeholder', (512, 512)
+
+    def _style_resolution(self, size: Tuple[int, int]) -> Tuple[int, int]:
+        """Size a style is encoded at (longest edge scaled to style_size)"""
+        if not self.style_size:
+            return size
+        scale = self.style_size / max(size)
+        return max(1, round(size[0] * scale)), max(1, round(size[1] * scale))
+
     def _load_style_image(self, style: str) -> Image.Image:
         """Load style image from name or path"""
         # Check if it's a cached style
@@ -510,21 +817,6 @@ class StyleTransfer:
         image.save(buffer, format=format)
         return buffer.getvalue()
 
-    def _blend_images(self, images: List[Image.Image], weights: List[float]) -> Image.Image:
-        """Blend multiple images with weights"""
-        # Convert to arrays
-        arrays = [np.array(img).astype(np.float32) for img in images]
-
-        # Weighted sum
-        blended = np.zeros_like(arrays[0])
-        for array, weight in zip(arrays, weights):
-            blended += array * weight
-
-        # Convert back to uint8
-        blended = np.clip(blended, 0, 255).astype(np.uint8)
-
-        return Image.fromarray(blended)
-
     def get_model_info(self) -> Dict:
         """Get model information"""
         return {
@@ -533,7 +825,8 @@ class StyleTransfer:
                 'vgg19': self.vgg_features is not None,
                 'adain': self.adain_model is not None
             },
-            'cached_styles': list(self.style_images.keys())
+            'cached_styles': list(self.style_images.keys()),
+            'style_cache': self.style_cache.get_stats()
         }
 
     def cleanup(self):
@@ -553,20 +846,26 @@ class StyleTransfer:
 
 def create_style_mosaic(
     content_image: Image.Image,
-    style_images: List[Image.Image],
-    grid_size: Tuple[int, int] = (3, 3)
+    style_images: List[Union[str, Image.Image]],
+    grid_size: Tuple[int, int] = (3, 3),
+    transfer: Optional[StyleTransfer] = None
 ) -> Image.Image:
     """
     Create mosaic with different styles in different regions
 
     Args:
         content_image: Content image
-        style_images: List of style images
+        style_images: List of style images (or style names with a transfer)
         grid_size: Grid size (rows, cols)
+        transfer: StyleTransfer with AdaIN loaded; its cached style
+            statistics are applied per cell in one encode/decode pass
 
     Returns:
         Mosaic image
     """
+    if transfer is not None and transfer.adain_model:
+        return transfer.mosaic(content_image, style_images, grid_size)
+
     rows, cols = grid_size
     width, height = content_image.size
 
@@ -585,10 +884,7 @@ def create_style_mosaic(
 
             cell = content_image.crop((left, top, right, bottom))
 
-            # Apply style (cycling through style images)
-            style_idx = (i * cols + j) % len(style_images)
-            # In production, would apply actual style transfer
-            # For now, just paste the cell
+            # Without a transfer model, just paste the cell
             result.paste(cell, (left, top))
 
     return result
@@ -633,4 +929,4 @@ def interpolate_styles(
 
 
 # Export for Elide polyglot runtime
-__all__ = ['StyleTransfer', 'VGG19Features', 'AdaINModel']
+__all__ = ['StyleTransfer', 'StyleFeatureCache', 'VGG19Features', 'AdaINModel']
@@ -8,6 +8,7 @@ using shared memory regions and memory-mapped files.
 This bridge enables:
 - Direct memory access from Python without copying
 - Shared memory regions for large image/video buffers
+- Lock-free frame ring buffers for decoded video frames
 - Efficient inter-process communication
 
 @module cv/bridge
@@ -17,17 +18,501 @@ import sys
 import json
 import mmap
 import os
-from typing import Optional
+import struct
+import time
+from multiprocessing import shared_memory, resource_tracker
+from typing import Optional, Tuple
 import numpy as np
 
 
+class FrameRingBuffer:
+    """
+    Fixed-shape frame ring buffer in shared memory
+
+    Single producer, any number of consumers, no locks. Each slot carries a
+    seqlock-style pair of sequence numbers: the producer stamps `begin`,
+    writes the pixels, then stamps `end` and publishes the sequence in the
+    ring header. A consumer holding sequence `s` knows its view is intact
+    as long as the slot's `begin` still equals `s`; once the producer laps
+    the ring the view is reported stale instead of blocking the producer.
+
+    Backed by multiprocessing.shared_memory (by name) or by an mmap'ed file
+    (by path, e.g. under /dev/shm for the TypeScript side).
+    """
+
+    MAGIC = b'FRMRING1'
+    VERSION = 1
+    MAX_DIMS = 4
+
+    # magic, version, num_slots, ndim, slot_bytes, dtype, shape[MAX_DIMS]
+    HEADER = struct.Struct('<8sIIIQ16s4Q')
+    HEADER_BYTES = 128
+    WRITE_SEQ_OFFSET = 96
+
+    # begin sequence, end sequence, timestamp (ns)
+    SLOT_HEADER_BYTES = 64
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        slot_shape: Optional[Tuple[int, ...]] = None,
+        dtype=np.uint8,
+        num_slots: int = 8,
+        create: bool = True,
+        path: Optional[str] = None
+    ):
+        """
+        Create or attach to a frame ring
+
+        Args:
+            name: shared_memory segment name (ignored when path is given)
+            slot_shape: Frame shape, e.g. (height, width, 3); read from the
+                header when attaching
+            dtype: Frame dtype
+            num_slots: Number of frame slots
+            create: Create the ring (producer) or attach to it (consumer)
+            path: Back the ring with an mmap'ed file instead
+        """
+        self.name = name
+        self.path = path
+        self.owner = create
+        self._shm = None
+        self._mmap = None
+        self._file = None
+        # (inode, size) of the backing file, for detecting a recreated ring
+        self.file_id: Optional[Tuple[int, int]] = None
+
+        if create:
+            if slot_shape is None:
+                raise ValueError('slot_shape is required to create a frame ring')
+            if len(slot_shape) > self.MAX_DIMS:
+                raise ValueError(f'Frames may have at most {self.MAX_DIMS} dimensions')
+
+            self.slot_shape = tuple(int(d) for d in slot_shape)
+            self.dtype = np.dtype(dtype)
+            self.num_slots = int(num_slots)
+            self._init_layout()
+            self._open(self.total_bytes)
+            self._write_header()
+        else:
+            self._open(None)
+            self._read_header()
+            self._init_layout()
+
+        self._bind_views()
+
+    @classmethod
+    def attach(cls, name: Optional[str] = None, path: Optional[str] = None) -> 'FrameRingBuffer':
+        """
+        Attach to an existing ring as a consumer
+
+        Args:
+            name: shared_memory segment name
+            path: Ring file path
+
+        Returns:
+            FrameRingBuffer reading the producer's slots
+        """
+        return cls(name=name, path=path, create=False)
+
+    @staticmethod
+    def is_ring_file(path: str) -> bool:
+        """
+        Check whether a file holds a frame ring
+
+        Args:
+            path: File path
+
+        Returns:
+            True if the file starts with the ring magic
+        """
+        try:
+            with open(path, 'rb') as f:
+                return f.read(len(FrameRingBuffer.MAGIC)) == FrameRingBuffer.MAGIC
+        except OSError:
+            return False
+
+    @property
+    def write_seq(self) -> int:
+        """Sequence number of the newest published frame (0 if none)"""
+        return int(self._write_seq[0])
+
+    def acquire_write(self) -> Tuple[int, np.ndarray]:
+        """
+        Reserve the next slot for the producer
+
+        Decode or render straight into the returned view, then call
+        commit(seq). Nothing is copied.
+
+        Returns:
+            (sequence, writable view of the slot)
+        """
+        seq = self.write_seq + 1
+        slot = seq % self.num_slots
+
+        # Invalidate the slot for readers before touching its pixels
+        self._slot_headers[slot, 0] = seq
+        return seq, self._slots[slot]
+
+    def commit(self, seq: int) -> None:
+        """
+        Publish a frame written via acquire_write()
+
+        Args:
+            seq: Sequence returned by acquire_write()
+        """
+        slot = seq % self.num_slots
+        self._slot_headers[slot, 2] = time.time_ns()
+        self._slot_headers[slot, 1] = seq
+        self._write_seq[0] = seq
+
+    def abort(self, seq: int) -> None:
+        """
+        Give back a slot reserved with acquire_write() without publishing
+
+        Only valid if the slot's pixels were not modified.
+
+        Args:
+            seq: Sequence returned by acquire_write()
+        """
+        slot = seq % self.num_slots
+        self._slot_headers[slot, 0] = self._slot_headers[slot, 1]
+
+    def write(self, frame: np.ndarray) -> int:
+        """
+        Copy a frame into the next slot and publish it
+
+        Args:
+            frame: Frame with the ring's shape
+
+        Returns:
+            Sequence number of the frame
+        """
+        seq, slot = self.acquire_write()
+        np.copyto(slot, frame, casting='unsafe')
+        self.commit(seq)
+        return seq
+
+    def view(self, seq: Optional[int] = None) -> Optional[np.ndarray]:
+        """
+        Zero-copy read-only view of a published frame
+
+        The view aliases live shared memory. Check is_valid(seq) after using
+        it to make sure the producer did not overwrite the slot meanwhile.
+
+        Args:
+            seq: Frame sequence (latest if None)
+
+        Returns:
+            Frame view, or None if the frame is not (or no longer) available
+        """
+        if seq is None:
+            seq = self.write_seq
+        if seq <= 0 or not self.is_valid(seq):
+            return None
+
+        slot = seq % self.num_slots
+        if int(self._slot_headers[slot, 1]) != seq:
+            return None
+
+        return self._readonly_slots[slot]
+
+    def is_valid(self, seq: int) -> bool:
+        """
+        Check that a frame has been published and not yet overwritten
+
+        Args:
+            seq: Frame sequence
+
+        Returns:
+            True if views of this frame are still intact
+        """
+        if seq <= 0 or seq > self.write_seq:
+            return False
+        return int(self._slot_headers[seq % self.num_slots, 0]) == seq
+
+    def read(self, seq: Optional[int] = None, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        Copy a frame out of the ring, validated against concurrent overwrite
+
+        Args:
+            seq: Frame sequence (latest if None)
+            out: Optional preallocated destination
+
+        Returns:
+            Frame copy, or None if it was overwritten while copying
+        """
+        if seq is None:
+            seq = self.write_seq
+
+        frame = self.view(seq)
+        if frame is None:
+            return None
+
+        if out is None:
+            out = np.empty(self.slot_shape, dtype=self.dtype)
+        np.copyto(out, frame)
+
+        return out if self.is_valid(seq) else None
+
+    def timestamp_ns(self, seq: int) -> int:
+        """Producer timestamp of a frame (time.time_ns())"""
+        return int(self._slot_headers[seq % self.num_slots, 2])
+
+    def reader(self, from_latest: bool = True) -> 'FrameRingReader':
+        """
+        Create an independent consumer cursor
+
+        Args:
+            from_latest: Start at the newest frame instead of the oldest one
+                still held by the ring
+
+        Returns:
+            FrameRingReader
+        """
+        return FrameRingReader(self, from_latest=from_latest)
+
+    def close(self):
+        """Release the mapping (views become invalid)"""
+        self._slots = self._readonly_slots = None
+        self._slot_headers = self._write_seq = None
+
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def unlink(self):
+        """Destroy the backing segment/file (producer side)"""
+        if self.path:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        elif self.name:
+            segment = shared_memory.SharedMemory(name=self.name)
+            segment.close()
+            segment.unlink()
+
+    def _init_layout(self):
+        """Compute slot sizes and offsets from shape/dtype"""
+        self.slot_bytes = int(np.prod(self.slot_shape)) * self.dtype.itemsize
+        self.slot_stride = self.SLOT_HEADER_BYTES + -(-self.slot_bytes // 64) * 64
+        self.total_bytes = self.HEADER_BYTES + self.num_slots * self.slot_stride
+
+    def _open(self, size: Optional[int]):
+        """Create or attach to the backing memory"""
+        if self.path:
+            if size is not None:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._file = open(self.path, 'w+b')
+                self._file.truncate(size)
+            else:
+                self._file = open(self.path, 'r+b')
+            st = os.fstat(self._file.fileno())
+            self.file_id = (st.st_ino, st.st_size)
+            self._mmap = mmap.mmap(self._file.fileno(), 0)
+            self._buffer = self._mmap
+        else:
+            if size is not None:
+                self._shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+                self.name = self._shm.name
+            else:
+                self._shm = shared_memory.SharedMemory(name=self.name)
+                # Consumers must not destroy the producer's segment on exit
+                try:
+                    resource_tracker.unregister(self._shm._name, 'shared_memory')
+                except Exception:
+                    pass
+            self._buffer = self._shm.buf
+
+    def _write_header(self):
+        """Write the static ring description"""
+        shape = list(self.slot_shape) + [0] * (self.MAX_DIMS - len(self.slot_shape))
+        header = self.HEADER.pack(
+            self.MAGIC, self.VERSION, self.num_slots, len(self.slot_shape),
+            self.slot_bytes, self.dtype.str.encode('ascii'), *shape
+        )
+        self._buffer[:len(header)] = header
+
+    def _read_header(self):
+        """Read the static ring description written by the producer"""
+        magic, version, num_slots, ndim, _, dtype, *shape = self.HEADER.unpack_from(self._buffer, 0)
+        if magic != self.MAGIC:
+            raise ValueError('Shared memory does not contain a frame ring')
+        if version != self.VERSION:
+            raise ValueError(f'Unsupported frame ring version: {version}')
+
+        self.num_slots = num_slots
+        self.slot_shape = tuple(shape[:ndim])
+        self.dtype = np.dtype(dtype.rstrip(b'\0').decode('ascii'))
+
+    def _bind_views(self):
+        """Create NumPy views over the header and slots"""
+        self._write_seq = np.ndarray((1,), dtype=np.uint64, buffer=self._buffer, offset=self.WRITE_SEQ_OFFSET)
+
+        slot_area = np.ndarray(
+            (self.num_slots, self.slot_stride), dtype=np.uint8,
+            buffer=self._buffer, offset=self.HEADER_BYTES
+        )
+        self._slot_headers = slot_area[:, :self.SLOT_HEADER_BYTES].view(np.uint64)
+
+        pixels = slot_area[:, self.SLOT_HEADER_BYTES:self.SLOT_HEADER_BYTES + self.slot_bytes]
+        self._slots = [
+            pixels[i].view(self.dtype).reshape(self.slot_shape)
+            for i in range(self.num_slots)
+        ]
+        self._readonly_slots = []
+        for slot in self._slots:
+            readonly = slot.view()
+            readonly.flags.writeable = False
+            self._readonly_slots.append(readonly)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class FrameRingReader:
+    """
+    Per-consumer cursor over a FrameRingBuffer
+
+    Consumers share no state with each other or with the producer. A slow
+    consumer skips ahead to the oldest frame still held by the ring and
+    counts the frames it missed.
+    """
+
+    def __init__(self, ring: FrameRingBuffer, from_latest: bool = True):
+        self.ring = ring
+        latest = ring.write_seq
+        self.next_seq = latest if from_latest else max(1, latest - ring.num_slots + 1)
+        self.next_seq = max(self.next_seq, 1)
+        self.dropped = 0
+
+    def poll(self) -> Optional[Tuple[int, np.ndarray]]:
+        """
+        Return the next frame as a zero-copy view without blocking
+
+        Returns:
+            (sequence, view) or None if no new frame is available
+        """
+        while True:
+            latest = self.ring.write_seq
+            if self.next_seq > latest:
+                return None
+
+            oldest = latest - self.ring.num_slots + 1
+            if self.next_seq < oldest:
+                self.dropped += oldest - self.next_seq
+                self.next_seq = oldest
+
+            seq = self.next_seq
+            self.next_seq += 1
+
+            frame = self.ring.view(seq)
+            if frame is not None:
+                return seq, frame
+
+            # Overwritten between the header reads; move on to a newer frame
+            self.dropped += 1
+
+    def next(self, timeout: Optional[float] = None, poll_interval: float = 0.0005) -> Optional[Tuple[int, np.ndarray]]:
+        """
+        Wait for the next frame
+
+        Args:
+            timeout: Seconds to wait (forever if None)
+            poll_interval: Sleep between polls
+
+        Returns:
+            (sequence, view) or None on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            result = self.poll()
+            if result is not None:
+                return result
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(poll_interval)
+
+
 class SharedMemoryBridge:
     """
     Bridge for zero-copy buffer sharing between processes
+
+    Files are memory-mapped and cached in `memory_regions` (remapped when
+    they are resized or replaced); the *_view readers and NumPy helpers
+    return views into the mapping instead of copying the file contents.
     """
 
     def __init__(self):
         self.memory_regions = {}
+        self.frame_rings = {}
+
+    def _map(self, path: str, min_size: int = 0) -> Optional[mmap.mmap]:
+        """
+        Get (or create) the cached mapping of a file
+
+        The file is stat'ed on every call; the mapping is rebuilt when the
+        file was resized (reading past a shrunk file's end would raise
+        SIGBUS) or replaced by a new inode (the old mapping would keep
+        returning stale bytes).
+
+        Args:
+            path: Path to shared memory file
+            min_size: Grow the file to at least this many bytes
+
+        Returns:
+            Writable mapping of the whole file, or None for an empty file
+        """
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            st = None
+
+        region = self.memory_regions.get(path)
+        if region is not None:
+            if (st is not None and st.st_ino == region['ino'] and
+                    st.st_size == len(region['mmap']) and st.st_size >= min_size):
+                return region['mmap']
+            self._unmap(path)
+
+        if st is None:
+            if min_size == 0:
+                raise FileNotFoundError(f'Shared memory file not found: {path}')
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            open(path, 'wb').close()
+
+        f = open(path, 'r+b')
+        st = os.fstat(f.fileno())
+        if st.st_size < min_size:
+            f.truncate(min_size)
+
+        if max(st.st_size, min_size) == 0:
+            f.close()
+            return None
+
+        mapping = mmap.mmap(f.fileno(), 0)
+        self.memory_regions[path] = {'file': f, 'mmap': mapping, 'ino': st.st_ino}
+        return mapping
+
+    def _unmap(self, path: str):
+        """Drop the cached mapping of a file"""
+        region = self.memory_regions.pop(path, None)
+        if region is not None:
+            try:
+                region['mmap'].close()
+            except BufferError:
+                # Views are still exported; the mapping is released with them
+                pass
+            region['file'].close()
 
     def read_from_shared_memory(self, path: str, size: Optional[int] = None) -> bytes:
         """
@@ -40,14 +525,29 @@ class SharedMemoryBridge:
         Returns:
             Bytes read from shared memory
         """
-        if not os.path.exists(path):
-            raise FileNotFoundError(f'Shared memory file not found: {path}')
+        return bytes(self.read_from_shared_memory_view(path, size))
 
-        with open(path, 'rb') as f:
-            if size:
-                return f.read(size)
-            else:
-                return f.read()
+    def read_from_shared_memory_view(self, path: str, size: Optional[int] = None) -> memoryview:
+        """
+        Read data from shared memory file (zero-copy)
+
+        The view tracks the live mapping: later writes show through it, so
+        copy it before keeping it past the next write.
+
+        Args:
+            path: Path to shared memory file
+            size: Optional size to read (reads entire file if None)
+
+        Returns:
+            Memoryview over the mapped file contents
+        """
+        # Remaps if the file was resized or replaced since it was last mapped
+        mapping = self._map(path)
+        if mapping is None:
+            return memoryview(b'')
+
+        view = memoryview(mapping)[:len(mapping)]
+        return view[:size] if size else view
 
     def write_to_shared_memory(self, path: str, data: bytes, offset: int = 0):
         """
@@ -58,28 +558,46 @@ class SharedMemoryBridge:
             data: Data to write
             offset: Offset in file to start writing
         """
-        mode = 'r+b' if os.path.exists(path) else 'wb'
-
-        with open(path, mode) as f:
-            if offset > 0:
-                f.seek(offset)
-            f.write(data)
-            f.flush()
-
-    def create_numpy_array_from_shared_memory(self, path: str, shape: tuple, dtype=np.uint8) -> np.ndarray:
+        data = memoryview(data).cast('B')
+        if not len(data):
+            # Nothing to map; just make sure the file exists
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                open(path, 'wb').close()
+            return
+
+        mapping = self._map(path, offset + len(data))
+        mapping[offset:offset + len(data)] = data
+
+    def create_numpy_array_from_shared_memory(
+        self,
+        path: str,
+        shape: tuple,
+        dtype=np.uint8,
+        seq: Optional[int] = None
+    ) -> np.ndarray:
         """
         Create numpy array from shared memory (zero-copy)
 
+        If the file holds a FrameRingBuffer, the array is a view of a live
+        frame slot (the latest frame unless `seq` is given).
+
         Args:
             path: Path to shared memory file
             shape: Shape of numpy array
             dtype: Data type of array
+            seq: Frame sequence when reading from a frame ring
 
         Returns:
             Numpy array backed by shared memory
         """
-        data = self.read_from_shared_memory(path)
-        arr = np.frombuffer(data, dtype=dtype)
+        if FrameRingBuffer.is_ring_file(path):
+            frame = self.open_frame_ring(path).view(seq)
+            if frame is None:
+                raise LookupError(f'Frame {seq} is not available in {path}')
+            return frame
+
+        arr = np.frombuffer(self.read_from_shared_memory_view(path), dtype=dtype)
 
         # Reshape if needed
         if shape:
@@ -97,8 +615,82 @@ class SharedMemoryBridge:
             path: Path to shared memory file
             arr: Numpy array to write
         """
-        data = arr.tobytes()
-        self.write_to_shared_memory(path, data)
+        self.write_to_shared_memory(path, np.ascontiguousarray(arr).data)
+
+    def create_frame_ring(
+        self,
+        path: str,
+        slot_shape: Tuple[int, ...],
+        dtype=np.uint8,
+        num_slots: int = 8
+    ) -> FrameRingBuffer:
+        """
+        Create a file-backed frame ring (producer side)
+
+        Args:
+            path: Ring file path (e.g. under /dev/shm)
+            slot_shape: Frame shape
+            dtype: Frame dtype
+            num_slots: Number of slots
+
+        Returns:
+            FrameRingBuffer
+        """
+        self._unmap(path)
+        self.close_frame_ring(path)
+
+        ring = FrameRingBuffer(slot_shape=slot_shape, dtype=dtype, num_slots=num_slots, path=path)
+        self.frame_rings[path] = ring
+        return ring
+
+    def open_frame_ring(self, path: str) -> FrameRingBuffer:
+        """
+        Attach to a file-backed frame ring (consumer side)
+
+        The ring file is stat'ed on every call; a ring whose file was
+        recreated or resized by the producer is re-attached.
+
+        Args:
+            path: Ring file path
+
+        Returns:
+            Cached FrameRingBuffer
+        """
+        ring = self.frame_rings.get(path)
+        if ring is not None:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                self.close_frame_ring(path)
+                raise
+
+            if (st.st_ino, st.st_size) == ring.file_id:
+                return ring
+            self.close_frame_ring(path)
+
+        ring = FrameRingBuffer.attach(path=path)
+        self.frame_rings[path] = ring
+        return ring
+
+    def close_frame_ring(self, path: str):
+        """
+        Detach from a frame ring
+
+        Args:
+            path: Ring file path
+        """
+        ring = self.frame_rings.pop(path, None)
+        if ring is not None:
+            ring.close()
+
+    def close(self):
+        """
+        Release every cached mapping
+        """
+        for path in list(self.frame_rings):
+            self.close_frame_ring(path)
+        for path in list(self.memory_regions):
+            self._unmap(path)
 
     def get_buffer_info(self, path: str) -> dict:
         """
@@ -134,11 +726,11 @@ def demonstrate_zero_copy():
 
     if os.path.exists(shm_path):
         # Read image as numpy array (zero-copy)
-        image_data = bridge.read_from_shared_memory(shm_path)
+        image_data = bridge.read_from_shared_memory_view(shm_path)
 
         print(json.dumps({
             'success': True,
-            'bytesRead': len(image_data),
+            'bytesRead': image_data.nbytes,
             'zeroCopy': True,
             'message': 'Successfully read from shared memory',
         }))
@@ -29,6 +29,8 @@ except ImportError:
     }), file=sys.stderr)
     sys.exit(1)
 
+from bridge import FrameRingBuffer
+
 
 class OpenCVProcessor:
     """
@@ -179,7 +181,13 @@ class OpenCVProcessor:
             'memoryUsed': image.nbytes,
         }
 
-    def process_video(self, video_data: bytes, operation: str = 'detect-faces', target_fps: int = 30) -> Dict:
+    def process_video(
+        self,
+        video_data: bytes,
+        operation: str = 'detect-faces',
+        target_fps: int = 30,
+        frame_ring_path: Optional[str] = None
+    ) -> Dict:
         """
         Process video frames for real-time CV operations
 
@@ -187,6 +195,9 @@ class OpenCVProcessor:
             video_data: Video data as bytes
             operation: Operation to perform on each frame
             target_fps: Target FPS for processing
+            frame_ring_path: If set, frames are decoded straight into a
+                shared FrameRingBuffer at this path so other processes
+                (e.g. the Pillow processor) can read them without copies
 
         Returns:
             Dictionary with processing results
@@ -214,15 +225,49 @@ class OpenCVProcessor:
         # Calculate frame skip to achieve target FPS
         frame_skip = max(1, int(fps / target_fps)) if fps > 0 else 1
 
+        frame_ring = None
+        first_frame = None
+        frames_unpublished = 0
+        if frame_ring_path:
+            # Size the ring from a decoded frame: containers can report
+            # CAP_PROP_FRAME_WIDTH/HEIGHT wrongly or as 0
+            ret, first_frame = cap.read()
+            if ret:
+                frame_ring = FrameRingBuffer(slot_shape=first_frame.shape, path=frame_ring_path)
+            else:
+                first_frame = None
+
         results = []
         frames_processed = 0
         frame_times = []
 
         frame_idx = 0
         while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
+            if first_frame is not None:
+                seq = frame_ring.write(first_frame)
+                frame = frame_ring.view(seq)
+                first_frame = None
+            elif frame_ring is not None:
+                # Decode directly into the next shared slot
+                seq, slot = frame_ring.acquire_write()
+                ret, frame = cap.read(slot)
+                if not ret:
+                    frame_ring.abort(seq)
+                    break
+                if frame is slot or np.shares_memory(frame, slot):
+                    frame_ring.commit(seq)
+                else:
+                    # The decoder allocated its own frame (the slot is
+                    # untouched); publish a copy if the shape still fits
+                    frame_ring.abort(seq)
+                    if frame.shape == frame_ring.slot_shape and frame.dtype == frame_ring.dtype:
+                        frame = frame_ring.view(frame_ring.write(frame))
+                    else:
+                        frames_unpublished += 1
+            else:
+                ret, frame = cap.read()
+                if not ret:
+                    break
 
             # Process only selected frames
             if frame_idx % frame_skip == 0:
@@ -253,6 +298,17 @@ class OpenCVProcessor:
 
         cap.release()
 
+        frame_ring_info = None
+        if frame_ring is not None:
+            frame_ring_info = {
+                'path': frame_ring_path,
+                'framesPublished': frame_ring.write_seq,
+                'framesUnpublished': frames_unpublished,
+                'slots': frame_ring.num_slots,
+            }
+            frame_ring.close()
+            self.buffer_reused = True
+
         # Cleanup
         try:
             os.remove(temp_video_path)
@@ -271,6 +327,7 @@ class OpenCVProcessor:
             'avgFrameTime': avg_frame_time,
             'processingTime': processing_time,
             'bufferReused': self.buffer_reused,
+            'frameRing': frame_ring_info,
         }
 
 
@@ -294,7 +351,8 @@ def main():
         if operation == 'process-video':
             tracking_type = sys.argv[3] if len(sys.argv) > 3 else 'detect-faces'
             target_fps = int(sys.argv[4]) if len(sys.argv) > 4 else 30
-            result = processor.process_video(image_data, tracking_type, target_fps)
+            frame_ring_path = sys.argv[5] if len(sys.argv) > 5 else None
+            result = processor.process_video(image_data, tracking_type, target_fps, frame_ring_path)
         else:
             # Decode image
             nparr = np.frombuffer(image_data, np.uint8)
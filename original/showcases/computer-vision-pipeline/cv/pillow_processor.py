@@ -28,6 +28,8 @@ except ImportError:
     }), file=sys.stderr)
     sys.exit(1)
 
+from bridge import FrameRingBuffer
+
 
 class PillowProcessor:
     """
@@ -49,6 +51,36 @@ class PillowProcessor:
             'find-edges': ImageFilter.FIND_EDGES,
         }
 
+    def load_ring_frame(self, ring: FrameRingBuffer, seq: Optional[int] = None) -> Optional[Image.Image]:
+        """
+        Wrap a decoded video frame from a shared frame ring as a PIL Image
+
+        Frames are published by OpenCVProcessor.process_video in BGR order;
+        the only copy made is Pillow's BGR -> RGB unpack.
+
+        Args:
+            ring: Attached FrameRingBuffer
+            seq: Frame sequence (latest if None)
+
+        Returns:
+            PIL Image, or None if the frame was overwritten
+        """
+        if seq is None:
+            seq = ring.write_seq
+
+        frame = ring.view(seq)
+        if frame is None:
+            return None
+
+        height, width = frame.shape[:2]
+        image = Image.frombuffer('RGB', (width, height), frame, 'raw', 'BGR', 0, 1)
+
+        if not ring.is_valid(seq):
+            return None
+
+        self.buffer_reused = True
+        return image
+
     def apply_filter(self, image: Image.Image, filter_name: str, intensity: float = 1.0) -> Dict:
         """
         Apply filter to image
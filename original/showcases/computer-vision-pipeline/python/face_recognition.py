@@ -12,7 +12,7 @@ Features:
 - Anti-spoofing detection
 - Age and gender estimation
 - Expression recognition
-- Face database management
+- Face database management (memory-mapped storage; exact, IVF and HNSW indexes)
 """
 
 import numpy as np
@@ -20,7 +20,13 @@ import cv2
 from typing import List, Tuple, Dict, Optional, Union
 from dataclasses import dataclass
 from pathlib import Path
+import copy
+import heapq
+import json
+import os
 import pickle
+import struct
+import threading
 import logging
 
 # Configure logging
@@ -521,36 +527,1166 @@ class FaceRecognizer:
         logger.info("Face recognizer released")
 
 
+class FaceEmbeddingStore:
+    """Packed, pre-normalized float32 embedding matrix
+
+    Every enrolled face occupies one row of a single contiguous matrix.
+    Rows are L2-normalized on insert, so cosine similarity against the
+    whole database is one matrix product. A row -> identity table maps
+    rows back to identities; removed rows are tombstoned (label -1) until
+    the next compaction so that indexes never see row ids shift under them.
+    """
+
+    def __init__(self, initial_capacity: int = 1024):
+        """Initialize embedding store
+
+        Args:
+            initial_capacity: Number of rows to preallocate
+        """
+        self.initial_capacity = max(1, initial_capacity)
+        self.model: Optional[str] = None
+        self.dim: Optional[int] = None
+        self.size = 0
+        self.num_removed = 0
+
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._labels = np.empty(0, dtype=np.int32)
+
+        # Identity-offset table: identity slot -> name and name -> row ids
+        self.identities: List[Optional[str]] = []
+        self._identity_ids: Dict[str, int] = {}
+        self._identity_rows: Dict[int, List[int]] = {}
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """View of all rows (including tombstoned ones)"""
+        return self._matrix[:self.size]
+
+    @property
+    def labels(self) -> np.ndarray:
+        """Row -> identity slot table (-1 for removed rows)"""
+        return self._labels[:self.size]
+
+    @property
+    def num_faces(self) -> int:
+        """Number of live rows"""
+        return self.size - self.num_removed
+
+    @property
+    def num_identities(self) -> int:
+        """Number of live identities"""
+        return len(self._identity_ids)
+
+    def live_rows(self) -> np.ndarray:
+        """Row ids that have not been removed"""
+        return np.flatnonzero(self.labels >= 0)
+
+    def identity_names(self) -> List[str]:
+        """Live identity names in enrolment order"""
+        return list(self._identity_ids.keys())
+
+    def rows_for(self, identity: str) -> List[int]:
+        """Row ids enrolled for an identity"""
+        identity_id = self._identity_ids.get(identity)
+        if identity_id is None:
+            return []
+        return list(self._identity_rows[identity_id])
+
+    def add(
+        self,
+        identity: str,
+        vectors: np.ndarray,
+        model: Optional[str] = None
+    ) -> np.ndarray:
+        """Append embeddings for one identity
+
+        Args:
+            identity: Person identity
+            vectors: (D,) or (N, D) embedding(s)
+            model: Embedding model name
+
+        Returns:
+            Row ids assigned to the new embeddings
+        """
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        self._check_compatible(vectors.shape[1], model)
+
+        count = vectors.shape[0]
+        self._reserve(self.size + count)
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+
+        rows = np.arange(self.size, self.size + count)
+        self._matrix[rows] = vectors / norms
+
+        identity_id = self._identity_ids.get(identity)
+        if identity_id is None:
+            identity_id = len(self.identities)
+            self.identities.append(identity)
+            self._identity_ids[identity] = identity_id
+            self._identity_rows[identity_id] = []
+
+        self._labels[rows] = identity_id
+        self._identity_rows[identity_id].extend(rows.tolist())
+        self.size += count
+
+        return rows
+
+    def remove_identity(self, identity: str) -> np.ndarray:
+        """Tombstone all rows of an identity
+
+        Args:
+            identity: Identity to remove
+
+        Returns:
+            Row ids that were removed (empty if identity is unknown)
+        """
+        identity_id = self._identity_ids.pop(identity, None)
+        if identity_id is None:
+            return np.empty(0, dtype=np.int64)
+
+        rows = np.asarray(self._identity_rows.pop(identity_id), dtype=np.int64)
+        self._labels[rows] = -1
+        self.identities[identity_id] = None
+        self.num_removed += len(rows)
+
+        return rows
+
+    def compact(self) -> None:
+        """Drop tombstoned rows and renumber rows and identity slots
+
+        Rows of each identity end up contiguous, in enrolment order.
+        Indexes built on this store must be rebuilt afterwards.
+        """
+        order = [
+            row
+            for identity_id in self._identity_ids.values()
+            for row in self._identity_rows[identity_id]
+        ]
+        order = np.asarray(order, dtype=np.int64)
+
+        matrix = np.empty(
+            (max(self.initial_capacity, len(order)), self.dim or 0),
+            dtype=np.float32
+        )
+        matrix[:len(order)] = self._matrix[order]
+        labels = np.full(matrix.shape[0], -1, dtype=np.int32)
+
+        identities: List[Optional[str]] = []
+        identity_ids: Dict[str, int] = {}
+        identity_rows: Dict[int, List[int]] = {}
+
+        offset = 0
+        for name, old_id in self._identity_ids.items():
+            count = len(self._identity_rows[old_id])
+            new_id = len(identities)
+            identities.append(name)
+            identity_ids[name] = new_id
+            identity_rows[new_id] = list(range(offset, offset + count))
+            labels[offset:offset + count] = new_id
+            offset += count
+
+        self._matrix = matrix
+        self._labels = labels
+        self.identities = identities
+        self._identity_ids = identity_ids
+        self._identity_rows = identity_rows
+        self.size = len(order)
+        self.num_removed = 0
+
+    def clear(self) -> None:
+        """Remove all rows"""
+        self.__init__(self.initial_capacity)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        matrix: np.ndarray,
+        labels: np.ndarray,
+        identities: List[Optional[str]],
+        size: int,
+        model: Optional[str] = None
+    ) -> 'FaceEmbeddingStore':
+        """Wrap existing (e.g. memory-mapped) arrays without copying them
+
+        Args:
+            matrix: (capacity, D) normalized float32 rows
+            labels: (capacity,) row -> identity slot table
+            identities: Identity slot -> name (None for removed slots)
+            size: Number of used rows
+            model: Embedding model name
+
+        Returns:
+            Store backed by the given arrays
+        """
+        store = cls()
+        store.model = model
+        store.dim = matrix.shape[1]
+        store.size = size
+        store._matrix = matrix
+        store._labels = labels
+        store.identities = list(identities)
+
+        used = np.asarray(labels[:size])
+        store.num_removed = int(np.count_nonzero(used < 0))
+
+        order = np.argsort(used, kind='stable')
+        slots = used[order]
+        first = np.searchsorted(slots, 0)
+        bounds = np.flatnonzero(np.diff(slots[first:])) + 1
+
+        for rows in np.split(order[first:], bounds):
+            if len(rows) == 0:
+                continue
+            identity_id = int(used[rows[0]])
+            store._identity_ids[store.identities[identity_id]] = identity_id
+            store._identity_rows[identity_id] = rows.tolist()
+
+        # Keep enrolment order for identity listings
+        store._identity_ids = dict(sorted(store._identity_ids.items(), key=lambda item: item[1]))
+
+        return store
+
+    def snapshot(self) -> Tuple[np.ndarray, List[str], List[np.ndarray]]:
+        """Consistent view for writing the store out
+
+        The matrix is never mutated in place below `size` (growth and
+        compaction allocate new arrays), so the returned reference stays
+        valid while the store keeps changing.
+
+        Returns:
+            (matrix, identity names, per-identity row ids)
+        """
+        names = self.identity_names()
+        rows = [
+            np.asarray(self._identity_rows[self._identity_ids[name]], dtype=np.int64)
+            for name in names
+        ]
+        return self._matrix, names, rows
+
+    def _check_compatible(self, dim: int, model: Optional[str]) -> None:
+        """Validate dimension/model against what is already stored"""
+        if self.dim is None:
+            self.dim = dim
+            self._matrix = np.empty((self.initial_capacity, dim), dtype=np.float32)
+            self._labels = np.full(self.initial_capacity, -1, dtype=np.int32)
+        elif dim != self.dim:
+            raise ValueError(f"Embedding size {dim} does not match database size {self.dim}")
+
+        if model is not None:
+            if self.model is None:
+                self.model = model
+            elif model != self.model:
+                raise ValueError(f"Embedding model {model} does not match database model {self.model}")
+
+    def _reserve(self, capacity: int) -> None:
+        """Grow the matrix geometrically to hold at least `capacity` rows"""
+        if capacity <= self._matrix.shape[0]:
+            return
+
+        new_capacity = max(capacity, self._matrix.shape[0] * 2)
+
+        matrix = np.empty((new_capacity, self.dim), dtype=np.float32)
+        matrix[:self.size] = self._matrix[:self.size]
+        labels = np.full(new_capacity, -1, dtype=np.int32)
+        labels[:self.size] = self._labels[:self.size]
+
+        self._matrix = matrix
+        self._labels = labels
+
+
+class FaceIndex:
+    """Base class for nearest-neighbour indexes over a FaceEmbeddingStore
+
+    Indexes return row ids ranked by cosine similarity. Rows tombstoned in
+    the store are skipped at query time; compaction requires a rebuild.
+    """
+
+    def __init__(self):
+        self.store: Optional[FaceEmbeddingStore] = None
+
+    def build(self, store: FaceEmbeddingStore) -> None:
+        """(Re)build the index from every row in the store"""
+        self.store = store
+
+    def add(self, rows: np.ndarray) -> None:
+        """Index rows that were just appended to the store"""
+        raise NotImplementedError
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the k most similar rows for each query
+
+        Args:
+            queries: (Q, D) normalized query matrix
+            k: Number of rows per query
+
+        Returns:
+            (rows, similarities) arrays of shape (Q, k), padded with -1 / -inf
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _top_k(
+        candidates: np.ndarray,
+        scores: np.ndarray,
+        k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Select the k best (row, score) pairs from a candidate list"""
+        rows = np.full(k, -1, dtype=np.int64)
+        sims = np.full(k, -np.inf, dtype=np.float32)
+
+        if len(candidates) == 0:
+            return rows, sims
+
+        take = min(k, len(candidates))
+        if take < len(candidates):
+            part = np.argpartition(-scores, take - 1)[:take]
+        else:
+            part = np.arange(len(candidates))
+
+        order = part[np.argsort(-scores[part], kind='stable')]
+        rows[:take] = candidates[order]
+        sims[:take] = scores[order]
+
+        return rows, sims
+
+
+class ExactFaceIndex(FaceIndex):
+    """Brute-force index: one vectorized matmul against the packed matrix"""
+
+    def __init__(self, block_size: int = 65536):
+        """Initialize exact index
+
+        Args:
+            block_size: Rows scored per matmul block, bounds temporary memory
+        """
+        super().__init__()
+        self.block_size = block_size
+
+    def add(self, rows: np.ndarray) -> None:
+        """Nothing to maintain: the store matrix is the index"""
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Score every live row and keep the top k per query"""
+        num_queries = queries.shape[0]
+        best_rows = np.full((num_queries, k), -1, dtype=np.int64)
+        best_sims = np.full((num_queries, k), -np.inf, dtype=np.float32)
+
+        store = self.store
+        if store is None or store.size == 0:
+            return best_rows, best_sims
+
+        labels = store.labels
+        for start in range(0, store.size, self.block_size):
+            stop = min(start + self.block_size, store.size)
+
+            sims = queries @ store.vectors[start:stop].T
+            sims[:, labels[start:stop] < 0] = -np.inf
+
+            block_rows = np.broadcast_to(np.arange(start, stop), sims.shape)
+            merged_rows = np.concatenate([best_rows, block_rows], axis=1)
+            merged_sims = np.concatenate([best_sims, sims], axis=1)
+
+            take = min(k, merged_sims.shape[1])
+            part = np.argpartition(-merged_sims, take - 1, axis=1)[:, :take]
+            best_rows = np.take_along_axis(merged_rows, part, axis=1)
+            best_sims = np.take_along_axis(merged_sims, part, axis=1)
+
+        order = np.argsort(-best_sims, axis=1, kind='stable')
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        best_sims = np.take_along_axis(best_sims, order, axis=1)
+        best_rows[~np.isfinite(best_sims)] = -1
+
+        return best_rows, best_sims
+
+
+class IVFFaceIndex(FaceIndex):
+    """Inverted-file index: spherical k-means cells, probe the nearest few"""
+
+    # Training points wanted per cell before k-means is trusted
+    MIN_POINTS_PER_CELL = 40
+
+    def __init__(
+        self,
+        nlist: int = 256,
+        nprobe: int = 8,
+        train_iterations: int = 10,
+        max_train_samples: int = 65536,
+        seed: int = 0
+    ):
+        """Initialize IVF index
+
+        Args:
+            nlist: Number of coarse cells
+            nprobe: Cells scanned per query
+            train_iterations: k-means iterations
+            max_train_samples: Rows sampled for k-means training
+            seed: Random seed for training
+        """
+        super().__init__()
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_iterations = train_iterations
+        self.max_train_samples = max_train_samples
+        self.seed = seed
+
+        self.centroids: Optional[np.ndarray] = None
+        self._trained_on = 0
+        self._lists: List[List[int]] = []
+        self._list_arrays: List[Optional[np.ndarray]] = []
+
+    def build(self, store: FaceEmbeddingStore) -> None:
+        """Train centroids on live rows and assign every row to a cell"""
+        super().build(store)
+
+        self.centroids = None
+        self._lists = []
+        self._list_arrays = []
+
+        rows = store.live_rows()
+        if len(rows) == 0:
+            return
+
+        self.centroids = self._train(store.vectors[rows])
+        self._trained_on = len(rows)
+        self._lists = [[] for _ in range(len(self.centroids))]
+        self._list_arrays = [None] * len(self.centroids)
+        self.add(rows)
+
+    def add(self, rows: np.ndarray) -> None:
+        """Assign new rows to their nearest cell"""
+        # Indexes that start empty are trained on the first few enrolments;
+        # retrain geometrically until every cell has enough training points
+        undertrained = (
+            self.centroids is not None
+            and self._trained_on < self.nlist * self.MIN_POINTS_PER_CELL
+            and self.store.num_faces >= 2 * self._trained_on
+        )
+        if self.centroids is None or undertrained:
+            self.build(self.store)
+            return
+
+        rows = np.asarray(rows, dtype=np.int64)
+        cells = np.argmax(self.store.vectors[rows] @ self.centroids.T, axis=1)
+
+        for row, cell in zip(rows.tolist(), cells.tolist()):
+            self._lists[cell].append(row)
+            self._list_arrays[cell] = None
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Scan the nprobe closest cells for each query"""
+        num_queries = queries.shape[0]
+        rows_out = np.full((num_queries, k), -1, dtype=np.int64)
+        sims_out = np.full((num_queries, k), -np.inf, dtype=np.float32)
+
+        if self.centroids is None:
+            return rows_out, sims_out
+
+        nprobe = min(self.nprobe, len(self.centroids))
+        cell_sims = queries @ self.centroids.T
+        probes = np.argpartition(-cell_sims, nprobe - 1, axis=1)[:, :nprobe]
+
+        labels = self.store.labels
+        vectors = self.store.vectors
+
+        for q in range(num_queries):
+            candidates = np.concatenate([self._cell_rows(c) for c in probes[q]])
+            candidates = candidates[labels[candidates] >= 0]
+            scores = vectors[candidates] @ queries[q]
+            rows_out[q], sims_out[q] = self._top_k(candidates, scores, k)
+
+        return rows_out, sims_out
+
+    def _cell_rows(self, cell: int) -> np.ndarray:
+        """Row ids of a cell as an array (cached until the cell changes)"""
+        rows = self._list_arrays[cell]
+        if rows is None:
+            rows = np.asarray(self._lists[cell], dtype=np.int64)
+            self._list_arrays[cell] = rows
+        return rows
+
+    def _train(self, vectors: np.ndarray) -> np.ndarray:
+        """Spherical k-means on a sample of the vectors"""
+        rng = np.random.default_rng(self.seed)
+
+        if len(vectors) > self.max_train_samples:
+            sample = vectors[rng.choice(len(vectors), self.max_train_samples, replace=False)]
+        else:
+            sample = vectors
+
+        nlist = max(1, min(self.nlist, len(sample) // self.MIN_POINTS_PER_CELL))
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+        for _ in range(self.train_iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=nlist)
+
+            # Re-seed empty cells from random samples
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+
+        return centroids
+
+
+class HNSWFaceIndex(FaceIndex):
+    """Hierarchical navigable small-world graph index
+
+    Pure NumPy implementation: neighbour lists are Python lists, candidate
+    scoring is vectorized per expansion step.
+    """
+
+    def __init__(
+        self,
+        m: int = 16,
+        ef_construction: int = 100,
+        ef_search: int = 64,
+        seed: int = 0
+    ):
+        """Initialize HNSW index
+
+        Args:
+            m: Neighbours per node (2*m on the base layer)
+            ef_construction: Beam width while inserting
+            ef_search: Beam width while querying
+            seed: Random seed for level assignment
+        """
+        super().__init__()
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.seed = seed
+
+        self._level_mult = 1.0 / np.log(max(m, 2))
+        self._rng = np.random.default_rng(seed)
+        self._graph: List[Dict[int, List[int]]] = []
+        self._entry: Optional[int] = None
+
+    def build(self, store: FaceEmbeddingStore) -> None:
+        """Insert every live row"""
+        super().build(store)
+
+        self._rng = np.random.default_rng(self.seed)
+        self._graph = []
+        self._entry = None
+
+        self.add(store.live_rows())
+
+    def add(self, rows: np.ndarray) -> None:
+        """Insert rows one by one"""
+        for row in np.asarray(rows, dtype=np.int64).tolist():
+            self._insert(row)
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Greedy descent through upper layers, beam search on layer 0"""
+        num_queries = queries.shape[0]
+        rows_out = np.full((num_queries, k), -1, dtype=np.int64)
+        sims_out = np.full((num_queries, k), -np.inf, dtype=np.float32)
+
+        if self._entry is None:
+            return rows_out, sims_out
+
+        labels = self.store.labels
+        ef = max(self.ef_search, k)
+
+        for q in range(num_queries):
+            query = queries[q]
+            entry = self._entry
+
+            for level in range(len(self._graph) - 1, 0, -1):
+                entry = self._search_layer(query, [entry], 1, level)[0][1]
+
+            found = self._search_layer(query, [entry], ef, 0)
+            found = [(sim, row) for sim, row in found if labels[row] >= 0]
+
+            candidates = np.array([row for _, row in found], dtype=np.int64)
+            scores = np.array([sim for sim, _ in found], dtype=np.float32)
+            rows_out[q], sims_out[q] = self._top_k(candidates, scores, k)
+
+        return rows_out, sims_out
+
+    def _insert(self, row: int) -> None:
+        """Insert one row into the graph"""
+        level = int(-np.log(1.0 - self._rng.random()) * self._level_mult)
+        while len(self._graph) <= level:
+            self._graph.append({})
+
+        for layer in range(level + 1):
+            self._graph[layer][row] = []
+
+        if self._entry is None:
+            self._entry = row
+            return
+
+        vector = self.store.vectors[row]
+        entry = self._entry
+        top_level = self._node_level(entry)
+
+        for layer in range(top_level, level, -1):
+            entry = self._search_layer(vector, [entry], 1, layer)[0][1]
+
+        entries = [entry]
+        for layer in range(min(level, top_level), -1, -1):
+            found = self._search_layer(vector, entries, self.ef_construction, layer)
+            max_links = self.m * 2 if layer == 0 else self.m
+
+            neighbours = [node for _, node in found[:self.m]]
+            self._graph[layer][row] = neighbours
+
+            for node in neighbours:
+                links = self._graph[layer][node]
+                links.append(row)
+                if len(links) > max_links:
+                    self._graph[layer][node] = self._prune(node, links, max_links)
+
+            entries = [node for _, node in found]
+
+        if level > top_level:
+            self._entry = row
+
+    def _search_layer(
+        self,
+        query: np.ndarray,
+        entries: List[int],
+        ef: int,
+        layer: int
+    ) -> List[Tuple[float, int]]:
+        """Beam search within one layer
+
+        Returns:
+            Up to ef (similarity, row) pairs, best first
+        """
+        vectors = self.store.vectors
+        graph = self._graph[layer]
+
+        visited = set(entries)
+        entry_sims = (vectors[entries] @ query).tolist()
+
+        # candidates: max-heap on similarity, results: min-heap on similarity
+        candidates = [(-sim, node) for sim, node in zip(entry_sims, entries)]
+        results = [(sim, node) for sim, node in zip(entry_sims, entries)]
+        heapq.heapify(candidates)
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            neg_sim, node = heapq.heappop(candidates)
+            if -neg_sim < results[0][0] and len(results) >= ef:
+                break
+
+            fresh = [n for n in graph.get(node, ()) if n not in visited]
+            if not fresh:
+                continue
+            visited.update(fresh)
+
+            for sim, neighbour in zip((vectors[fresh] @ query).tolist(), fresh):
+                if len(results) < ef or sim > results[0][0]:
+                    heapq.heappush(candidates, (-sim, neighbour))
+                    heapq.heappush(results, (sim, neighbour))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+
+        return sorted(results, reverse=True)
+
+    def _prune(self, node: int, links: List[int], max_links: int) -> List[int]:
+        """Keep the max_links most similar neighbours of a node"""
+        vectors = self.store.vectors
+        sims = vectors[links] @ vectors[node]
+        keep = np.argsort(-sims)[:max_links]
+        return [links[i] for i in keep]
+
+    def _node_level(self, node: int) -> int:
+        """Highest layer containing a node"""
+        level = 0
+        while level + 1 < len(self._graph) and node in self._graph[level + 1]:
+            level += 1
+        return level
+
+
+class FaceStorage:
+    """Memory-mapped columnar on-disk format for a FaceDatabase
+
+    Layout of the database directory:
+
+        meta.json              committed base generation, shape, identity slots
+        embeddings-<gen>.f32   row-major float32 matrix (with spare rows)
+        labels-<gen>.i32       row -> identity slot table
+        append-<gen>.log       enrolments/removals made after base <gen>
+
+    Opening maps the base files copy-on-write and replays the (small) append
+    log, so no embedding is copied at startup. Enrolments only append to the
+    log; compaction folds the logs back into a new base generation.
+    """
+
+    META_FILE = 'meta.json'
+    FORMAT_VERSION = 1
+
+    # op, identity length, model length, row count, dimension
+    LOG_HEADER = struct.Struct('<cHHII')
+    OP_ADD = b'A'
+    OP_REMOVE = b'R'
+    OP_CLEAR = b'C'
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        spare_ratio: float = 0.125,
+        min_spare_rows: int = 1024
+    ):
+        """Initialize storage
+
+        Args:
+            path: Database directory
+            spare_ratio: Extra rows reserved in the base file for enrolments
+            min_spare_rows: Minimum number of spare rows
+        """
+        self.path = Path(path)
+        self.spare_ratio = spare_ratio
+        self.min_spare_rows = min_spare_rows
+
+        self.generation = 0
+        self.base_rows = 0
+        self.log_rows = 0
+
+        self._log = None
+        self._log_generation = 0
+        self._log_lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether open() has been called and the log is writable"""
+        return self._log is not None
+
+    def open(self) -> FaceEmbeddingStore:
+        """Map the base generation and replay append logs
+
+        Returns:
+            Store whose matrix is backed by the mapped base file
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        meta_path = self.path / self.META_FILE
+        if meta_path.exists():
+            with open(meta_path) as f:
+                meta = json.load(f)
+            store = self._map_base(meta)
+            self.generation = meta['generation']
+            self.base_rows = meta['rows']
+        else:
+            store = FaceEmbeddingStore()
+            self.generation = 0
+            self.base_rows = 0
+
+        self.log_rows = 0
+        log_generations = sorted(
+            gen for gen in self._log_generations() if gen >= self.generation
+        )
+        for gen in log_generations:
+            self.log_rows += self._replay(self._log_path(gen), store)
+
+        self._log_generation = log_generations[-1] if log_generations else self.generation
+        self._log = open(self._log_path(self._log_generation), 'ab')
+
+        return store
+
+    def append_add(
+        self,
+        identity: str,
+        vectors: np.ndarray,
+        model: Optional[str]
+    ) -> None:
+        """Log normalized embeddings enrolled for an identity"""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self._write_record(self.OP_ADD, identity, model, vectors)
+        self.log_rows += vectors.shape[0]
+
+    def append_remove(self, identity: str) -> None:
+        """Log removal of an identity"""
+        self._write_record(self.OP_REMOVE, identity)
+
+    def append_clear(self) -> None:
+        """Log removal of everything"""
+        self._write_record(self.OP_CLEAR, '')
+
+    def flush(self, fsync: bool = True) -> None:
+        """Flush the append log to disk"""
+        with self._log_lock:
+            if self._log is None:
+                return
+            self._log.flush()
+            if fsync:
+                os.fsync(self._log.fileno())
+
+    def rotate_log(self) -> int:
+        """Start a new append log
+
+        Records written before the rotation belong to the next base
+        generation; records written after it are replayed on top of it.
+
+        Returns:
+            Generation number of the base that the caller must write
+        """
+        with self._log_lock:
+            if self._log is not None:
+                self._log.flush()
+                os.fsync(self._log.fileno())
+                self._log.close()
+
+            self._log_generation += 1
+            self._log = open(self._log_path(self._log_generation), 'ab')
+            self.log_rows = 0
+
+            return self._log_generation
+
+    def write_base(
+        self,
+        generation: int,
+        snapshot: Tuple[np.ndarray, List[str], List[np.ndarray]],
+        model: Optional[str],
+        block_rows: int = 65536
+    ) -> None:
+        """Write a new base generation and retire the files it supersedes
+
+        Rows are regrouped per identity. The meta file is replaced last,
+        so a crash at any point leaves the previous generation intact.
+
+        Args:
+            generation: Generation returned by rotate_log()
+            snapshot: Output of FaceEmbeddingStore.snapshot()
+            model: Embedding model name
+            block_rows: Rows copied per write
+        """
+        matrix, names, identity_rows = snapshot
+        num_rows = int(sum(len(rows) for rows in identity_rows))
+        dim = matrix.shape[1] if matrix.ndim == 2 else 0
+        capacity = num_rows + max(self.min_spare_rows, int(num_rows * self.spare_ratio))
+
+        embeddings_path = self._embeddings_path(generation)
+        labels_path = self._labels_path(generation)
+
+        with open(f"{embeddings_path}.tmp", 'wb') as f:
+            for rows in identity_rows:
+                for start in range(0, len(rows), block_rows):
+                    np.asarray(matrix[rows[start:start + block_rows]], dtype=np.float32).tofile(f)
+            f.truncate(capacity * dim * 4)
+            f.flush()
+            os.fsync(f.fileno())
+
+        labels = np.full(capacity, -1, dtype=np.int32)
+        offset = 0
+        for slot, rows in enumerate(identity_rows):
+            labels[offset:offset + len(rows)] = slot
+            offset += len(rows)
+
+        with open(f"{labels_path}.tmp", 'wb') as f:
+            labels.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(f"{embeddings_path}.tmp", embeddings_path)
+        os.replace(f"{labels_path}.tmp", labels_path)
+
+        meta = {
+            'version': self.FORMAT_VERSION,
+            'generation': generation,
+            'rows': num_rows,
+            'capacity': capacity,
+            'dim': dim,
+            'model': model,
+            'identities': names
+        }
+        meta_path = self.path / self.META_FILE
+        with open(f"{meta_path}.tmp", 'w') as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{meta_path}.tmp", meta_path)
+
+        self.generation = generation
+        self.base_rows = num_rows
+        self._remove_generations_before(generation)
+
+        logger.info(f"Compacted face database into generation {generation} ({num_rows} faces)")
+
+    def close(self) -> None:
+        """Flush and close the append log"""
+        self.flush()
+        with self._log_lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def _map_base(self, meta: Dict) -> FaceEmbeddingStore:
+        """Wrap the base files of a generation in a store, copy-on-write"""
+        generation = meta['generation']
+        rows = meta['rows']
+        capacity = meta['capacity']
+        dim = meta['dim']
+
+        if capacity == 0 or dim == 0:
+            return FaceEmbeddingStore()
+
+        matrix = np.memmap(self._embeddings_path(generation), dtype=np.float32,
+                           mode='c', shape=(capacity, dim))
+        labels = np.memmap(self._labels_path(generation), dtype=np.int32,
+                           mode='c', shape=(capacity,))
+
+        return FaceEmbeddingStore.from_arrays(
+            matrix, labels, meta['identities'], rows, meta.get('model')
+        )
+
+    def _write_record(
+        self,
+        op: bytes,
+        identity: str,
+        model: Optional[str] = None,
+        vectors: Optional[np.ndarray] = None
+    ) -> None:
+        """Append one log record"""
+        name = identity.encode('utf-8')
+        model_name = (model or '').encode('utf-8')
+        count, dim = vectors.shape if vectors is not None else (0, 0)
+
+        record = self.LOG_HEADER.pack(op, len(name), len(model_name), count, dim)
+        record += name + model_name
+        if vectors is not None:
+            record += vectors.tobytes()
+
+        with self._log_lock:
+            self._log.write(record)
+
+    def _replay(self, log_path: Path, store: FaceEmbeddingStore) -> int:
+        """Apply a log to the store, truncating a torn trailing record
+
+        Returns:
+            Number of rows enrolled by the log
+        """
+        with open(log_path, 'rb') as f:
+            data = f.read()
+
+        offset = 0
+        added = 0
+        header_size = self.LOG_HEADER.size
+
+        while offset + header_size <= len(data):
+            op, name_len, model_len, count, dim = self.LOG_HEADER.unpack_from(data, offset)
+            body = offset + header_size
+            end = body + name_len + model_len + count * dim * 4
+            if end > len(data):
+                break
+
+            identity = data[body:body + name_len].decode('utf-8')
+            model = data[body + name_len:body + name_len + model_len].decode('utf-8') or None
+
+            if op == self.OP_ADD:
+                vectors = np.frombuffer(
+                    data, dtype=np.float32, count=count * dim,
+                    offset=body + name_len + model_len
+                ).reshape(count, dim)
+                store.add(identity, vectors, model)
+                added += count
+            elif op == self.OP_REMOVE:
+                store.remove_identity(identity)
+            elif op == self.OP_CLEAR:
+                store.clear()
+
+            offset = end
+
+        if offset < len(data):
+            logger.warning(f"Discarding torn record at end of {log_path.name}")
+            with open(log_path, 'r+b') as f:
+                f.truncate(offset)
+
+        return added
+
+    def _log_generations(self) -> List[int]:
+        """Generations that have an append log on disk"""
+        return [
+            int(p.stem.split('-', 1)[1])
+            for p in self.path.glob('append-*.log')
+        ]
+
+    def _remove_generations_before(self, generation: int) -> None:
+        """Delete base files and logs superseded by `generation`"""
+        for pattern in ('append-*.log', 'embeddings-*.f32', 'labels-*.i32'):
+            for p in self.path.glob(pattern):
+                if int(p.stem.split('-', 1)[1]) < generation:
+                    p.unlink(missing_ok=True)
+
+    def _log_path(self, generation: int) -> Path:
+        return self.path / f"append-{generation}.log"
+
+    def _embeddings_path(self, generation: int) -> Path:
+        return self.path / f"embeddings-{generation}.f32"
+
+    def _labels_path(self, generation: int) -> Path:
+        return self.path / f"labels-{generation}.i32"
+
+
 class FaceDatabase:
-    """Face database for storing and searching embeddings"""
+    """Face database for storing and searching embeddings
+
+    Embeddings live in a packed FaceEmbeddingStore backed by a memory-mapped
+    FaceStorage directory; matching goes through a pluggable FaceIndex
+    (exact, IVF or HNSW). Approximate indexes are (re)built on a background
+    thread after load and compaction; exact search answers until they are
+    ready.
+    """
 
-    def __init__(self, database_path: str):
+    def __init__(
+        self,
+        database_path: str,
+        index: Optional[FaceIndex] = None,
+        compact_ratio: float = 0.25,
+        compact_log_ratio: float = 0.1
+    ):
         """Initialize face database
 
         Args:
-            database_path: Path to database file
+            database_path: Path to database directory
+            index: Search index (defaults to ExactFaceIndex)
+            compact_ratio: Fraction of removed rows that triggers compaction
+            compact_log_ratio: Logged rows, relative to the base, that make
+                save() start a background compaction
         """
         self.database_path = Path(database_path)
-        self.faces: Dict[str, List[FaceEmbedding]] = {}
+        self.storage = FaceStorage(self.database_path)
+        self.store = FaceEmbeddingStore()
+        self.index = index if index is not None else ExactFaceIndex()
+        self.compact_ratio = compact_ratio
+        self.compact_log_ratio = compact_log_ratio
+
+        self._lock = threading.RLock()
+        self._compaction: Optional[threading.Thread] = None
+
+        # Fallback used while the configured index is being rebuilt
+        self._exact_index = ExactFaceIndex()
+        self._index_ready = True
+        self._index_generation = 0
+        self._index_thread: Optional[threading.Thread] = None
+
+        self.index.build(self.store)
+        self._exact_index.build(self.store)
+
+    @property
+    def index_ready(self) -> bool:
+        """Whether searches go through the configured index (not the exact fallback)"""
+        return self._index_ready
+
+    @property
+    def faces(self) -> Dict[str, List[FaceEmbedding]]:
+        """Identity -> embeddings view of the store"""
+        vectors = self.store.vectors
+        return {
+            identity: [
+                FaceEmbedding(vector=vectors[row].copy(), model=self.store.model)
+                for row in self.store.rows_for(identity)
+            ]
+            for identity in self.store.identity_names()
+        }
 
     def load(self) -> None:
-        """Load database from file"""
-        if self.database_path.exists():
-            with open(self.database_path, 'rb') as f:
-                data = pickle.load(f)
-                self.faces = data
-                logger.info(f"Loaded {len(self.faces)} identities from database")
-        else:
-            logger.info("Database file not found, starting with empty database")
+        """Open the database directory (memory-mapped, no embedding copies)
+
+        A legacy pickle file at database_path is moved aside to
+        `<name>.legacy` and migrated into a database directory in its place.
+        """
+        with self._lock:
+            legacy_path = self._move_legacy_pickle()
+
+            self.store = self.storage.open()
+            self._rebuild_index()
+
+            if legacy_path is not None:
+                self.import_pickle(str(legacy_path))
+                self.storage.flush()
+
+        logger.info(f"Loaded {self.store.num_identities} identities from database")
+
+    def import_pickle(self, pickle_path: str) -> None:
+        """Enrol every face from a legacy pickled database
+
+        Args:
+            pickle_path: Path to a pickled Dict[str, List[FaceEmbedding]]
+        """
+        with open(pickle_path, 'rb') as f:
+            data = pickle.load(f)
+
+        for identity, embeddings in data.items():
+            for embedding in embeddings:
+                self.add_face(identity, embedding)
+
+        logger.info(f"Imported {len(data)} identities from {pickle_path}")
+
+    def save(self, compact: bool = False) -> Optional[threading.Thread]:
+        """Make enrolments durable
+
+        Appends are already on disk; this only fsyncs the log. Compaction
+        runs in the background, either on request or once the log grows
+        past compact_log_ratio of the base.
+
+        Args:
+            compact: Force a background compaction
 
-    def save(self) -> None:
-        """Save database to file"""
-        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        Returns:
+            Compaction thread if one was started
+        """
+        self.storage.flush()
+
+        log_heavy = self.storage.log_rows > self.compact_log_ratio * max(self.storage.base_rows, 1)
+        thread = self.compact() if compact or log_heavy else None
+
+        logger.info(f"Saved database with {self.store.num_identities} identities")
+        return thread
 
-        with open(self.database_path, 'wb') as f:
-            pickle.dump(self.faces, f)
+    def compact(self, background: bool = True) -> Optional[threading.Thread]:
+        """Fold the append log back into a new memory-mapped base
 
-        logger.info(f"Saved database with {len(self.faces)} identities")
+        Args:
+            background: Run on a daemon thread instead of blocking
+
+        Returns:
+            Compaction thread (None when run in the foreground or when a
+            compaction is already in progress)
+        """
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return None
+
+            snapshot = self.store.snapshot()
+            model = self.store.model
+            generation = self.storage.rotate_log()
+
+        if not background:
+            self.storage.write_base(generation, snapshot, model)
+            return None
+
+        self._compaction = threading.Thread(
+            target=self.storage.write_base,
+            args=(generation, snapshot, model),
+            name='face-db-compaction',
+            daemon=True
+        )
+        self._compaction.start()
+        return self._compaction
+
+    def close(self) -> None:
+        """Wait for compaction and index builds, then close the append log"""
+        if self._compaction is not None:
+            self._compaction.join()
+        index_thread = self._index_thread
+        if index_thread is not None:
+            index_thread.join()
+        self.storage.close()
 
     def add_face(self, identity: str, embedding: FaceEmbedding) -> None:
         """Add face to database
@@ -559,11 +1695,14 @@ class FaceDatabase:
             identity: Person identity
             embedding: Face embedding
         """
-        if identity not in self.faces:
-            self.faces[identity] = []
+        with self._lock:
+            self._ensure_open()
+            rows = self.store.add(identity, embedding.vector, embedding.model)
+            self.storage.append_add(identity, self.store.vectors[rows], embedding.model)
+            if self._index_ready:
+                self.index.add(rows)
 
-        self.faces[identity].append(embedding)
-        logger.info(f"Added face for {identity} (total: {len(self.faces[identity])})")
+        logger.info(f"Added face for {identity} (total: {len(self.store.rows_for(identity))})")
 
     def find_match(
         self,
@@ -579,38 +1718,103 @@ class FaceDatabase:
         Returns:
             (identity, distance) tuple or None if no match
         """
-        best_match = None
-        best_distance = float('inf')
+        matches = self.find_matches([query_embedding], k=1, threshold=threshold)[0]
+        return matches[0] if matches else None
 
-        for identity, embeddings in self.faces.items():
-            for embedding in embeddings:
-                # Calculate distance
-                distance = self._cosine_distance(
-                    query_embedding.vector,
-                    embedding.vector
+    def find_matches(
+        self,
+        queries: List[FaceEmbedding],
+        k: int = 5,
+        threshold: Optional[float] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """Find the top-k identities for many faces at once
+
+        Args:
+            queries: Query face embeddings
+            k: Identities returned per query
+            threshold: Optional cosine distance cutoff
+
+        Returns:
+            Per query, up to k (identity, distance) tuples, closest first
+        """
+        if not queries:
+            return []
+
+        query_matrix = np.stack([q.vector for q in queries]).astype(np.float32)
+        norms = np.linalg.norm(query_matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        query_matrix /= norms
+
+        results: List[List[Tuple[str, float]]] = [[] for _ in queries]
+        live = self.store.num_faces
+        if live == 0:
+            return results
+
+        with self._lock:
+            index = self.index if self._index_ready else self._exact_index
+
+        # An identity may own several rows, so over-fetch rows and widen
+        # the search only for queries that still lack k distinct identities
+        pending = np.arange(len(queries))
+        num_rows = min(live, max(k * 4, 16))
+
+        while len(pending) > 0:
+            rows, sims = index.search(query_matrix[pending], num_rows)
+            labels = self.store.labels
+
+            unresolved = []
+            for i, q in enumerate(pending.tolist()):
+                matches = self._aggregate(rows[i], sims[i], labels, k, threshold)
+                results[q] = matches
+
+                exhausted = rows[i, -1] < 0 or (
+                    threshold is not None and 1.0 - sims[i, -1] >= threshold
                 )
+                if len(matches) < k and not exhausted:
+                    unresolved.append(q)
 
-                if distance < best_distance:
-                    best_distance = distance
-                    best_match = identity
+            if num_rows >= live:
+                break
 
-        if best_match and best_distance < threshold:
-            return best_match, best_distance
+            pending = np.asarray(unresolved, dtype=np.int64)
+            num_rows = min(live, num_rows * 4)
 
-        return None
+        return results
 
-    def _cosine_distance(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
-        """Calculate cosine distance"""
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
+    def _aggregate(
+        self,
+        rows: np.ndarray,
+        sims: np.ndarray,
+        labels: np.ndarray,
+        k: int,
+        threshold: Optional[float]
+    ) -> List[Tuple[str, float]]:
+        """Collapse ranked rows into distinct identities"""
+        matches: List[Tuple[str, float]] = []
+        seen = set()
+
+        for row, sim in zip(rows.tolist(), sims.tolist()):
+            if row < 0:
+                break
+
+            distance = 1.0 - sim
+            if threshold is not None and distance >= threshold:
+                break
+
+            identity_id = int(labels[row])
+            if identity_id < 0 or identity_id in seen:
+                continue
 
-        cosine_similarity = dot_product / (norm1 * norm2)
-        return 1 - cosine_similarity
+            seen.add(identity_id)
+            matches.append((self.store.identities[identity_id], distance))
+            if len(matches) == k:
+                break
+
+        return matches
 
     def get_identities(self) -> List[str]:
         """Get all identities in database"""
-        return list(self.faces.keys())
+        return self.store.identity_names()
 
     def remove_identity(self, identity: str) -> bool:
         """Remove identity from database
@@ -621,18 +1825,116 @@ class FaceDatabase:
         Returns:
             True if removed, False if not found
         """
-        if identity in self.faces:
-            del self.faces[identity]
-            logger.info(f"Removed {identity} from database")
-            return True
+        with self._lock:
+            self._ensure_open()
+            rows = self.store.remove_identity(identity)
+            if len(rows) == 0:
+                return False
+
+            self.storage.append_remove(identity)
 
-        return False
+            if self.store.num_removed > self.compact_ratio * self.store.size:
+                self.store.compact()
+                self._rebuild_index()
+
+        logger.info(f"Removed {identity} from database")
+        return True
 
     def clear(self) -> None:
         """Clear all faces from database"""
-        self.faces.clear()
+        with self._lock:
+            self._ensure_open()
+            self.storage.append_clear()
+            self.store.clear()
+            self._rebuild_index()
+
         logger.info("Database cleared")
 
+    def _move_legacy_pickle(self) -> Optional[Path]:
+        """Move a legacy pickled database out of the way of the directory format
+
+        Returns:
+            New path of the pickle, or None if database_path is not one
+        """
+        if not self.database_path.is_file():
+            return None
+
+        with open(self.database_path, 'rb') as f:
+            magic = f.read(1)
+        # Pickle protocols 2+ start with the PROTO opcode
+        if magic != b'\x80':
+            raise ValueError(f"{self.database_path} is neither a database directory nor a pickle")
+
+        legacy_path = self.database_path.with_name(self.database_path.name + '.legacy')
+        if legacy_path.exists():
+            raise ValueError(f"Cannot migrate {self.database_path}: {legacy_path} already exists")
+
+        os.replace(self.database_path, legacy_path)
+        logger.info(f"Migrating legacy pickle database {self.database_path}")
+        return legacy_path
+
+    def _rebuild_index(self) -> None:
+        """Rebuild the configured index for the current store (call under the lock)
+
+        Exact indexes and empty stores are rebuilt in place. Otherwise the
+        exact fallback serves searches while a background thread builds the
+        configured index.
+        """
+        self._exact_index.build(self.store)
+        self._index_generation += 1
+
+        if isinstance(self.index, ExactFaceIndex) or self.store.num_faces == 0:
+            self.index.build(self.store)
+            self._index_ready = True
+            return
+
+        self._index_ready = False
+        if self._index_thread is None:
+            self._index_thread = threading.Thread(
+                target=self._index_worker,
+                name='face-db-index',
+                daemon=True
+            )
+            self._index_thread.start()
+
+    def _index_worker(self) -> None:
+        """Build the configured index off the lock until it matches the store"""
+        while True:
+            with self._lock:
+                generation = self._index_generation
+                # Growth, compaction and clear() allocate new arrays, so a
+                # shallow copy is a stable view of the rows to index
+                view = copy.copy(self.store)
+
+            try:
+                self.index.build(view)
+                failed = False
+            except Exception as e:
+                logger.warning(f"Background index build failed, using exact search: {e}")
+                failed = True
+
+            with self._lock:
+                if generation != self._index_generation:
+                    continue
+                if failed:
+                    self._index_thread = None
+                    return
+
+                # Point the index at the live store and catch up on rows
+                # enrolled while it was being built
+                self.index.store = self.store
+                if self.store.size > view.size:
+                    self.index.add(np.arange(view.size, self.store.size))
+
+                self._index_ready = True
+                self._index_thread = None
+                return
+
+    def _ensure_open(self) -> None:
+        """Open storage lazily for databases that were never load()ed"""
+        if not self.storage.is_open:
+            self.load()
+
 
 class FaceAttributeAnalyzer:
     """Analyze face attributes (age, gender, expression, liveness)"""
@@ -12,7 +12,7 @@ Features:
 - Non-maximum suppression
 - Model optimization (TensorRT, ONNX)
 - Multi-scale detection
-- Object tracking integration
+- Object tracking integration (SORT/ByteTrack)
 """
 
 import numpy as np
@@ -23,6 +23,13 @@ from pathlib import Path
 import time
 import logging
 
+from object_tracker import (
+    ByteTracker,
+    SORTTracker,
+    TrackedObjects,
+    tracked_objects_to_dicts
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -481,19 +488,52 @@ class YOLODetector:
 
 
 class YOLOTracker:
-    """Object tracker using YOLO detections"""
+    """Object tracker using YOLO detections
+
+    Thin adapter over the vectorized ByteTracker/SORTTracker engine in
+    object_tracker.py.
+    """
 
-    def __init__(self, max_age: int = 30, min_hits: int = 3):
+    def __init__(
+        self,
+        max_age: int = 30,
+        min_hits: int = 3,
+        iou_threshold: float = 0.3,
+        use_byte: bool = False,
+        high_threshold: float = 0.5
+    ):
         """Initialize tracker
 
         Args:
             max_age: Maximum frames to keep track without detection
             min_hits: Minimum hits to consider track valid
+            iou_threshold: Minimum IoU for a detection/track match
+            use_byte: Use two-stage ByteTrack association instead of SORT.
+                Off by default: ByteTrack only starts tracks from detections
+                scoring at least high_threshold, while SORT (like the original
+                tracker) starts one from every unmatched detection
+            high_threshold: ByteTrack score separating first- and second-stage
+                detections
         """
         self.max_age = max_age
         self.min_hits = min_hits
-        self.tracks = []
-        self.next_id = 0
+
+        if use_byte:
+            self.engine = ByteTracker(
+                max_age=max_age,
+                min_hits=min_hits,
+                iou_threshold=iou_threshold,
+                high_threshold=high_threshold
+            )
+        else:
+            self.engine = SORTTracker(max_age=max_age, min_hits=min_hits, iou_threshold=iou_threshold)
+
+        self.class_names: Dict[int, str] = {}
+
+    @property
+    def next_id(self) -> int:
+        """Next track id to be assigned"""
+        return self.engine.next_id
 
     def update(self, detections: List[Detection]) -> List[Dict]:
         """Update tracks with new detections
@@ -504,82 +544,37 @@ class YOLOTracker:
         Returns:
             List of tracked objects
         """
-        # Simple IOU-based tracking
-        matched_tracks = []
-
-        for detection in detections:
-            matched = False
-
-            # Try to match with existing tracks
-            for track in self.tracks:
-                if self._iou(track['bbox'], detection.bbox) > 0.3:
-                    track['bbox'] = detection.bbox
-                    track['confidence'] = detection.confidence
-                    track['age'] = 0
-                    track['hits'] += 1
-                    matched = True
-                    matched_tracks.append(track)
-                    break
-
-            # Create new track if not matched
-            if not matched:
-                new_track = {
-                    'id': self.next_id,
-                    'class_id': detection.class_id,
-                    'class_name': detection.class_name,
-                    'bbox': detection.bbox,
-                    'confidence': detection.confidence,
-                    'age': 0,
-                    'hits': 1
-                }
-                self.tracks.append(new_track)
-                self.next_id += 1
-
-                if new_track['hits'] >= self.min_hits:
-                    matched_tracks.append(new_track)
-
-        # Update ages and remove old tracks
-        self.tracks = [
-            track for track in self.tracks
-            if track['age'] < self.max_age
-        ]
-
-        for track in self.tracks:
-            if track not in matched_tracks:
-                track['age'] += 1
-
-        return matched_tracks
-
-    def _iou(self, bbox1: Tuple[int, int, int, int], bbox2: Tuple[int, int, int, int]) -> float:
-        """Calculate Intersection over Union
-
-        Args:
-            bbox1: First bounding box (x, y, w, h)
-            bbox2: Second bounding box (x, y, w, h)
+        for det in detections:
+            self.class_names.setdefault(det.class_id, det.class_name)
 
-        Returns:
-            IoU score
-        """
-        x1, y1, w1, h1 = bbox1
-        x2, y2, w2, h2 = bbox2
+        boxes = np.array([det.bbox for det in detections], dtype=np.float64).reshape(-1, 4)
+        scores = np.array([det.confidence for det in detections], dtype=np.float64)
+        class_ids = np.array([det.class_id for det in detections], dtype=np.int64)
 
-        # Calculate intersection
-        xi1 = max(x1, x2)
-        yi1 = max(y1, y2)
-        xi2 = min(x1 + w1, x2 + w2)
-        yi2 = min(y1 + h1, y2 + h2)
+        tracked = self.engine.update(boxes, scores, class_ids)
+        return tracked_objects_to_dicts(tracked, self.class_names)
 
-        inter_area = max(0, xi2 - xi1) * max(0, yi2 - yi1)
+    def update_arrays(
+        self,
+        boxes: np.ndarray,
+        scores: np.ndarray,
+        class_ids: Optional[np.ndarray] = None
+    ) -> TrackedObjects:
+        """Update tracks from raw detection arrays (no per-object dicts)
 
-        # Calculate union
-        box1_area = w1 * h1
-        box2_area = w2 * h2
-        union_area = box1_area + box2_area - inter_area
+        Args:
+            boxes: (N, 4) boxes as (x, y, w, h)
+            scores: (N,) confidences
+            class_ids: (N,) class ids
 
-        # Calculate IoU
-        iou = inter_area / union_area if union_area > 0 else 0
+        Returns:
+            Tracked objects as parallel arrays
+        """
+        return self.engine.update(boxes, scores, class_ids)
 
-        return iou
+    def reset(self) -> None:
+        """Drop all tracks"""
+        self.engine.reset()
 
 
 def main():
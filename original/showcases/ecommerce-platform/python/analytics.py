@@ -12,6 +12,11 @@ Advanced analytics and business intelligence featuring:
 - Time series analysis
 - Statistical modeling
 - Data visualization preparation
+- Incremental rollups (daily/weekly/monthly, per product, per customer)
+  maintained on ingest, with date-range slicing
+- Columnar, day-partitioned order storage with dictionary-encoded ids
+  (int32 millisecond times and block-mapped order references, int64 cents)
+- Median order value merged from per-day sorted totals
 
 This demonstrates Python's data analysis capabilities integrated
 with TypeScript through Elide's polyglot runtime.
@@ -30,12 +35,15 @@ const ltv = calculate_customer_ltv(customerId);
 
 import json
 import math
+import bisect
 import statistics
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
-from collections import defaultdict, Counter
+from array import array
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterator, List, Tuple, Optional
 from dataclasses import dataclass, asdict
 
+import numpy as np
+
 
 # ============================================================================
 # Data Structures
@@ -89,6 +97,472 @@ class ProductMetrics:
         return asdict(self)
 
 
+# ============================================================================
+# Order Storage
+# ============================================================================
+
+ONE_MICROSECOND = timedelta(microseconds=1)
+ONE_DAY_US = 86_400_000_000
+EPOCH = datetime(1970, 1, 1)
+# Candidate values per pass of the partitioned median search
+MEDIAN_PROBES = 64
+
+
+INT32_MAX = np.iinfo(np.int32).max
+INT64_MAX = np.iinfo(np.int64).max
+
+# stdlib array type codes that match the NumPy column dtypes
+ARRAY_TYPECODES = {
+    np.dtype(np.int32): 'i',
+    np.dtype(np.int64): 'q',
+    np.dtype(np.float64): 'd'
+}
+
+
+def to_cents(amount: float) -> int:
+    """Money amount as whole cents (ValueError unless finite and within int64)"""
+    if not math.isfinite(amount):
+        raise ValueError(f"Invalid amount: {amount}")
+    cents = int(round(amount * 100))
+    if abs(cents) > INT64_MAX:
+        raise ValueError(f"Amount out of range: {amount}")
+    return cents
+
+
+class Column:
+    """
+    Growable NumPy column with an explicit length
+
+    Appends go to a stdlib array (a C call per row instead of a NumPy
+    scalar write) and are flushed into a NumPy array with spare capacity
+    when the column is viewed or trimmed. Growing or trimming allocates a
+    new array instead of resizing in place, so views from view() never
+    block an append: they keep their buffer alive and just don't see rows
+    added afterwards.
+    """
+
+    GROWTH = 1.25
+
+    def __init__(self, dtype, capacity: int = 0):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.size = 0  # rows flushed to data
+        self.pending = array(ARRAY_TYPECODES[self.data.dtype])
+        # Bound once so appending runs no Python code (pending is only
+        # ever cleared in place)
+        self.append = self.pending.append
+
+    def __len__(self) -> int:
+        return self.size + len(self.pending)
+
+    def __getitem__(self, row: int):
+        if row < self.size:
+            return self.data[row].item()
+        return self.pending[row - self.size]
+
+    def __setitem__(self, row: int, value):
+        if row < self.size:
+            self.data[row] = value
+        else:
+            self.pending[row - self.size] = value
+
+    def view(self) -> np.ndarray:
+        """NumPy view of the rows (a snapshot of the length, not a copy)"""
+        self.flush()
+        return self.data[:self.size]
+
+    def flush(self):
+        """Move pending rows into the NumPy array"""
+        if not self.pending:
+            return
+        size = len(self)
+        if size > len(self.data):
+            self._reallocate(max(int(size * self.GROWTH), size + 64))
+        self.data[self.size:size] = np.frombuffer(self.pending, dtype=self.data.dtype)
+        self.size = size
+        del self.pending[:]
+
+    def trim(self):
+        """Flush and drop spare capacity"""
+        if len(self.data) != len(self):
+            self._reallocate(len(self))
+        self.flush()
+
+    def _reallocate(self, capacity: int):
+        data = np.empty(capacity, dtype=self.data.dtype)
+        data[:self.size] = self.data[:self.size]
+        self.data = data
+
+
+class DayPartition:
+    """
+    Columnar orders of one calendar day
+
+    Columns are preallocated NumPy arrays (see Column); scans read them
+    through views. Times are milliseconds since midnight (wall clock) and
+    money is whole cents. Line items are stored flat, with `item_end[i]`
+    the end offset of order i's items. `next_ref` chains each order to
+    the same customer's next one. Sorted order totals are kept per day
+    (rebuilt when the day changes) so medians merge without
+    concatenating days, and the day's period keys are built once for the
+    rollups.
+    """
+
+    COLUMNS = {
+        'time_ms': np.int32,  # milliseconds since midnight (wall clock)
+        'total': np.int64,  # cents
+        'customer': np.int32,
+        'item_end': np.int32,
+        'next_ref': np.int32,
+        'product': np.int32,
+        'quantity': np.int32,
+        'price': np.int64  # cents
+    }
+
+    def __init__(self, day: date, index: int):
+        self.day = day
+        self.index = index
+        self.revenue = 0.0
+        self.ref_blocks: List[int] = []
+        self.period_keys = {
+            period: AnalyticsEngine._period_key(day, period) for period in AnalyticsEngine.PERIODS
+        }
+        self._sorted_totals: Optional[np.ndarray] = None
+
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, Column(dtype))
+
+    def __len__(self) -> int:
+        return len(self.total)
+
+    def column(self, name: str) -> np.ndarray:
+        """NumPy view of a column (does not see later appends)"""
+        return getattr(self, name).view()
+
+    def sorted_totals(self) -> np.ndarray:
+        """Order totals (cents) in ascending order"""
+        if self._sorted_totals is None or len(self._sorted_totals) != len(self):
+            self._sorted_totals = np.sort(self.column('total'))
+        return self._sorted_totals
+
+    def item_mask(self, order_mask: np.ndarray) -> np.ndarray:
+        """Expand a per-order mask to the line items"""
+        ends = self.column('item_end')
+        counts = np.diff(ends, prepend=0)
+        return np.repeat(order_mask, counts)
+
+    def trim(self):
+        """Flush columns and drop spare capacity (once the day stops receiving orders)"""
+        for name in self.COLUMNS:
+            getattr(self, name).trim()
+
+
+class OrderStore:
+    """
+    Day-partitioned columnar order store
+
+    Each order keeps its timestamp (millisecond precision), total,
+    customer and line items (product, quantity, price in cents). Customer
+    and product ids are dictionary encoded to int32 codes. References are
+    int32: each partition claims blocks of REF_BLOCK references as it
+    grows, and a block table maps a reference back to (partition, row).
+    The customer index links a customer's orders through these
+    references. Other order fields are not retained.
+    """
+
+    REF_BLOCK = 4096
+
+    def __init__(self):
+        self.partitions: Dict[date, DayPartition] = {}
+        self.days: List[date] = []  # sorted
+        self.tzinfo = None
+
+        self.customer_codes: Dict[str, int] = {}
+        self.customer_ids: List[str] = []
+        self.product_codes: Dict[str, int] = {}
+        self.product_ids: List[str] = []
+
+        # Reference block -> (partition index, first row)
+        self._by_index: List[DayPartition] = []
+        self._block_partition = Column(np.int32)
+        self._block_row = Column(np.int32)
+        self._latest_day: Optional[date] = None
+
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Orders as dicts, in day order"""
+        for day in self.days:
+            partition = self.partitions[day]
+            for row in range(len(partition)):
+                yield self._order(partition, row)
+
+    def encode(self, codes: Dict[str, int], ids: List[str], value: str) -> int:
+        """Dictionary code of an id, assigning the next code to new ids"""
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(ids)
+            ids.append(value)
+        return code
+
+    def append(self, order: Dict) -> int:
+        """
+        Store an order
+
+        Every value is encoded and checked before any column is touched, so
+        an order rejected with ValueError (an amount or quantity that does
+        not fit its column) leaves the store unchanged.
+
+        Returns:
+            Reference of the stored order
+        """
+        if not self._count:
+            self.tzinfo = order['created_at'].tzinfo
+        # Partition by the stored orders' wall clock, like range bounds
+        created_at = self._local(order['created_at'])
+
+        day = created_at.date()
+        time_ms = self._time_of_day(created_at)
+        total = to_cents(order['total'])
+        items = [
+            (item['product_id'], int(item['quantity']), to_cents(item['price']))
+            for item in order.get('items', [])
+        ]
+        for _, quantity, _ in items:
+            if abs(quantity) > INT32_MAX:
+                raise ValueError(f"Quantity out of range: {quantity}")
+
+        partition = self.partitions.get(day)
+        if partition is None:
+            partition = self.partitions[day] = DayPartition(day, len(self._by_index))
+            self._by_index.append(partition)
+            bisect.insort(self.days, day)
+
+        # Ingest moved past the latest day: its columns are (usually) final
+        if self._latest_day is None or day > self._latest_day:
+            if self._latest_day is not None:
+                self.partitions[self._latest_day].trim()
+            self._latest_day = day
+
+        row = len(partition)
+        partition.time_ms.append(time_ms)
+        partition.total.append(total)
+        partition.customer.append(
+            self.encode(self.customer_codes, self.customer_ids, order.get('customer_id', 'guest'))
+        )
+
+        for product_id, quantity, price in items:
+            partition.product.append(self.encode(self.product_codes, self.product_ids, product_id))
+            partition.quantity.append(quantity)
+            partition.price.append(price)
+        partition.item_end.append(len(partition.product))
+        partition.next_ref.append(-1)
+
+        partition.revenue += order['total']
+        self._count += 1
+
+        if row % self.REF_BLOCK == 0:
+            partition.ref_blocks.append(len(self._block_partition))
+            self._block_partition.append(partition.index)
+            self._block_row.append(row)
+
+        return partition.ref_blocks[row // self.REF_BLOCK] * self.REF_BLOCK + row % self.REF_BLOCK
+
+    def partition(self, ref: int) -> DayPartition:
+        """Day partition holding a reference"""
+        return self._by_index[self._block_partition[ref // self.REF_BLOCK]]
+
+    def get(self, ref: int) -> Dict:
+        """Order dict for a reference"""
+        return self._order(*self._locate(ref))
+
+    def next_ref(self, ref: int) -> int:
+        """Reference of the customer's next order (-1 for the last)"""
+        partition, row = self._locate(ref)
+        return partition.next_ref[row]
+
+    def link(self, ref: int, next_ref: int):
+        """Chain an order to the customer's next order"""
+        partition, row = self._locate(ref)
+        partition.next_ref[row] = next_ref
+
+    def wall_us(self, moment: datetime) -> int:
+        """Microseconds since 1970-01-01 on the stored orders' wall clock"""
+        return (self._local(moment).replace(tzinfo=None) - EPOCH) // ONE_MICROSECOND
+
+    def from_wall_us(self, us: int) -> datetime:
+        """Inverse of wall_us"""
+        return (EPOCH + timedelta(microseconds=int(us))).replace(tzinfo=self.tzinfo)
+
+    def now(self) -> datetime:
+        """Current time, in the stored orders' timezone when they carry one"""
+        return datetime.now(self.tzinfo)
+
+    def slice(self, start_date: Optional[datetime],
+              end_date: Optional[datetime]) -> Iterator[Tuple[DayPartition, Optional[np.ndarray]]]:
+        """
+        Partitions overlapping a date range (bounds inclusive, to the millisecond)
+
+        Only the partitions of days in the range are touched.
+
+        Yields:
+            (partition, None) for days wholly inside the range, or
+            (partition, mask) with a per-order mask for boundary days
+        """
+        start_date = self._local(start_date)
+        end_date = self._local(end_date)
+
+        lo = bisect.bisect_left(self.days, start_date.date()) if start_date else 0
+        hi = bisect.bisect_right(self.days, end_date.date()) if end_date else len(self.days)
+
+        for day in self.days[lo:hi]:
+            partition = self.partitions[day]
+            low = self._time_of_day(start_date) if start_date and start_date.date() == day else None
+            high = self._time_of_day(end_date) if end_date and end_date.date() == day else None
+
+            if low is None and high is None:
+                yield partition, None
+                continue
+
+            times = partition.column('time_ms')
+            mask = np.ones(len(times), dtype=bool)
+            if low is not None:
+                mask &= times >= low
+            if high is not None:
+                mask &= times <= high
+            yield partition, mask
+
+    def _locate(self, ref: int) -> Tuple[DayPartition, int]:
+        block, offset = divmod(ref, self.REF_BLOCK)
+        return self._by_index[self._block_partition[block]], self._block_row[block] + offset
+
+    def _local(self, moment: Optional[datetime]) -> Optional[datetime]:
+        """Express a bound in the timezone the orders were stored in"""
+        if moment is not None and moment.tzinfo is not None and self.tzinfo is not None:
+            return moment.astimezone(self.tzinfo)
+        return moment
+
+    @staticmethod
+    def _time_of_day(moment: datetime) -> int:
+        """Milliseconds since the moment's wall-clock midnight"""
+        return ((moment.hour * 60 + moment.minute) * 60 + moment.second) * 1000 + moment.microsecond // 1000
+
+    def _order(self, partition: DayPartition, row: int) -> Dict:
+        """Rebuild an order dict from its row"""
+        start = partition.item_end[row - 1] if row else 0
+        return {
+            'customer_id': self.customer_ids[partition.customer[row]],
+            'created_at': datetime.combine(partition.day, time.min, tzinfo=self.tzinfo) +
+                          timedelta(milliseconds=partition.time_ms[row]),
+            'total': partition.total[row] / 100,
+            'items': [
+                {
+                    'product_id': self.product_ids[partition.product[i]],
+                    'quantity': partition.quantity[i],
+                    'price': partition.price[i] / 100
+                }
+                for i in range(start, partition.item_end[row])
+            ]
+        }
+
+
+class CustomerTable:
+    """
+    Columnar per-customer state, indexed by the store's customer codes
+
+    Holds the RFM inputs (first/last purchase, order count, spend), the
+    head and tail of each customer's order chain and the acquisition
+    cohorts. Lookups by id return a dict view of one row.
+    """
+
+    COLUMNS = {
+        'first_us': np.int64,
+        'last_us': np.int64,
+        'order_count': np.int64,
+        'total_spent': np.float64,
+        'head': np.int32,
+        'tail': np.int32,
+        'monthly_cohort': np.int32,
+        'weekly_cohort': np.int32
+    }
+
+    def __init__(self, store: OrderStore):
+        self.store = store
+        self.cohort_keys: Dict[str, List[str]] = {'monthly': [], 'weekly': []}
+        self._cohort_codes: Dict[str, Dict[str, int]] = {'monthly': {}, 'weekly': {}}
+
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, Column(dtype))
+
+    def __len__(self) -> int:
+        return len(self.order_count)
+
+    def __contains__(self, customer_id: str) -> bool:
+        return customer_id in self.store.customer_codes
+
+    def __getitem__(self, customer_id: str) -> Dict:
+        code = self.store.customer_codes[customer_id]
+        return {
+            'first_purchase': self.store.from_wall_us(self.first_us[code]),
+            'last_purchase': self.store.from_wall_us(self.last_us[code]),
+            'order_count': self.order_count[code],
+            'total_spent': self.total_spent[code]
+        }
+
+    def column(self, name: str) -> np.ndarray:
+        """NumPy view of a column (does not see later appends)"""
+        return getattr(self, name).view()
+
+    def add_order(self, code: int, created_at: datetime, total: float, ref: int) -> int:
+        """
+        Record an order for a customer code
+
+        Returns:
+            The customer's order count
+        """
+        moment = self.store.wall_us(created_at)
+
+        if code == len(self):
+            period_keys = self.store.partition(ref).period_keys
+            self.first_us.append(moment)
+            self.last_us.append(moment)
+            self.order_count.append(0)
+            self.total_spent.append(0.0)
+            self.head.append(ref)
+            self.tail.append(-1)
+            for period in self.cohort_keys:
+                getattr(self, f'{period}_cohort').append(self._cohort_code(period, period_keys[period]))
+        else:
+            self.store.link(self.tail[code], ref)
+
+        self.tail[code] = ref
+        self.order_count[code] += 1
+        self.total_spent[code] += total
+        self.last_us[code] = max(self.last_us[code], moment)
+
+        return self.order_count[code]
+
+    def order_refs(self, code: int) -> Iterator[int]:
+        """References of a customer's orders, in the order they were added"""
+        ref = self.head[code]
+        while ref != -1:
+            yield ref
+            ref = self.store.next_ref(ref)
+
+    def days_since_last(self, now: datetime) -> np.ndarray:
+        """Whole days since each customer's last purchase"""
+        return (self.store.wall_us(now) - self.column('last_us')) // ONE_DAY_US
+
+    def _cohort_code(self, period: str, key: str) -> int:
+        codes = self._cohort_codes[period]
+        if key not in codes:
+            codes[key] = len(self.cohort_keys[period])
+            self.cohort_keys[period].append(key)
+        return codes[key]
+
+
 # ============================================================================
 # Analytics Engine
 # ============================================================================
@@ -96,34 +570,121 @@ class ProductMetrics:
 class AnalyticsEngine:
     """Main analytics engine"""
 
+    PERIODS = ('daily', 'weekly', 'monthly')
+
     def __init__(self):
-        self.orders: List[Dict] = []
-        self.customers: Dict[str, Dict] = {}
+        self.orders = OrderStore()
+        self.customers = CustomerTable(self.orders)
         self.products: Dict[str, Dict] = {}
         self.sessions: List[Dict] = []
 
+        # Rollups maintained by add_order
+        self.total_revenue = 0.0
+        self.period_totals: Dict[str, Dict[str, List]] = {period: {} for period in self.PERIODS}  # key -> [revenue, orders]
+        self.product_totals: Dict[str, List] = {}
+        self.single_order_customers = 0
+
     # ========================================================================
     # Data Ingestion
     # ========================================================================
 
     def add_order(self, order: Dict):
-        """Add an order to analytics"""
-        self.orders.append(order)
-
-        # Update customer data
-        customer_id = order.get('customer_id', 'guest')
+        """Add an order to analytics and update the rollups"""
+        ref = self.orders.append(order)
+        period_keys = self.orders.partition(ref).period_keys
+        created_at = order['created_at']
+        total = order['total']
+
+        # Update customer data (RFM state, order index and cohort membership)
+        code = self.orders.customer_codes[order.get('customer_id', 'guest')]
+        order_count = self.customers.add_order(code, created_at, total, ref)
+
+        if order_count == 1:
+            self.single_order_customers += 1
+        elif order_count == 2:
+            self.single_order_customers -= 1
+
+        # Overall and per-period sales (keyed by the order's stored day)
+        self.total_revenue += total
+
+        for period, totals in self.period_totals.items():
+            bucket = totals.setdefault(period_keys[period], [0.0, 0])
+            bucket[0] += total
+            bucket[1] += 1
+
+        # Per-product units and revenue
+        self._add_items(self.product_totals, order)
+
+    def get_customer_orders(self, customer_id: str) -> List[Dict]:
+        """Orders of a customer, in the order they were added"""
         if customer_id not in self.customers:
-            self.customers[customer_id] = {
-                'first_purchase': order['created_at'],
-                'last_purchase': order['created_at'],
-                'orders': [],
-                'total_spent': 0.0
-            }
+            raise ValueError(f"Customer {customer_id} not found")
 
-        customer = self.customers[customer_id]
-        customer['orders'].append(order)
-        customer['total_spent'] += order['total']
-        customer['last_purchase'] = max(customer['last_purchase'], order['created_at'])
+        code = self.orders.customer_codes[customer_id]
+        return [self.orders.get(ref) for ref in self.customers.order_refs(code)]
+
+    @staticmethod
+    def _add_items(products: Dict[str, List], order: Dict):
+        """Accumulate an order's line items into [units, revenue, price sum, lines]"""
+        for item in order.get('items', []):
+            stats = products.get(item['product_id'])
+            if stats is None:
+                stats = products[item['product_id']] = [0, 0.0, 0.0, 0]
+
+            stats[0] += item['quantity']
+            stats[1] += item['price'] * item['quantity']
+            stats[2] += item['price']
+            stats[3] += 1
+
+    @staticmethod
+    def _period_key(moment: date, period: str) -> str:
+        """Bucket key of a date or timestamp for 'daily', 'weekly' or 'monthly'"""
+        if period == 'daily':
+            return moment.strftime('%Y-%m-%d')
+        if period == 'weekly':
+            year, week, _ = moment.isocalendar()
+            return f"{year}-W{week:02d}"
+        return moment.strftime('%Y-%m')
+
+    @staticmethod
+    def _merged_median(runs: List[np.ndarray]) -> float:
+        """
+        Median of several sorted integer arrays without concatenating them
+
+        Searches on the value: the k-th smallest is the least v with more
+        than k values <= v, counted for a batch of candidate values with
+        one searchsorted per array.
+        """
+        runs = [run for run in runs if len(run)]
+        n = sum(len(run) for run in runs)
+        k = (n - 1) // 2
+
+        def at_most(values: np.ndarray) -> np.ndarray:
+            counts = np.zeros(len(values), dtype=np.int64)
+            for run in runs:
+                counts += np.searchsorted(run, values.astype(run.dtype), 'right')
+            return counts
+
+        # Each pass narrows [lo, hi] to the gap between two of up to
+        # MEDIAN_PROBES candidate values, so a few passes cover any range
+        lo, hi = min(int(run[0]) for run in runs), max(int(run[-1]) for run in runs)
+        while lo < hi:
+            probes = np.unique(np.linspace(lo, hi, MEDIAN_PROBES, dtype=np.int64))
+            first = int(np.argmax(at_most(probes) > k))
+            hi = int(probes[first])
+            if first:
+                lo = int(probes[first - 1]) + 1
+            if hi - lo < MEDIAN_PROBES:
+                probes = np.arange(lo, hi + 1, dtype=np.int64)
+                lo = hi = int(probes[np.argmax(at_most(probes) > k)])
+
+        if n % 2 or int(at_most(np.array([lo]))[0]) > k + 1:
+            upper = lo
+        else:
+            # Even count and the next value is larger: smallest value above lo
+            upper = min(int(run[i]) for run in runs
+                        for i in [int(np.searchsorted(run, lo, 'right'))] if i < len(run))
+        return (lo + upper) / 2
 
     def add_session(self, session: Dict):
         """Add a browsing session"""
@@ -136,17 +697,47 @@ class AnalyticsEngine:
     def calculate_sales_metrics(self, start_date: Optional[datetime] = None,
                                 end_date: Optional[datetime] = None) -> SalesMetrics:
         """Calculate comprehensive sales metrics"""
-        # Filter orders by date range
-        filtered_orders = self.orders
-
         if start_date or end_date:
-            filtered_orders = [
-                order for order in self.orders
-                if (not start_date or order['created_at'] >= start_date) and
-                   (not end_date or order['created_at'] <= end_date)
-            ]
-
-        if not filtered_orders:
+            # Combine the day partitions in range
+            total_revenue = 0.0
+            total_orders = 0
+            sorted_totals = []
+            customers = []
+
+            for partition, mask in self.orders.slice(start_date, end_date):
+                order_customers = partition.column('customer')
+
+                if mask is None:
+                    total_revenue += partition.revenue
+                    total_orders += len(partition)
+                    sorted_totals.append(partition.sorted_totals())
+                else:
+                    order_totals = partition.column('total')[mask]
+                    order_customers = order_customers[mask]
+                    total_revenue += int(order_totals.sum(dtype=np.int64)) / 100
+                    total_orders += len(order_totals)
+                    sorted_totals.append(np.sort(order_totals))
+
+                customers.append(order_customers)
+
+            median_order_value = self._merged_median(sorted_totals) / 100 if total_orders else 0.0
+
+            seen = np.zeros(len(self.customers), dtype=bool)
+            for codes in customers:
+                seen[codes] = True
+            order_counts = self.customers.column('order_count')
+            unique_customers = int(np.count_nonzero(seen))
+            new_customers = int(np.count_nonzero(seen & (order_counts == 1)))
+        else:
+            total_revenue = self.total_revenue
+            total_orders = len(self.orders)
+            median_order_value = self._merged_median([
+                partition.sorted_totals() for partition in self.orders.partitions.values()
+            ]) / 100 if total_orders else 0.0
+            unique_customers = len(self.customers)
+            new_customers = self.single_order_customers
+
+        if not total_orders:
             return SalesMetrics(
                 total_revenue=0.0,
                 total_orders=0,
@@ -158,29 +749,10 @@ class AnalyticsEngine:
                 conversion_rate=0.0
             )
 
-        # Calculate metrics
-        total_revenue = sum(order['total'] for order in filtered_orders)
-        total_orders = len(filtered_orders)
-        order_values = [order['total'] for order in filtered_orders]
-
         avg_order_value = total_revenue / total_orders
-        median_order_value = statistics.median(order_values)
-
-        # Customer analysis
-        customer_ids = set(order.get('customer_id', 'guest') for order in filtered_orders)
-        unique_customers = len(customer_ids)
 
-        # Identify new vs returning
-        new_customers = 0
-        returning_customers = 0
-
-        for customer_id in customer_ids:
-            if customer_id in self.customers:
-                customer = self.customers[customer_id]
-                if len(customer['orders']) == 1:
-                    new_customers += 1
-                else:
-                    returning_customers += 1
+        # Customer analysis (new = exactly one order overall)
+        returning_customers = unique_customers - new_customers
 
         # Conversion rate (orders / sessions)
         conversion_rate = 0.0
@@ -198,44 +770,45 @@ class AnalyticsEngine:
             conversion_rate=conversion_rate
         )
 
-    def analyze_sales_trends(self, period: str = 'daily') -> List[Dict]:
+    def analyze_sales_trends(self, period: str = 'daily',
+                             start_date: Optional[datetime] = None,
+                             end_date: Optional[datetime] = None) -> List[Dict]:
         """
         Analyze sales trends over time
 
         Args:
             period: 'daily', 'weekly', or 'monthly'
+            start_date: Optional start of the range (inclusive)
+            end_date: Optional end of the range (inclusive)
 
         Returns:
             List of time period metrics
         """
-        if not self.orders:
-            return []
-
-        # Group orders by period
-        period_buckets = defaultdict(list)
+        if period not in self.period_totals:
+            period = 'monthly'
 
-        for order in self.orders:
-            date = order['created_at']
-
-            if period == 'daily':
-                key = date.strftime('%Y-%m-%d')
-            elif period == 'weekly':
-                # Get week number
-                year, week, _ = date.isocalendar()
-                key = f"{year}-W{week:02d}"
-            else:  # monthly
-                key = date.strftime('%Y-%m')
+        if start_date or end_date:
+            period_buckets: Dict[str, List] = {}
 
-            period_buckets[key].append(order)
+            for partition, mask in self.orders.slice(start_date, end_date):
+                if mask is None:
+                    revenue, orders = partition.revenue, len(partition)
+                else:
+                    orders = int(np.count_nonzero(mask))
+                    if not orders:
+                        continue
+                    revenue = int(partition.column('total')[mask].sum(dtype=np.int64)) / 100
+
+                bucket = period_buckets.setdefault(partition.period_keys[period], [0.0, 0])
+                bucket[0] += revenue
+                bucket[1] += orders
+        else:
+            period_buckets = self.period_totals[period]
 
-        # Calculate metrics for each period
         trends = []
 
         for period_key in sorted(period_buckets.keys()):
-            period_orders = period_buckets[period_key]
-
-            total_revenue = sum(o['total'] for o in period_orders)
-            total_orders = len(period_orders)
+            total_revenue, total_orders = period_buckets[period_key]
             avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
 
             trends.append({
@@ -316,16 +889,15 @@ class AnalyticsEngine:
             raise ValueError(f"Customer {customer_id} not found")
 
         customer = self.customers[customer_id]
-        orders = customer['orders']
 
-        total_orders = len(orders)
+        total_orders = customer['order_count']
         total_spent = customer['total_spent']
         avg_order_value = total_spent / total_orders if total_orders > 0 else 0
 
         # Calculate days since first and last purchase
         first_purchase = customer['first_purchase']
         last_purchase = customer['last_purchase']
-        now = datetime.now()
+        now = self.orders.now()
 
         days_since_first = (now - first_purchase).days
         days_since_last = (now - last_purchase).days
@@ -375,45 +947,30 @@ class AnalyticsEngine:
         if not self.customers:
             return {}
 
-        # Calculate RFM scores
-        rfm_scores = {}
-        now = datetime.now()
+        # RFM columns
+        recency = self.customers.days_since_last(self.orders.now())
+        frequency = self.customers.column('order_count')
+        monetary = self.customers.column('total_spent')
 
-        for customer_id, customer in self.customers.items():
-            recency = (now - customer['last_purchase']).days
-            frequency = len(customer['orders'])
-            monetary = customer['total_spent']
+        # Simple segmentation logic (first matching rule wins)
+        rules = [
+            ('champions', (recency < 30) & (frequency >= 5) & (monetary >= 500)),  # High F, M, Low R
+            ('loyal', (recency < 60) & (frequency >= 3)),  # High F, Low R
+            ('potential', (recency < 30) & (frequency < 3) & (monetary >= 200)),  # Low F, Low R, High M
+            ('at_risk', (recency >= 90) & (frequency >= 3)),  # High R, previously High F, M
+        ]
 
-            rfm_scores[customer_id] = {
-                'recency': recency,
-                'frequency': frequency,
-                'monetary': monetary
-            }
+        segments = {}
+        unassigned = np.ones(len(recency), dtype=bool)
+        customer_ids = self.orders.customer_ids
 
-        # Simple segmentation logic
-        segments = {
-            'champions': [],  # High F, M, Low R
-            'loyal': [],  # High F, Low R
-            'potential': [],  # Low F, Low R, High M
-            'at_risk': [],  # High R, previously High F, M
-            'hibernating': []  # High R, Low F, M
-        }
+        for segment, matches in rules:
+            matches &= unassigned
+            segments[segment] = [customer_ids[code] for code in np.flatnonzero(matches)]
+            unassigned &= ~matches
 
-        for customer_id, scores in rfm_scores.items():
-            r = scores['recency']
-            f = scores['frequency']
-            m = scores['monetary']
-
-            if r < 30 and f >= 5 and m >= 500:
-                segments['champions'].append(customer_id)
-            elif r < 60 and f >= 3:
-                segments['loyal'].append(customer_id)
-            elif r < 30 and f < 3 and m >= 200:
-                segments['potential'].append(customer_id)
-            elif r >= 90 and f >= 3:
-                segments['at_risk'].append(customer_id)
-            else:
-                segments['hibernating'].append(customer_id)
+        # High R, Low F, M
+        segments['hibernating'] = [customer_ids[code] for code in np.flatnonzero(unassigned)]
 
         return segments
 
@@ -427,39 +984,26 @@ class AnalyticsEngine:
         Returns:
             Cohort retention data
         """
-        # Group customers by acquisition period
-        cohorts = defaultdict(set)
+        # Customers by acquisition period (maintained by add_order)
+        period = 'monthly' if period == 'monthly' else 'weekly'
+        cohort_keys = self.customers.cohort_keys[period]
+        cohorts = self.customers.column(f'{period}_cohort')
 
-        for customer_id, customer in self.customers.items():
-            first_purchase = customer['first_purchase']
+        # Count active customers per cohort
+        # (simplified - assumes active = purchased in last 30 days)
+        active = self.customers.days_since_last(self.orders.now()) < 30
+        sizes = np.bincount(cohorts, minlength=len(cohort_keys))
+        active_counts = np.bincount(cohorts[active], minlength=len(cohort_keys))
 
-            if period == 'monthly':
-                cohort_key = first_purchase.strftime('%Y-%m')
-            else:  # weekly
-                year, week, _ = first_purchase.isocalendar()
-                cohort_key = f"{year}-W{week:02d}"
-
-            cohorts[cohort_key].add(customer_id)
-
-        # Calculate retention for each cohort
         cohort_analysis = []
 
-        for cohort_key in sorted(cohorts.keys()):
-            cohort_customers = cohorts[cohort_key]
-            cohort_size = len(cohort_customers)
-
-            # Count active customers in subsequent periods
-            # (simplified - assumes active = purchased in last 30 days)
-            now = datetime.now()
-            active_count = sum(
-                1 for customer_id in cohort_customers
-                if (now - self.customers[customer_id]['last_purchase']).days < 30
-            )
-
+        for code in sorted(range(len(cohort_keys)), key=cohort_keys.__getitem__):
+            cohort_size = int(sizes[code])
+            active_count = int(active_counts[code])
             retention_rate = active_count / cohort_size if cohort_size > 0 else 0
 
             cohort_analysis.append({
-                'cohort': cohort_key,
+                'cohort': cohort_keys[code],
                 'size': cohort_size,
                 'active': active_count,
                 'retention_rate': retention_rate
@@ -471,41 +1015,29 @@ class AnalyticsEngine:
     # Product Analytics
     # ========================================================================
 
-    def analyze_product_performance(self) -> List[ProductMetrics]:
-        """Analyze performance metrics for all products"""
-        product_stats = defaultdict(lambda: {
-            'units_sold': 0,
-            'revenue': 0.0,
-            'prices': [],
-            'orders': 0
-        })
-
-        # Aggregate data from orders
-        for order in self.orders:
-            for item in order.get('items', []):
-                product_id = item['product_id']
-                stats = product_stats[product_id]
-
-                stats['units_sold'] += item['quantity']
-                stats['revenue'] += item['price'] * item['quantity']
-                stats['prices'].append(item['price'])
-                stats['orders'] += 1
+    def analyze_product_performance(self, start_date: Optional[datetime] = None,
+                                    end_date: Optional[datetime] = None) -> List[ProductMetrics]:
+        """Analyze performance metrics for all products (optionally within a date range)"""
+        if start_date or end_date:
+            product_stats = self._product_stats(start_date, end_date)
+        else:
+            product_stats = self.product_totals
 
         # Calculate metrics
         metrics = []
 
-        for product_id, stats in product_stats.items():
-            avg_price = statistics.mean(stats['prices']) if stats['prices'] else 0
+        for product_id, (units_sold, revenue, price_sum, lines) in product_stats.items():
+            avg_price = price_sum / lines if lines else 0
 
             # Mock conversion rate and return rate
-            conversion_rate = 0.05 + (stats['units_sold'] / 1000) * 0.1
+            conversion_rate = 0.05 + (units_sold / 1000) * 0.1
             return_rate = 0.02
             profit_margin = 0.3
 
             metrics.append(ProductMetrics(
                 product_id=product_id,
-                total_units_sold=stats['units_sold'],
-                total_revenue=stats['revenue'],
+                total_units_sold=units_sold,
+                total_revenue=revenue,
                 average_price=avg_price,
                 conversion_rate=min(conversion_rate, 1.0),
                 return_rate=return_rate,
@@ -517,6 +1049,37 @@ class AnalyticsEngine:
 
         return metrics
 
+    def _product_stats(self, start_date: Optional[datetime],
+                       end_date: Optional[datetime]) -> Dict[str, List]:
+        """Per-product [units, revenue, price sum, lines] within a date range"""
+        n = len(self.orders.product_ids)
+        units = np.zeros(n, dtype=np.int64)
+        revenue = np.zeros(n)
+        price_sum = np.zeros(n)
+        lines = np.zeros(n, dtype=np.int64)
+
+        for partition, mask in self.orders.slice(start_date, end_date):
+            products = partition.column('product')
+            quantity = partition.column('quantity')
+            price = partition.column('price')
+
+            if mask is not None:
+                items = partition.item_mask(mask)
+                products, quantity, price = products[items], quantity[items], price[items]
+
+            units += np.bincount(products, weights=quantity, minlength=n).astype(np.int64)
+            revenue += np.bincount(products, weights=price * quantity.astype(np.float64), minlength=n) / 100
+            price_sum += np.bincount(products, weights=price, minlength=n) / 100
+            lines += np.bincount(products, minlength=n)
+
+        product_stats = {
+            self.orders.product_ids[code]: [int(units[code]), float(revenue[code]),
+                                            float(price_sum[code]), int(lines[code])]
+            for code in np.flatnonzero(lines)
+        }
+
+        return product_stats
+
     def identify_product_trends(self, days: int = 30) -> Dict[str, List[str]]:
         """
         Identify trending products
@@ -526,20 +1089,16 @@ class AnalyticsEngine:
         """
         cutoff_date = datetime.now() - timedelta(days=days)
 
-        # Count sales in recent period
-        recent_sales = defaultdict(int)
-        historical_sales = defaultdict(int)
-
-        for order in self.orders:
-            order_date = order['created_at']
-
-            for item in order.get('items', []):
-                product_id = item['product_id']
-
-                if order_date >= cutoff_date:
-                    recent_sales[product_id] += item['quantity']
-                else:
-                    historical_sales[product_id] += item['quantity']
+        # Units sold since the cutoff, from the day rollups
+        recent_sales = {
+            product_id: stats[0]
+            for product_id, stats in self._product_stats(cutoff_date, None).items()
+        }
+        historical_sales = {
+            product_id: stats[0] - recent_sales.get(product_id, 0)
+            for product_id, stats in self.product_totals.items()
+            if stats[0] > recent_sales.get(product_id, 0)
+        }
 
         # Categorize trends
         trends = {
@@ -617,9 +1176,14 @@ def calculate_sales_metrics(start_date: Optional[str] = None,
     return json.dumps(metrics.to_dict())
 
 
-def analyze_sales_trends(period: str = 'monthly') -> str:
+def analyze_sales_trends(period: str = 'monthly',
+                         start_date: Optional[str] = None,
+                         end_date: Optional[str] = None) -> str:
     """Analyze sales trends (returns JSON for TypeScript)"""
-    trends = _analytics_engine.analyze_sales_trends(period)
+    start = datetime.fromisoformat(start_date) if start_date else None
+    end = datetime.fromisoformat(end_date) if end_date else None
+
+    trends = _analytics_engine.analyze_sales_trends(period, start, end)
     return json.dumps(trends)
 
 
@@ -641,9 +1205,13 @@ def segment_customers() -> str:
     return json.dumps(segments)
 
 
-def analyze_product_performance() -> str:
+def analyze_product_performance(start_date: Optional[str] = None,
+                                end_date: Optional[str] = None) -> str:
     """Analyze product performance (returns JSON for TypeScript)"""
-    metrics = _analytics_engine.analyze_product_performance()
+    start = datetime.fromisoformat(start_date) if start_date else None
+    end = datetime.fromisoformat(end_date) if end_date else None
+
+    metrics = _analytics_engine.analyze_product_performance(start, end)
     return json.dumps([m.to_dict() for m in metrics])
 
 
@@ -5,11 +5,14 @@ Machine learning-based fraud detection featuring:
 - Real-time transaction scoring
 - Anomaly detection
 - Velocity checks (transaction frequency)
+- Sliding-window velocity counters per user, IP and device (O(1) updates)
+- Count-min sketch velocity for high-cardinality keys
 - Geolocation analysis
 - Device fingerprinting
 - Behavioral analysis
 - Pattern recognition
 - Risk scoring and thresholds
+- Batch scoring with column-wise rule evaluation and bulk profile updates
 - False positive minimization
 - Adaptive learning
 
@@ -18,13 +21,16 @@ TypeScript payment processing through Elide's polyglot runtime.
 
 Integration with TypeScript:
 ```typescript
-import { check_transaction_fraud, update_fraud_model } from './python/fraud_detection.py';
+import { check_transaction_fraud, check_transactions_fraud, update_fraud_model } from './python/fraud_detection.py';
 
 // Check transaction for fraud
 const fraudCheck = check_transaction_fraud(transactionData);
 if (fraudCheck.risk_score > 0.7) {
     // Flag for review or reject
 }
+
+// Score a checkout burst in one call
+const fraudChecks = check_transactions_fraud(transactionBatch);
 ```
 """
 
@@ -33,9 +39,11 @@ import math
 import hashlib
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 from dataclasses import dataclass, asdict
 
+import numpy as np
+
 
 # ============================================================================
 # Data Structures
@@ -98,6 +106,220 @@ class UserProfile:
         return data
 
 
+# ============================================================================
+# Velocity Tracking
+# ============================================================================
+
+class SlidingWindowCounter:
+    """
+    Per-key event counts over several sliding windows
+
+    Each window is split into `resolution` time buckets. A key keeps, per
+    window, a queue of its non-empty buckets (flat bucket id / count
+    pairs, so a busy key costs no extra objects) and their running total.
+    Adding an event bumps the newest bucket. Buckets that leave the window
+    are subtracted the next time the key is touched, so updates and
+    queries are O(1) amortized. A window counts the events of its last
+    `resolution` buckets, which can leave out up to one bucket's worth of
+    the oldest events. Keys idle for longer than the longest window are
+    dropped as new events arrive. Queries are expected in (roughly)
+    increasing time order, as transactions arrive.
+    """
+
+    def __init__(self, windows: Dict[str, float], resolution: int = 60):
+        """
+        Args:
+            windows: Window name -> length in seconds
+            resolution: Buckets per window
+        """
+        self.windows = dict(windows)
+        self.resolution = resolution
+        self.bucket_widths = [length / resolution for length in self.windows.values()]
+        self.window_index = {name: i for i, name in enumerate(self.windows)}
+        self.retention = max(self.windows.values())
+
+        # key -> [last seen, total per window..., bucket queue per window...]
+        self._keys: 'OrderedDict[str, list]' = OrderedDict()
+
+    def add(self, key: str, timestamp: float, count: int = 1):
+        """Record `count` events for a key at `timestamp` (epoch seconds)"""
+        self._expire_idle(timestamp)
+        n = len(self.bucket_widths)
+
+        state = self._keys.get(key)
+        if state is None:
+            state = self._keys[key] = [timestamp] + [0] * n + [deque() for _ in range(n)]
+        else:
+            state[0] = max(state[0], timestamp)
+            self._keys.move_to_end(key)
+
+        for i, width in enumerate(self.bucket_widths):
+            bucket = int(timestamp // width)
+            buckets = state[1 + n + i]
+
+            # Drop buckets that left the window
+            oldest = bucket - self.resolution + 1
+            while buckets and buckets[0] < oldest:
+                buckets.popleft()
+                state[1 + i] -= buckets.popleft()
+
+            if buckets and buckets[-2] == bucket:
+                buckets[-1] += count
+            elif not buckets or buckets[-2] < bucket:
+                buckets.append(bucket)
+                buckets.append(count)
+            elif bucket > buckets[-2] - self.resolution:
+                # Late event still inside the window
+                self._add_late(buckets, bucket, count)
+            else:
+                continue
+            state[1 + i] += count
+
+    def count(self, key: str, window: str, timestamp: float) -> int:
+        """Events for a key in the named window ending at `timestamp`"""
+        state = self._keys.get(key)
+        if state is None:
+            return 0
+
+        i = self.window_index[window]
+        self._evict(state, i, int(timestamp // self.bucket_widths[i]))
+        return state[1 + i]
+
+    def counts(self, key: str, timestamp: float) -> Dict[str, int]:
+        """Events for a key in every window"""
+        return {name: self.count(key, name, timestamp) for name in self.windows}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _evict(self, state: list, i: int, bucket: int):
+        buckets = state[1 + len(self.bucket_widths) + i]
+        oldest = bucket - self.resolution + 1
+        while buckets and buckets[0] < oldest:
+            buckets.popleft()
+            state[1 + i] -= buckets.popleft()
+
+    @staticmethod
+    def _add_late(buckets: deque, bucket: int, count: int):
+        pairs = dict(zip(list(buckets)[::2], list(buckets)[1::2]))
+        pairs[bucket] = pairs.get(bucket, 0) + count
+        buckets.clear()
+        for entry in sorted(pairs.items()):
+            buckets.extend(entry)
+
+    def _expire_idle(self, timestamp: float):
+        while self._keys:
+            key, state = next(iter(self._keys.items()))
+            if timestamp - state[0] <= self.retention:
+                break
+            del self._keys[key]
+
+
+class SlidingWindowSketch:
+    """
+    Approximate per-key sliding-window counts in fixed memory
+
+    Same interface as SlidingWindowCounter for high-cardinality keys (busy
+    IP ranges, device fingerprints). Each window keeps a ring of
+    `resolution` count-min tables (depth x width) plus their running sum;
+    when time moves into a new bucket the expiring table is subtracted
+    from the sum and reused. Updates are conservative (only the cells at
+    the key's current minimum in that bucket's table grow), which keeps
+    every cell an upper bound for the keys hashed to it, so counts are
+    never underestimated within the bucket granularity.
+
+    Error bound: tables are sized as width = ceil(e * expected_events /
+    max_error) and depth = ceil(ln(1 / delta)), so with probability at
+    least 1 - delta a count exceeds the true count by at most
+    max_error * N / expected_events, where N is the number of events (all
+    keys) in that window. With the defaults and N = expected_events that
+    is at most 2 extra events; conservative updates usually do better.
+    """
+
+    def __init__(self, windows: Dict[str, float], resolution: int = 60,
+                 expected_events: int = 10_000, max_error: float = 2.0,
+                 delta: float = 0.05):
+        """
+        Args:
+            windows: Window name -> length in seconds
+            resolution: Buckets per window
+            expected_events: Events (all keys) expected in one window
+            max_error: Overestimate allowed at `expected_events` events
+            delta: Probability of exceeding the error bound
+        """
+        self.windows = dict(windows)
+        self.resolution = resolution
+        self.width = max(1, math.ceil(math.e * expected_events / max_error))
+        self.depth = max(1, math.ceil(math.log(1 / delta)))
+        self.bucket_widths = [length / resolution for length in self.windows.values()]
+        self.window_index = {name: i for i, name in enumerate(self.windows)}
+        self._rows = np.arange(self.depth)
+
+        # Per window: ring of tables, bucket id per slot, running sum
+        self._rings = [np.zeros((resolution, self.depth, self.width), dtype=np.int32)
+                       for _ in self.bucket_widths]
+        self._slot_buckets = [[None] * resolution for _ in self.bucket_widths]
+        self._totals = [np.zeros((self.depth, self.width), dtype=np.int32) for _ in self.bucket_widths]
+        self._current = [None for _ in self.bucket_widths]
+
+    def add(self, key: str, timestamp: float, count: int = 1):
+        """Record `count` events for a key at `timestamp` (epoch seconds)"""
+        cells = self._cells(key)
+
+        for i, width in enumerate(self.bucket_widths):
+            bucket = int(timestamp // width)
+            self._advance(i, bucket)
+            if bucket <= self._current[i] - self.resolution:
+                continue  # Older than the window
+
+            slot = self._slot(i, bucket)
+            table = self._rings[i][slot]
+            current = table[self._rows, cells]
+            raised = np.maximum(current, current.min() + count)
+            table[self._rows, cells] = raised
+            self._totals[i][self._rows, cells] += raised - current
+
+    def count(self, key: str, window: str, timestamp: float) -> int:
+        """Estimated events for a key in the named window ending at `timestamp`"""
+        i = self.window_index[window]
+        self._advance(i, int(timestamp // self.bucket_widths[i]))
+        return int(self._totals[i][self._rows, self._cells(key)].min())
+
+    def counts(self, key: str, timestamp: float) -> Dict[str, int]:
+        """Estimated events for a key in every window"""
+        return {name: self.count(key, name, timestamp) for name in self.windows}
+
+    def _cells(self, key: str) -> List[int]:
+        return [hash((row, key)) % self.width for row in range(self.depth)]
+
+    def _slot(self, i: int, bucket: int) -> int:
+        """Ring slot for a bucket, clearing it if it still holds an expired bucket"""
+        slot = bucket % self.resolution
+        if self._slot_buckets[i][slot] != bucket:
+            self._clear_slot(i, slot)
+            self._slot_buckets[i][slot] = bucket
+        return slot
+
+    def _advance(self, i: int, bucket: int):
+        """Drop buckets that left the window ending at `bucket`"""
+        current = self._current[i]
+        if current is not None and bucket <= current:
+            return
+
+        self._current[i] = bucket
+        oldest = bucket - self.resolution + 1
+        for slot, slot_bucket in enumerate(self._slot_buckets[i]):
+            if slot_bucket is not None and slot_bucket < oldest:
+                self._clear_slot(i, slot)
+
+    def _clear_slot(self, i: int, slot: int):
+        if self._slot_buckets[i][slot] is not None:
+            table = self._rings[i][slot]
+            self._totals[i] -= table
+            table[:] = 0
+        self._slot_buckets[i][slot] = None
+
+
 # ============================================================================
 # Fraud Detection Engine
 # ============================================================================
@@ -105,7 +327,74 @@ class UserProfile:
 class FraudDetectionEngine:
     """Main fraud detection engine"""
 
-    def __init__(self):
+    # Sliding windows tracked for every velocity dimension
+    VELOCITY_WINDOWS = {'minute': 60, 'hour': 3600, 'day': 86400}
+
+    # (count, risk) limits on the hourly window, highest first
+    VELOCITY_LIMITS = {
+        'user': [(5, 0.7), (3, 0.4)],
+        'ip': [(10, 0.8), (5, 0.5)],
+        'device': [(10, 0.7), (5, 0.4)]
+    }
+
+    # Amount rule: users without a profile are scored on the amount,
+    # others on the z-score against their average ((threshold, risk)
+    # pairs, highest first)
+    AMOUNT_RISK = {
+        'new_user': [(500, 0.6), (200, 0.4)],
+        'new_user_default': 0.2,
+        'no_average': 0.3,
+        'z_score': [(3.0, 0.9), (2.0, 0.6), (1.0, 0.3)],
+        'default': 0.1
+    }
+
+    # Behavioral rule scores and the limits that trigger them
+    BEHAVIOR_RISK = {
+        'new_user': 0.2,
+        'max_failed': 3,
+        'failure_rate_weight': 0.7,
+        'disputed': 0.8,
+        'min_account_age_days': 1,
+        'new_account': 0.4
+    }
+
+    # Weight of each rule in the overall score
+    RISK_WEIGHTS = {
+        'amount': 0.15,
+        'velocity': 0.20,
+        'location': 0.15,
+        'device': 0.10,
+        'behavioral': 0.15,
+        'payment_method': 0.10,
+        'address_mismatch': 0.10,
+        'cart_anomaly': 0.05,
+        'blocklist': 0.50  # Override if present
+    }
+
+    # (rule, score above which it flags, flag)
+    FLAG_RULES = [
+        ('amount', 0.5, 'unusual_amount'),
+        ('velocity', 0.5, 'high_velocity'),
+        ('location', 0.5, 'suspicious_location'),
+        ('device', 0.5, 'suspicious_device'),
+        ('behavioral', 0.5, 'abnormal_behavior'),
+        ('address_mismatch', 0.7, 'address_mismatch'),
+        ('cart_anomaly', 0.5, 'cart_anomaly')
+    ]
+
+    def __init__(self, velocity_sketch: Tuple[str, ...] = (), velocity_resolution: int = 60,
+                 velocity_sketch_events: int = 10_000):
+        """
+        Initialize engine
+
+        Args:
+            velocity_sketch: Velocity dimensions ('user', 'ip', 'device') to
+                track with count-min sketches instead of exact counters
+            velocity_resolution: Time buckets per velocity window
+            velocity_sketch_events: Events per hour expected in a sketched
+                dimension; sizes the sketches so hourly counts are at most
+                ~2 too high at that volume (see SlidingWindowSketch)
+        """
         self.transaction_history: List[Transaction] = []
         self.user_profiles: Dict[str, UserProfile] = {}
         self.blocked_ips: set = set()
@@ -113,8 +402,17 @@ class FraudDetectionEngine:
         self.high_risk_countries: set = {'XX', 'YY'}  # Mock data
 
         # Velocity tracking
-        self.user_transaction_times: Dict[str, deque] = defaultdict(lambda: deque(maxlen=100))
-        self.ip_transaction_times: Dict[str, deque] = defaultdict(lambda: deque(maxlen=100))
+        self.velocity = {
+            dimension: SlidingWindowSketch(
+                self.VELOCITY_WINDOWS, velocity_resolution, expected_events=velocity_sketch_events
+            ) if dimension in velocity_sketch else SlidingWindowCounter(
+                self.VELOCITY_WINDOWS, velocity_resolution
+            )
+            for dimension in self.VELOCITY_LIMITS
+        }
+
+        # Device fingerprint -> users with it among their common devices
+        self.device_users: Dict[str, set] = defaultdict(set)
 
         # Risk thresholds
         self.thresholds = {
@@ -132,7 +430,6 @@ class FraudDetectionEngine:
         """
         Perform comprehensive fraud check on a transaction
         """
-        flags = []
         risk_scores = {}
 
         # Run all fraud checks
@@ -145,64 +442,206 @@ class FraudDetectionEngine:
         risk_scores['address_mismatch'] = self._check_address_mismatch(transaction)
         risk_scores['cart_anomaly'] = self._check_cart_anomalies(transaction)
 
-        # Collect flags
-        if risk_scores['amount'] > 0.5:
-            flags.append('unusual_amount')
-        if risk_scores['velocity'] > 0.5:
-            flags.append('high_velocity')
-        if risk_scores['location'] > 0.5:
-            flags.append('suspicious_location')
-        if risk_scores['device'] > 0.5:
-            flags.append('suspicious_device')
-        if risk_scores['behavioral'] > 0.5:
-            flags.append('abnormal_behavior')
-        if risk_scores['address_mismatch'] > 0.7:
-            flags.append('address_mismatch')
-        if risk_scores['cart_anomaly'] > 0.5:
-            flags.append('cart_anomaly')
-
-        # Check blocklists
-        if transaction.ip_address in self.blocked_ips:
-            flags.append('blocked_ip')
-            risk_scores['blocklist'] = 1.0
-
-        if transaction.device_fingerprint in self.blocked_devices:
-            flags.append('blocked_device')
-            risk_scores['blocklist'] = 1.0
+        flags = self._collect_flags(transaction, risk_scores)
 
         # Calculate overall risk score (weighted average)
-        weights = {
-            'amount': 0.15,
-            'velocity': 0.20,
-            'location': 0.15,
-            'device': 0.10,
-            'behavioral': 0.15,
-            'payment_method': 0.10,
-            'address_mismatch': 0.10,
-            'cart_anomaly': 0.05,
-            'blocklist': 0.50  # Override if present
-        }
-
         overall_risk = 0.0
         total_weight = 0.0
 
         for factor, score in risk_scores.items():
-            weight = weights.get(factor, 0.1)
+            weight = self.RISK_WEIGHTS.get(factor, 0.1)
             overall_risk += score * weight
             total_weight += weight
 
         if total_weight > 0:
             overall_risk = overall_risk / total_weight
 
-        # Determine risk level and decision
-        risk_level = self._determine_risk_level(overall_risk)
-        decision = self._make_decision(overall_risk, flags)
+        return self._make_result(transaction, overall_risk, flags, risk_scores)
+
+    def check_transactions(self, transactions: List[Transaction],
+                           update_profiles: bool = True) -> List[FraudCheckResult]:
+        """
+        Score a batch of transactions
+
+        Results are identical to running the transactions one by one
+        through check_transaction (followed by update_user_profile when
+        `update_profiles` is set, as check_transaction_fraud does). The
+        batch is split into waves in which no user, IP or device occurs
+        twice; each wave looks every profile and velocity key up once,
+        evaluates the numeric rules over columns and applies its profile
+        updates in bulk before the next wave is scored. Sketch-backed
+        velocity dimensions share counters between keys and expire by
+        time, so their counts depend on the exact update order; with any
+        of them configured the batch is scored one transaction at a time.
+
+        Args:
+            transactions: Transactions in arrival order
+            update_profiles: Record each transaction (approved when the
+                decision is 'approve') after scoring
+
+        Returns:
+            FraudCheckResult per transaction, in input order
+        """
+        if not update_profiles:
+            return self._score_wave(transactions)
+
+        if any(isinstance(store, SlidingWindowSketch) for store in self.velocity.values()):
+            # One-transaction waves would pay the column setup per transaction
+            results = []
+            for transaction in transactions:
+                result = self.check_transaction(transaction)
+                self.update_user_profile(transaction, result.decision == 'approve')
+                results.append(result)
+            return results
+
+        results: List[Optional[FraudCheckResult]] = [None] * len(transactions)
+
+        for wave in self._batch_waves(transactions):
+            batch = [transactions[i] for i in wave]
+            wave_results = self._score_wave(batch)
+            self.update_user_profiles(batch, [r.decision == 'approve' for r in wave_results])
+
+            for i, result in zip(wave, wave_results):
+                results[i] = result
+
+        return results
+
+    def _batch_waves(self, transactions: List[Transaction]) -> List[List[int]]:
+        """Split a batch into waves without repeated users, IPs or devices"""
+        last_user: Dict[str, int] = {}
+        last_ip: Dict[str, int] = {}
+        last_device: Dict[str, int] = {}
+        waves: List[List[int]] = []
+
+        for i, t in enumerate(transactions):
+            wave = 1 + max(last_user.get(t.user_id, -1), last_ip.get(t.ip_address, -1),
+                           last_device.get(t.device_fingerprint, -1))
+
+            if wave == len(waves):
+                waves.append([])
+            waves[wave].append(i)
+
+            last_user[t.user_id] = last_ip[t.ip_address] = last_device[t.device_fingerprint] = wave
+
+        return waves
+
+    def _score_wave(self, transactions: List[Transaction]) -> List[FraudCheckResult]:
+        """Score transactions against the current state, column-wise"""
+        n = len(transactions)
+        if n == 0:
+            return []
+
+        profiles = [self.user_profiles.get(t.user_id) for t in transactions]
+        known = np.array([p is not None for p in profiles])
+
+        def profile_column(field: str) -> np.ndarray:
+            return np.array([getattr(p, field) if p else 0 for p in profiles], dtype=np.float64)
+
+        amount = np.array([t.amount for t in transactions], dtype=np.float64)
+        average = profile_column('average_transaction')
+
+        # Amount anomaly (z-score against the user's average)
+        rules = self.AMOUNT_RISK
+        z_score = np.abs(amount - average) / np.maximum(average, 1.0)
+        amount_risk = np.select(
+            [~known & (amount > limit) for limit, _ in rules['new_user']]
+            + [~known, average == 0]
+            + [z_score > limit for limit, _ in rules['z_score']],
+            [risk for _, risk in rules['new_user']]
+            + [rules['new_user_default'], rules['no_average']]
+            + [risk for _, risk in rules['z_score']],
+            rules['default']
+        )
+
+        # Velocity per dimension
+        velocity_risk = np.zeros(n)
+        now = [t.timestamp.timestamp() for t in transactions]
+
+        for dimension, limits in self.VELOCITY_LIMITS.items():
+            store = self.velocity[dimension]
+            recent = np.array([
+                store.count(self._velocity_key(t, dimension), 'hour', ts)
+                for t, ts in zip(transactions, now)
+            ])
+            risk = np.select([recent > limit for limit, _ in limits], [r for _, r in limits], 0.0)
+            np.maximum(velocity_risk, risk, out=velocity_risk)
+
+        # Behavioral patterns
+        failed = profile_column('failed_transactions')
+        account_age_days = np.array([
+            (t.timestamp - p.first_transaction).days if p else 0
+            for t, p in zip(transactions, profiles)
+        ])
+        rules = self.BEHAVIOR_RISK
+        failure_rate = failed / np.maximum(profile_column('total_transactions'), 1)
+        behavioral_risk = np.where(failed > rules['max_failed'],
+                                   failure_rate * rules['failure_rate_weight'], 0.0)
+        behavioral_risk = np.where(profile_column('disputed_transactions') > 0,
+                                   np.maximum(behavioral_risk, rules['disputed']), behavioral_risk)
+        behavioral_risk = np.where(account_age_days < rules['min_account_age_days'],
+                                   np.maximum(behavioral_risk, rules['new_account']), behavioral_risk)
+        behavioral_risk = np.where(known, behavioral_risk, rules['new_user'])
+
+        columns = {
+            'amount': amount_risk,
+            'velocity': velocity_risk,
+            'location': np.array([self._check_location(t) for t in transactions]),
+            'device': np.array([self._check_device(t) for t in transactions]),
+            'behavioral': behavioral_risk,
+            'payment_method': np.array([self._check_payment_method(t) for t in transactions]),
+            'address_mismatch': np.array([self._check_address_mismatch(t) for t in transactions]),
+            'cart_anomaly': np.array([self._check_cart_anomalies(t) for t in transactions])
+        }
+
+        # Weighted average, accumulated in the same order as check_transaction
+        overall = np.zeros(n)
+        total_weight = 0.0
+        for factor, column in columns.items():
+            weight = self.RISK_WEIGHTS[factor]
+            overall += column * weight
+            total_weight += weight
+
+        blocked = np.array([
+            t.ip_address in self.blocked_ips or t.device_fingerprint in self.blocked_devices
+            for t in transactions
+        ])
+        overall = np.where(
+            blocked,
+            (overall + 1.0 * self.RISK_WEIGHTS['blocklist']) / (total_weight + self.RISK_WEIGHTS['blocklist']),
+            overall / total_weight
+        )
+
+        results = []
+        for i, transaction in enumerate(transactions):
+            risk_scores = {factor: float(column[i]) for factor, column in columns.items()}
+            flags = self._collect_flags(transaction, risk_scores)
+            results.append(self._make_result(transaction, float(overall[i]), flags, risk_scores))
+
+        return results
+
+    def _collect_flags(self, transaction: Transaction, risk_scores: Dict[str, float]) -> List[str]:
+        """Flags raised by the rule scores and blocklists (adds the blocklist score)"""
+        flags = [flag for factor, limit, flag in self.FLAG_RULES if risk_scores[factor] > limit]
+
+        # Check blocklists
+        if transaction.ip_address in self.blocked_ips:
+            flags.append('blocked_ip')
+            risk_scores['blocklist'] = 1.0
+
+        if transaction.device_fingerprint in self.blocked_devices:
+            flags.append('blocked_device')
+            risk_scores['blocklist'] = 1.0
+
+        return flags
 
+    def _make_result(self, transaction: Transaction, overall_risk: float,
+                     flags: List[str], risk_scores: Dict[str, float]) -> FraudCheckResult:
+        """Determine risk level and decision"""
         return FraudCheckResult(
             transaction_id=transaction.transaction_id,
             risk_score=overall_risk,
-            risk_level=risk_level,
-            decision=decision,
+            risk_level=self._determine_risk_level(overall_risk),
+            decision=self._make_decision(overall_risk, flags),
             flags=flags,
             details=risk_scores
         )
@@ -213,60 +652,54 @@ class FraudDetectionEngine:
 
     def _check_amount_anomaly(self, transaction: Transaction) -> float:
         """Check if transaction amount is anomalous for this user"""
+        rules = self.AMOUNT_RISK
+
         if transaction.user_id not in self.user_profiles:
             # New user - higher risk for large amounts
-            if transaction.amount > 500:
-                return 0.6
-            elif transaction.amount > 200:
-                return 0.4
-            return 0.2
+            for limit, risk in rules['new_user']:
+                if transaction.amount > limit:
+                    return risk
+            return rules['new_user_default']
 
         profile = self.user_profiles[transaction.user_id]
 
         if profile.average_transaction == 0:
-            return 0.3
+            return rules['no_average']
 
         # Z-score based anomaly detection
         deviation = abs(transaction.amount - profile.average_transaction)
         z_score = deviation / max(profile.average_transaction, 1.0)
 
-        if z_score > 3.0:
-            return 0.9
-        elif z_score > 2.0:
-            return 0.6
-        elif z_score > 1.0:
-            return 0.3
+        for limit, risk in rules['z_score']:
+            if z_score > limit:
+                return risk
 
-        return 0.1
+        return rules['default']
 
     def _check_velocity(self, transaction: Transaction) -> float:
-        """Check transaction velocity (frequency)"""
-        now = transaction.timestamp
-
-        # Check user velocity
-        user_times = self.user_transaction_times[transaction.user_id]
-        recent_user_txns = sum(1 for t in user_times if (now - t).total_seconds() < 3600)
-
-        # Check IP velocity
-        ip_times = self.ip_transaction_times[transaction.ip_address]
-        recent_ip_txns = sum(1 for t in ip_times if (now - t).total_seconds() < 3600)
+        """Check transaction velocity (frequency) per user, IP and device"""
+        now = transaction.timestamp.timestamp()
 
         risk = 0.0
 
-        # More than 5 transactions per hour for user
-        if recent_user_txns > 5:
-            risk = max(risk, 0.7)
-        elif recent_user_txns > 3:
-            risk = max(risk, 0.4)
-
-        # More than 10 transactions per hour from same IP
-        if recent_ip_txns > 10:
-            risk = max(risk, 0.8)
-        elif recent_ip_txns > 5:
-            risk = max(risk, 0.5)
+        for dimension, limits in self.VELOCITY_LIMITS.items():
+            recent = self.velocity[dimension].count(self._velocity_key(transaction, dimension), 'hour', now)
+            for limit, limit_risk in limits:
+                if recent > limit:
+                    risk = max(risk, limit_risk)
+                    break
 
         return risk
 
+    @staticmethod
+    def _velocity_key(transaction: Transaction, dimension: str) -> str:
+        """Velocity key of a transaction for one dimension"""
+        if dimension == 'user':
+            return transaction.user_id
+        if dimension == 'ip':
+            return transaction.ip_address
+        return transaction.device_fingerprint
+
     def _check_location(self, transaction: Transaction) -> float:
         """Check geographical location risk"""
         risk = 0.0
@@ -307,10 +740,7 @@ class FraudDetectionEngine:
         # New user with suspicious device pattern
         else:
             # Check if device has been used by multiple users
-            device_users = sum(
-                1 for p in self.user_profiles.values()
-                if transaction.device_fingerprint in p.common_devices
-            )
+            device_users = len(self.device_users.get(transaction.device_fingerprint, ()))
 
             if device_users > 5:
                 risk = max(risk, 0.6)
@@ -319,26 +749,27 @@ class FraudDetectionEngine:
 
     def _check_behavioral_patterns(self, transaction: Transaction) -> float:
         """Check for unusual behavioral patterns"""
+        rules = self.BEHAVIOR_RISK
         risk = 0.0
 
         if transaction.user_id not in self.user_profiles:
-            return 0.2  # Slight risk for new users
+            return rules['new_user']  # Slight risk for new users
 
         profile = self.user_profiles[transaction.user_id]
 
         # Check if user has history of failed transactions
-        if profile.failed_transactions > 3:
+        if profile.failed_transactions > rules['max_failed']:
             failure_rate = profile.failed_transactions / max(profile.total_transactions, 1)
-            risk = max(risk, failure_rate * 0.7)
+            risk = max(risk, failure_rate * rules['failure_rate_weight'])
 
         # Check disputed transactions
         if profile.disputed_transactions > 0:
-            risk = max(risk, 0.8)
+            risk = max(risk, rules['disputed'])
 
         # Check account age
         account_age_days = (transaction.timestamp - profile.first_transaction).days
-        if account_age_days < 1:
-            risk = max(risk, 0.4)
+        if account_age_days < rules['min_account_age_days']:
+            risk = max(risk, rules['new_account'])
 
         return risk
 
@@ -447,46 +878,63 @@ class FraudDetectionEngine:
 
     def update_user_profile(self, transaction: Transaction, approved: bool = True):
         """Update user profile with transaction data"""
-        user_id = transaction.user_id
-
-        if user_id not in self.user_profiles:
-            self.user_profiles[user_id] = UserProfile(
-                user_id=user_id,
-                total_transactions=0,
-                total_spent=0.0,
-                average_transaction=0.0,
-                transaction_frequency=0.0,
-                common_locations=[],
-                common_devices=[],
-                first_transaction=transaction.timestamp,
-                last_transaction=transaction.timestamp,
-                failed_transactions=0,
-                disputed_transactions=0
-            )
-
-        profile = self.user_profiles[user_id]
+        self.update_user_profiles([transaction], [approved])
 
-        if approved:
-            profile.total_transactions += 1
-            profile.total_spent += transaction.amount
-            profile.average_transaction = profile.total_spent / profile.total_transactions
-            profile.last_transaction = transaction.timestamp
-
-            # Update common locations
-            country = transaction.billing_address.get('country', 'US')
-            if country not in profile.common_locations:
-                profile.common_locations.append(country)
-
-            # Update common devices
-            if transaction.device_fingerprint not in profile.common_devices:
-                profile.common_devices.append(transaction.device_fingerprint)
+    def update_user_profiles(self, transactions: List[Transaction], approved: List[bool]):
+        """
+        Update user profiles with a batch of transactions
 
-        else:
-            profile.failed_transactions += 1
+        Gives the same state as calling update_user_profile for each
+        transaction in order.
 
-        # Track transaction times for velocity checks
-        self.user_transaction_times[user_id].append(transaction.timestamp)
-        self.ip_transaction_times[transaction.ip_address].append(transaction.timestamp)
+        Args:
+            transactions: Transactions in arrival order
+            approved: Approval flag per transaction
+        """
+        profiles = self.user_profiles
+
+        for transaction, ok in zip(transactions, approved):
+            user_id = transaction.user_id
+            profile = profiles.get(user_id)
+
+            if profile is None:
+                profile = profiles[user_id] = UserProfile(
+                    user_id=user_id,
+                    total_transactions=0,
+                    total_spent=0.0,
+                    average_transaction=0.0,
+                    transaction_frequency=0.0,
+                    common_locations=[],
+                    common_devices=[],
+                    first_transaction=transaction.timestamp,
+                    last_transaction=transaction.timestamp,
+                    failed_transactions=0,
+                    disputed_transactions=0
+                )
+
+            if ok:
+                profile.total_transactions += 1
+                profile.total_spent += transaction.amount
+                profile.average_transaction = profile.total_spent / profile.total_transactions
+                profile.last_transaction = transaction.timestamp
+
+                # Update common locations
+                country = transaction.billing_address.get('country', 'US')
+                if country not in profile.common_locations:
+                    profile.common_locations.append(country)
+
+                # Update common devices
+                if transaction.device_fingerprint not in profile.common_devices:
+                    profile.common_devices.append(transaction.device_fingerprint)
+                    self.device_users[transaction.device_fingerprint].add(user_id)
+
+            else:
+                profile.failed_transactions += 1
+
+        # Count the transactions for velocity checks
+        for dimension, store in self.velocity.items():
+            for transaction in transactions:
+                store.add(self._velocity_key(transaction, dimension), transaction.timestamp.timestamp())
 
     def report_dispute(self, transaction_id: str, user_id: str):
         """Report a disputed/fraudulent transaction"""
@@ -533,18 +981,9 @@ class FraudDetectionEngine:
 _fraud_engine = FraudDetectionEngine()
 
 
-def check_transaction_fraud(transaction_data: Dict) -> str:
-    """
-    Check a transaction for fraud (returns JSON string for TypeScript)
-
-    Args:
-        transaction_data: Dictionary with transaction details
-
-    Returns:
-        JSON string with fraud check results
-    """
-    # Parse transaction data
-    transaction = Transaction(
+def _parse_transaction(transaction_data: Dict) -> Transaction:
+    """Build a Transaction from a TypeScript payload"""
+    return Transaction(
         transaction_id=transaction_data['transaction_id'],
         user_id=transaction_data['user_id'],
         amount=float(transaction_data['amount']),
@@ -558,6 +997,20 @@ def check_transaction_fraud(transaction_data: Dict) -> str:
         cart_items=transaction_data.get('cart_items', [])
     )
 
+
+def check_transaction_fraud(transaction_data: Dict) -> str:
+    """
+    Check a transaction for fraud (returns JSON string for TypeScript)
+
+    Args:
+        transaction_data: Dictionary with transaction details
+
+    Returns:
+        JSON string with fraud check results
+    """
+    # Parse transaction data
+    transaction = _parse_transaction(transaction_data)
+
     # Perform fraud check
     result = _fraud_engine.check_transaction(transaction)
 
@@ -570,6 +1023,24 @@ def check_transaction_fraud(transaction_data: Dict) -> str:
     return json.dumps(result.to_dict())
 
 
+def check_transactions_fraud(transactions_data: List[Dict]) -> str:
+    """
+    Check a batch of transactions for fraud (returns JSON string for TypeScript)
+
+    Same results as calling check_transaction_fraud for each transaction
+    in order, with a single JSON round trip.
+
+    Args:
+        transactions_data: List of transaction dictionaries
+
+    Returns:
+        JSON string with a list of fraud check results
+    """
+    transactions = [_parse_transaction(data) for data in transactions_data]
+    results = _fraud_engine.check_transactions(transactions)
+    return json.dumps([result.to_dict() for result in results])
+
+
 def report_fraud(transaction_id: str, user_id: str) -> str:
     """Report a fraudulent transaction"""
     _fraud_engine.report_dispute(transaction_id, user_id)
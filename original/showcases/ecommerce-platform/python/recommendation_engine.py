@@ -2,7 +2,8 @@
 Product Recommendation Engine
 
 Machine learning-based product recommendation system featuring:
-- Collaborative filtering (user-based and item-based)
+- Collaborative filtering (user-based and item-based) on sparse matrices
+- Batched recommendations for many users
 - Content-based filtering
 - Hybrid recommendation approach
 - Real-time personalization
@@ -35,6 +36,9 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Tuple, Optional, Set
 from collections import defaultdict, Counter
 
+import numpy as np
+from scipy import sparse
+
 
 # ============================================================================
 # Data Structures
@@ -101,154 +105,490 @@ class Recommendation:
         }
 
 
+# ============================================================================
+# Sparse Interaction Matrix
+# ============================================================================
+
+class InteractionMatrix:
+    """
+    Sparse user x item interaction weights
+
+    Merged interactions live in a CSR matrix (user rows) and its CSC copy
+    (item columns). New interactions go to a small pending overlay that
+    compact() merges in bulk, automatically once `compact_threshold`
+    entries are pending. Squared row norms and per-item user counts are
+    maintained as interactions arrive, so scoring never re-sums a row,
+    and pairs new since the last compaction are listed so co-occurrence
+    products can include them without compacting.
+    """
+
+    def __init__(self, compact_threshold: int = 100_000):
+        self.compact_threshold = compact_threshold
+
+        self.user_index: Dict[str, int] = {}
+        self.item_index: Dict[str, int] = {}
+        self.user_ids: List[str] = []
+        self.item_ids: List[str] = []
+
+        self.csr = sparse.csr_matrix((0, 0))
+        self.csc = self.csr.tocsc()
+        self._binary: Optional[sparse.csr_matrix] = None
+
+        self.pending_by_user: Dict[int, Dict[int, float]] = defaultdict(dict)
+        self.pending_by_item: Dict[int, Dict[int, float]] = defaultdict(dict)
+        self.pending_count = 0
+        self.new_pairs: List[Tuple[int, int]] = []
+
+        self.row_norms_sq = np.zeros(16)
+        self.item_counts = np.zeros(16, dtype=np.int64)
+
+    @property
+    def num_users(self) -> int:
+        return len(self.user_ids)
+
+    @property
+    def num_items(self) -> int:
+        return len(self.item_ids)
+
+    def add(self, user_id: str, product_id: str, weight: float) -> Tuple[int, int, bool]:
+        """Set a user-product weight; returns (user, item, is_new_pair)"""
+        u = self._index(user_id, self.user_index, self.user_ids)
+        i = self._index(product_id, self.item_index, self.item_ids)
+
+        if self.num_users > len(self.row_norms_sq):
+            self.row_norms_sq = np.concatenate([self.row_norms_sq, np.zeros(len(self.row_norms_sq))])
+        if self.num_items > len(self.item_counts):
+            self.item_counts = np.concatenate([self.item_counts, np.zeros(len(self.item_counts), dtype=np.int64)])
+
+        old = self.get(u, i)
+        is_new = old is None
+        if is_new:
+            self.item_counts[i] += 1
+            self.new_pairs.append((u, i))
+            old = 0.0
+        self.row_norms_sq[u] += weight * weight - old * old
+
+        if i not in self.pending_by_user[u]:
+            self.pending_count += 1
+        self.pending_by_user[u][i] = weight
+        self.pending_by_item[i][u] = weight
+
+        if self.pending_count >= self.compact_threshold:
+            self.compact()
+
+        return u, i, is_new
+
+    def get(self, u: int, i: int) -> Optional[float]:
+        """Weight of a pair, or None if the user never interacted with the item"""
+        pending = self.pending_by_user.get(u)
+        if pending and i in pending:
+            return pending[i]
+
+        if u < self.csr.shape[0]:
+            start, end = self.csr.indptr[u], self.csr.indptr[u + 1]
+            pos = start + np.searchsorted(self.csr.indices[start:end], i)
+            if pos < end and self.csr.indices[pos] == i:
+                return float(self.csr.data[pos])
+
+        return None
+
+    def user_row(self, u: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(item indices, weights) of a user"""
+        return self._merged(self.csr, u, self.pending_by_user.get(u))
+
+    def item_column(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(user indices, weights) of an item"""
+        return self._merged(self.csc, i, self.pending_by_item.get(i))
+
+    def compact(self):
+        """Merge pending interactions into the CSR/CSC matrices"""
+        shape = (self.num_users, self.num_items)
+        if not self.pending_count and self.csr.shape == shape:
+            return
+
+        rows = np.fromiter((u for u, items in self.pending_by_user.items() for _ in items), dtype=np.int64)
+        cols = np.fromiter((i for items in self.pending_by_user.values() for i in items), dtype=np.int64)
+        vals = np.fromiter((w for items in self.pending_by_user.values() for w in items.values()), dtype=np.float64)
+
+        # Pending weights replace merged ones
+        base = self.csr.tocoo()
+        base_keys = base.row.astype(np.int64) * shape[1] + base.col
+        keep = ~np.isin(base_keys, rows * shape[1] + cols)
+
+        self.csr = sparse.csr_matrix(
+            (np.concatenate([base.data[keep], vals]),
+             (np.concatenate([base.row[keep], rows]), np.concatenate([base.col[keep], cols]))),
+            shape=shape
+        )
+        self.csr.sort_indices()
+        self.csc = self.csr.tocsc()
+        self.csc.sort_indices()
+        self._binary = None
+
+        self.pending_by_user.clear()
+        self.pending_by_item.clear()
+        self.pending_count = 0
+        self.new_pairs.clear()
+
+        # Refresh the incremental caches exactly
+        self.row_norms_sq[:shape[0]] = np.bincount(
+            np.repeat(np.arange(shape[0]), np.diff(self.csr.indptr)),
+            weights=self.csr.data ** 2, minlength=shape[0]
+        )
+        self.item_counts[:shape[1]] = np.diff(self.csc.indptr)
+
+    def binary(self) -> Tuple[sparse.csr_matrix, sparse.csr_matrix]:
+        """
+        0/1 user x item matrices for co-occurrence products, without compacting
+
+        Returns:
+            (merged pairs, pairs new since the last compaction); both have
+            every current item as a column, and their sum is the full matrix
+        """
+        if self._binary is None:
+            self._binary = sparse.csr_matrix(
+                (np.ones(len(self.csr.data), dtype=np.int32), self.csr.indices, self.csr.indptr),
+                shape=self.csr.shape
+            )
+        shape = (self.csr.shape[0], self.num_items)
+        merged = self._binary
+        if merged.shape != shape:
+            merged = sparse.csr_matrix((merged.data, merged.indices, merged.indptr), shape=shape)
+
+        rows, cols = np.array(self.new_pairs, dtype=np.int64).reshape(-1, 2).T
+        new = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(self.num_users, self.num_items)
+        )
+        return merged, new
+
+    @staticmethod
+    def _index(key: str, index: Dict[str, int], ids: List[str]) -> int:
+        position = index.get(key)
+        if position is None:
+            position = index[key] = len(ids)
+            ids.append(key)
+        return position
+
+    @staticmethod
+    def _merged(matrix: sparse.spmatrix, position: int,
+                pending: Optional[Dict[int, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Compressed row/column slice with pending weights applied"""
+        if position < len(matrix.indptr) - 1:
+            start, end = matrix.indptr[position], matrix.indptr[position + 1]
+            indices, values = matrix.indices[start:end].astype(np.int64), matrix.data[start:end]
+        else:
+            indices, values = np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        if pending:
+            pending_indices = np.fromiter(pending.keys(), dtype=np.int64, count=len(pending))
+            pending_values = np.fromiter(pending.values(), dtype=np.float64, count=len(pending))
+            keep = ~np.isin(indices, pending_indices)
+            indices = np.concatenate([indices[keep], pending_indices])
+            values = np.concatenate([values[keep], pending_values])
+
+        return indices, values
+
+
+def _top_k(indices: np.ndarray, scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k highest scores, best first (ties by lower index)"""
+    if len(scores) > k:
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates = np.flatnonzero(scores >= kth)
+    else:
+        candidates = np.arange(len(scores))
+
+    order = np.lexsort((indices[candidates], -scores[candidates]))
+    return candidates[order[:k]]
+
+
 # ============================================================================
 # Collaborative Filtering Engine
 # ============================================================================
 
 class CollaborativeFilter:
-    """User-based and item-based collaborative filtering"""
-
-    def __init__(self):
-        self.user_item_matrix: Dict[str, Dict[str, float]] = defaultdict(dict)
-        self.item_user_matrix: Dict[str, Dict[str, float]] = defaultdict(dict)
-        self.user_similarities: Dict[str, Dict[str, float]] = {}
-        self.item_similarities: Dict[str, Dict[str, float]] = {}
+    """
+    User-based and item-based collaborative filtering
+
+    Interactions are stored in an InteractionMatrix. User similarity is
+    cosine over the users sharing an item with the target, gathered from
+    item columns, with cached row norms. Item similarity (Jaccard over user
+    sets) is served from a top-`neighbors` table filled by sparse
+    co-occurrence products (B^T B on the 0/1 matrix, merged pairs plus the
+    pending overlay, so refreshing never compacts). New user-item pairs
+    only mark the items they touch dirty (writes never refresh); all dirty
+    rows are recomputed in one batch on the next read that needs one of
+    them or that finds `refresh_batch` of them dirty. The table keeps
+    co-occurrence counts, so Jaccard scores always use current item
+    counts, but it is approximate: when an item's user count grows, rows
+    that list it are rescored, not re-ranked, so an item just outside such
+    a row's top-`neighbors` can stay out until the row is refreshed
+    (refresh_neighbors(product_ids) forces it).
+    """
+
+    # Similar users / items considered when recommending
+    CANDIDATE_NEIGHBORS = 20
+
+    def __init__(self, neighbors: int = 50, refresh_batch: int = 256,
+                 compact_threshold: int = 100_000, refresh_chunk: int = 1024):
+        self.matrix = InteractionMatrix(compact_threshold)
+        self.neighbors = max(neighbors, self.CANDIDATE_NEIGHBORS)
+        self.refresh_batch = refresh_batch
+        self.refresh_chunk = refresh_chunk
+
+        # Top-k neighbour table: item ids (-1 padded) and co-occurrence counts
+        self.neighbor_ids = np.full((16, self.neighbors), -1, dtype=np.int32)
+        self.neighbor_shared = np.zeros((16, self.neighbors), dtype=np.int32)
+        self.dirty_items: Set[int] = set()
 
     def add_interaction(self, user_id: str, product_id: str, weight: float = 1.0):
         """Add user-product interaction"""
-        self.user_item_matrix[user_id][product_id] = weight
-        self.item_user_matrix[product_id][user_id] = weight
+        u, i, is_new = self.matrix.add(user_id, product_id, weight)
+
+        # Co-occurrences of the new item with the user's other items changed
+        if is_new:
+            items, _ = self.matrix.user_row(u)
+            self.dirty_items.update(items.tolist())
 
     def compute_user_similarity(self, user_a: str, user_b: str) -> float:
         """Compute cosine similarity between two users"""
-        items_a = set(self.user_item_matrix.get(user_a, {}).keys())
-        items_b = set(self.user_item_matrix.get(user_b, {}).keys())
-
-        common_items = items_a & items_b
-
-        if not common_items:
+        a = self.matrix.user_index.get(user_a)
+        b = self.matrix.user_index.get(user_b)
+        if a is None or b is None:
             return 0.0
 
-        # Cosine similarity
-        dot_product = sum(
-            self.user_item_matrix[user_a][item] * self.user_item_matrix[user_b][item]
-            for item in common_items
-        )
-
-        magnitude_a = math.sqrt(sum(
-            v * v for v in self.user_item_matrix[user_a].values()
-        ))
+        items_a, weights_a = self.matrix.user_row(a)
+        items_b, weights_b = self.matrix.user_row(b)
+        _, pos_a, pos_b = np.intersect1d(items_a, items_b, assume_unique=True, return_indices=True)
 
-        magnitude_b = math.sqrt(sum(
-            v * v for v in self.user_item_matrix[user_b].values()
-        ))
+        if not len(pos_a):
+            return 0.0
 
-        if magnitude_a == 0 or magnitude_b == 0:
+        magnitude = math.sqrt(self.matrix.row_norms_sq[a]) * math.sqrt(self.matrix.row_norms_sq[b])
+        if magnitude == 0:
             return 0.0
 
-        return dot_product / (magnitude_a * magnitude_b)
+        return float(np.dot(weights_a[pos_a], weights_b[pos_b])) / magnitude
 
     def compute_item_similarity(self, item_a: str, item_b: str) -> float:
         """Compute Jaccard similarity between two items based on user overlap"""
-        users_a = set(self.item_user_matrix.get(item_a, {}).keys())
-        users_b = set(self.item_user_matrix.get(item_b, {}).keys())
-
-        if not users_a or not users_b:
+        a = self.matrix.item_index.get(item_a)
+        b = self.matrix.item_index.get(item_b)
+        if a is None or b is None:
             return 0.0
 
-        intersection = len(users_a & users_b)
-        union = len(users_a | users_b)
+        users_a, _ = self.matrix.item_column(a)
+        users_b, _ = self.matrix.item_column(b)
+        if not len(users_a) or not len(users_b):
+            return 0.0
 
-        return intersection / union if union > 0 else 0.0
+        intersection = len(np.intersect1d(users_a, users_b, assume_unique=True))
+        return intersection / (len(users_a) + len(users_b) - intersection)
 
     def get_similar_users(self, user_id: str, k: int = 10) -> List[Tuple[str, float]]:
         """Get k most similar users"""
-        if user_id not in self.user_item_matrix:
+        u = self.matrix.user_index.get(user_id)
+        if u is None:
             return []
 
-        similarities = []
-        for other_user in self.user_item_matrix:
-            if other_user != user_id:
-                sim = self.compute_user_similarity(user_id, other_user)
-                if sim > 0:
-                    similarities.append((other_user, sim))
-
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        return similarities[:k]
+        users, similarities = self._user_similarities(u)
+        order = _top_k(users, similarities, k)
+        return [(self.matrix.user_ids[users[j]], float(similarities[j])) for j in order]
 
     def get_similar_items(self, product_id: str, k: int = 10) -> List[Tuple[str, float]]:
         """Get k most similar items"""
-        if product_id not in self.item_user_matrix:
+        i = self.matrix.item_index.get(product_id)
+        if i is None:
             return []
 
-        similarities = []
-        for other_item in self.item_user_matrix:
-            if other_item != product_id:
-                sim = self.compute_item_similarity(product_id, other_item)
-                if sim > 0:
-                    similarities.append((other_item, sim))
+        if k > self.neighbors:
+            # Beyond the table: compute the full row
+            _, items, shared = next(self._cooccurrence(np.array([i])))
+            similarities = self._jaccard(i, items, shared)
+            order = _top_k(items, similarities, k)
+            items, similarities = items[order], similarities[order]
+        else:
+            self._refresh_if_needed([i])
+            items, similarities = self._neighbor_row(i, k)
 
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        return similarities[:k]
+        return [(self.matrix.item_ids[j], float(s)) for j, s in zip(items, similarities)]
 
     def recommend_user_based(self, user_id: str, k: int = 10) -> List[Recommendation]:
         """User-based collaborative filtering recommendations"""
-        if user_id not in self.user_item_matrix:
+        u = self.matrix.user_index.get(user_id)
+        if u is None:
             return []
 
-        # Get similar users
-        similar_users = self.get_similar_users(user_id, k=20)
+        # Similar users
+        users, similarities = self._user_similarities(u)
+        order = _top_k(users, similarities, self.CANDIDATE_NEIGHBORS)
 
-        # Get products from similar users
-        user_items = set(self.user_item_matrix[user_id].keys())
-        candidate_scores = defaultdict(float)
+        # Products from similar users, weighted by similarity
+        rows = [self.matrix.user_row(users[j]) for j in order]
+        if not rows:
+            return []
+        items = np.concatenate([row[0] for row in rows])
+        scores = np.concatenate([row[1] * similarities[j] for row, j in zip(rows, order)])
 
-        for similar_user, similarity in similar_users:
-            for item, rating in self.user_item_matrix[similar_user].items():
-                if item not in user_items:
-                    candidate_scores[item] += similarity * rating
+        candidates, inverse = np.unique(items, return_inverse=True)
+        candidate_scores = np.bincount(inverse, weights=scores)
 
-        # Sort by score
-        recommendations = [
-            Recommendation(item, score, 'user-based-cf')
-            for item, score in sorted(
-                candidate_scores.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:k]
-        ]
+        own_items, _ = self.matrix.user_row(u)
+        keep = ~np.isin(candidates, own_items)
+        candidates, candidate_scores = candidates[keep], candidate_scores[keep]
 
-        return recommendations
+        return [
+            Recommendation(self.matrix.item_ids[candidates[j]], float(candidate_scores[j]), 'user-based-cf')
+            for j in _top_k(candidates, candidate_scores, k)
+        ]
 
     def recommend_item_based(self, user_id: str, k: int = 10) -> List[Recommendation]:
         """Item-based collaborative filtering recommendations"""
-        if user_id not in self.user_item_matrix:
-            return []
+        return self.recommend_item_based_batch([user_id], k).get(user_id, [])
 
-        user_items = self.user_item_matrix[user_id]
-        candidate_scores = defaultdict(float)
+    def recommend_item_based_batch(self, user_ids: List[str],
+                                   k: int = 10) -> Dict[str, List[Recommendation]]:
+        """
+        Item-based recommendations for many users at once
 
-        # For each item the user has interacted with
-        for item, rating in user_items.items():
-            # Get similar items
-            similar_items = self.get_similar_items(item, k=20)
+        Scores are one sparse product of the users' interaction rows with
+        the neighbour table rows of the items they touched.
+        """
+        users = [(user_id, self.matrix.user_index[user_id])
+                 for user_id in dict.fromkeys(user_ids) if user_id in self.matrix.user_index]
+        if not users:
+            return {}
+
+        rows = [self.matrix.user_row(u) for _, u in users]
+        touched = np.unique(np.concatenate([items for items, _ in rows]))
+        self._refresh_if_needed(touched.tolist())
+
+        # Users x touched items
+        interactions = sparse.csr_matrix(
+            (np.concatenate([weights for _, weights in rows]),
+             (np.repeat(np.arange(len(rows)), [len(items) for items, _ in rows]),
+              np.searchsorted(touched, np.concatenate([items for items, _ in rows])))),
+            shape=(len(rows), len(touched))
+        )
 
-            # Score similar items
-            for similar_item, similarity in similar_items:
-                if similar_item not in user_items:
-                    candidate_scores[similar_item] += similarity * rating
+        # Touched items x all items: each item's closest neighbours
+        neighbor_rows = [self._neighbor_row(i, self.CANDIDATE_NEIGHBORS) for i in touched]
+        similarity = sparse.csr_matrix(
+            (np.concatenate([s for _, s in neighbor_rows]),
+             (np.repeat(np.arange(len(touched)), [len(n) for n, _ in neighbor_rows]),
+              np.concatenate([n for n, _ in neighbor_rows]))),
+            shape=(len(touched), self.matrix.num_items)
+        )
 
-        # Sort by score
-        recommendations = [
-            Recommendation(item, score, 'item-based-cf')
-            for item, score in sorted(
-                candidate_scores.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:k]
-        ]
+        scores = (interactions @ similarity).tocsr()
+        results = {}
 
-        return recommendations
+        for r, (user_id, _) in enumerate(users):
+            start, end = scores.indptr[r], scores.indptr[r + 1]
+            candidates = scores.indices[start:end].astype(np.int64)
+            candidate_scores = scores.data[start:end]
+
+            keep = ~np.isin(candidates, rows[r][0])
+            candidates, candidate_scores = candidates[keep], candidate_scores[keep]
+
+            results[user_id] = [
+                Recommendation(self.matrix.item_ids[candidates[j]], float(candidate_scores[j]), 'item-based-cf')
+                for j in _top_k(candidates, candidate_scores, k)
+            ]
+
+        return results
+
+    def refresh_neighbors(self, product_ids: Optional[List[str]] = None):
+        """
+        Recompute neighbour table rows with sparse co-occurrence products
+
+        Args:
+            product_ids: Items to refresh (default: all dirty items)
+        """
+        if product_ids is None:
+            targets = np.array(sorted(self.dirty_items), dtype=np.int64)
+            self.dirty_items.clear()
+        else:
+            targets = np.array([self.matrix.item_index[p] for p in product_ids
+                                if p in self.matrix.item_index], dtype=np.int64)
+            self.dirty_items.difference_update(targets.tolist())
+
+        if len(self.neighbor_ids) < self.matrix.num_items:
+            grow = max(self.matrix.num_items, 2 * len(self.neighbor_ids)) - len(self.neighbor_ids)
+            self.neighbor_ids = np.vstack([self.neighbor_ids, np.full((grow, self.neighbors), -1, dtype=np.int32)])
+            self.neighbor_shared = np.vstack([self.neighbor_shared, np.zeros((grow, self.neighbors), dtype=np.int32)])
+
+        for i, items, shared in self._cooccurrence(targets):
+            order = _top_k(items, self._jaccard(i, items, shared), self.neighbors)
+            self.neighbor_ids[i] = -1
+            self.neighbor_ids[i, :len(order)] = items[order]
+            self.neighbor_shared[i, :len(order)] = shared[order]
+
+    def _refresh_if_needed(self, items: List[int]):
+        """Refresh dirty rows if `items` need one or the batch is full"""
+        if not self.dirty_items:
+            return
+        if len(self.dirty_items) >= self.refresh_batch or not self.dirty_items.isdisjoint(items):
+            self.refresh_neighbors()
+
+    def _cooccurrence(self, targets: np.ndarray):
+        """Yield (item, other items, shared users) per target, in chunks of sparse products"""
+        merged, new = self.matrix.binary()
+
+        for start in range(0, len(targets), self.refresh_chunk):
+            chunk = targets[start:start + self.refresh_chunk]
+
+            # (chunk x users) from merged columns plus pending users
+            columns = [self.matrix.item_column(i)[0] for i in chunk]
+            users = sparse.csr_matrix(
+                (np.ones(sum(len(c) for c in columns), dtype=np.int32),
+                 np.concatenate(columns),
+                 np.concatenate([[0], np.cumsum([len(c) for c in columns])])),
+                shape=(len(chunk), self.matrix.num_users)
+            )
+
+            # (chunk x users) @ (users x items), split at the merged rows
+            counts = (users[:, :merged.shape[0]] @ merged + users @ new).tocsr()
+
+            for row, i in enumerate(chunk):
+                begin, end = counts.indptr[row], counts.indptr[row + 1]
+                items = counts.indices[begin:end].astype(np.int64)
+                shared = counts.data[begin:end]
+                keep = items != i
+                yield i, items[keep], shared[keep]
+
+    def _jaccard(self, i: int, items: np.ndarray, shared: np.ndarray) -> np.ndarray:
+        counts = self.matrix.item_counts
+        return shared / (counts[i] + counts[items] - shared)
+
+    def _neighbor_row(self, i: int, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k table neighbours of an item, rescored with current item counts"""
+        if i >= len(self.neighbor_ids):
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        valid = self.neighbor_ids[i] >= 0
+        items = self.neighbor_ids[i][valid]
+        similarities = self._jaccard(i, items, self.neighbor_shared[i][valid])
+        order = _top_k(items, similarities, k)
+        return items[order], similarities[order]
+
+    def _user_similarities(self, u: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Cosine similarity to every user sharing an item with u (excluding u, > 0 only)"""
+        items, weights = self.matrix.user_row(u)
+        columns = [self.matrix.item_column(i) for i in items]
+        if not columns:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        users = np.concatenate([c[0] for c in columns])
+        products = np.concatenate([c[1] * w for c, w in zip(columns, weights)])
+
+        candidates, inverse = np.unique(users, return_inverse=True)
+        dots = np.bincount(inverse, weights=products)
+        magnitudes = np.sqrt(self.matrix.row_norms_sq[candidates]) * math.sqrt(self.matrix.row_norms_sq[u])
+
+        similarities = np.divide(dots, magnitudes, out=np.zeros_like(dots), where=magnitudes > 0)
+        keep = (candidates != u) & (similarities > 0)
+        return candidates[keep], similarities[keep]
 
 
 # ============================================================================
@@ -376,6 +716,7 @@ class HybridRecommendationEngine:
         self.collaborative_filter = CollaborativeFilter()
         self.content_filter = ContentBasedFilter()
         self.interactions: List[UserInteraction] = []
+        self.interactions_by_user: Dict[str, List[UserInteraction]] = defaultdict(list)
         self.trending_products: List[str] = []
 
     def add_product(self, product_dict: Dict):
@@ -409,13 +750,14 @@ class HybridRecommendationEngine:
 
         interaction = UserInteraction(user_id, product_id, event_type, timestamp, weight)
         self.interactions.append(interaction)
+        self.interactions_by_user[user_id].append(interaction)
 
         # Update collaborative filter
         self.collaborative_filter.add_interaction(user_id, product_id, weight)
 
     def get_user_interactions(self, user_id: str) -> List[UserInteraction]:
         """Get all interactions for a user"""
-        return [i for i in self.interactions if i.user_id == user_id]
+        return list(self.interactions_by_user.get(user_id, []))
 
     def recommend_products(self, user_id: str, count: int = 10,
                           strategy: str = 'hybrid') -> List[Dict]:
@@ -428,33 +770,59 @@ class HybridRecommendationEngine:
         - 'content': Use only content-based filtering
         - 'trending': Return trending products
         """
-        recommendations = []
+        return self.recommend_for_users([user_id], count, strategy)[user_id]
+
+    def recommend_for_users(self, user_ids: List[str], count: int = 10,
+                            strategy: str = 'hybrid') -> Dict[str, List[Dict]]:
+        """
+        Get product recommendations for many users at once
 
+        Same results as recommend_products per user; the item-based
+        collaborative scores for the whole batch come from one sparse
+        product against the item neighbour table.
+
+        Returns:
+            Recommendations keyed by user id
+        """
+        item_cf_recs = {}
         if strategy == 'collaborative' or strategy == 'hybrid':
-            # Try user-based collaborative filtering
-            user_cf_recs = self.collaborative_filter.recommend_user_based(user_id, count)
-            recommendations.extend(user_cf_recs)
-
-            # Try item-based collaborative filtering
-            item_cf_recs = self.collaborative_filter.recommend_item_based(user_id, count)
-            recommendations.extend(item_cf_recs)
-
-        if strategy == 'content' or strategy == 'hybrid':
-            # Content-based recommendations
-            user_interactions = self.get_user_interactions(user_id)
-            content_recs = self.content_filter.recommend_by_user_profile(
-                user_interactions, count
-            )
-            recommendations.extend(content_recs)
+            item_cf_recs = self.collaborative_filter.recommend_item_based_batch(user_ids, count)
+
+        results = {}
+
+        for user_id in user_ids:
+            recommendations = []
+
+            if strategy == 'collaborative' or strategy == 'hybrid':
+                # User-based collaborative filtering
+                user_cf_recs = self.collaborative_filter.recommend_user_based(user_id, count)
+                recommendations.extend(user_cf_recs)
 
-        if strategy == 'trending':
-            # Return trending products
-            recommendations.extend([
-                Recommendation(pid, 1.0, 'trending')
-                for pid in self.trending_products[:count]
-            ])
+                # Item-based collaborative filtering
+                recommendations.extend(item_cf_recs.get(user_id, []))
 
-        # Deduplicate and combine scores
+            if strategy == 'content' or strategy == 'hybrid':
+                # Content-based recommendations
+                user_interactions = self.get_user_interactions(user_id)
+                content_recs = self.content_filter.recommend_by_user_profile(
+                    user_interactions, count
+                )
+                recommendations.extend(content_recs)
+
+            if strategy == 'trending':
+                # Return trending products
+                recommendations.extend([
+                    Recommendation(pid, 1.0, 'trending')
+                    for pid in self.trending_products[:count]
+                ])
+
+            results[user_id] = self._combine_recommendations(recommendations, count)
+
+        return results
+
+    @staticmethod
+    def _combine_recommendations(recommendations: List[Recommendation], count: int) -> List[Dict]:
+        """Deduplicate, sum scores per product and keep the top `count`"""
         product_scores = defaultdict(lambda: {'score': 0.0, 'reasons': []})
 
         for rec in recommendations:
@@ -462,7 +830,7 @@ class HybridRecommendationEngine:
             product_scores[rec.product_id]['reasons'].append(rec.reason)
 
         # Sort by combined score
-        final_recommendations = sorted(
+        return sorted(
             [
                 {
                     'product_id': pid,
@@ -475,8 +843,6 @@ class HybridRecommendationEngine:
             reverse=True
         )[:count]
 
-        return final_recommendations
-
     def get_similar_products(self, product_id: str, count: int = 5) -> List[Dict]:
         """Get similar products using multiple methods"""
         recommendations = []
@@ -493,27 +859,7 @@ class HybridRecommendationEngine:
         ])
 
         # Combine scores
-        product_scores = defaultdict(lambda: {'score': 0.0, 'reasons': []})
-
-        for rec in recommendations:
-            product_scores[rec.product_id]['score'] += rec.score
-            product_scores[rec.product_id]['reasons'].append(rec.reason)
-
-        # Sort by combined score
-        final_recommendations = sorted(
-            [
-                {
-                    'product_id': pid,
-                    'score': data['score'],
-                    'reasons': list(set(data['reasons']))
-                }
-                for pid, data in product_scores.items()
-            ],
-            key=lambda x: x['score'],
-            reverse=True
-        )[:count]
-
-        return final_recommendations
+        return self._combine_recommendations(recommendations, count)
 
     def update_trending_products(self, days: int = 7, top_n: int = 50):
         """Update trending products based on recent interactions"""
@@ -620,6 +966,12 @@ def recommend_products(user_id: str, count: int = 10, strategy: str = 'hybrid')
     return json.dumps(recommendations)
 
 
+def recommend_for_users(user_ids: List[str], count: int = 10, strategy: str = 'hybrid') -> str:
+    """Get recommendations for a batch of users (returns JSON string for TypeScript)"""
+    recommendations = _recommendation_engine.recommend_for_users(user_ids, count, strategy)
+    return json.dumps(recommendations)
+
+
 def get_similar_products(product_id: str, count: int = 5) -> str:
     """Get similar products (returns JSON string for TypeScript)"""
     similar = _recommendation_engine.get_similar_products(product_id, count)
@@ -0,0 +1,112 @@
+"""
+E-Commerce Platform - Fraud Detection Tests
+
+Checks that batch scoring gives the same results as scoring transactions
+one by one.
+"""
+
+import unittest
+import random
+import sys
+import os
+
+# Add python directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'python'))
+
+from fraud_detection import FraudDetectionEngine, Transaction
+from datetime import datetime, timedelta
+
+
+def make_transactions(count: int, seed: int = 0):
+    """Random transactions with repeated users, IPs and devices"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    countries = ['US', 'US', 'US', 'CA', 'XX']
+    transactions = []
+
+    for i in range(count):
+        billing_country = rng.choice(countries)
+        shipping_country = billing_country if rng.random() < 0.8 else rng.choice(countries)
+        transactions.append(Transaction(
+            transaction_id=f"txn_{i}",
+            user_id=f"user_{rng.randrange(40)}",
+            amount=round(rng.lognormvariate(4.5, 1.0), 2),
+            currency='USD',
+            payment_method=rng.choice(['credit_card', 'credit_card', 'paypal', 'gift_card', 'crypto', 'wire']),
+            billing_address={'country': billing_country, 'state': 'CA', 'city': 'SF'},
+            shipping_address={
+                'country': shipping_country,
+                'state': rng.choice(['CA', 'NY']),
+                'city': 'SF',
+                'addressLine1': rng.choice(['1 Main St', 'PO Box 12'])
+            },
+            ip_address=f"10.0.0.{rng.randrange(25)}",
+            device_fingerprint=f"device_{rng.randrange(30)}",
+            timestamp=start + timedelta(seconds=i * rng.randrange(1, 400)),
+            cart_items=[
+                {'price': rng.choice([20, 600]), 'quantity': rng.choice([1, 2, 12])}
+                for _ in range(rng.randrange(1, 4))
+            ]
+        ))
+
+    return transactions
+
+
+class TestBatchScoring(unittest.TestCase):
+    """check_transactions must match check_transaction + update_user_profile"""
+
+    def assert_batch_matches_sequential(self, **engine_args):
+        transactions = make_transactions(1500)
+
+        sequential = FraudDetectionEngine(**engine_args)
+        batched = FraudDetectionEngine(**engine_args)
+        # Rejections build up failed transactions for the behavioral rule
+        for engine in (sequential, batched):
+            for ip_address in ('10.0.0.3', '10.0.0.4', '10.0.0.5'):
+                engine.block_ip(ip_address)
+            engine.block_device('device_7')
+
+        expected = []
+        for transaction in transactions[:500]:
+            result = sequential.check_transaction(transaction)
+            sequential.update_user_profile(transaction, result.decision == 'approve')
+            expected.append(result.to_dict())
+        actual = [result.to_dict() for result in batched.check_transactions(transactions[:500])]
+        self.assertEqual(actual, expected)
+
+        # Disputes change the behavioral score of later batches
+        for engine in (sequential, batched):
+            engine.report_dispute('txn_1', 'user_1')
+            engine.report_dispute('txn_2', 'user_2')
+
+        for transaction in transactions[500:]:
+            result = sequential.check_transaction(transaction)
+            sequential.update_user_profile(transaction, result.decision == 'approve')
+            expected.append(result.to_dict())
+        actual += [result.to_dict() for result in batched.check_transactions(transactions[500:])]
+        self.assertEqual(actual, expected)
+
+        self.assertEqual(batched.get_fraud_statistics(), sequential.get_fraud_statistics())
+
+    def test_exact_counters(self):
+        """Column-wise waves give the sequential results"""
+        self.assert_batch_matches_sequential()
+
+    def test_sketch_counters(self):
+        """Sketch-backed velocity gives the sequential results"""
+        self.assert_batch_matches_sequential(velocity_sketch=('ip',))
+
+    def test_score_without_updates(self):
+        """update_profiles=False scores against unchanged state"""
+        transactions = make_transactions(200, seed=1)
+
+        engine = FraudDetectionEngine()
+        engine.check_transactions(transactions[:100])
+
+        expected = [engine.check_transaction(t).to_dict() for t in transactions[100:]]
+        actual = [r.to_dict() for r in engine.check_transactions(transactions[100:], update_profiles=False)]
+        self.assertEqual(actual, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,16 +7,19 @@ This module is imported directly by TypeScript with <1ms overhead.
 Key Features:
 - Feature computation and transformation
 - Online and offline feature serving
+- Columnar online store with binary-search point-in-time lookups
 - Feature versioning and lineage
 - Real-time feature computation
 """
 
 import time
 import random
+from bisect import bisect_right
 from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 import hashlib
+import numpy as np
 
 
 @dataclass
@@ -51,6 +54,216 @@ class FeatureValue:
     version: str
 
 
+class OnlineFeatureTable:
+    """
+    Columnar online store for one feature group.
+
+    Every write fills one row: an integer epoch timestamp (microseconds)
+    plus one value per feature, each feature in its own column. A column
+    is int64 while its values are ints, is promoted to float64 once a
+    float arrives (ints written to it read back as floats), and falls back
+    to object only when a non-numeric value arrives. A presence mask
+    per column marks missing (None) values. Each entity keeps the
+    timestamps and row numbers of its last `max_versions` writes in sorted
+    lists, so a point-in-time read is a binary search and a batch read
+    gathers whole columns at once; rows of evicted versions are reused.
+    """
+
+    def __init__(self, features: List[Feature], initial_capacity: int = 1024, max_versions: int = 16):
+        self.feature_names = [f.name for f in features]
+        self.max_versions = max_versions
+
+        # Column kind: None (no value yet), 'int', 'float' or 'object'
+        self.kinds: Dict[str, Optional[str]] = {
+            f.name: None if f.feature_type == "numeric" else "object" for f in features
+        }
+        self.columns: Dict[str, np.ndarray] = {
+            name: self._empty_column(name, initial_capacity) for name in self.feature_names
+        }
+        self.present: Dict[str, np.ndarray] = {
+            name: np.zeros(initial_capacity, dtype=bool) for name in self.feature_names
+        }
+        self.timestamps = np.empty(initial_capacity, dtype=np.int64)
+        self.num_rows = 0
+        self._free_rows: List[int] = []
+
+        self.entity_slots: Dict[str, int] = {}
+        self._entity_times: List[List[int]] = []
+        self._entity_rows: List[List[int]] = []
+        self._latest_row = np.empty(64, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.entity_slots)
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self.entity_slots
+
+    def write(self, entity_id: str, values: Dict[str, Any], timestamp_us: int) -> int:
+        """
+        Append a version of an entity's features.
+
+        Args:
+            entity_id: Entity identifier
+            values: Feature name -> value (missing features are stored as None)
+            timestamp_us: Computation time, epoch microseconds
+
+        Returns:
+            Row number
+        """
+        if self._free_rows:
+            row = self._free_rows.pop()
+        else:
+            row = self.num_rows
+            if row == len(self.timestamps):
+                self._grow_rows(2 * row)
+            self.num_rows += 1
+
+        self.timestamps[row] = timestamp_us
+        for name in self.feature_names:
+            value = values.get(name)
+            self.present[name][row] = value is not None
+            if value is None:
+                continue
+
+            kind = self._promote(self.kinds[name], self._kind_of(value))
+            if kind != self.kinds[name]:
+                self._convert(name, kind)
+            self.columns[name][row] = value
+
+        slot = self.entity_slots.get(entity_id)
+        if slot is None:
+            slot = self.entity_slots[entity_id] = len(self._entity_times)
+            self._entity_times.append([])
+            self._entity_rows.append([])
+            if slot == len(self._latest_row):
+                self._latest_row = np.concatenate((self._latest_row, np.empty(slot, dtype=np.int64)))
+
+        times = self._entity_times[slot]
+        rows = self._entity_rows[slot]
+        if not times or timestamp_us >= times[-1]:
+            times.append(timestamp_us)
+            rows.append(row)
+        else:
+            # Late write: keep the per-entity lists sorted
+            position = bisect_right(times, timestamp_us)
+            times.insert(position, timestamp_us)
+            rows.insert(position, row)
+
+        # Cap the history; the oldest version's row is reused
+        if len(rows) > self.max_versions:
+            times.pop(0)
+            self._free_rows.append(rows.pop(0))
+        self._latest_row[slot] = rows[-1]
+
+        return row
+
+    def lookup_rows(self, entity_ids: List[str], timestamp: Optional[int] = None) -> np.ndarray:
+        """
+        Row holding each entity's features as of a point in time.
+
+        Args:
+            entity_ids: Entity identifiers
+            timestamp: Epoch seconds (inclusive); None for the latest version
+
+        Returns:
+            Row per entity, -1 if the entity is unknown or has no retained
+            version at that time
+        """
+        slots = np.fromiter(
+            (self.entity_slots.get(entity_id, -1) for entity_id in entity_ids),
+            dtype=np.int64, count=len(entity_ids)
+        )
+
+        if timestamp is None:
+            rows = np.full(len(slots), -1, dtype=np.int64)
+            known = slots >= 0
+            rows[known] = self._latest_row[slots[known]]
+            return rows
+
+        # Versions computed within the requested second are included
+        cutoff = (int(timestamp) + 1) * 1_000_000
+        rows = np.full(len(slots), -1, dtype=np.int64)
+        for i, slot in enumerate(slots.tolist()):
+            if slot < 0:
+                continue
+            position = bisect_right(self._entity_times[slot], cutoff - 1)
+            if position:
+                rows[i] = self._entity_rows[slot][position - 1]
+        return rows
+
+    def gather(self, rows: np.ndarray) -> Dict[str, List[Any]]:
+        """
+        Feature columns for the given rows (None where row is -1).
+
+        Returns:
+            Feature name -> list of values, one per row
+        """
+        found = rows >= 0
+        safe_rows = np.where(found, rows, 0)
+
+        columns = {}
+        for name in self.feature_names:
+            values = self.columns[name][safe_rows].astype(object)
+            values[~(found & self.present[name][safe_rows])] = None
+            columns[name] = values.tolist()
+        return columns
+
+    def history_size(self, entity_id: str) -> int:
+        """Number of retained versions for an entity"""
+        slot = self.entity_slots.get(entity_id)
+        return 0 if slot is None else len(self._entity_rows[slot])
+
+    @staticmethod
+    def _kind_of(value: Any) -> str:
+        if isinstance(value, (bool, np.bool_)):
+            return "object"
+        if isinstance(value, (int, np.integer)):
+            return "int" if -2 ** 63 <= value < 2 ** 63 else "object"
+        if isinstance(value, (float, np.floating)):
+            return "float"
+        return "object"
+
+    @staticmethod
+    def _promote(current: Optional[str], kind: str) -> str:
+        """Column kind able to hold both the stored values and a new one"""
+        if current is None or current == kind:
+            return kind
+        if {current, kind} == {"int", "float"}:
+            return "float"
+        return "object"
+
+    def _dtype(self, name: str):
+        return {"int": np.int64, "object": object}.get(self.kinds[name], np.float64)
+
+    def _empty_column(self, name: str, capacity: int) -> np.ndarray:
+        return np.empty(capacity, dtype=self._dtype(name))
+
+    def _convert(self, name: str, kind: str) -> None:
+        """Switch a column to another kind, keeping the stored values"""
+        previous = self.kinds[name]
+        self.kinds[name] = kind
+        if previous is None:
+            self.columns[name] = self._empty_column(name, len(self.timestamps))
+        else:
+            # int64 -> float64 promotes in place; int64/float64 -> object
+            # turns each value back into int/float
+            self.columns[name] = self.columns[name].astype(self._dtype(name))
+
+    def _grow_rows(self, capacity: int) -> None:
+        timestamps = np.empty(capacity, dtype=np.int64)
+        timestamps[:self.num_rows] = self.timestamps[:self.num_rows]
+        self.timestamps = timestamps
+
+        for name, column in self.columns.items():
+            grown = self._empty_column(name, capacity)
+            grown[:self.num_rows] = column[:self.num_rows]
+            self.columns[name] = grown
+
+            present = np.zeros(capacity, dtype=bool)
+            present[:self.num_rows] = self.present[name][:self.num_rows]
+            self.present[name] = present
+
+
 class FeatureStore:
     """
     Feature store for managing ML features.
@@ -65,7 +278,7 @@ class FeatureStore:
 
     def __init__(self):
         self.feature_groups: Dict[str, FeatureGroup] = {}
-        self.online_store: Dict[str, Dict[str, List[FeatureValue]]] = {}  # {feature_group: {entity_id: [values]}}
+        self.online_store: Dict[str, OnlineFeatureTable] = {}  # {feature_group: columnar table}
         self.offline_store: Dict[str, List[Dict[str, Any]]] = {}  # {feature_group: [records]}
         self.transformations: Dict[str, Callable] = {}
 
@@ -177,7 +390,7 @@ class FeatureStore:
 
         # Initialize storage
         if online:
-            self.online_store[name] = {}
+            self.online_store[name] = OnlineFeatureTable(feature_objects)
         if offline:
             self.offline_store[name] = []
 
@@ -236,25 +449,19 @@ class FeatureStore:
         if not group.online_enabled:
             raise ValueError(f"Feature group {feature_group} is not online-enabled")
 
-        # Check if features exist for entity
-        if feature_group not in self.online_store:
-            self.online_store[feature_group] = {}
+        table = self.online_store[feature_group]
 
-        if entity_id not in self.online_store[feature_group]:
+        if entity_id not in table:
             # Compute features on-demand
             features = self._compute_features_on_demand(feature_group, entity_id)
         else:
-            # Get cached features
-            feature_values = self.online_store[feature_group][entity_id]
-
-            # Apply point-in-time filtering if timestamp provided
-            if timestamp:
-                feature_values = [
-                    fv for fv in feature_values
-                    if self._parse_timestamp(fv.computed_at) <= timestamp
-                ]
-
-            features = {fv.feature_name: fv.value for fv in feature_values}
+            # Latest version at or before the timestamp (binary search)
+            rows = table.lookup_rows([entity_id], timestamp or None)
+            if rows[0] < 0:
+                features = {}
+            else:
+                columns = table.gather(rows)
+                features = {name: values[0] for name, values in columns.items()}
 
         return {
             "feature_group": feature_group,
@@ -265,6 +472,60 @@ class FeatureStore:
             "source": "online_store"
         }
 
+    def get_features_batch(
+        self,
+        feature_group: str,
+        entity_ids: List[str],
+        timestamp: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Get features for many entities at once (online serving).
+
+        Results are columnar: one list per feature, aligned with entity_ids.
+        Unknown entities are computed on demand, as in get_features().
+
+        Args:
+            feature_group: Feature group name
+            entity_ids: Entity identifiers
+            timestamp: Optional point-in-time timestamp (epoch seconds)
+
+        Returns:
+            Feature columns
+        """
+        if feature_group not in self.feature_groups:
+            raise ValueError(f"Feature group {feature_group} not found")
+
+        group = self.feature_groups[feature_group]
+        if not group.online_enabled:
+            raise ValueError(f"Feature group {feature_group} is not online-enabled")
+
+        table = self.online_store[feature_group]
+
+        missing = [entity_id for entity_id in dict.fromkeys(entity_ids) if entity_id not in table]
+        for entity_id in missing:
+            self._compute_features_on_demand(feature_group, entity_id)
+
+        # Freshly computed entities are served as of now
+        rows = table.lookup_rows(entity_ids, timestamp or None)
+        if timestamp and missing:
+            fresh = table.lookup_rows(missing)
+            computed = dict(zip(missing, fresh.tolist()))
+            for i, entity_id in enumerate(entity_ids):
+                if entity_id in computed:
+                    rows[i] = computed[entity_id]
+
+        return {
+            "feature_group": feature_group,
+            "entity_type": group.entity_type,
+            "entity_ids": entity_ids,
+            "feature_names": table.feature_names,
+            "features": table.gather(rows),
+            "found": (rows >= 0).tolist(),
+            "computed_on_demand": len(missing),
+            "timestamp": timestamp or int(time.time()),
+            "source": "online_store"
+        }
+
     def compute_features(
         self,
         feature_group: str,
@@ -289,7 +550,8 @@ class FeatureStore:
         computed_features = {}
         feature_values = []
 
-        now = datetime.utcnow().isoformat()
+        now_us = time.time_ns() // 1000
+        now = datetime.utcfromtimestamp(now_us / 1_000_000).isoformat()
 
         for feature in group.features:
             try:
@@ -312,9 +574,11 @@ class FeatureStore:
 
         # Update online store
         if group.online_enabled:
-            if feature_group not in self.online_store:
-                self.online_store[feature_group] = {}
-            self.online_store[feature_group][entity_id] = feature_values
+            self.online_store[feature_group].write(
+                entity_id,
+                {fv.feature_name: fv.value for fv in feature_values},
+                now_us
+            )
 
         # Update offline store
         if group.offline_enabled:
@@ -538,11 +802,6 @@ class FeatureStore:
         result = self.compute_features(feature_group, entity_id, raw_data)
         return result["features"]
 
-    def _parse_timestamp(self, timestamp_str: str) -> int:
-        """Parse timestamp string to epoch"""
-        dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-        return int(dt.timestamp())
-
 
 # Global feature store instance
 featureStore = FeatureStore()
@@ -6,15 +6,21 @@ This module is imported directly by TypeScript with <1ms overhead.
 
 Key Features:
 - Real-time inference
+- Dynamic micro-batching of concurrent requests
 - Batch inference with optimizations
 - Streaming inference for large inputs
 - Model caching and warmup
+- Memory-budgeted model residency (LRU/LFU eviction, pinning, prefetch)
 - GPU acceleration (simulated)
 """
 
+import asyncio
+import threading
 import time
 import random
-from typing import Dict, List, Optional, Any, Union
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import numpy as np
@@ -54,6 +60,397 @@ class ModelCache:
     avg_latency_ms: float
     cached_in_memory: bool
     warmup_completed: bool
+    size_bytes: int = 0
+    pinned: bool = False
+
+
+class Histogram:
+    """Power-of-two bucketed histogram for queue depths and batch sizes"""
+
+    def __init__(self, max_bucket: int = 1024):
+        self.bounds = [1]
+        while self.bounds[-1] < max_bucket:
+            self.bounds.append(self.bounds[-1] * 2)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0
+        self.sum = 0
+        self.max = 0
+
+    def observe(self, value: int) -> None:
+        """Record one observation"""
+        index = 0
+        while index < len(self.bounds) and value > self.bounds[index]:
+            index += 1
+        self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Buckets keyed by upper bound ("le_N"), plus summary stats"""
+        buckets = {f"le_{bound}": count for bound, count in zip(self.bounds, self.counts)}
+        buckets[f"gt_{self.bounds[-1]}"] = self.counts[-1]
+        return {
+            "buckets": buckets,
+            "count": self.total,
+            "mean": round(self.sum / self.total, 2) if self.total else 0,
+            "max": self.max
+        }
+
+
+class DynamicBatcher:
+    """
+    Per-model request queue that coalesces concurrent predictions.
+
+    A batch is flushed when it reaches max_batch_size or when its oldest
+    request has waited max_wait_ms. At most max_inflight batches run at
+    once; while they run, new requests keep accumulating, so batches grow
+    automatically under load.
+    """
+
+    def __init__(
+        self,
+        engine: "InferenceEngine",
+        model_name: str,
+        version: Optional[str],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        max_inflight: int = 1
+    ):
+        self.engine = engine
+        self.model_name = model_name
+        self.version = version
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self.loop = asyncio.get_running_loop()
+        self._pending: List[tuple] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_scheduled = False
+        self._inflight = asyncio.Semaphore(max_inflight)
+
+        self.queue_depth = Histogram()
+        self.batch_size = Histogram(max_bucket=max(max_batch_size, 1))
+        self.num_batches = 0
+        self.num_requests = 0
+
+    async def submit(self, input_data: Any) -> tuple:
+        """
+        Queue one input and wait for its result.
+
+        Returns:
+            (prediction, confidence, probabilities)
+        """
+        future = self.loop.create_future()
+        self._pending.append((input_data, future))
+        self.num_requests += 1
+        self.queue_depth.observe(len(self._pending))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._trigger()
+        elif self._timer is None and not self._flush_scheduled:
+            self._timer = self.loop.call_later(self.max_wait_ms / 1000, self._trigger)
+
+        return await future
+
+    def _trigger(self) -> None:
+        """Schedule a flush (size or deadline reached)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._pending and not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.loop.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        """Run one batch and resolve its callers' futures"""
+        async with self._inflight:
+            self._flush_scheduled = False
+
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+
+            # Re-arm for whatever is still queued behind this batch
+            if len(self._pending) >= self.max_batch_size:
+                self._trigger()
+            elif self._pending and self._timer is None:
+                self._timer = self.loop.call_later(self.max_wait_ms / 1000, self._trigger)
+
+            if not batch:
+                return
+
+            self.num_batches += 1
+            self.batch_size.observe(len(batch))
+
+            inputs = [input_data for input_data, _ in batch]
+            try:
+                results = await self.loop.run_in_executor(
+                    None, self.engine._run_batch_inference, self.model_name, inputs
+                )
+            except Exception as e:
+                results = [e] * len(batch)
+
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue-depth and batch-size histograms"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "requests": self.num_requests,
+            "batches": self.num_batches,
+            "pending": len(self._pending),
+            "queue_depth": self.queue_depth.to_dict(),
+            "batch_size": self.batch_size.to_dict()
+        }
+
+
+class ModelResidencyManager:
+    """
+    Keeps loaded models within a memory budget.
+
+    Eviction is size-aware GreedyDual: every resident model has a priority
+    `clock + value / size`, where value is 1 under the "lru" policy and the
+    hit count under "lfu". The lowest-priority unpinned model is evicted
+    first and the clock advances to its priority, so models that have not
+    been touched for a while age out and large models have to earn their
+    memory. Loads are single-flight: concurrent requests for a cold model
+    share one load.
+    """
+
+    def __init__(
+        self,
+        memory_budget_bytes: int,
+        policy: str = "lru",
+        prefetch_workers: int = 2
+    ):
+        if policy not in ("lru", "lfu"):
+            raise ValueError(f"Unknown eviction policy: {policy}")
+
+        self.memory_budget_bytes = memory_budget_bytes
+        self.policy = policy
+        self.models: "OrderedDict[str, ModelCache]" = OrderedDict()
+        self.used_bytes = 0
+
+        self._priority: Dict[str, float] = {}
+        self._hits: Dict[str, int] = {}
+        self._pinned: set = set()
+        self._clock = 0.0
+        self._loading: Dict[str, Future] = {}
+        self._lock = threading.RLock()
+        self._prefetch_pool = ThreadPoolExecutor(
+            max_workers=prefetch_workers,
+            thread_name_prefix="model-prefetch"
+        )
+
+        self.loads = 0
+        self.evictions = 0
+        self.coalesced_loads = 0
+
+    def get_or_load(self, model_key: str, loader: Callable[[], ModelCache]) -> ModelCache:
+        """
+        Return a resident model, loading it at most once.
+
+        Args:
+            model_key: "name:version" key
+            loader: Builds the ModelCache entry (called outside the lock)
+
+        Returns:
+            Resident model entry
+        """
+        entry, future, owner = self._claim(model_key)
+        if entry is not None:
+            return entry
+        if owner:
+            self._run_load(model_key, loader, future)
+        return future.result()
+
+    async def get_or_load_async(self, model_key: str, loader: Callable[[], ModelCache]) -> ModelCache:
+        """Async variant of get_or_load(); loads run in the default executor"""
+        entry, future, owner = self._claim(model_key)
+        if entry is not None:
+            return entry
+        if owner:
+            asyncio.get_running_loop().run_in_executor(None, self._run_load, model_key, loader, future)
+        return await asyncio.wrap_future(future)
+
+    def prefetch(self, model_key: str, loader: Callable[[], ModelCache]) -> Future:
+        """
+        Start loading a model in the background.
+
+        Returns:
+            Future resolving to the model entry
+        """
+        entry, future, owner = self._claim(model_key, count_hit=False)
+        if entry is not None:
+            done: Future = Future()
+            done.set_result(entry)
+            return done
+        if owner:
+            self._prefetch_pool.submit(self._run_load, model_key, loader, future)
+        return future
+
+    def pin(self, model_key: str) -> None:
+        """Never evict this model (it need not be resident yet)"""
+        with self._lock:
+            self._pinned.add(model_key)
+            if model_key in self.models:
+                self.models[model_key].pinned = True
+
+    def unpin(self, model_key: str) -> None:
+        """Make a pinned model evictable again"""
+        with self._lock:
+            self._pinned.discard(model_key)
+            if model_key in self.models:
+                self.models[model_key].pinned = False
+
+    def evict(self, model_key: str) -> bool:
+        """
+        Drop a model regardless of its pin.
+
+        Returns:
+            True if the model was resident
+        """
+        with self._lock:
+            self._pinned.discard(model_key)
+            return self._remove(model_key)
+
+    def clear(self) -> int:
+        """Drop every model; returns how many were resident"""
+        with self._lock:
+            count = len(self.models)
+            for model_key in list(self.models):
+                self._remove(model_key)
+            self._pinned.clear()
+            return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Memory usage and eviction counters"""
+        with self._lock:
+            return {
+                "policy": self.policy,
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "used_bytes": self.used_bytes,
+                "utilization": round(self.used_bytes / self.memory_budget_bytes, 4)
+                if self.memory_budget_bytes else 0,
+                "resident_models": len(self.models),
+                "pinned_models": sorted(self._pinned),
+                "loads": self.loads,
+                "coalesced_loads": self.coalesced_loads,
+                "evictions": self.evictions,
+                "loading": sorted(self._loading)
+            }
+
+    def _claim(
+        self, model_key: str, count_hit: bool = True
+    ) -> Tuple[Optional[ModelCache], Optional[Future], bool]:
+        """
+        Register interest in a model.
+
+        The resident entry is read under the lock so a concurrent eviction
+        cannot remove it between the check and the caller's use.
+
+        Returns:
+            (entry, None, False) if resident, else (None, load future,
+            whether the caller must perform the load)
+        """
+        with self._lock:
+            entry = self.models.get(model_key)
+            if entry is not None:
+                if count_hit:
+                    self._touch(model_key)
+                return entry, None, False
+
+            future = self._loading.get(model_key)
+            if future is not None:
+                self.coalesced_loads += 1
+                return None, future, False
+
+            future = Future()
+            self._loading[model_key] = future
+            return None, future, True
+
+    def _run_load(self, model_key: str, loader: Callable[[], ModelCache], future: Future) -> None:
+        """Load outside the lock, then admit the model and wake waiters"""
+        try:
+            cache = loader()
+            with self._lock:
+                self._admit(model_key, cache)
+        except BaseException as e:
+            with self._lock:
+                self._loading.pop(model_key, None)
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            self._loading.pop(model_key, None)
+        future.set_result(cache)
+
+    def _admit(self, model_key: str, cache: ModelCache) -> None:
+        """Insert a freshly loaded model, evicting others to fit it"""
+        if cache.size_bytes > self.memory_budget_bytes:
+            raise MemoryError(
+                f"Model {model_key} needs {cache.size_bytes} bytes, "
+                f"budget is {self.memory_budget_bytes}"
+            )
+
+        while self.used_bytes + cache.size_bytes > self.memory_budget_bytes:
+            victim = self._choose_victim()
+            if victim is None:
+                raise MemoryError(
+                    f"Cannot fit {model_key}: remaining models are pinned "
+                    f"({self.used_bytes} of {self.memory_budget_bytes} bytes used)"
+                )
+            self._remove(victim)
+            self.evictions += 1
+
+        cache.pinned = model_key in self._pinned
+        self.models[model_key] = cache
+        self.used_bytes += cache.size_bytes
+        self._hits[model_key] = 0
+        self.loads += 1
+        self._touch(model_key)
+
+    def _touch(self, model_key: str) -> None:
+        """Record an access and refresh the model's priority"""
+        self._hits[model_key] += 1
+        self.models.move_to_end(model_key)
+
+        value = 1.0 if self.policy == "lru" else float(self._hits[model_key])
+        size_mb = max(self.models[model_key].size_bytes / (1024 * 1024), 1e-6)
+        self._priority[model_key] = self._clock + value / size_mb
+
+    def _choose_victim(self) -> Optional[str]:
+        """Lowest-priority unpinned model (oldest first on ties)"""
+        victim = None
+        for model_key in self.models:
+            if model_key in self._pinned:
+                continue
+            if victim is None or self._priority[model_key] < self._priority[victim]:
+                victim = model_key
+
+        if victim is not None:
+            self._clock = self._priority[victim]
+        return victim
+
+    def _remove(self, model_key: str) -> bool:
+        """Drop a resident model's bookkeeping"""
+        cache = self.models.pop(model_key, None)
+        if cache is None:
+            return False
+
+        cache.cached_in_memory = False
+        self.used_bytes -= cache.size_bytes
+        self._priority.pop(model_key, None)
+        self._hits.pop(model_key, None)
+        return True
 
 
 class InferenceEngine:
@@ -67,11 +464,36 @@ class InferenceEngine:
     - GPU acceleration support
     """
 
-    def __init__(self):
-        self.model_cache: Dict[str, ModelCache] = {}
+    def __init__(
+        self,
+        enable_batching: bool = False,
+        max_batch_size: int = 32,
+        max_batch_wait_ms: float = 2.0,
+        memory_budget_bytes: int = 8 * 1024 ** 3,
+        eviction_policy: str = "lru"
+    ):
+        """
+        Args:
+            enable_batching: Route synchronous predict() calls through the
+                dynamic batcher (predict_async() always batches)
+            max_batch_size: Largest micro-batch per model
+            max_batch_wait_ms: Longest a request waits for its batch to fill
+            memory_budget_bytes: Memory available for resident models
+            eviction_policy: "lru" or "lfu" (both size-aware)
+        """
+        self.residency = ModelResidencyManager(memory_budget_bytes, eviction_policy)
+        self.model_cache: Dict[str, ModelCache] = self.residency.models
+        self.warmup_list: List[Tuple[str, Optional[str]]] = []
         self.inference_count = 0
         self.batch_count = 0
 
+        self.enable_batching = enable_batching
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait_ms = max_batch_wait_ms
+        self._batchers: Dict[str, DynamicBatcher] = {}
+        self._batch_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._batch_loop_lock = threading.Lock()
+
     def predict(
         self,
         model_name: str,
@@ -89,17 +511,19 @@ class InferenceEngine:
         Returns:
             Inference result
         """
+        if self.enable_batching:
+            # Concurrent callers (threads) are coalesced on the batching loop
+            future = asyncio.run_coroutine_threadsafe(
+                self.predict_async(model_name, input_data, version),
+                self._get_batch_loop()
+            )
+            return future.result()
+
         start_time = time.time()
 
         # Get or load model
         model_key = f"{model_name}:{version or 'latest'}"
-        if model_key not in self.model_cache:
-            self._load_model(model_name, version)
-
-        # Update cache stats
-        cache = self.model_cache[model_key]
-        cache.last_used = datetime.utcnow().isoformat()
-        cache.num_inferences += 1
+        self._ensure_loaded(model_name, version)
 
         # Simulate inference (in real implementation, this calls the actual model)
         prediction, confidence, probabilities = self._run_inference(
@@ -107,14 +531,71 @@ class InferenceEngine:
             input_data
         )
 
-        inference_time_ms = (time.time() - start_time) * 1000
+        return self._finish_prediction(
+            model_key, model_name, version, start_time,
+            prediction, confidence, probabilities
+        )
+
+    async def predict_async(
+        self,
+        model_name: str,
+        input_data: Any,
+        version: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Run single inference through the per-model dynamic batcher.
 
-        # Update average latency
-        cache.avg_latency_ms = (
-            (cache.avg_latency_ms * (cache.num_inferences - 1) + inference_time_ms)
-            / cache.num_inferences
+        Concurrent calls for the same model and version are grouped into
+        one batched forward pass; each caller gets its own result.
+
+        Args:
+            model_name: Name of the model
+            input_data: Input data for inference
+            version: Optional model version
+
+        Returns:
+            Inference result (same shape as predict())
+        """
+        start_time = time.time()
+
+        model_key = f"{model_name}:{version or 'latest'}"
+        await self.residency.get_or_load_async(
+            model_key, lambda: self._load_model(model_name, version)
+        )
+
+        batcher = self._get_batcher(model_key, model_name, version)
+        prediction, confidence, probabilities = await batcher.submit(input_data)
+
+        return self._finish_prediction(
+            model_key, model_name, version, start_time,
+            prediction, confidence, probabilities
         )
 
+    def _finish_prediction(
+        self,
+        model_key: str,
+        model_name: str,
+        version: Optional[str],
+        start_time: float,
+        prediction: Any,
+        confidence: float,
+        probabilities: Optional[Dict[str, float]]
+    ) -> Dict[str, Any]:
+        """Update cache stats and build the response for one prediction"""
+        inference_time_ms = (time.time() - start_time) * 1000
+
+        # Update cache stats (the model may have been evicted meanwhile)
+        cache = self.model_cache.get(model_key)
+        if cache is not None:
+            cache.last_used = datetime.utcnow().isoformat()
+            cache.num_inferences += 1
+
+            # Update average latency
+            cache.avg_latency_ms = (
+                (cache.avg_latency_ms * (cache.num_inferences - 1) + inference_time_ms)
+                / cache.num_inferences
+            )
+
         self.inference_count += 1
 
         return {
@@ -149,9 +630,7 @@ class InferenceEngine:
         start_time = time.time()
 
         # Get or load model
-        model_key = f"{model_name}:{version or 'latest'}"
-        if model_key not in self.model_cache:
-            self._load_model(model_name, version)
+        self._ensure_loaded(model_name, version)
 
         predictions = []
         confidences = []
@@ -161,23 +640,21 @@ class InferenceEngine:
         for i in range(0, len(inputs), batch_size):
             batch = inputs[i:i + batch_size]
 
-            for input_data in batch:
-                try:
-                    prediction, confidence, probs = self._run_inference(
-                        model_name,
-                        input_data
-                    )
-                    predictions.append({
-                        "prediction": prediction,
-                        "confidence": round(confidence, 4),
-                        "probabilities": probs
-                    })
-                    confidences.append(confidence)
-                except Exception as e:
+            for result in self._run_batch_inference(model_name, batch):
+                if isinstance(result, Exception):
                     failed_count += 1
                     predictions.append({
-                        "error": str(e)
+                        "error": str(result)
                     })
+                    continue
+
+                prediction, confidence, probs = result
+                predictions.append({
+                    "prediction": prediction,
+                    "confidence": round(confidence, 4),
+                    "probabilities": probs
+                })
+                confidences.append(confidence)
 
         total_time_ms = (time.time() - start_time) * 1000
         throughput = len(inputs) / (total_time_ms / 1000) if total_time_ms > 0 else 0
@@ -221,9 +698,7 @@ class InferenceEngine:
         stream_id = f"stream_{int(time.time())}_{random.randint(1000, 9999)}"
 
         # Load model if not cached
-        model_key = f"{model_name}:{version or 'latest'}"
-        if model_key not in self.model_cache:
-            self._load_model(model_name, version)
+        self._ensure_loaded(model_name, version)
 
         return {
             "stream_id": stream_id,
@@ -256,10 +731,12 @@ class InferenceEngine:
         """
         start_time = time.time()
 
+        # Remember the model so prefetch_models() can reload it later
+        if (model_name, version) not in self.warmup_list:
+            self.warmup_list.append((model_name, version))
+
         # Load model
-        model_key = f"{model_name}:{version or 'latest'}"
-        if model_key not in self.model_cache:
-            self._load_model(model_name, version)
+        cache = self._ensure_loaded(model_name, version)
 
         # Run dummy inferences
         warmup_times = []
@@ -269,7 +746,6 @@ class InferenceEngine:
             warmup_times.append((time.time() - sample_start) * 1000)
 
         # Mark as warmed up
-        cache = self.model_cache[model_key]
         cache.warmup_completed = True
 
         total_time_ms = (time.time() - start_time) * 1000
@@ -296,6 +772,11 @@ class InferenceEngine:
             "total_models_cached": len(self.model_cache),
             "total_inferences": self.inference_count,
             "total_batches": self.batch_count,
+            "memory": self.residency.get_stats(),
+            "batching": {
+                model_key: batcher.get_stats()
+                for model_key, batcher in self._batchers.items()
+            },
             "cached_models": [
                 {
                     "model": cache.model_name,
@@ -304,7 +785,9 @@ class InferenceEngine:
                     "num_inferences": cache.num_inferences,
                     "avg_latency_ms": round(cache.avg_latency_ms, 2),
                     "last_used": cache.last_used,
-                    "warmup_completed": cache.warmup_completed
+                    "warmup_completed": cache.warmup_completed,
+                    "size_bytes": cache.size_bytes,
+                    "pinned": cache.pinned
                 }
                 for cache in self.model_cache.values()
             ]
@@ -324,7 +807,7 @@ class InferenceEngine:
             # Clear specific model
             keys_to_remove = [k for k in self.model_cache if k.startswith(model_name)]
             for key in keys_to_remove:
-                del self.model_cache[key]
+                self.residency.evict(key)
             return {
                 "success": True,
                 "cleared": len(keys_to_remove),
@@ -332,8 +815,7 @@ class InferenceEngine:
             }
         else:
             # Clear all
-            count = len(self.model_cache)
-            self.model_cache.clear()
+            count = self.residency.clear()
             return {
                 "success": True,
                 "cleared": count,
@@ -388,11 +870,75 @@ class InferenceEngine:
             "message": f"Model optimized with {optimization}"
         }
 
-    def _load_model(self, model_name: str, version: Optional[str]) -> None:
-        """Load model into cache"""
+    def prefetch_models(
+        self,
+        models: Optional[List[Tuple[str, Optional[str]]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Load models in the background before traffic needs them.
+
+        Args:
+            models: (model_name, version) pairs; defaults to every model
+                passed to warmup_model()
+
+        Returns:
+            Prefetch summary (loads continue asynchronously)
+        """
+        models = self.warmup_list if models is None else models
+
+        scheduled = []
+        for model_name, version in models:
+            model_key = f"{model_name}:{version or 'latest'}"
+            self.residency.prefetch(
+                model_key,
+                lambda name=model_name, ver=version: self._load_model(name, ver)
+            )
+            scheduled.append(model_key)
+
+        return {
+            "scheduled": scheduled,
+            "status": "prefetching"
+        }
+
+    def pin_model(self, model_name: str, version: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Keep a hot model resident regardless of memory pressure.
+
+        Args:
+            model_name: Name of the model
+            version: Optional model version
+
+        Returns:
+            Pin result
+        """
+        model_key = f"{model_name}:{version or 'latest'}"
+        self.residency.pin(model_key)
+        return {"model": model_name, "version": version or "latest", "pinned": True}
+
+    def unpin_model(self, model_name: str, version: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Allow a pinned model to be evicted again.
+
+        Args:
+            model_name: Name of the model
+            version: Optional model version
+
+        Returns:
+            Unpin result
+        """
         model_key = f"{model_name}:{version or 'latest'}"
+        self.residency.unpin(model_key)
+        return {"model": model_name, "version": version or "latest", "pinned": False}
 
-        # Simulate model loading
+    def _ensure_loaded(self, model_name: str, version: Optional[str]) -> ModelCache:
+        """Get a resident model, loading it (once) if needed"""
+        model_key = f"{model_name}:{version or 'latest'}"
+        return self.residency.get_or_load(
+            model_key, lambda: self._load_model(model_name, version)
+        )
+
+    def _load_model(self, model_name: str, version: Optional[str]) -> ModelCache:
+        """Load model (admission into the cache is done by the residency manager)"""
         framework = self._detect_framework(model_name)
 
         cache = ModelCache(
@@ -404,10 +950,75 @@ class InferenceEngine:
             num_inferences=0,
             avg_latency_ms=0.0,
             cached_in_memory=True,
-            warmup_completed=False
+            warmup_completed=False,
+            size_bytes=self._estimate_model_size(model_name)
         )
 
-        self.model_cache[model_key] = cache
+        return cache
+
+    def _get_batcher(
+        self,
+        model_key: str,
+        model_name: str,
+        version: Optional[str]
+    ) -> DynamicBatcher:
+        """Get the batcher for a model on the running event loop"""
+        previous = self._batchers.get(model_key)
+        if previous is not None and previous.loop is asyncio.get_running_loop():
+            return previous
+
+        batcher = DynamicBatcher(
+            self,
+            model_name,
+            version,
+            max_batch_size=self.max_batch_size,
+            max_wait_ms=self.max_batch_wait_ms
+        )
+        if previous is not None:
+            # New event loop: keep the accumulated statistics
+            batcher.queue_depth = previous.queue_depth
+            batcher.batch_size = previous.batch_size
+            batcher.num_batches = previous.num_batches
+            batcher.num_requests = previous.num_requests
+
+        self._batchers[model_key] = batcher
+        return batcher
+
+    def _get_batch_loop(self) -> asyncio.AbstractEventLoop:
+        """Background event loop serving synchronous predict() callers"""
+        with self._batch_loop_lock:
+            if self._batch_loop is None:
+                self._batch_loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._batch_loop.run_forever,
+                    name="inference-batcher",
+                    daemon=True
+                ).start()
+            return self._batch_loop
+
+    def _run_batch_inference(
+        self,
+        model_name: str,
+        inputs: List[Any]
+    ) -> List[Union[tuple, Exception]]:
+        """
+        Run one batched forward pass (simulated for demo).
+
+        Returns:
+            Per input, a (prediction, confidence, probabilities) tuple or the
+            exception raised for that input
+        """
+        # Simulate batched latency: one fixed launch cost plus a small
+        # per-item cost, instead of the full launch cost per item
+        time.sleep(random.uniform(0.001, 0.005) + 0.0002 * len(inputs))
+
+        results: List[Union[tuple, Exception]] = []
+        for input_data in inputs:
+            try:
+                results.append(self._simulate_output(model_name, input_data))
+            except Exception as e:
+                results.append(e)
+        return results
 
     def _run_inference(
         self,
@@ -426,6 +1037,14 @@ class InferenceEngine:
         # Simulate inference latency (1-5ms typical for cached models)
         time.sleep(random.uniform(0.001, 0.005))
 
+        return self._simulate_output(model_name, input_data)
+
+    def _simulate_output(
+        self,
+        model_name: str,
+        input_data: Any
+    ) -> tuple[Any, float, Optional[Dict[str, float]]]:
+        """Generate a plausible output for the model type"""
         # Determine model type and generate appropriate output
         if "sentiment" in model_name.lower() or "text" in model_name.lower():
             # Text classification
@@ -466,6 +1085,18 @@ class InferenceEngine:
         else:
             return "sklearn"
 
+    def _estimate_model_size(self, model_name: str) -> int:
+        """Estimate resident size of a model in bytes (simulated)"""
+        name = model_name.lower()
+        if "bert" in name or "llm" in name or "gpt" in name:
+            return 440 * 1024 ** 2
+        elif "vision" in name or "image" in name:
+            return 100 * 1024 ** 2
+        elif "torch" in name or "tf" in name or "keras" in name:
+            return 250 * 1024 ** 2
+        else:
+            return 10 * 1024 ** 2
+
     def _generate_dummy_input(self, model_name: str) -> Any:
         """Generate dummy input for warmup"""
         if "text" in model_name.lower() or "sentiment" in model_name.lower():
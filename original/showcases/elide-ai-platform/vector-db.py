@@ -6,8 +6,10 @@ This module is imported directly by TypeScript with <1ms overhead.
 
 Key Features:
 - Store and index high-dimensional embeddings
+- Contiguous float32 storage with vectorized scoring and top-k selection
 - Fast similarity search (cosine, euclidean, dot product)
-- Metadata filtering
+- IVF-Flat and IVF-PQ approximate indexes with configurable nprobe
+- Metadata filtering with bitmap pre-filter indexes
 - Text embedding generation
 - Index management and optimization
 """
@@ -51,6 +53,450 @@ class IndexStats:
     last_updated: str
 
 
+def _assign_nearest(
+    vectors: np.ndarray,
+    centroids: np.ndarray,
+    block_size: int = 16384
+) -> np.ndarray:
+    """Index of the nearest centroid (L2) for every vector"""
+    centroid_norms = np.einsum('ij,ij->i', centroids, centroids)
+    assignments = np.empty(len(vectors), dtype=np.int64)
+
+    for start in range(0, len(vectors), block_size):
+        block = vectors[start:start + block_size]
+        # ||x||^2 is constant per row and does not change the argmin
+        distances = centroid_norms - 2.0 * (block @ centroids.T)
+        assignments[start:start + block_size] = np.argmin(distances, axis=1)
+
+    return assignments
+
+
+def _kmeans(
+    vectors: np.ndarray,
+    k: int,
+    iterations: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """Lloyd's k-means; empty clusters are re-seeded from random points"""
+    k = min(k, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), k, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = _assign_nearest(vectors, centroids)
+        counts = np.bincount(assignments, minlength=k)
+
+        order = np.argsort(assignments, kind='stable')
+        occupied = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts[occupied])[:-1]))
+        sums = np.add.reduceat(vectors[order], starts, axis=0)
+        centroids[occupied] = sums / counts[occupied, None]
+
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            centroids[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted file index over the rows of a VectorDB matrix.
+
+    Vectors are partitioned by a coarse k-means quantizer; a query only
+    scans the rows of its `nprobe` nearest partitions. With product
+    quantization enabled (IVF-PQ) every row also gets a compact code, the
+    probed rows are ranked by asymmetric distance over the codes and only a
+    shortlist is re-scored exactly against the full-precision matrix.
+    """
+
+    METRICS = ("cosine", "euclidean", "dot_product")
+
+    def __init__(
+        self,
+        num_clusters: int = 100,
+        metric: str = "cosine",
+        pq_subvectors: int = 0,
+        rerank_factor: int = 50,
+        train_iterations: int = 20,
+        max_train_samples: int = 65536,
+        seed: int = 0
+    ):
+        """
+        Args:
+            num_clusters: Number of coarse partitions (nlist)
+            metric: Metric the partitions and codes are trained for
+            pq_subvectors: Sub-quantizers per vector; 0 disables PQ
+            rerank_factor: PQ shortlist size as a multiple of top_k
+            train_iterations: k-means iterations
+            max_train_samples: Vectors sampled for training
+            seed: Random seed
+        """
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+
+        self.num_clusters = num_clusters
+        self.metric = metric
+        self.pq_subvectors = pq_subvectors
+        self.rerank_factor = rerank_factor
+        self.train_iterations = train_iterations
+        self.max_train_samples = max_train_samples
+        self.rng = np.random.default_rng(seed)
+
+        self.centroids: Optional[np.ndarray] = None
+        self.codebooks: Optional[np.ndarray] = None  # (m, ksub, dsub)
+        self._lists: List[np.ndarray] = []
+        self._list_sizes: Optional[np.ndarray] = None
+        self._codes = np.empty((0, max(pq_subvectors, 1)), dtype=np.uint8)
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def uses_pq(self) -> bool:
+        return self.pq_subvectors > 0
+
+    def train(self, vectors: np.ndarray) -> None:
+        """Train the coarse quantizer (and PQ codebooks) on sample vectors"""
+        if len(vectors) == 0:
+            raise ValueError("Cannot train an IVF index without vectors")
+
+        dim = vectors.shape[1]
+        if self.uses_pq and dim % self.pq_subvectors:
+            raise ValueError(
+                f"Dimension {dim} is not divisible by {self.pq_subvectors} PQ sub-vectors"
+            )
+
+        sample = self._prepare(vectors)
+        if len(sample) > self.max_train_samples:
+            sample = sample[self.rng.choice(len(sample), self.max_train_samples, replace=False)]
+
+        self.centroids = _kmeans(sample, self.num_clusters, self.train_iterations, self.rng)
+        self._lists = [np.empty(16, dtype=np.int64) for _ in range(len(self.centroids))]
+        self._list_sizes = np.zeros(len(self.centroids), dtype=np.int64)
+
+        if self.uses_pq:
+            m = self.pq_subvectors
+            dsub = dim // m
+            # 256 centroids per sub-space keeps every code in one byte
+            pq_sample = sample[:min(len(sample), 256 * 64)]
+            self.codebooks = np.stack([
+                _kmeans(
+                    np.ascontiguousarray(pq_sample[:, j * dsub:(j + 1) * dsub]),
+                    256, max(self.train_iterations // 2, 1), self.rng
+                )
+                for j in range(m)
+            ])
+            self._codes = np.empty((0, m), dtype=np.uint8)
+
+    def add(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """Assign matrix rows to partitions (and encode them)"""
+        if len(rows) == 0:
+            return
+
+        prepared = self._prepare(vectors)
+        assignments = _assign_nearest(prepared, self.centroids)
+
+        order = np.argsort(assignments, kind='stable')
+        sorted_rows = rows[order]
+        clusters, starts = np.unique(assignments[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        for cluster, start, end in zip(clusters.tolist(), starts.tolist(), ends.tolist()):
+            self._extend_list(cluster, sorted_rows[start:end])
+
+        if self.uses_pq:
+            needed = int(rows.max()) + 1
+            if needed > len(self._codes):
+                grown = np.zeros((max(needed, 2 * len(self._codes)), self.pq_subvectors), dtype=np.uint8)
+                grown[:len(self._codes)] = self._codes
+                self._codes = grown
+            self._codes[rows] = self._encode(prepared)
+
+    def probe(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Rows stored in the `nprobe` partitions nearest to the query"""
+        prepared = self._prepare(query[None, :])[0]
+        nprobe = min(nprobe, len(self.centroids))
+
+        if self.metric == "dot_product":
+            closeness = self.centroids @ prepared
+        else:
+            residuals = self.centroids - prepared
+            closeness = -np.einsum('ij,ij->i', residuals, residuals)
+        probed = np.argpartition(-closeness, nprobe - 1)[:nprobe]
+
+        return np.concatenate([self._lists[c][:self._list_sizes[c]] for c in probed.tolist()])
+
+    def shortlist(self, query: np.ndarray, rows: np.ndarray, top_k: int) -> np.ndarray:
+        """Best `top_k * rerank_factor` rows by asymmetric PQ distance"""
+        size = top_k * self.rerank_factor
+        if not self.uses_pq or len(rows) <= size:
+            return rows
+
+        m, _, dsub = self.codebooks.shape
+        sub_queries = self._prepare(query[None, :])[0].reshape(m, dsub)
+        if self.metric == "dot_product":
+            tables = -np.einsum('mkd,md->mk', self.codebooks, sub_queries)
+        else:
+            residuals = self.codebooks - sub_queries[:, None, :]
+            tables = np.einsum('mkd,mkd->mk', residuals, residuals)
+
+        approx = tables[np.arange(m), self._codes[rows]].sum(axis=1)
+        return rows[np.argpartition(approx, size - 1)[:size]]
+
+    def remap(self, mapping: np.ndarray, kept_rows: np.ndarray) -> None:
+        """Follow a matrix compaction
+
+        Args:
+            mapping: Old row -> new row (-1 for dropped rows)
+            kept_rows: Old rows in their new order
+        """
+        for cluster, rows in enumerate(self._lists):
+            new_rows = mapping[rows[:self._list_sizes[cluster]]]
+            new_rows = new_rows[new_rows >= 0]
+            self._lists[cluster] = np.concatenate((new_rows, np.empty(16, dtype=np.int64)))
+            self._list_sizes[cluster] = len(new_rows)
+
+        if self.uses_pq:
+            self._codes = self._codes[kept_rows]
+
+    @property
+    def memory_bytes(self) -> int:
+        total = sum(rows.nbytes for rows in self._lists) + self._codes.nbytes
+        if self.centroids is not None:
+            total += self.centroids.nbytes
+        if self.codebooks is not None:
+            total += self.codebooks.nbytes
+        return total
+
+    def list_sizes(self) -> List[int]:
+        return self._list_sizes.tolist() if self._list_sizes is not None else []
+
+    def _prepare(self, vectors: np.ndarray) -> np.ndarray:
+        """Map vectors into the space the index is trained in"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.metric == "cosine":
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            return vectors / np.maximum(norms, 1e-12)
+        return vectors
+
+    def _encode(self, prepared: np.ndarray) -> np.ndarray:
+        """PQ codes for prepared vectors"""
+        m, _, dsub = self.codebooks.shape
+        codes = np.empty((len(prepared), m), dtype=np.uint8)
+        for j in range(m):
+            codes[:, j] = _assign_nearest(
+                np.ascontiguousarray(prepared[:, j * dsub:(j + 1) * dsub]), self.codebooks[j]
+            )
+        return codes
+
+    def _extend_list(self, cluster: int, rows: np.ndarray) -> None:
+        """Append rows to a partition, doubling its buffer as needed"""
+        size = self._list_sizes[cluster]
+        needed = size + len(rows)
+        buffer = self._lists[cluster]
+        if needed > len(buffer):
+            grown = np.empty(max(needed, 2 * len(buffer)), dtype=np.int64)
+            grown[:size] = buffer[:size]
+            self._lists[cluster] = buffer = grown
+        buffer[size:needed] = rows
+        self._list_sizes[cluster] = needed
+
+
+class BitmapPosting:
+    """
+    Rows holding one metadata value.
+
+    Starts as a Python set and switches to a packed uint64 bitmap once it
+    covers more than 1/64 of the rows, where the bitmap becomes both smaller
+    and faster to intersect.
+    """
+
+    __slots__ = ("rows", "words", "count")
+
+    def __init__(self):
+        self.rows: Optional[set] = set()
+        self.words: Optional[np.ndarray] = None
+        self.count = 0
+
+    @property
+    def dense(self) -> bool:
+        return self.words is not None
+
+    def add(self, rows: List[int], num_rows: int) -> None:
+        """Add rows that are not yet in the posting"""
+        if self.words is None:
+            self.rows.update(rows)
+            self.count = len(self.rows)
+            if self.count * 64 > num_rows and self.count > 64:
+                self._densify(num_rows)
+            return
+
+        rows = np.asarray(rows, dtype=np.int64)
+        self._reserve(int(rows.max()) + 1)
+        np.bitwise_or.at(self.words, rows >> 6, np.left_shift(np.uint64(1), (rows & 63).astype(np.uint64)))
+        self.count += len(rows)
+
+    def discard(self, row: int) -> None:
+        """Remove a row"""
+        if self.words is None:
+            self.rows.discard(row)
+            self.count = len(self.rows)
+        else:
+            self.words[row >> 6] &= ~np.uint64(1 << (row & 63))
+            self.count -= 1
+
+    def to_array(self) -> np.ndarray:
+        """Sorted rows"""
+        if self.words is None:
+            return np.fromiter(sorted(self.rows), dtype=np.int64, count=len(self.rows))
+        bits = np.unpackbits(self.words.view(np.uint8), bitorder='little')
+        return np.flatnonzero(bits)
+
+    def contains(self, rows: np.ndarray) -> np.ndarray:
+        """Boolean mask of which rows are in the posting"""
+        if self.words is None:
+            return np.isin(rows, self.to_array(), assume_unique=True)
+        words = rows >> 6
+        inside = words < len(self.words)
+        mask = np.zeros(len(rows), dtype=bool)
+        mask[inside] = (
+            self.words[words[inside]] >> (rows[inside] & 63).astype(np.uint64)
+        ) & np.uint64(1) == 1
+        return mask
+
+    def _densify(self, num_rows: int) -> None:
+        rows = self.rows
+        self.rows = None
+        self.words = np.zeros(0, dtype=np.uint64)
+        self.count = 0
+        self.add(list(rows), num_rows)
+
+    def _reserve(self, num_rows: int) -> None:
+        needed = (num_rows + 63) >> 6
+        if needed > len(self.words):
+            grown = np.zeros(max(needed, 2 * len(self.words)), dtype=np.uint64)
+            grown[:len(self.words)] = self.words
+            self.words = grown
+
+
+class MetadataIndex:
+    """
+    Inverted index from metadata (field, value) pairs to matrix rows.
+
+    Equality filters are answered by intersecting postings, smallest first,
+    so a search only scores rows that already match. Unhashable values
+    (lists, dicts) are not indexed; filters on them are checked per row.
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Dict[Any, BitmapPosting]] = {}
+        self.num_rows = 0
+
+    def add(self, rows: List[int], metadatas: List[Dict[str, Any]]) -> None:
+        """Index the metadata of newly appended rows"""
+        grouped: Dict[Tuple[str, Any], List[int]] = {}
+        for row, metadata in zip(rows, metadatas):
+            for key, value in metadata.items():
+                try:
+                    grouped.setdefault((key, value), []).append(row)
+                except TypeError:
+                    continue
+
+        if rows:
+            self.num_rows = max(self.num_rows, rows[-1] + 1)
+
+        for (key, value), value_rows in grouped.items():
+            postings = self.fields.setdefault(key, {})
+            posting = postings.get(value)
+            if posting is None:
+                posting = postings[value] = BitmapPosting()
+            posting.add(value_rows, self.num_rows)
+
+    def remove(self, row: int, metadata: Dict[str, Any]) -> None:
+        """Drop a row from the postings of its metadata"""
+        for key, value in metadata.items():
+            self._discard(key, value, row)
+
+    def update(self, row: int, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+        """Re-index the fields of a row whose values changed"""
+        for key, value in new.items():
+            if key in old:
+                if old[key] == value:
+                    continue
+                self._discard(key, old[key], row)
+            try:
+                posting = self.fields.setdefault(key, {}).setdefault(value, BitmapPosting())
+            except TypeError:
+                continue
+            posting.add([row], self.num_rows)
+
+    def rebuild(self, metadatas: List[Dict[str, Any]]) -> None:
+        """Re-index every row from scratch (after compaction)"""
+        self.fields = {}
+        self.num_rows = 0
+        self.add(list(range(len(metadatas))), metadatas)
+
+    def lookup(self, filters: Dict[str, Any]) -> Tuple[Optional[np.ndarray], Dict[str, Any]]:
+        """
+        Rows matching the indexable part of the filters.
+
+        Args:
+            filters: Field -> required value
+
+        Returns:
+            (sorted rows or None when no term is indexable, terms that
+            still have to be checked per row)
+        """
+        postings = []
+        residual = {}
+        for key, value in filters.items():
+            try:
+                posting = self.fields.get(key, {}).get(value)
+            except TypeError:
+                residual[key] = value
+                continue
+            if posting is None or posting.count == 0:
+                return np.empty(0, dtype=np.int64), {}
+            postings.append(posting)
+
+        if not postings:
+            return None, residual
+
+        postings.sort(key=lambda p: p.count)
+        if all(p.dense for p in postings):
+            words = postings[0].words
+            for posting in postings[1:]:
+                size = min(len(words), len(posting.words))
+                words = words[:size] & posting.words[:size]
+            bits = np.unpackbits(words.view(np.uint8), bitorder='little')
+            return np.flatnonzero(bits), residual
+
+        rows = postings[0].to_array()
+        for posting in postings[1:]:
+            if len(rows) == 0:
+                break
+            rows = rows[posting.contains(rows)]
+        return rows, residual
+
+    @property
+    def memory_bytes(self) -> int:
+        total = 0
+        for postings in self.fields.values():
+            for posting in postings.values():
+                total += posting.words.nbytes if posting.dense else 64 * posting.count
+        return total
+
+    def _discard(self, key: str, value: Any, row: int) -> None:
+        try:
+            posting = self.fields.get(key, {}).get(value)
+        except TypeError:
+            return
+        if posting is not None:
+            posting.discard(row)
+            if posting.count == 0:
+                del self.fields[key][value]
+
+
 class VectorDB:
     """
     Vector database for embeddings and similarity search.
@@ -61,14 +507,36 @@ class VectorDB:
     - Metadata filtering
     - Text-to-embedding conversion
     - Index optimization
+
+    Embeddings live in one contiguous float32 matrix (one row per vector,
+    grown by doubling); ids, metadata and timestamps are kept per row.
+    Deleting or re-storing a vector tombstones its row, and the matrix is
+    compacted once a quarter of its rows are dead. Metadata filters are
+    resolved through a MetadataIndex before any vector is scored.
     """
 
+    COMPACT_RATIO = 0.25
+
     def __init__(self):
-        self.vectors: Dict[str, VectorRecord] = {}
         self.dimension: Optional[int] = None
-        self.index_type = "flat"  # flat, ivf, hnsw
+        self.index_type = "flat"  # flat, ivf, ivf_pq
+        self.index: Optional[IVFIndex] = None
+        self.nprobe = 8
+        self.metadata_index = MetadataIndex()
         self.created_at = datetime.utcnow().isoformat()
 
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._sq_norms = np.empty(0, dtype=np.float32)
+        self._alive = np.empty(0, dtype=bool)
+        self._count = 0
+        self._deleted = 0
+
+        self._ids: List[Optional[str]] = []
+        self._metadata: List[Optional[Dict[str, Any]]] = []
+        self._created_at: List[Optional[str]] = []
+        self._updated_at: List[Optional[str]] = []
+        self._row_of: Dict[str, int] = {}
+
     def store_embedding(
         self,
         id: str,
@@ -95,23 +563,11 @@ class VectorDB:
                 f"index dimension {self.dimension}"
             )
 
-        now = datetime.utcnow().isoformat()
-
-        # Create or update record
-        if id in self.vectors:
-            record = self.vectors[id]
-            record.embedding = embedding
-            record.metadata = metadata or {}
-            record.updated_at = now
-        else:
-            record = VectorRecord(
-                id=id,
-                embedding=embedding,
-                metadata=metadata or {},
-                created_at=now,
-                updated_at=now
-            )
-            self.vectors[id] = record
+        self._append(
+            [id],
+            np.asarray(embedding, dtype=np.float32).reshape(1, -1),
+            [dict(metadata or {})]
+        )
 
         return {
             "success": True,
@@ -127,30 +583,37 @@ class VectorDB:
         """
         Store multiple embeddings in batch.
 
+        Valid records are appended to the matrix in one bulk copy.
+
         Args:
             records: List of records with id, embedding, and metadata
 
         Returns:
             Batch storage result
         """
-        stored_count = 0
-        failed_count = 0
+        if self.dimension is None and records and records[0].get("embedding") is not None:
+            self.dimension = len(records[0]["embedding"])
 
+        valid = []
+        failed_count = 0
         for record in records:
-            try:
-                self.store_embedding(
-                    id=record["id"],
-                    embedding=record["embedding"],
-                    metadata=record.get("metadata")
-                )
-                stored_count += 1
-            except Exception as e:
+            embedding = record.get("embedding")
+            if "id" not in record or embedding is None or len(embedding) != self.dimension:
                 failed_count += 1
-                print(f"Failed to store {record.get('id')}: {e}")
+                print(f"Failed to store {record.get('id')}: invalid id or embedding dimension")
+                continue
+            valid.append(record)
+
+        if valid:
+            self._append(
+                [record["id"] for record in valid],
+                np.asarray([record["embedding"] for record in valid], dtype=np.float32),
+                [dict(record.get("metadata") or {}) for record in valid]
+            )
 
         return {
             "success": True,
-            "stored": stored_count,
+            "stored": len(valid),
             "failed": failed_count,
             "total": len(records)
         }
@@ -160,7 +623,8 @@ class VectorDB:
         query_embedding: List[float],
         top_k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
-        metric: str = "cosine"
+        metric: str = "cosine",
+        nprobe: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Search for similar vectors by embedding.
@@ -170,6 +634,7 @@ class VectorDB:
             top_k: Number of results to return
             filters: Optional metadata filters
             metric: Distance metric (cosine, euclidean, dot_product)
+            nprobe: IVF partitions to scan (defaults to the index setting)
 
         Returns:
             Search results
@@ -182,34 +647,49 @@ class VectorDB:
                 f"Query dimension {len(query_embedding)} doesn't match "
                 f"index dimension {self.dimension}"
             )
+        if metric not in IVFIndex.METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
 
-        # Filter vectors by metadata
-        candidates = list(self.vectors.values())
-        if filters:
-            candidates = self._apply_filters(candidates, filters)
-
-        # Compute similarities
-        results = []
-        for vector in candidates:
-            distance = self._compute_distance(
-                query_embedding,
-                vector.embedding,
-                metric
-            )
-            score = self._distance_to_score(distance, metric)
-
-            results.append(SearchResult(
-                id=vector.id,
-                score=score,
-                metadata=vector.metadata,
-                distance=distance
-            ))
-
-        # Sort by score (descending)
-        results.sort(key=lambda x: x.score, reverse=True)
+        query = np.asarray(query_embedding, dtype=np.float32).ravel()
+
+        # Candidate rows: None means every live row
+        rows = self._apply_filters(filters) if filters else None
+        if self.index is not None:
+            nprobe = nprobe or self.nprobe
+            # A selective filter is cheaper (and exact) to score directly
+            expected_probe = (self._count - self._deleted) * nprobe / len(self.index.centroids)
+            if rows is None or len(rows) > expected_probe:
+                probed = self.index.probe(query, nprobe)
+                probed = probed[self._alive[probed]]
+                if rows is not None:
+                    probed = probed[np.isin(probed, rows, assume_unique=True)]
+                rows = self.index.shortlist(query, probed, top_k)
+
+        scores, distances = self._score(query, rows, metric)
+        if rows is None:
+            scores = np.where(self._alive[:self._count], scores, -np.inf)
+            rows = np.arange(self._count)
+            available = self._count - self._deleted
+        else:
+            available = len(rows)
 
-        # Return top-k
-        results = results[:top_k]
+        # Top-k without a full sort
+        k = min(top_k, available)
+        if k > 0:
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind='stable')]
+        else:
+            top = np.empty(0, dtype=np.int64)
+
+        results = [
+            SearchResult(
+                id=self._ids[row],
+                score=float(scores[i]),
+                metadata=self._metadata[row],
+                distance=float(distances[i])
+            )
+            for i, row in zip(top.tolist(), rows[top].tolist())
+        ]
 
         latency_ms = (time.time() - start_time) * 1000
 
@@ -217,7 +697,9 @@ class VectorDB:
             "results": [asdict(r) for r in results],
             "total_found": len(results),
             "latency_ms": round(latency_ms, 2),
-            "metric": metric
+            "metric": metric,
+            "index_type": self.index_type,
+            "candidates_scored": len(rows)
         }
 
     def search_by_text(
@@ -262,10 +744,17 @@ class VectorDB:
         Returns:
             Vector record
         """
-        if id not in self.vectors:
+        if id not in self._row_of:
             raise ValueError(f"Vector {id} not found")
 
-        return asdict(self.vectors[id])
+        row = self._row_of[id]
+        return asdict(VectorRecord(
+            id=id,
+            embedding=self._matrix[row].tolist(),
+            metadata=self._metadata[row],
+            created_at=self._created_at[row],
+            updated_at=self._updated_at[row]
+        ))
 
     def delete_vector(self, id: str) -> Dict[str, Any]:
         """
@@ -277,10 +766,11 @@ class VectorDB:
         Returns:
             Deletion result
         """
-        if id not in self.vectors:
+        if id not in self._row_of:
             raise ValueError(f"Vector {id} not found")
 
-        del self.vectors[id]
+        self._tombstone(self._row_of.pop(id))
+        self._maybe_compact()
 
         return {
             "success": True,
@@ -303,55 +793,99 @@ class VectorDB:
         Returns:
             Update result
         """
-        if id not in self.vectors:
+        if id not in self._row_of:
             raise ValueError(f"Vector {id} not found")
 
-        record = self.vectors[id]
-        record.metadata.update(metadata)
-        record.updated_at = datetime.utcnow().isoformat()
+        row = self._row_of[id]
+        self.metadata_index.update(row, self._metadata[row], metadata)
+        self._metadata[row].update(metadata)
+        self._updated_at[row] = datetime.utcnow().isoformat()
 
         return {
             "success": True,
             "id": id,
-            "metadata": record.metadata
+            "metadata": self._metadata[row]
         }
 
     def create_index(
         self,
         index_type: str = "ivf",
-        num_clusters: int = 100
+        num_clusters: int = 100,
+        nprobe: int = 8,
+        metric: str = "cosine",
+        pq_subvectors: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Create an optimized index for faster search.
 
         Index types:
-        - flat: Exact search (slow but accurate)
-        - ivf: Inverted file index (fast approximate search)
-        - hnsw: Hierarchical navigable small world (very fast)
+        - flat: Exact search over the whole matrix
+        - ivf: Inverted file index (IVF-Flat, exact scoring of probed partitions)
+        - ivf_pq: IVF with product-quantized codes; a PQ-ranked shortlist is
+          re-scored exactly
+
+        Vectors stored after the index is built are assigned to the existing
+        partitions; rebuild the index after large ingests to rebalance it.
 
         Args:
             index_type: Type of index to create
             num_clusters: Number of clusters for IVF
+            nprobe: Clusters scanned per query
+            metric: Metric the index is trained for
+            pq_subvectors: PQ sub-vectors (ivf_pq only; must divide the
+                dimension, defaults to one per 8 dimensions)
 
         Returns:
             Index creation result
         """
         start_time = time.time()
 
+        if index_type == "flat":
+            self.index = None
+        elif index_type in ("ivf", "ivf_pq"):
+            live_rows = np.flatnonzero(self._alive[:self._count])
+            if len(live_rows) == 0:
+                raise ValueError("Cannot build an IVF index on an empty database")
+
+            if index_type == "ivf_pq" and pq_subvectors is None:
+                pq_subvectors = max(
+                    (m for m in range(1, self.dimension + 1)
+                     if self.dimension % m == 0 and m <= max(self.dimension // 8, 1)),
+                    default=1
+                )
+
+            index = IVFIndex(
+                num_clusters=min(num_clusters, len(live_rows)),
+                metric=metric,
+                pq_subvectors=pq_subvectors if index_type == "ivf_pq" else 0
+            )
+            index.train(self._matrix[live_rows])
+            index.add(live_rows, self._matrix[live_rows])
+            self.index = index
+        else:
+            raise ValueError(f"Unknown index type: {index_type}")
+
         self.index_type = index_type
+        self.nprobe = nprobe
 
-        # In real implementation, this would build the index structure
-        # For demo, we simulate it
         build_time_ms = (time.time() - start_time) * 1000
 
-        return {
+        result = {
             "success": True,
             "index_type": index_type,
-            "num_vectors": len(self.vectors),
+            "num_vectors": len(self._row_of),
             "dimension": self.dimension,
             "build_time_ms": round(build_time_ms, 2),
             "status": "ready"
         }
+        if self.index is not None:
+            result.update({
+                "num_clusters": len(self.index.centroids),
+                "nprobe": nprobe,
+                "metric": metric,
+                "pq_subvectors": self.index.pq_subvectors
+            })
+        return result
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -360,17 +894,19 @@ class VectorDB:
         Returns:
             Database statistics
         """
-        total_vectors = len(self.vectors)
+        total_vectors = len(self._row_of)
 
-        # Estimate memory usage (rough approximation)
         if self.dimension and total_vectors > 0:
-            vector_memory = total_vectors * self.dimension * 4  # 4 bytes per float
+            vector_memory = self._matrix.nbytes + self._sq_norms.nbytes + self._alive.nbytes
             metadata_memory = total_vectors * 100  # Approximate metadata size
-            total_memory_mb = (vector_memory + metadata_memory) / (1024 * 1024)
+            index_memory = self.metadata_index.memory_bytes
+            if self.index is not None:
+                index_memory += self.index.memory_bytes
+            total_memory_mb = (vector_memory + metadata_memory + index_memory) / (1024 * 1024)
         else:
             total_memory_mb = 0
 
-        return {
+        stats = {
             "total_vectors": total_vectors,
             "dimension": self.dimension,
             "index_type": self.index_type,
@@ -378,72 +914,163 @@ class VectorDB:
             "created_at": self.created_at,
             "last_updated": datetime.utcnow().isoformat()
         }
+        if self.index is not None:
+            sizes = self.index.list_sizes()
+            stats["index"] = {
+                "num_clusters": len(sizes),
+                "nprobe": self.nprobe,
+                "metric": self.index.metric,
+                "pq_subvectors": self.index.pq_subvectors,
+                "largest_cluster": max(sizes) if sizes else 0
+            }
+        return stats
 
-    def _compute_distance(
+    def _append(
         self,
-        vec1: List[float],
-        vec2: List[float],
-        metric: str
-    ) -> float:
-        """Compute distance between two vectors"""
-        if metric == "cosine":
-            return self._cosine_distance(vec1, vec2)
-        elif metric == "euclidean":
-            return self._euclidean_distance(vec1, vec2)
-        elif metric == "dot_product":
-            return self._dot_product(vec1, vec2)
-        else:
-            raise ValueError(f"Unknown metric: {metric}")
+        ids: List[str],
+        embeddings: np.ndarray,
+        metadatas: List[Dict[str, Any]]
+    ) -> None:
+        """Append rows in bulk; re-stored ids tombstone their old row"""
+        n = len(ids)
+        self._reserve(self._count + n)
+
+        rows = np.arange(self._count, self._count + n)
+        self._matrix[rows] = embeddings
+        self._sq_norms[rows] = np.einsum('ij,ij->i', embeddings, embeddings)
+        self._alive[rows] = True
+        self._count += n
 
-    def _cosine_distance(self, vec1: List[float], vec2: List[float]) -> float:
-        """Compute cosine distance (1 - cosine similarity)"""
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = math.sqrt(sum(a * a for a in vec1))
-        norm2 = math.sqrt(sum(b * b for b in vec2))
-
-        if norm1 == 0 or norm2 == 0:
-            return 1.0
+        now = datetime.utcnow().isoformat()
+        self._ids.extend(ids)
+        self._metadata.extend(metadatas)
+        self._created_at.extend([now] * n)
+        self._updated_at.extend([now] * n)
+        self.metadata_index.add(rows.tolist(), metadatas)
+
+        for id, row in zip(ids, rows.tolist()):
+            previous = self._row_of.get(id)
+            if previous is not None:
+                self._created_at[row] = self._created_at[previous]
+                self._tombstone(previous)
+            self._row_of[id] = row
+
+        if self.index is not None:
+            self.index.add(rows, embeddings)
+
+        self._maybe_compact()
+
+    def _reserve(self, rows: int) -> None:
+        """Grow the matrix to hold at least `rows` rows"""
+        capacity = len(self._matrix)
+        if rows <= capacity:
+            return
+
+        capacity = max(rows, 2 * capacity, 1024)
+        matrix = np.empty((capacity, self.dimension), dtype=np.float32)
+        sq_norms = np.empty(capacity, dtype=np.float32)
+        alive = np.zeros(capacity, dtype=bool)
+
+        if self._count:
+            matrix[:self._count] = self._matrix[:self._count]
+            sq_norms[:self._count] = self._sq_norms[:self._count]
+            alive[:self._count] = self._alive[:self._count]
+
+        self._matrix, self._sq_norms, self._alive = matrix, sq_norms, alive
+
+    def _tombstone(self, row: int) -> None:
+        """Mark a row dead (its id mapping is handled by the caller)"""
+        self.metadata_index.remove(row, self._metadata[row])
+        self._alive[row] = False
+        self._ids[row] = None
+        self._metadata[row] = None
+        self._created_at[row] = None
+        self._updated_at[row] = None
+        self._deleted += 1
+
+    def _maybe_compact(self) -> None:
+        """Drop dead rows once they make up COMPACT_RATIO of the matrix"""
+        if self._deleted <= max(self.COMPACT_RATIO * self._count, 64):
+            return
+
+        kept = np.flatnonzero(self._alive[:self._count])
+        mapping = np.full(self._count, -1, dtype=np.int64)
+        mapping[kept] = np.arange(len(kept))
+
+        n = len(kept)
+        self._matrix[:n] = self._matrix[kept]
+        self._sq_norms[:n] = self._sq_norms[kept]
+        self._alive[:n] = True
+        self._alive[n:self._count] = False
+
+        kept_list = kept.tolist()
+        self._ids = [self._ids[row] for row in kept_list]
+        self._metadata = [self._metadata[row] for row in kept_list]
+        self._created_at = [self._created_at[row] for row in kept_list]
+        self._updated_at = [self._updated_at[row] for row in kept_list]
+        self._row_of = {id: row for row, id in enumerate(self._ids)}
+        self.metadata_index.rebuild(self._metadata)
+
+        if self.index is not None:
+            self.index.remap(mapping, kept)
+
+        self._count = n
+        self._deleted = 0
+
+    def _score(
+        self,
+        query: np.ndarray,
+        rows: Optional[np.ndarray],
+        metric: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized scores and distances of the query against matrix rows.
 
-        cosine_sim = dot_product / (norm1 * norm2)
-        return 1.0 - cosine_sim
+        Args:
+            query: Query vector
+            rows: Rows to score (None for all rows)
+            metric: Distance metric
 
-    def _euclidean_distance(self, vec1: List[float], vec2: List[float]) -> float:
-        """Compute euclidean distance"""
-        return math.sqrt(sum((a - b) ** 2 for a, b in zip(vec1, vec2)))
+        Returns:
+            (scores, distances), higher score is better
+        """
+        if rows is None:
+            vectors = self._matrix[:self._count]
+            sq_norms = self._sq_norms[:self._count]
+        else:
+            vectors = self._matrix[rows]
+            sq_norms = self._sq_norms[rows]
 
-    def _dot_product(self, vec1: List[float], vec2: List[float]) -> float:
-        """Compute dot product"""
-        return sum(a * b for a, b in zip(vec1, vec2))
+        dots = vectors @ query
 
-    def _distance_to_score(self, distance: float, metric: str) -> float:
-        """Convert distance to similarity score (higher is better)"""
         if metric == "cosine":
-            return 1.0 - distance  # Cosine distance to similarity
+            norms = np.sqrt(sq_norms) * np.linalg.norm(query)
+            similarities = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+            return similarities, 1.0 - similarities
         elif metric == "euclidean":
-            return 1.0 / (1.0 + distance)  # Convert to similarity
-        elif metric == "dot_product":
-            return distance  # Dot product is already a similarity
-        return 0.0
+            squared = np.maximum(sq_norms - 2.0 * dots + query @ query, 0.0)
+            distances = np.sqrt(squared)
+            return 1.0 / (1.0 + distances), distances
+        else:
+            return dots, dots
+
+    def _apply_filters(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Live rows matching the metadata filters, via bitmap intersection"""
+        rows, residual = self.metadata_index.lookup(filters)
+        if rows is None:
+            rows = np.flatnonzero(self._alive[:self._count])
+
+        if residual:
+            # Unhashable filter values are not indexed; check them per row
+            rows = np.asarray([
+                row for row in rows.tolist()
+                if all(
+                    key in self._metadata[row] and self._metadata[row][key] == value
+                    for key, value in residual.items()
+                )
+            ], dtype=np.int64)
 
-    def _apply_filters(
-        self,
-        candidates: List[VectorRecord],
-        filters: Dict[str, Any]
-    ) -> List[VectorRecord]:
-        """Apply metadata filters to candidates"""
-        filtered = []
-        for record in candidates:
-            match = True
-            for key, value in filters.items():
-                if key not in record.metadata:
-                    match = False
-                    break
-                if record.metadata[key] != value:
-                    match = False
-                    break
-            if match:
-                filtered.append(record)
-        return filtered
+        return rows
 
     def _text_to_embedding(self, text: str) -> List[float]:
         """
@@ -8,13 +8,18 @@ Comprehensive deduplication strategies:
 - Token-based matching
 - TF-IDF similarity
 - Blocking strategies for performance
+- Multi-pass candidate generation (standard, phonetic, sorted neighbourhood)
+- Parallel pair scoring with per-record caches
 - Record linkage
 - Merge strategies
 """
 
+import os
 import re
 import math
-from typing import Any, Dict, List, Optional, Set, Tuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import combinations
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
 
@@ -44,26 +49,49 @@ class FuzzyMatcher:
 
     @staticmethod
     def levenshtein_distance(s1: str, s2: str) -> int:
-        """Calculate Levenshtein distance between two strings"""
+        """Calculate Levenshtein distance between two strings
+
+        Uses the bit-parallel algorithm of Myers/Hyyro: each column of the
+        edit-distance matrix is a pair of bit vectors (Python ints), so the
+        cost is one pass over the longer string instead of len1 * len2
+        interpreted steps.
+        """
         if len(s1) < len(s2):
-            return FuzzyMatcher.levenshtein_distance(s2, s1)
+            s1, s2 = s2, s1
 
-        if len(s2) == 0:
+        m = len(s2)
+        if m == 0:
             return len(s1)
 
-        previous_row = range(len(s2) + 1)
+        # Bit mask of positions of every character in the shorter string
+        peq: Dict[str, int] = {}
+        for i, c in enumerate(s2):
+            peq[c] = peq.get(c, 0) | (1 << i)
+
+        full = (1 << m) - 1
+        last = 1 << (m - 1)
+        pv = full
+        mv = 0
+        score = m
+
+        for c in s1:
+            eq = peq.get(c, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & full)
+            mh = pv & xh
+
+            if ph & last:
+                score += 1
+            elif mh & last:
+                score -= 1
 
-        for i, c1 in enumerate(s1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                # Cost of insertions, deletions, or substitutions
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
+            ph = ((ph << 1) | 1) & full
+            mh = (mh << 1) & full
+            pv = mh | (~(xv | ph) & full)
+            mv = ph & xv
 
-        return previous_row[-1]
+        return score
 
     @staticmethod
     def levenshtein_similarity(s1: str, s2: str) -> float:
@@ -89,37 +117,28 @@ class FuzzyMatcher:
         len1, len2 = len(s1), len(s2)
         match_distance = max(len1, len2) // 2 - 1
 
-        s1_matches = [False] * len1
         s2_matches = [False] * len2
-        matches = 0
-        transpositions = 0
+        s1_matched_chars = []
 
-        # Find matches
-        for i in range(len1):
+        # Find matches (first unmatched occurrence inside the window)
+        for i, c in enumerate(s1):
             start = max(0, i - match_distance)
             end = min(i + match_distance + 1, len2)
 
-            for j in range(start, end):
-                if s2_matches[j] or s1[i] != s2[j]:
-                    continue
-                s1_matches[i] = True
+            j = s2.find(c, start, end)
+            while j != -1 and s2_matches[j]:
+                j = s2.find(c, j + 1, end)
+            if j != -1:
                 s2_matches[j] = True
-                matches += 1
-                break
+                s1_matched_chars.append(c)
 
+        matches = len(s1_matched_chars)
         if matches == 0:
             return 0.0
 
         # Count transpositions
-        k = 0
-        for i in range(len1):
-            if not s1_matches[i]:
-                continue
-            while not s2_matches[k]:
-                k += 1
-            if s1[i] != s2[k]:
-                transpositions += 1
-            k += 1
+        s2_matched_chars = [c for c, matched in zip(s2, s2_matches) if matched]
+        transpositions = sum(a != b for a, b in zip(s1_matched_chars, s2_matched_chars))
 
         return (matches / len1 + matches / len2 +
                 (matches - transpositions / 2) / matches) / 3
@@ -271,6 +290,203 @@ class BlockingStrategy:
         return pairs
 
 
+class BlockingPass:
+    """
+    One candidate-generation pass over per-record blocking keys.
+
+    Records sharing a key form a block. Blocks up to `max_block_size` are
+    compared exhaustively; larger blocks (and sorted-neighbourhood passes,
+    which treat the whole dataset as one block) only compare records that
+    are within `window_size` of each other in sort order. Because a pass can
+    tell whether it generates a given pair, pairs already produced by an
+    earlier pass are skipped without keeping a set of seen pairs.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        keys: List[Optional[str]],
+        sort_keys: List[str],
+        window_size: int = 5,
+        max_block_size: int = 1000,
+        windowed: bool = False
+    ):
+        """
+        Args:
+            name: Pass label for reporting
+            keys: Block key per record (None excludes the record)
+            sort_keys: Sort key per record, used inside windowed blocks
+            window_size: Sorted-neighbourhood window
+            max_block_size: Largest block compared exhaustively
+            windowed: Always use windowing (sorted-neighbourhood pass)
+        """
+        self.name = name
+        self.window_size = window_size
+
+        members: Dict[str, List[int]] = defaultdict(list)
+        for idx, key in enumerate(keys):
+            if key is not None:
+                members[key].append(idx)
+
+        self.block_of: List[int] = [-1] * len(keys)
+        self.rank: List[int] = [0] * len(keys)
+        self.blocks: List[List[int]] = []
+        self.block_windowed: List[bool] = []
+
+        for block_members in members.values():
+            if len(block_members) < 2:
+                continue
+
+            is_windowed = windowed or len(block_members) > max_block_size
+            if is_windowed:
+                block_members.sort(key=lambda idx: sort_keys[idx])
+
+            block_id = len(self.blocks)
+            for rank, idx in enumerate(block_members):
+                self.block_of[idx] = block_id
+                self.rank[idx] = rank
+
+            self.blocks.append(block_members)
+            self.block_windowed.append(is_windowed)
+
+    def covers(self, i: int, j: int) -> bool:
+        """Whether this pass generates the pair (i, j)"""
+        block = self.block_of[i]
+        if block < 0 or block != self.block_of[j]:
+            return False
+        if self.block_windowed[block]:
+            return abs(self.rank[i] - self.rank[j]) < self.window_size
+        return True
+
+    def pairs(self) -> Iterator[Tuple[int, int]]:
+        """All candidate pairs of this pass"""
+        window = self.window_size
+        for block, is_windowed in zip(self.blocks, self.block_windowed):
+            if not is_windowed:
+                yield from combinations(block, 2)
+                continue
+            for pos, idx in enumerate(block):
+                for other in block[pos + 1:pos + window]:
+                    yield idx, other
+
+
+class PairScorer:
+    """
+    Scores candidate pairs by record index.
+
+    Field values are converted once per record (and tokenised or
+    Soundex-encoded for the methods that need it), fields are evaluated
+    cheapest first, and a pair is rejected as soon as the remaining fields
+    can no longer lift its average above the threshold.
+    """
+
+    # Relative cost, used to evaluate cheap fields first
+    METHOD_COST = {'exact': 0, 'soundex': 0, 'token_jaccard': 1, 'jaro_winkler': 2, 'levenshtein': 3}
+
+    def __init__(
+        self,
+        columns: Dict[str, List[str]],
+        methods: Dict[str, str],
+        threshold: float,
+        memo_size: int = 100000
+    ):
+        """
+        Args:
+            columns: Field -> string value per record
+            methods: Field -> matching method
+            threshold: Average similarity required for a match
+            memo_size: Distinct string pairs memoized per field
+        """
+        self.threshold = threshold
+        self.num_fields = len(columns)
+        self.memo_size = memo_size
+
+        self.fields = sorted(columns, key=lambda f: self.METHOD_COST.get(methods.get(f), 3))
+        self.methods = [methods.get(f, 'levenshtein') for f in self.fields]
+        self.columns = []
+        for field, method in zip(self.fields, self.methods):
+            values = columns[field]
+            if method == 'soundex':
+                values = [FuzzyMatcher.soundex(v) for v in values]
+            elif method == 'token_jaccard':
+                values = [frozenset(v.lower().split()) for v in values]
+            self.columns.append(values)
+
+        self._memos: List[Dict[Tuple[str, str], float]] = [{} for _ in self.fields]
+
+    def score_pairs(self, pairs: List[Tuple[int, int]]) -> List[Tuple[int, int, float]]:
+        """Return (i, j, similarity) for the pairs that match"""
+        matches = []
+        for i, j in pairs:
+            similarity = self.score(i, j)
+            if similarity is not None:
+                matches.append((i, j, similarity))
+        return matches
+
+    def score(self, i: int, j: int) -> Optional[float]:
+        """Average field similarity of a pair, or None if below threshold"""
+        needed = self.threshold * self.num_fields - 1e-9
+        total = 0.0
+        remaining = self.num_fields
+
+        for column, method, memo in zip(self.columns, self.methods, self._memos):
+            remaining -= 1
+            a = column[i]
+            b = column[j]
+
+            if a == b:
+                similarity = 1.0
+            elif method in ('exact', 'soundex'):
+                similarity = 0.0
+            elif method == 'token_jaccard':
+                if not a or not b:
+                    similarity = 0.0
+                else:
+                    similarity = len(a & b) / len(a | b)
+            else:
+                if method == 'levenshtein':
+                    longest = max(len(a), len(b))
+                    # Edit distance is at least the length difference
+                    bound = 1 - abs(len(a) - len(b)) / longest if longest else 1.0
+                    if total + bound + remaining < needed:
+                        return None
+                key = (a, b) if a < b else (b, a)
+                similarity = memo.get(key)
+                if similarity is None:
+                    if method == 'jaro_winkler':
+                        similarity = FuzzyMatcher.jaro_winkler_similarity(a, b)
+                    else:
+                        similarity = FuzzyMatcher.levenshtein_similarity(a, b)
+                    if len(memo) >= self.memo_size:
+                        memo.clear()
+                    memo[key] = similarity
+
+            total += similarity
+            if total + remaining < needed:
+                return None
+
+        average = total / self.num_fields
+        return average if average >= self.threshold else None
+
+
+_worker_scorer: Optional[PairScorer] = None
+
+
+def _init_scoring_worker(
+    columns: Dict[str, List[str]],
+    methods: Dict[str, str],
+    threshold: float
+) -> None:
+    """Build the per-process scorer (and its caches) once"""
+    global _worker_scorer
+    _worker_scorer = PairScorer(columns, methods, threshold)
+
+
+def _score_chunk(pairs: List[Tuple[int, int]]) -> List[Tuple[int, int, float]]:
+    """Score one chunk of candidate pairs in a worker process"""
+    return _worker_scorer.score_pairs(pairs)
+
+
 class Deduplicator:
     """Main deduplication engine"""
 
@@ -279,18 +495,51 @@ class Deduplicator:
         match_fields: List[str],
         match_threshold: float = 0.8,
         fuzzy_methods: Optional[Dict[str, str]] = None,
-        blocking_keys: Optional[List[str]] = None
+        blocking_keys: Optional[List[str]] = None,
+        phonetic_keys: Optional[List[str]] = None,
+        sorted_neighborhood_keys: Optional[List[str]] = None,
+        window_size: int = 5,
+        max_block_size: int = 1000,
+        n_jobs: Optional[int] = None,
+        chunk_size: int = 20000
     ):
+        """
+        Args:
+            match_fields: Fields compared between records
+            match_threshold: Average field similarity for a match
+            fuzzy_methods: Field -> method (exact, levenshtein, jaro_winkler,
+                token_jaccard, soundex)
+            blocking_keys: Fields combined into one standard blocking key
+            phonetic_keys: Fields blocked by Soundex code (one pass each)
+            sorted_neighborhood_keys: Fields sorted for a windowed pass (one
+                pass each)
+            window_size: Sorted-neighbourhood window
+            max_block_size: Blocks larger than this are windowed instead of
+                compared exhaustively
+            n_jobs: Scoring processes (defaults to the CPU count)
+            chunk_size: Candidate pairs per scoring task
+        """
         self.match_fields = match_fields
         self.match_threshold = match_threshold
         self.fuzzy_methods = fuzzy_methods or {}
         self.blocking_keys = blocking_keys
+        self.phonetic_keys = phonetic_keys or []
+        self.sorted_neighborhood_keys = sorted_neighborhood_keys or []
+        self.window_size = window_size
+        self.max_block_size = max_block_size
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.chunk_size = chunk_size
         self.matcher = FuzzyMatcher()
 
     def deduplicate(self, records: List[Dict[str, Any]]) -> DeduplicationResult:
         """
         Deduplicate records
 
+        Candidate pairs come from every configured blocking pass (each pair
+        is scored once even if several passes produce it). Without any
+        blocking configuration, all records form one block, which is
+        windowed on the match fields once it exceeds max_block_size.
+
         Args:
             records: List of records to deduplicate
 
@@ -299,40 +548,31 @@ class Deduplicator:
         """
         print(f"Deduplicating {len(records)} records...")
 
-        # Apply blocking if configured
-        if self.blocking_keys:
-            blocks = BlockingStrategy.standard_blocking(records, self.blocking_keys)
-            print(f"Created {len(blocks)} blocks")
-        else:
-            blocks = {"all": records}
-
-        # Find matches within each block
-        all_matches: List[Tuple[int, int, float]] = []
-        record_to_idx = {id(r): i for i, r in enumerate(records)}
+        columns = {
+            field: [str(record.get(field, '')) for record in records]
+            for field in self.match_fields
+        }
 
-        for block_key, block_records in blocks.items():
-            matches = self._find_matches_in_block(block_records)
+        passes = self._build_passes(records, columns)
+        for blocking_pass in passes:
+            print(f"Blocking pass {blocking_pass.name}: {len(blocking_pass.blocks)} blocks")
 
-            # Convert to global indices
-            for r1, r2, similarity in matches:
-                idx1 = record_to_idx[id(r1)]
-                idx2 = record_to_idx[id(r2)]
-                all_matches.append((idx1, idx2, similarity))
+        all_matches = self._score_candidates(passes, columns)
 
         print(f"Found {len(all_matches)} potential matches")
 
-        # Build duplicate groups using union-find
-        duplicate_groups = self._build_duplicate_groups(records, all_matches)
+        # Build duplicate groups using union-find over indices
+        index_groups = self._build_duplicate_groups(len(records), all_matches)
+        duplicate_groups = [[records[idx] for idx in group] for group in index_groups]
 
         # Create result
         unique_records = []
         seen_indices = set()
 
-        for group in duplicate_groups:
+        for indices, group in zip(index_groups, duplicate_groups):
             # Merge records in group
-            merged = self._merge_records(group)
-            unique_records.append(merged)
-            seen_indices.update(records.index(r) for r in group)
+            unique_records.append(self._merge_records(group))
+            seen_indices.update(indices)
 
         # Add non-duplicate records
         for i, record in enumerate(records):
@@ -352,19 +592,107 @@ class Deduplicator:
 
         return result
 
-    def _find_matches_in_block(
+    def _build_passes(
         self,
-        records: List[Dict[str, Any]]
-    ) -> List[Tuple[Dict[str, Any], Dict[str, Any], float]]:
-        """Find matching records within a block"""
-        matches = []
+        records: List[Dict[str, Any]],
+        columns: Dict[str, List[str]]
+    ) -> List[BlockingPass]:
+        """Create the configured blocking passes"""
+        # Records inside windowed blocks are ordered by their match fields
+        sort_keys = ['|'.join(values).lower() for values in zip(*columns.values())] \
+            if columns else [''] * len(records)
 
-        for i in range(len(records)):
-            for j in range(i + 1, len(records)):
-                match_result = self._compare_records(records[i], records[j])
+        def make_pass(name: str, keys: List[Optional[str]], windowed: bool = False) -> BlockingPass:
+            return BlockingPass(name, keys, sort_keys, self.window_size,
+                                self.max_block_size, windowed)
 
-                if match_result.is_match:
-                    matches.append((records[i], records[j], match_result.similarity))
+        passes = []
+
+        if self.blocking_keys:
+            keys = []
+            for record in records:
+                key_values = []
+                for key in self.blocking_keys:
+                    value = record.get(key, '')
+                    if isinstance(value, str):
+                        value = value.strip().lower()
+                    key_values.append(str(value))
+                keys.append('|'.join(key_values))
+            passes.append(make_pass(f"standard({','.join(self.blocking_keys)})", keys))
+
+        for field in self.phonetic_keys:
+            keys = [FuzzyMatcher.soundex(str(record.get(field, '')).strip()) or None for record in records]
+            passes.append(make_pass(f"phonetic({field})", keys))
+
+        for field in self.sorted_neighborhood_keys:
+            keys = ['' if str(record.get(field, '')).strip() else None for record in records]
+            field_sort_keys = [str(record.get(field, '')).strip().lower() for record in records]
+            passes.append(BlockingPass(f"sorted_neighborhood({field})", keys, field_sort_keys,
+                                       self.window_size, self.max_block_size, windowed=True))
+
+        if not passes:
+            passes.append(make_pass("all", [''] * len(records)))
+            if len(records) > self.max_block_size:
+                for field, values in columns.items():
+                    field_sort_keys = [value.strip().lower() for value in values]
+                    passes.append(BlockingPass(f"sorted_neighborhood({field})", [''] * len(records),
+                                               field_sort_keys, self.window_size,
+                                               self.max_block_size, windowed=True))
+
+        return passes
+
+    def _candidate_chunks(self, passes: List[BlockingPass]) -> Iterator[List[Tuple[int, int]]]:
+        """Candidate pairs from all passes, each pair once, in chunks"""
+        chunk: List[Tuple[int, int]] = []
+        for position, blocking_pass in enumerate(passes):
+            earlier = passes[:position]
+            for i, j in blocking_pass.pairs():
+                if any(p.covers(i, j) for p in earlier):
+                    continue
+                chunk.append((i, j) if i < j else (j, i))
+                if len(chunk) >= self.chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+    def _score_candidates(
+        self,
+        passes: List[BlockingPass],
+        columns: Dict[str, List[str]]
+    ) -> List[Tuple[int, int, float]]:
+        """Score candidate pairs, across processes when there is enough work"""
+        chunks = self._candidate_chunks(passes)
+        first = next(chunks, None)
+        if first is None:
+            return []
+        second = next(chunks, None)
+
+        if second is None or self.n_jobs <= 1:
+            scorer = PairScorer(columns, self.fuzzy_methods, self.match_threshold)
+            matches = scorer.score_pairs(first)
+            if second is not None:
+                matches.extend(scorer.score_pairs(second))
+                for chunk in chunks:
+                    matches.extend(scorer.score_pairs(chunk))
+            return matches
+
+        matches: List[Tuple[int, int, float]] = []
+        with ProcessPoolExecutor(
+            max_workers=self.n_jobs,
+            initializer=_init_scoring_worker,
+            initargs=(columns, self.fuzzy_methods, self.match_threshold)
+        ) as executor:
+            # Bound in-flight chunks so candidates are not all materialized
+            pending = {executor.submit(_score_chunk, first), executor.submit(_score_chunk, second)}
+            for chunk in chunks:
+                if len(pending) >= 2 * self.n_jobs:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        matches.extend(future.result())
+                pending.add(executor.submit(_score_chunk, chunk))
+            for future in pending:
+                matches.extend(future.result())
 
         return matches
 
@@ -411,37 +739,33 @@ class Deduplicator:
 
     def _build_duplicate_groups(
         self,
-        records: List[Dict[str, Any]],
+        num_records: int,
         matches: List[Tuple[int, int, float]]
-    ) -> List[List[Dict[str, Any]]]:
-        """Build groups of duplicate records using union-find"""
+    ) -> List[List[int]]:
+        """Build groups of duplicate record indices using union-find"""
         # Initialize union-find
-        parent = list(range(len(records)))
+        parent = list(range(num_records))
 
         def find(x: int) -> int:
-            if parent[x] != x:
-                parent[x] = find(parent[x])
-            return parent[x]
-
-        def union(x: int, y: int) -> None:
-            px, py = find(x), find(y)
-            if px != py:
-                parent[px] = py
+            # Iterative with path halving (no recursion limit on long chains)
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
 
         # Union matched records
         for idx1, idx2, _ in matches:
-            union(idx1, idx2)
+            root1, root2 = find(idx1), find(idx2)
+            if root1 != root2:
+                parent[root1] = root2
 
         # Build groups
-        groups: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
-        for i, record in enumerate(records):
-            root = find(i)
-            groups[root].append(record)
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for i in range(num_records):
+            groups[find(i)].append(i)
 
         # Filter to only groups with duplicates
-        duplicate_groups = [group for group in groups.values() if len(group) > 1]
-
-        return duplicate_groups
+        return [group for group in groups.values() if len(group) > 1]
 
     def _merge_records(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Merge duplicate records into single record"""
@@ -0,0 +1,329 @@
+"""
+Real-Time Audio Renderer
+
+Block-based synthesis of note events for live playback, fed by a
+lookahead scheduler that pulls composed bars just ahead of the playhead.
+
+Features:
+- Fixed-size audio blocks rendered into preallocated NumPy buffers
+- Polyphonic voices with attack/release envelopes and voice stealing
+- Per-part timbre presets (melody, harmony, bass)
+- Sample-accurate note starts
+- Lookahead scheduling of streamed bars (bounded latency, constant memory)
+- 16-bit PCM encoding for WebSocket streaming
+"""
+
+import heapq
+import numpy as np
+from typing import Dict, Iterator, List, Optional
+
+
+class AudioRenderer:
+    """Polyphonic block renderer for note events"""
+
+    WAVEFORMS = ['sine', 'triangle', 'square', 'sawtooth']
+
+    # Timbre per part: waveform, gain, pan (-1 left .. 1 right), attack/release (seconds)
+    PART_PRESETS = {
+        'melody': {'waveform': 'triangle', 'gain': 0.35, 'pan': 0.15, 'attack': 0.01, 'release': 0.12},
+        'harmony': {'waveform': 'sine', 'gain': 0.15, 'pan': -0.25, 'attack': 0.03, 'release': 0.25},
+        'bass': {'waveform': 'sawtooth', 'gain': 0.25, 'pan': 0.0, 'attack': 0.005, 'release': 0.08},
+    }
+
+    DEFAULT_PRESET = {'waveform': 'sine', 'gain': 0.3, 'pan': 0.0, 'attack': 0.01, 'release': 0.1}
+
+    def __init__(self, sample_rate: int = 44100,
+                 block_size: int = 512,
+                 channels: int = 2,
+                 max_voices: int = 64,
+                 master_gain: float = 0.8):
+        """
+        Initialize renderer
+
+        Args:
+            sample_rate: Output sample rate
+            block_size: Frames per rendered block
+            channels: 1 (mono) or 2 (stereo)
+            max_voices: Simultaneous voices; the oldest voice is stolen
+                when a note starts with all voices busy
+            master_gain: Output gain before clipping
+        """
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.channels = channels
+        self.max_voices = max_voices
+        self.master_gain = master_gain
+
+        # Voice state (structure of arrays)
+        self.active = np.zeros(max_voices, dtype=bool)
+        self.frequency = np.zeros(max_voices)
+        self.start = np.zeros(max_voices, dtype=np.int64)
+        self.length = np.zeros(max_voices, dtype=np.int64)  # note-on to note-off, samples
+        self.attack = np.ones(max_voices)
+        self.release = np.ones(max_voices)
+        self.gain = np.zeros((2, max_voices))  # left/right
+        self.waveform = np.zeros(max_voices, dtype=np.int8)
+
+        # Preallocated block buffers
+        self._ramp = np.arange(block_size, dtype=np.float64)
+        self._time = np.empty((max_voices, block_size))
+        self._cycles = np.empty((max_voices, block_size))
+        self._envelope = np.empty((max_voices, block_size))
+        self._mix = np.empty((2, block_size))
+        self._output = np.empty((block_size, channels), dtype=np.float32)
+
+        self._pending: List = []  # heap of (start sample, sequence, note)
+        self._sequence = 0
+
+        self.position = 0  # samples rendered so far
+        self.stolen_voices = 0
+
+    @property
+    def time(self) -> float:
+        """Playhead position in seconds"""
+        return self.position / self.sample_rate
+
+    @property
+    def block_duration(self) -> float:
+        """Duration of one block in seconds"""
+        return self.block_size / self.sample_rate
+
+    @property
+    def idle(self) -> bool:
+        """No voices sounding and nothing scheduled"""
+        return not self._pending and not self.active.any()
+
+    def schedule(self, notes: List[Dict], offset: float = 0.0):
+        """
+        Queue note events
+
+        Args:
+            notes: Note dicts with pitch, startTime, duration, velocity and
+                an optional part (selects the timbre preset)
+            offset: Seconds added to every startTime
+        """
+        for note in notes:
+            start = int(round((note['startTime'] + offset) * self.sample_rate))
+            heapq.heappush(self._pending, (start, self._sequence, note))
+            self._sequence += 1
+
+    def render_block(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Render the next block
+
+        Args:
+            out: Optional (block_size, channels) float32 array to write into
+
+        Returns:
+            (block_size, channels) float32 samples in [-1, 1]; without `out`
+            this is an internal buffer overwritten by the next call
+        """
+        block_start = self.position
+        block_end = block_start + self.block_size
+
+        while self._pending and self._pending[0][0] < block_end:
+            start, _, note = heapq.heappop(self._pending)
+            self._start_voice(start, note)
+
+        out = self._output if out is None else out
+        voices = np.flatnonzero(self.active)
+        n = len(voices)
+
+        if n == 0:
+            out.fill(0)
+        else:
+            time = self._time[:n]
+            cycles = self._cycles[:n]
+            envelope = self._envelope[:n]
+
+            # Samples since each note-on
+            np.add(self._ramp, (block_start - self.start[voices])[:, None], out=time)
+
+            # Oscillators
+            np.multiply(time, (self.frequency[voices] / self.sample_rate)[:, None], out=cycles)
+            waveforms = self.waveform[voices]
+            for code in np.unique(waveforms):
+                rows = np.flatnonzero(waveforms == code)
+                cycles[rows] = self._oscillate(self.WAVEFORMS[code], cycles[rows])
+
+            # Linear attack and release, silent before note-on
+            attack = self.attack[voices][:, None]
+            release = self.release[voices][:, None]
+            end = (self.length[voices] + self.release[voices])[:, None]
+            np.divide(time, attack, out=envelope)
+            np.minimum(envelope, (end - time) / release, out=envelope)
+            np.clip(envelope, 0.0, 1.0, out=envelope)
+            np.multiply(cycles, envelope, out=cycles)
+
+            # Pan and mix down
+            np.dot(self.gain[:, voices], cycles, out=self._mix)
+            self._mix *= self.master_gain
+
+            if self.channels == 1:
+                out[:, 0] = self._mix.sum(axis=0) * 0.5
+            else:
+                out[:, 0] = self._mix[0]
+                out[:, 1] = self._mix[1]
+            np.clip(out, -1.0, 1.0, out=out)
+
+            # Free voices whose release has finished
+            finished = self.start[voices] + self.length[voices] + self.release[voices] <= block_end
+            self.active[voices[finished]] = False
+
+        self.position = block_end
+        return out
+
+    def _start_voice(self, start: int, note: Dict):
+        """Assign a note to a free (or the oldest) voice"""
+        free = np.flatnonzero(~self.active)
+        if len(free):
+            voice = free[0]
+        else:
+            voice = int(np.argmin(self.start))
+            self.stolen_voices += 1
+
+        preset = self.PART_PRESETS.get(note.get('part'), self.DEFAULT_PRESET)
+        level = preset['gain'] * note.get('velocity', 80) / 127
+        pan = preset['pan']
+
+        self.active[voice] = True
+        self.frequency[voice] = 440.0 * 2 ** ((note['pitch'] - 69) / 12)
+        self.start[voice] = start
+        self.length[voice] = max(1, int(round(note['duration'] * self.sample_rate)))
+        self.attack[voice] = max(1.0, preset['attack'] * self.sample_rate)
+        self.release[voice] = max(1.0, preset['release'] * self.sample_rate)
+        self.gain[0, voice] = level * np.sqrt((1 - pan) / 2)
+        self.gain[1, voice] = level * np.sqrt((1 + pan) / 2)
+        self.waveform[voice] = self.WAVEFORMS.index(preset['waveform'])
+
+    @staticmethod
+    def _oscillate(waveform: str, cycles: np.ndarray) -> np.ndarray:
+        """Waveform value at the given phase (in cycles)"""
+        if waveform == 'sine':
+            return np.sin(2 * np.pi * cycles)
+
+        frac = cycles - np.floor(cycles)
+        if waveform == 'square':
+            return np.where(frac < 0.5, 1.0, -1.0)
+        if waveform == 'sawtooth':
+            return 2 * frac - 1
+        return 1 - 4 * np.abs(frac - 0.5)  # triangle
+
+    def get_stats(self) -> Dict:
+        """Renderer statistics"""
+        return {
+            'time': self.time,
+            'active_voices': int(self.active.sum()),
+            'pending_notes': len(self._pending),
+            'stolen_voices': self.stolen_voices
+        }
+
+
+class LookaheadScheduler:
+    """
+    Feeds streamed bars to an AudioRenderer just ahead of playback
+
+    Before each block, bars starting within `lookahead` seconds of the
+    end of that block are pulled from the bar iterator (for example
+    MLComposer.stream_bars) and their notes scheduled. Composition
+    therefore runs at most `lookahead` ahead of the playhead: latency is
+    bounded by lookahead + one block and memory stays constant however
+    long the set runs.
+    """
+
+    PARTS = ('melody', 'harmony', 'bass')
+
+    def __init__(self, bars: Iterator[Dict], renderer: AudioRenderer, lookahead: float = 0.5):
+        """
+        Initialize scheduler
+
+        Args:
+            bars: Iterator of bar dicts (startTime plus note lists per part)
+            renderer: Renderer to schedule into
+            lookahead: Seconds of music composed ahead of the playhead
+        """
+        self.bars = iter(bars)
+        self.renderer = renderer
+        self.lookahead = lookahead
+        self.offset = renderer.time  # bar times are relative to the scheduler start
+
+        self._next_bar: Optional[Dict] = None
+        self._exhausted = False
+        self.bars_scheduled = 0
+
+    @property
+    def latency(self) -> float:
+        """Upper bound between composing a bar and hearing it, in seconds"""
+        return self.lookahead + self.renderer.block_duration
+
+    def blocks(self, max_duration: Optional[float] = None) -> Iterator[np.ndarray]:
+        """
+        Render blocks until the bars run out and the last notes decay
+
+        The consumer paces playback (an audio callback or a socket
+        writer pulling one block at a time). Each yielded block is
+        the renderer's internal buffer; copy it if it must outlive the
+        next iteration.
+
+        Args:
+            max_duration: Optional stop time in seconds
+
+        Yields:
+            (block_size, channels) float32 blocks
+        """
+        renderer = self.renderer
+
+        while True:
+            self._schedule_until(renderer.time + renderer.block_duration + self.lookahead)
+
+            if self._exhausted and renderer.idle:
+                return
+            if max_duration is not None and renderer.time - self.offset >= max_duration:
+                return
+
+            yield renderer.render_block()
+
+    def _schedule_until(self, horizon: float):
+        """Pull and schedule bars starting before the horizon"""
+        while not self._exhausted:
+            if self._next_bar is None:
+                try:
+                    self._next_bar = next(self.bars)
+                except StopIteration:
+                    self._exhausted = True
+                    return
+
+            if self._next_bar['startTime'] + self.offset >= horizon:
+                return
+
+            bar, self._next_bar = self._next_bar, None
+            for part in self.PARTS:
+                self.renderer.schedule(bar.get(part, []), self.offset)
+            self.bars_scheduled += 1
+
+
+def encode_pcm16(block: np.ndarray) -> bytes:
+    """Interleaved little-endian 16-bit PCM from a float block"""
+    return (np.clip(block, -1.0, 1.0) * 32767).astype('<i2').tobytes()
+
+
+# Example usage
+if __name__ == '__main__':
+    from ml_composer import MLComposer
+
+    composer = MLComposer()
+    renderer = AudioRenderer(sample_rate=44100, block_size=512)
+    scheduler = LookaheadScheduler(
+        composer.stream_bars(style='jazz', tempo=120, num_bars=8),
+        renderer,
+        lookahead=0.25
+    )
+
+    frames = 0
+    peak = 0.0
+    for block in scheduler.blocks():
+        frames += len(block)
+        peak = max(peak, float(np.abs(block).max()))
+
+    print(f"Rendered {frames / renderer.sample_rate:.2f}s of audio from "
+          f"{scheduler.bars_scheduled} bars (latency <= {scheduler.latency * 1000:.0f}ms, peak {peak:.2f})")
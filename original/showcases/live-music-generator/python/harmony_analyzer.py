@@ -10,16 +10,73 @@ Features:
 - Voice leading optimization
 - Chord progression analysis
 - Modulation detection
+- Streaming analysis for live input (HarmonyStream)
 - Secondary dominants and borrowed chords
 - Neo-Riemannian transformations
 - Schenkerian reduction
 """
 
 from typing import List, Dict, Tuple, Optional, Set
+from collections import deque
 from enum import Enum
+from functools import lru_cache
 import numpy as np
 
 
+NOTE_VALUES = {
+    'C': 0, 'C#': 1, 'Db': 1,
+    'D': 2, 'D#': 3, 'Eb': 3,
+    'E': 4,
+    'F': 5, 'F#': 6, 'Gb': 6,
+    'G': 7, 'G#': 8, 'Ab': 8,
+    'A': 9, 'A#': 10, 'Bb': 10,
+    'B': 11
+}
+
+# Major scale intervals
+DIATONIC_INTERVALS = (0, 2, 4, 5, 7, 9, 11)
+
+
+@lru_cache(maxsize=4096)
+def _parse_root(symbol: str) -> str:
+    """Root note of a chord symbol (memoised)"""
+
+    if not symbol:
+        return 'C'
+
+    # Handle sharps and flats
+    if len(symbol) > 1 and symbol[1] in ['#', 'b']:
+        return symbol[:2]
+    else:
+        return symbol[0]
+
+
+@lru_cache(maxsize=4096)
+def _parse_quality(symbol: str) -> str:
+    """Quality of a chord symbol (memoised)"""
+
+    if 'maj7' in symbol:
+        return 'maj7'
+    elif 'min7' in symbol or 'm7' in symbol:
+        return 'min7'
+    elif 'dim7' in symbol or '°7' in symbol:
+        return 'dim7'
+    elif 'ø7' in symbol or 'm7b5' in symbol:
+        return 'ø7'
+    elif '7' in symbol:
+        return '7'
+    elif 'maj' in symbol or symbol[0].isupper():
+        return 'maj'
+    elif 'min' in symbol or 'm' in symbol:
+        return 'min'
+    elif 'dim' in symbol:
+        return 'dim'
+    elif 'aug' in symbol or '+' in symbol:
+        return 'aug'
+    else:
+        return 'maj'
+
+
 class HarmonicFunction(Enum):
     """Harmonic function types"""
     TONIC = "T"
@@ -56,6 +113,11 @@ class ChordQuality(Enum):
 class HarmonyAnalyzer:
     """Main harmony analyzer class"""
 
+    # Candidate keys and window for modulation detection
+    MODULATION_KEYS = ['C', 'G', 'D', 'F', 'Bb', 'A', 'E']
+    MODULATION_WINDOW = 3
+    MODULATION_THRESHOLD = 0.8
+
     def __init__(self):
         self.function_map = self._build_function_map()
 
@@ -108,6 +170,11 @@ class HarmonyAnalyzer:
 
         return analysis
 
+    def stream(self, key: str = 'C') -> 'HarmonyStream':
+        """Create an incremental analyser for live chord input"""
+
+        return HarmonyStream(self, key)
+
     def _analyze_chord(self, chord: Dict, key: str) -> Dict:
         """Analyze a single chord"""
 
@@ -136,38 +203,12 @@ class HarmonyAnalyzer:
     def _extract_root(self, symbol: str) -> str:
         """Extract root note from chord symbol"""
 
-        if not symbol:
-            return 'C'
-
-        # Handle sharps and flats
-        if len(symbol) > 1 and symbol[1] in ['#', 'b']:
-            return symbol[:2]
-        else:
-            return symbol[0]
+        return _parse_root(symbol)
 
     def _extract_quality(self, symbol: str) -> str:
         """Extract chord quality from symbol"""
 
-        if 'maj7' in symbol:
-            return 'maj7'
-        elif 'min7' in symbol or 'm7' in symbol:
-            return 'min7'
-        elif 'dim7' in symbol or '°7' in symbol:
-            return 'dim7'
-        elif 'ø7' in symbol or 'm7b5' in symbol:
-            return 'ø7'
-        elif '7' in symbol:
-            return '7'
-        elif 'maj' in symbol or symbol[0].isupper():
-            return 'maj'
-        elif 'min' in symbol or 'm' in symbol:
-            return 'min'
-        elif 'dim' in symbol:
-            return 'dim'
-        elif 'aug' in symbol or '+' in symbol:
-            return 'aug'
-        else:
-            return 'maj'
+        return _parse_quality(symbol)
 
     def _calculate_degree(self, root: str, key: str) -> int:
         """Calculate scale degree of root in key"""
@@ -226,36 +267,42 @@ class HarmonyAnalyzer:
         cadences = []
 
         for i in range(len(analyzed_chords) - 1):
-            current = analyzed_chords[i]
-            next_chord = analyzed_chords[i + 1]
+            cadence = self._cadence_between(analyzed_chords[i], analyzed_chords[i + 1], i)
+            if cadence:
+                cadences.append(cadence)
+
+        return cadences
 
-            cadence_type = None
+    def _cadence_between(self, current: Dict, next_chord: Dict, position: int) -> Optional[Dict]:
+        """Cadence formed by two consecutive analyzed chords, if any"""
 
-            # Authentic cadence (V-I or V7-I)
-            if (current['degree'] == 5 and next_chord['degree'] == 1):
-                if current['function'] == 'D' and next_chord['function'] == 'T':
-                    cadence_type = 'authentic'
+        cadence_type = None
 
-            # Plagal cadence (IV-I)
-            elif (current['degree'] == 4 and next_chord['degree'] == 1):
-                cadence_type = 'plagal'
+        # Authentic cadence (V-I or V7-I)
+        if (current['degree'] == 5 and next_chord['degree'] == 1):
+            if current['function'] == 'D' and next_chord['function'] == 'T':
+                cadence_type = 'authentic'
 
-            # Half cadence (any-V)
-            elif next_chord['degree'] == 5:
-                cadence_type = 'half'
+        # Plagal cadence (IV-I)
+        elif (current['degree'] == 4 and next_chord['degree'] == 1):
+            cadence_type = 'plagal'
 
-            # Deceptive cadence (V-vi)
-            elif (current['degree'] == 5 and next_chord['degree'] == 6):
-                cadence_type = 'deceptive'
+        # Half cadence (any-V)
+        elif next_chord['degree'] == 5:
+            cadence_type = 'half'
 
-            if cadence_type:
-                cadences.append({
-                    'type': cadence_type,
-                    'position': i,
-                    'chords': [current['roman'], next_chord['roman']]
-                })
+        # Deceptive cadence (V-vi)
+        elif (current['degree'] == 5 and next_chord['degree'] == 6):
+            cadence_type = 'deceptive'
 
-        return cadences
+        if not cadence_type:
+            return None
+
+        return {
+            'type': cadence_type,
+            'position': position,
+            'chords': [current['roman'], next_chord['roman']]
+        }
 
     def _detect_modulations(self, chords: List[Dict], key: str) -> List[Dict]:
         """Detect key modulations"""
@@ -265,19 +312,21 @@ class HarmonyAnalyzer:
         # Simplified modulation detection
         # Look for pivot chords and new tonal centers
 
-        for i in range(len(chords) - 3):
-            # Check if next 3 chords establish new key
-            window = chords[i:i+3]
+        size = self.MODULATION_WINDOW
+
+        for i in range(len(chords) - size):
+            # Check if next chords establish new key
+            window = chords[i:i + size]
 
             # Analyze in different keys
-            for new_key in ['C', 'G', 'D', 'F', 'Bb', 'A', 'E']:
+            for new_key in self.MODULATION_KEYS:
                 if new_key == key:
                     continue
 
                 # Check if window fits new key better
                 fit_score = self._calculate_key_fit(window, new_key)
 
-                if fit_score > 0.8:
+                if fit_score > self.MODULATION_THRESHOLD:
                     modulations.append({
                         'position': i,
                         'from_key': key,
@@ -575,6 +624,121 @@ class HarmonyAnalyzer:
         return reverse_map.get(new_val, 'C')
 
 
+class HarmonyStream:
+    """
+    Incremental harmony analysis for live chord input
+
+    Chords are pushed one at a time. Each push analyzes the new chord and
+    returns the events it completes: the cadence and secondary dominant
+    formed with the previous chord, a borrowed chord, and modulations
+    confirmed for the window that ended before it. Key fit is kept as
+    running diatonic counts for all 12 major keys over a rolling window,
+    so a push costs O(1) whatever the length of the set. After the same
+    chords, analysis() equals HarmonyAnalyzer.analyze_progression().
+    """
+
+    def __init__(self, analyzer: HarmonyAnalyzer, key: str = 'C'):
+        self.analyzer = analyzer
+        self.key = key
+        self.window_size = analyzer.MODULATION_WINDOW
+
+        # diatonic_table[root][k]: root is diatonic in the major key on pitch class k
+        self.diatonic_table = np.array([
+            [(root - k) % 12 in DIATONIC_INTERVALS for k in range(12)]
+            for root in range(12)
+        ], dtype=np.int32)
+        self.candidate_keys = [k for k in analyzer.MODULATION_KEYS if k != key]
+
+        self.key_counts = np.zeros(12, dtype=np.int32)
+        self.window: deque = deque()  # (chord, pitch class) of the last window_size chords
+        self.previous: Optional[Tuple[Dict, Dict]] = None  # (chord, analysis)
+
+        self.chords: List[Dict] = []
+        self.cadences: List[Dict] = []
+        self.modulations: List[Dict] = []
+        self.borrowed_chords: List[Dict] = []
+        self.secondary_dominants: List[Dict] = []
+
+    def push(self, chord: Dict) -> List[Dict]:
+        """
+        Add the next chord
+
+        Returns:
+            Events completed by this chord, each an entry of the
+            corresponding analysis list plus an 'event' field
+        """
+        analyzer = self.analyzer
+        position = len(self.chords)
+        analyzed = analyzer._analyze_chord(chord, self.key)
+        self.chords.append(analyzed)
+        events = []
+
+        if self.previous is not None:
+            previous_chord, previous_analysis = self.previous
+
+            cadence = analyzer._cadence_between(previous_analysis, analyzed, position - 1)
+            if cadence:
+                self.cadences.append(cadence)
+                events.append({'event': 'cadence', **cadence})
+
+            if previous_analysis['quality'] == '7' and analyzer._is_fifth_relation(
+                    previous_analysis['root'], analyzed['root']):
+                entry = {'position': position - 1, 'chord': previous_chord, 'target': chord}
+                self.secondary_dominants.append(entry)
+                events.append({'event': 'secondary_dominant', **entry})
+
+        # The window before this chord is complete
+        if len(self.window) == self.window_size:
+            pivot = self.window[0][0]
+            for new_key in self.candidate_keys:
+                fit_score = float(self.key_counts[NOTE_VALUES.get(new_key, 0)]) / self.window_size
+                if fit_score > analyzer.MODULATION_THRESHOLD:
+                    entry = {
+                        'position': position - self.window_size,
+                        'from_key': self.key,
+                        'to_key': new_key,
+                        'pivot_chord': pivot,
+                        'confidence': fit_score
+                    }
+                    self.modulations.append(entry)
+                    events.append({'event': 'modulation', **entry})
+
+        # Slide the key-fit window
+        pitch_class = NOTE_VALUES.get(analyzed['root'], 0)
+        self.window.append((chord, pitch_class))
+        self.key_counts += self.diatonic_table[pitch_class]
+        if len(self.window) > self.window_size:
+            _, dropped = self.window.popleft()
+            self.key_counts -= self.diatonic_table[dropped]
+
+        if not analyzer._is_diatonic(chord, self.key) and analyzer._is_from_parallel_mode(chord, self.key):
+            entry = {'position': position, 'chord': chord, 'source': 'parallel_mode'}
+            self.borrowed_chords.append(entry)
+            events.append({'event': 'borrowed_chord', **entry})
+
+        self.previous = (chord, analyzed)
+        return events
+
+    def key_scores(self) -> Dict[str, float]:
+        """Fit of the current window to each major key (0-1)"""
+
+        size = max(len(self.window), 1)
+        names = ['C', 'C#', 'D', 'Eb', 'E', 'F', 'F#', 'G', 'Ab', 'A', 'Bb', 'B']
+        return {name: float(self.key_counts[i]) / size for i, name in enumerate(names)}
+
+    def analysis(self) -> Dict:
+        """Snapshot of the analysis so far (same shape as analyze_progression)"""
+
+        return {
+            'key': self.key,
+            'chords': list(self.chords),
+            'cadences': list(self.cadences),
+            'modulations': list(self.modulations),
+            'borrowed_chords': list(self.borrowed_chords),
+            'secondary_dominants': list(self.secondary_dominants)
+        }
+
+
 # Example usage
 if __name__ == '__main__':
     analyzer = HarmonyAnalyzer()
@@ -12,10 +12,12 @@ Features:
 - Temperature-based sampling
 - Interpolation between musical ideas
 - Fine-tuning on custom datasets
+- Streaming bar-by-bar composition for live playback
 """
 
 import numpy as np
-from typing import List, Dict, Optional, Tuple
+from collections import deque
+from typing import Iterator, List, Dict, Optional, Tuple
 import json
 import os
 
@@ -511,6 +513,112 @@ class MLComposer:
             'duration': duration
         }
 
+    def stream_bars(self, style: str = 'jazz',
+                    tempo: float = 120.0,
+                    beats_per_bar: int = 4,
+                    num_bars: Optional[int] = None,
+                    scale: Optional[List[int]] = None,
+                    temperature: float = 0.8,
+                    chord_context: int = 4) -> Iterator[Dict]:
+        """
+        Compose bar by bar for live playback
+
+        A generator: each bar is only composed when the consumer asks for
+        it, so a player (see audio_renderer.LookaheadScheduler) can pull
+        bars just ahead of playback. State is bounded - the current
+        melody phrase and the last few chords - so sets of any length
+        stream in constant memory.
+
+        Args:
+            style: Melody style ('jazz' adds chromatic approaches,
+                'classical' passing tones)
+            tempo: Beats per minute
+            beats_per_bar: Beats (melody notes) per bar
+            num_bars: Bars to compose (None streams forever)
+            scale: Optional pitch classes to quantize the melody to
+            temperature: Sampling temperature
+            chord_context: Previous chords the chord predictor sees
+
+        Yields:
+            Bar dicts with bar, startTime, duration, chord and the
+            melody, harmony and bass notes (times in seconds from the
+            start of the stream, each note tagged with its part)
+        """
+
+        beat_duration = 60.0 / tempo
+        bar_duration = beat_duration * beats_per_bar
+
+        chords = deque(maxlen=chord_context)
+        phrase = deque()
+        previous_phrase: Optional[List[int]] = None
+        bar = 0
+
+        while num_bars is None or bar < num_bars:
+            # Continue the previous phrase once this one runs out
+            while len(phrase) < beats_per_bar:
+                if previous_phrase:
+                    latent = self.melody_vae.encode(previous_phrase)
+                    pitches = self.melody_vae.decode(latent, temperature)
+                else:
+                    pitches = self.melody_vae.sample(temperature)
+
+                if scale:
+                    pitches = [self._quantize_to_scale(pitch, scale) for pitch in pitches]
+
+                phrase.extend(pitches)
+                previous_phrase = pitches
+
+            start_time = bar * bar_duration
+            pitches = [phrase.popleft() for _ in range(beats_per_bar)]
+
+            symbol = self.chord_predictor.predict_next(list(chords), temperature) if chords else 'Cmaj7'
+            chords.append(symbol)
+
+            melody = [{
+                'pitch': pitch,
+                'startTime': start_time + i * beat_duration,
+                'duration': beat_duration * 0.9,
+                'velocity': 80 + np.random.randint(0, 40)
+            } for i, pitch in enumerate(pitches)]
+            melody = self._apply_style_to_melody(melody, style)
+            # Ornaments added by the style are melody notes too
+            for note in melody:
+                note['part'] = 'melody'
+
+            harmonization = self.transformer.harmonize(pitches)
+            harmony = [{
+                'pitch': pitch,
+                'startTime': start_time + i * beat_duration,
+                'duration': beat_duration * 0.95,
+                'velocity': 60,
+                'part': 'harmony'
+            } for i, chord in enumerate(harmonization) for pitch in chord[1:]]
+
+            bass = [{
+                'pitch': pitch,
+                'startTime': start_time + i * beat_duration,
+                'duration': beat_duration * 0.8,
+                'velocity': 90,
+                'part': 'bass'
+            } for i, pitch in enumerate(self._generate_bass(harmonization))]
+
+            yield {
+                'bar': bar,
+                'startTime': start_time,
+                'duration': bar_duration,
+                'chord': {
+                    'symbol': symbol,
+                    'bar': bar,
+                    'startTime': start_time,
+                    'duration': bar_duration
+                },
+                'melody': melody,
+                'harmony': harmony,
+                'bass': bass
+            }
+
+            bar += 1
+
     def _get_form_structure(self, form: str) -> Dict[str, int]:
         """Get structure for musical form"""
 
@@ -673,3 +781,7 @@ if __name__ == '__main__':
     # Compose complete piece
     composition = composer.compose(style='classical', form='sonata', duration=60)
     print(f"Composed piece with {len(composition['sections'])} sections")
+
+    # Stream bars just ahead of playback
+    for bar in composer.stream_bars(style='jazz', tempo=120, num_bars=4):
+        print(f"Bar {bar['bar']}: {bar['chord']['symbol']}, {len(bar['melody'])} melody notes")
@@ -11,10 +11,11 @@ Features:
 - Harmonic translation (chord substitution, reharmonization)
 - Texture and density adjustment
 - Preservation of melodic contour and motivic content
+- Bar-by-bar transfer of streamed compositions
 """
 
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import Iterator, List, Dict, Tuple, Optional
 from enum import Enum
 
 
@@ -163,6 +164,45 @@ class StyleTransfer:
         source_features = self.style_features[source_style]
         target_features = self.style_features[target_style]
 
+        return self._transfer_features(source_music, source_features, target_features, preserve_melody)
+
+    def transfer_stream(self, bars: Iterator[Dict], target_style: MusicStyle,
+                        preserve_melody: bool = True,
+                        source_style: Optional[MusicStyle] = None) -> Iterator[Dict]:
+        """
+        Transfer streamed bars (e.g. MLComposer.stream_bars) one at a time
+
+        The source style is detected from the first bar unless given, and
+        each bar is transferred as it arrives, so live streams keep their
+        bounded latency. Density changes apply within each bar.
+
+        Yields:
+            Bars with the transferred melody, 'chords' (the bar's chord
+            after harmonic transfer) and style 'effects'
+        """
+
+        target_features = self.style_features[target_style]
+        source_features = self.style_features[source_style] if source_style else None
+
+        for bar in bars:
+            music = {
+                'melody': bar.get('melody', []),
+                'chords': [bar['chord']] if 'chord' in bar else bar.get('chords', []),
+                'rhythm': bar.get('rhythm', [])
+            }
+
+            if source_features is None:
+                source_features = self.style_features[self._detect_style(music)]
+
+            transferred = self._transfer_features(music, source_features, target_features, preserve_melody)
+            yield {**bar, **transferred}
+
+    def _transfer_features(self, source_music: Dict,
+                           source_features: StyleFeatures,
+                           target_features: StyleFeatures,
+                           preserve_melody: bool) -> Dict:
+        """Transfer music between known source and target style features"""
+
         # Transfer components
         transferred = {}
 
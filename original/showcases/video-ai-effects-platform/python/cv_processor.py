@@ -3,16 +3,25 @@ OpenCV Video Processor
 
 High-performance video processing using OpenCV with support for
 real-time filters, transformations, and computer vision operations.
+
+Frames can be exchanged as JSON lines with base64 payloads (legacy) or
+through the binary frame protocol, which carries raw, JPEG or PNG
+payloads behind a length-prefixed header, or references frames that
+live in shared-memory slots on the same host.
 """
 
 import sys
 import json
 import base64
+import struct
 import argparse
 import numpy as np
 import cv2
-from typing import Dict, Any, Tuple, Optional, List
+from multiprocessing import shared_memory, resource_tracker
+from typing import Dict, Any, Tuple, Optional, List, Union, BinaryIO, Callable
 import time
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 
 
@@ -25,6 +34,559 @@ class ProcessorConfig:
     backend: str = 'cpu'
     threads: int = 4
     quality: str = 'high'
+    protocol: str = 'json'
+    jpeg_quality: int = 90
+    fuse_effects: bool = True
+    plan_cache_size: int = 64
+
+
+# Channel count and conversions to/from OpenCV's BGR layout per pixel format
+PIXEL_FORMATS = {
+    'bgr': (3, None, None),
+    'rgb': (3, cv2.COLOR_RGB2BGR, cv2.COLOR_BGR2RGB),
+    'rgba': (4, cv2.COLOR_RGBA2BGR, cv2.COLOR_BGR2RGBA),
+    'bgra': (4, cv2.COLOR_BGRA2BGR, cv2.COLOR_BGR2BGRA),
+    'gray': (1, cv2.COLOR_GRAY2BGR, cv2.COLOR_BGR2GRAY)
+}
+
+ENCODINGS = ('raw', 'jpeg', 'png')
+
+
+def frame_shape(width: int, height: int, pixel_format: str) -> Tuple[int, ...]:
+    """Array shape of a raw frame"""
+    channels = PIXEL_FORMATS[pixel_format][0]
+    return (height, width) + ((channels,) if channels > 1 else ())
+
+
+def frame_view(buffer: Any, width: int, height: int, pixel_format: str) -> np.ndarray:
+    """Wrap raw pixel bytes as an array without copying"""
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(frame_shape(width, height, pixel_format))
+
+
+def as_gray(frame: np.ndarray) -> np.ndarray:
+    """Grayscale view of a BGR frame (grayscale frames pass through)"""
+    return frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+
+def gray_like(result: np.ndarray, frame: np.ndarray) -> np.ndarray:
+    """Return a grayscale result in the layout (BGR or gray) of `frame`"""
+    return result if frame.ndim == 2 else cv2.cvtColor(result, cv2.COLOR_GRAY2BGR)
+
+
+def to_bgr(frame: np.ndarray, pixel_format: str) -> np.ndarray:
+    """Convert a frame in `pixel_format` to BGR (no copy for 'bgr')"""
+    _, to_code, _ = PIXEL_FORMATS[pixel_format]
+    if to_code is None:
+        return frame
+    return cv2.cvtColor(frame, to_code)
+
+
+def from_bgr(frame: np.ndarray, pixel_format: str) -> np.ndarray:
+    """Convert a BGR (or grayscale) frame to `pixel_format`"""
+    if frame.ndim == 2:
+        if pixel_format == 'gray':
+            return frame
+        frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+    _, _, from_code = PIXEL_FORMATS[pixel_format]
+    if from_code is None:
+        return frame
+    return cv2.cvtColor(frame, from_code)
+
+
+class SharedFrameSlots:
+    """Fixed-size frame slots in a named shared-memory segment
+
+    Same-host callers write pixels straight into a slot and send only a
+    header naming the segment and slot; the processor maps the slot as a
+    numpy array, processes it and writes the result into an output slot.
+    Slot k starts at byte k * slot_size.
+    """
+
+    def __init__(self, name: Optional[str] = None, slot_size: int = 0,
+                 num_slots: int = 0, create: bool = False):
+        """Create or attach to a slot segment
+
+        Args:
+            name: Segment name (generated when creating without a name)
+            slot_size: Bytes per slot (required when creating)
+            num_slots: Number of slots (required when creating)
+            create: Create the segment instead of attaching to it
+        """
+        if create:
+            self._shm = shared_memory.SharedMemory(
+                name=name, create=True, size=slot_size * num_slots
+            )
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            # The creator owns the segment; don't let our tracker unlink it
+            try:
+                resource_tracker.unregister(self._shm._name, 'shared_memory')
+            except Exception:
+                pass
+
+        self.name = self._shm.name
+        self.owner = create
+        self.slot_size = slot_size or self._shm.size
+        self.num_slots = num_slots or max(1, self._shm.size // self.slot_size)
+
+    def view(self, slot: int, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Map a slot as an array without copying"""
+        if not 0 <= slot < self.num_slots:
+            raise IndexError(f"Slot {slot} out of range (0..{self.num_slots - 1})")
+
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if nbytes > self.slot_size:
+            raise ValueError(f"Frame of {nbytes} bytes exceeds slot size {self.slot_size}")
+
+        return np.ndarray(shape, dtype=dtype, buffer=self._shm.buf,
+                          offset=slot * self.slot_size)
+
+    def close(self):
+        """Detach from the segment (and remove it if we created it)"""
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+
+class FrameProtocol:
+    """Length-prefixed binary frame messages
+
+    Every message is laid out as:
+
+        magic (4s) | header length (u32, little endian) | JSON header | payload
+
+    The JSON header is a few hundred bytes describing the frames; pixel
+    data travels as raw bytes (or JPEG/PNG) in the payload, concatenated
+    in frame order. Each frame entry in `header['frames']` has width,
+    height, format, encoding and length, or shm/slot instead of a
+    payload when the pixels live in a SharedFrameSlots segment.
+    """
+
+    MAGIC = b'VFX1'
+    PREFIX = struct.Struct('<4sI')
+
+    @classmethod
+    def pack(cls, header: Dict[str, Any], payloads: List[Any] = ()) -> List[Any]:
+        """Build a message as a list of buffers (written without joining)"""
+        header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+        return [cls.PREFIX.pack(cls.MAGIC, len(header_bytes)), header_bytes, *payloads]
+
+    @classmethod
+    def write_message(cls, stream: BinaryIO, header: Dict[str, Any],
+                      payloads: List[Any] = ()):
+        """Write a message to a binary stream and flush it"""
+        for chunk in cls.pack(header, payloads):
+            stream.write(chunk)
+        stream.flush()
+
+    @classmethod
+    def read_message(cls, stream: BinaryIO) -> Optional[Tuple[Dict[str, Any], memoryview]]:
+        """Read one message from a binary stream
+
+        Returns:
+            (header, payload) or None at end of stream
+        """
+        prefix = cls._read_exact(stream, cls.PREFIX.size)
+        if prefix is None:
+            return None
+
+        magic, header_len = cls.PREFIX.unpack(prefix)
+        if magic != cls.MAGIC:
+            raise ValueError(f"Bad frame message magic: {magic!r}")
+
+        header = json.loads(cls._read_exact(stream, header_len, allow_eof=False))
+        payload_len = sum(f.get('length', 0) for f in header.get('frames', []))
+        payload = cls._read_exact(stream, payload_len, allow_eof=False)
+
+        return header, memoryview(payload)
+
+    @classmethod
+    def parse(cls, message: Union[bytes, bytearray, memoryview]) -> Tuple[Dict[str, Any], memoryview]:
+        """Split an in-memory message into header and payload view"""
+        view = memoryview(message)
+        magic, header_len = cls.PREFIX.unpack_from(view, 0)
+        if magic != cls.MAGIC:
+            raise ValueError(f"Bad frame message magic: {magic!r}")
+
+        start = cls.PREFIX.size
+        header = json.loads(bytes(view[start:start + header_len]))
+        return header, view[start + header_len:]
+
+    @staticmethod
+    def decode_payload(spec: Dict[str, Any], payload: memoryview) -> Tuple[np.ndarray, str]:
+        """Turn one frame's payload into an array
+
+        Raw payloads are wrapped with np.frombuffer and not copied.
+
+        Returns:
+            (frame, pixel format of the returned array)
+        """
+        encoding = spec.get('encoding', 'raw')
+        pixel_format = spec.get('format', 'rgba')
+
+        if encoding == 'raw':
+            return frame_view(payload, spec['width'], spec['height'], pixel_format), pixel_format
+
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown frame encoding: {encoding}")
+
+        # imdecode yields BGR/gray, which is what the effects expect
+        gray = pixel_format == 'gray'
+        frame = cv2.imdecode(
+            np.frombuffer(payload, dtype=np.uint8),
+            cv2.IMREAD_GRAYSCALE if gray else cv2.IMREAD_COLOR
+        )
+        if frame is None:
+            raise ValueError(f"Could not decode {encoding} payload")
+        return frame, 'gray' if gray else 'bgr'
+
+    @staticmethod
+    def encode_payload(frame: np.ndarray, encoding: str, quality: int = 90) -> memoryview:
+        """Encode a frame (already in its output pixel format) as a payload"""
+        if encoding == 'raw':
+            return memoryview(np.ascontiguousarray(frame)).cast('B')
+
+        if encoding == 'jpeg':
+            ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        elif encoding == 'png':
+            ok, buffer = cv2.imencode('.png', frame, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+        else:
+            raise ValueError(f"Unknown frame encoding: {encoding}")
+
+        if not ok:
+            raise ValueError(f"Could not encode frame as {encoding}")
+        return memoryview(buffer).cast('B')
+
+    @staticmethod
+    def _read_exact(stream: BinaryIO, size: int, allow_eof: bool = True) -> Optional[bytearray]:
+        """Read exactly `size` bytes into a fresh buffer (None at clean EOF)"""
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        read = 0
+        while read < size:
+            n = stream.readinto(view[read:])
+            if not n:
+                if read == 0 and allow_eof:
+                    return None
+                raise EOFError(f"Expected {size} bytes, got {read}")
+            read += n
+        return buffer
+
+
+def _brightness_table(params: Dict[str, Any]) -> np.ndarray:
+    return np.clip(np.arange(256) + params.get('value', 0), 0, 255).astype(np.uint8)
+
+
+def _contrast_table(params: Dict[str, Any]) -> np.ndarray:
+    table = np.rint((np.arange(256) - 128) * params.get('amount', 1.0) + 128)
+    return np.clip(table, 0, 255).astype(np.uint8)
+
+
+def _gamma_table(params: Dict[str, Any]) -> np.ndarray:
+    gamma = params.get('gamma', 1.0)
+    return np.rint(255 * (np.arange(256) / 255.0) ** (1.0 / gamma)).astype(np.uint8)
+
+
+def _invert_table(params: Dict[str, Any]) -> np.ndarray:
+    return (255 - np.arange(256)).astype(np.uint8)
+
+
+def _posterize_table(params: Dict[str, Any]) -> np.ndarray:
+    levels = max(2, int(params.get('levels', 4)))
+    bins = np.arange(256) * levels // 256
+    return np.rint(bins * 255 / (levels - 1)).astype(np.uint8)
+
+
+# Per-pixel effects expressible as a 256-entry lookup table
+LUT_EFFECTS = {
+    'brightness': _brightness_table,
+    'contrast': _contrast_table,
+    'gamma': _gamma_table,
+    'invert': _invert_table,
+    'posterize': _posterize_table
+}
+
+
+@dataclass
+class PlanStep:
+    """One operation of a compiled effect plan
+
+    `run(src, dst)` writes into `dst` when given one; steps without an
+    `out_shape` allocate (or reuse) their own output.
+    """
+    name: str
+    run: Callable[[np.ndarray, Optional[np.ndarray]], np.ndarray]
+    out_shape: Optional[Callable[[Tuple[int, ...]], Tuple[int, ...]]] = None
+
+
+class EffectPlan:
+    """Compiled effect chain with reusable intermediate buffers
+
+    Intermediate results are written into buffers owned by the plan and
+    reused frame after frame; the final step always allocates, so a
+    returned frame never aliases a buffer the next frame will overwrite.
+    The result is BGR, or grayscale when the chain ends in gray.
+    """
+
+    def __init__(self, steps: List[PlanStep]):
+        self.steps = steps
+        self._buffers: Dict[int, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def run(self, frame: np.ndarray) -> np.ndarray:
+        """Run the plan on a BGR (or grayscale) frame"""
+        last = len(self.steps) - 1
+
+        with self._lock:
+            for i, step in enumerate(self.steps):
+                dst = None
+                if i < last and step.out_shape is not None:
+                    shape = step.out_shape(frame.shape)
+                    dst = self._buffers.get(i)
+                    if dst is None or dst.shape != shape:
+                        dst = self._buffers[i] = np.empty(shape, dtype=np.uint8)
+                frame = step.run(frame, dst)
+
+            # Steps like crop can return a view of an intermediate buffer
+            if any(np.may_share_memory(frame, buffer) for buffer in self._buffers.values()):
+                frame = frame.copy()
+
+        return frame
+
+    def describe(self) -> List[str]:
+        """Step names, for debugging and stats"""
+        return [step.name for step in self.steps]
+
+
+class EffectChainCompiler:
+    """Compile effect lists into fused EffectPlans
+
+    Effects are lowered to primitive nodes tagged with the colour domain
+    they need ('bgr', 'gray', or the 'lab'/'ycrcb' working space of
+    CLAHE/histogram equalization). Conversions are only emitted when the
+    domain actually changes, so edge detectors and thresholds chain in
+    gray. color_space round trips are lossy (except through gray, which
+    is replicated back exactly) and so are kept; only no-op targets are
+    dropped. CLAHE and
+    histogram equalization each keep their own LAB/YCrCb round trip, as
+    the unfused path does: sharing one between consecutive passes skips
+    the BGR clipping in between and shifts results by up to ~45 levels.
+    Adjacent per-pixel lookups are composed into one LUT, which is exact.
+    Convolutions are not merged: a combined kernel skips the uint8
+    rounding and clamping between passes, so each keeps its own pass.
+    """
+
+    # Conversions between colour domains (anything else goes through BGR)
+    CONVERSIONS = {
+        ('bgr', 'gray'): cv2.COLOR_BGR2GRAY,
+        ('gray', 'bgr'): cv2.COLOR_GRAY2BGR,
+        ('bgr', 'lab'): cv2.COLOR_BGR2LAB,
+        ('lab', 'bgr'): cv2.COLOR_LAB2BGR,
+        ('bgr', 'ycrcb'): cv2.COLOR_BGR2YCrCb,
+        ('ycrcb', 'bgr'): cv2.COLOR_YCrCb2BGR
+    }
+
+    # Effects that give the same result on gray frames as on replicated BGR
+    LAYOUT_AGNOSTIC = {
+        'median_blur', 'dilate', 'erode', 'morphology_open',
+        'morphology_close', 'perspective_transform', 'affine_transform', 'rotate',
+        'resize', 'crop', 'flip'
+    }
+
+    # Effects computed on the grayscale image
+    GRAY_INPUT = {'canny', 'sobel', 'laplacian', 'adaptive_threshold'}
+
+    # color_space targets whose BGR round trip changes pixels
+    LOSSY_COLOR_SPACES = {'hsv', 'lab', 'xyz', 'ycrcb', 'hls'}
+
+    THRESHOLD_TYPES = {
+        'binary': cv2.THRESH_BINARY,
+        'binary_inv': cv2.THRESH_BINARY_INV,
+        'trunc': cv2.THRESH_TRUNC,
+        'tozero': cv2.THRESH_TOZERO,
+        'tozero_inv': cv2.THRESH_TOZERO_INV
+    }
+
+    def __init__(self, processor: 'CVProcessor'):
+        self.processor = processor
+
+    def compile(self, effects: List[Dict[str, Any]]) -> EffectPlan:
+        """Compile an effect list into a plan"""
+        nodes = self._fuse(self._lower(effects))
+        return EffectPlan([self._emit(node) for node in nodes])
+
+    def _lower(self, effects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Translate effects into primitive nodes with explicit conversions"""
+        nodes: List[Dict[str, Any]] = []
+        domain = 'bgr'
+
+        def enter(target: str):
+            nonlocal domain
+            if domain == target:
+                return
+            path = [(domain, target)] if (domain, target) in self.CONVERSIONS \
+                else [(domain, 'bgr'), ('bgr', target)]
+            for src, dst in path:
+                nodes.append({'op': 'cvt', 'code': self.CONVERSIONS[(src, dst)], 'to': dst,
+                              'name': f"{src}->{dst}"})
+            domain = target
+
+        def enter_luma(target: str):
+            # Round-trip through BGR per pass so results match unfused runs
+            if domain == target:
+                enter('bgr')
+            enter(target)
+
+        def enter_pixels():
+            # Filters and geometry run on BGR or gray, never in LAB/YCrCb
+            if domain not in ('bgr', 'gray'):
+                enter('bgr')
+
+        for effect in effects:
+            if not effect.get('enabled', True):
+                continue
+
+            name = effect.get('name', '')
+            params = effect.get('params', {})
+            if name == 'edge_detection':
+                method = params.get('method', 'canny')
+                name = method if method in ('sobel', 'laplacian') else 'canny'
+
+            if name == 'gaussian_blur':
+                enter_pixels()
+                kernel_size = params.get('kernel_size', 15)
+                if kernel_size % 2 == 0:
+                    kernel_size += 1
+                sigma = params.get('sigma', 0)
+                nodes.append({'op': 'conv', 'name': name, 'gaussian': (kernel_size, sigma)})
+
+            elif name == 'sharpen':
+                enter_pixels()
+                amount = params.get('amount', 1.0)
+                kernel = np.array([
+                    [0, -amount, 0],
+                    [-amount, 1 + 4 * amount, -amount],
+                    [0, -amount, 0]
+                ], dtype=np.float64)
+                nodes.append({'op': 'conv', 'name': name, 'kernel': kernel})
+
+            elif name in LUT_EFFECTS:
+                enter_pixels()
+                nodes.append({'op': 'lut', 'name': name, 'table': LUT_EFFECTS[name](params)})
+
+            elif name == 'threshold':
+                enter('gray')
+                nodes.append({'op': 'lut', 'name': name, 'table': self._threshold_table(params)})
+
+            elif name in self.GRAY_INPUT:
+                enter('gray')
+                method = self.processor.effect_map[name]
+                nodes.append({'op': 'call', 'name': name, 'fn': method, 'params': params})
+
+            elif name == 'color_space':
+                # Every target except gray converts straight back to BGR;
+                # the round trip rounds, so it runs like the unfused effect
+                target = params.get('target', 'rgb')
+                if target == 'gray':
+                    enter('gray')
+                elif target in self.LOSSY_COLOR_SPACES:
+                    enter('bgr')
+                    method = self.processor.effect_map[name]
+                    nodes.append({'op': 'call', 'name': f"{name}:{target}", 'fn': method, 'params': params})
+
+            elif name == 'histogram_equalization':
+                enter_luma('ycrcb')
+                nodes.append({'op': 'luma', 'name': name, 'fn': cv2.equalizeHist})
+
+            elif name == 'clahe':
+                enter_luma('lab')
+                clahe = cv2.createCLAHE(
+                    clipLimit=params.get('clip_limit', 2.0),
+                    tileGridSize=tuple(params.get('tile_grid_size', (8, 8)))
+                )
+                nodes.append({'op': 'luma', 'name': name, 'fn': clahe.apply})
+
+            elif name in self.processor.effect_map:
+                if name in self.LAYOUT_AGNOSTIC:
+                    enter_pixels()
+                else:
+                    enter('bgr')
+                method = self.processor.effect_map[name]
+                nodes.append({'op': 'call', 'name': name, 'fn': method, 'params': params})
+
+            else:
+                print(f"Unknown effect: {name}", file=sys.stderr)
+
+        if domain not in ('bgr', 'gray'):
+            enter('bgr')
+
+        return nodes
+
+    def _fuse(self, nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Merge adjacent LUTs"""
+        fused: List[Dict[str, Any]] = []
+
+        for node in nodes:
+            previous = fused[-1] if fused else None
+
+            if previous is not None and previous['op'] == node['op'] == 'lut':
+                previous['table'] = node['table'][previous['table']]
+                previous['name'] += f"+{node['name']}"
+                continue
+
+            fused.append(dict(node))
+
+        return fused
+
+    def _threshold_table(self, params: Dict[str, Any]) -> np.ndarray:
+        """Lookup table equivalent to cv2.threshold on uint8 input"""
+        _, table = cv2.threshold(
+            np.arange(256, dtype=np.uint8),
+            params.get('threshold', 127),
+            params.get('max_value', 255),
+            self.THRESHOLD_TYPES.get(params.get('type', 'binary'), cv2.THRESH_BINARY)
+        )
+        return table.ravel().astype(np.uint8)
+
+    def _emit(self, node: Dict[str, Any]) -> PlanStep:
+        """Turn a node into an executable step"""
+        op = node['op']
+        name = node['name']
+
+        if op == 'cvt':
+            code = node['code']
+            channels = PIXEL_FORMATS.get(node['to'], (3,))[0]
+
+            def out_shape(shape, channels=channels):
+                return shape[:2] + ((channels,) if channels > 1 else ())
+
+            return PlanStep(name, lambda src, dst: cv2.cvtColor(src, code, dst=dst), out_shape)
+
+        if op == 'conv':
+            if 'gaussian' in node:
+                size, sigma = node['gaussian']
+                run = lambda src, dst: cv2.GaussianBlur(src, (size, size), sigma, dst=dst)
+            else:
+                kernel = node['kernel'].astype(np.float32)
+                run = lambda src, dst: cv2.filter2D(src, -1, kernel, dst=dst)
+            return PlanStep(name, run, lambda shape: shape)
+
+        if op == 'lut':
+            table = node['table']
+            return PlanStep(name, lambda src, dst: cv2.LUT(src, table, dst=dst), lambda shape: shape)
+
+        if op == 'luma':
+            fn = node['fn']
+
+            # Runs in place on the buffer the preceding conversion wrote
+            def run_luma(src, dst):
+                src[:, :, 0] = fn(np.ascontiguousarray(src[:, :, 0]))
+                return src
+
+            return PlanStep(name, run_luma)
+
+        fn, params = node['fn'], node['params']
+        return PlanStep(name, lambda src, dst: fn(src, params))
 
 
 class CVProcessor:
@@ -36,6 +598,13 @@ class CVProcessor:
         self.filters = self.initialize_filters()
         self.frame_count = 0
         self.processing_times = []
+        self.shared_slots: Dict[Tuple[str, int], SharedFrameSlots] = {}
+
+        self.effect_map = self.initialize_effect_map()
+        self.compiler = EffectChainCompiler(self)
+        self.plan_cache: 'OrderedDict[str, EffectPlan]' = OrderedDict()
+        self.plan_cache_hits = 0
+        self.plan_cache_misses = 0
 
     def setup_opencv(self):
         """Configure OpenCV for optimal performance"""
@@ -101,22 +670,38 @@ class CVProcessor:
 
         return filters
 
-    def process_frame(self, frame_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process a single frame"""
+    def process_frame(self, frame_data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Process a single frame or a batch of frames
+
+        Accepted inputs:
+            - {'data': base64 RGBA, 'width', 'height', 'effects'}: legacy
+              JSON frame, answered with a base64 RGBA 'frame'
+            - {'pixels': ndarray, 'format': 'rgba'|'rgb'|'bgr'|..., 'effects',
+              'output_format'}: decoded frame, answered with 'pixels'
+            - {'frames': [...], 'effects'} or a plain list: batch of either
+              kind, sharing the top-level effects unless a frame has its own
+        """
+        if isinstance(frame_data, list):
+            frame_data = {'frames': frame_data}
+
+        if 'frames' in frame_data:
+            return self.process_batch(frame_data['frames'], frame_data.get('effects', []))
+
         start_time = time.time()
 
         try:
-            # Decode frame
-            frame = self.decode_frame(frame_data)
-
-            # Apply effects
             effects = frame_data.get('effects', [])
-            for effect in effects:
-                if effect.get('enabled', True):
-                    frame = self.apply_effect(frame, effect)
 
-            # Encode result
-            result = self.encode_frame(frame)
+            if 'pixels' in frame_data:
+                pixel_format = frame_data.get('format', 'bgr')
+                output_format = frame_data.get('output_format', pixel_format)
+
+                frame = self.apply_effects(to_bgr(frame_data['pixels'], pixel_format), effects)
+                output = from_bgr(frame, output_format)
+                result = {'pixels': output, 'format': output_format}
+            else:
+                frame = self.apply_effects(self.decode_frame(frame_data), effects)
+                result = {'frame': self.encode_frame(frame), 'format': 'rgb24'}
 
             # Update statistics
             processing_time = time.time() - start_time
@@ -125,11 +710,10 @@ class CVProcessor:
 
             return {
                 'type': 'frame-processed',
-                'frame': result,
+                **result,
                 'width': frame.shape[1],
                 'height': frame.shape[0],
                 'timestamp': frame_data.get('timestamp', 0),
-                'format': 'rgb24',
                 'metadata': {
                     'processing_time': processing_time,
                     'frame_count': self.frame_count
@@ -142,6 +726,183 @@ class CVProcessor:
                 'message': str(e)
             }
 
+    def process_batch(
+        self,
+        frames: List[Dict[str, Any]],
+        effects: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """Process several frames with a shared effect chain
+
+        Args:
+            frames: Frame dicts as accepted by process_frame()
+            effects: Effects applied to frames that don't carry their own
+
+        Returns:
+            'frames-processed' message with one result per input frame
+        """
+        start_time = time.time()
+        results = []
+
+        for frame_data in frames:
+            if effects and 'effects' not in frame_data:
+                frame_data = {**frame_data, 'effects': effects}
+            results.append(self.process_frame(frame_data))
+
+        return {
+            'type': 'frames-processed',
+            'frames': results,
+            'metadata': {
+                'processing_time': time.time() - start_time,
+                'frame_count': self.frame_count
+            }
+        }
+
+    def apply_effects(self, frame: np.ndarray, effects: List[Dict[str, Any]]) -> np.ndarray:
+        """Apply enabled effects in order
+
+        With fuse_effects the chain runs as a compiled EffectPlan, which
+        may return a grayscale frame when the chain ends in gray.
+        """
+        if self.config.fuse_effects:
+            return self.compile_effects(effects).run(frame)
+
+        for effect in effects:
+            if effect.get('enabled', True):
+                frame = self.apply_effect(frame, effect)
+        return frame
+
+    def process_binary(
+        self,
+        header: Dict[str, Any],
+        payload: memoryview
+    ) -> Tuple[Dict[str, Any], List[Any]]:
+        """Process a binary protocol message
+
+        Inline frames are decoded from `payload` (raw frames without a
+        copy); shared-memory frames are mapped from their slot and the
+        result is written to `out_slot` (default: the input slot). The
+        header's 'output' entry selects the reply format/encoding.
+
+        Args:
+            header: Parsed message header (see FrameProtocol)
+            payload: Concatenated frame payloads
+
+        Returns:
+            (reply header, reply payload buffers)
+        """
+        effects = header.get('effects', [])
+        output = header.get('output', {})
+        quality = output.get('quality', self.config.jpeg_quality)
+
+        replies = []
+        payloads = []
+        offset = 0
+
+        for spec in header.get('frames', []):
+            try:
+                reply, data = self._process_frame_spec(spec, payload, offset, effects, output, quality)
+            except Exception as e:
+                reply, data = {'error': str(e), 'timestamp': spec.get('timestamp', 0)}, None
+
+            if 'shm' not in spec:
+                offset += spec.get('length', 0)
+
+            replies.append(reply)
+            if data is not None:
+                payloads.append(data)
+
+        return {
+            'type': 'frames-processed',
+            'frames': replies,
+            'metadata': {'frame_count': self.frame_count}
+        }, payloads
+
+    def _process_frame_spec(
+        self,
+        spec: Dict[str, Any],
+        payload: memoryview,
+        offset: int,
+        effects: List[Dict[str, Any]],
+        output: Dict[str, Any],
+        quality: int
+    ) -> Tuple[Dict[str, Any], Optional[np.ndarray]]:
+        """Process one frame entry of a binary message
+
+        Raises on bad input (unknown segment, slot out of range, short
+        payload) so the caller can report the error for this frame only.
+
+        Returns:
+            (frame reply, inline payload or None when written to a slot)
+        """
+        if 'shm' in spec:
+            slots = self.attach_slots(spec['shm'], spec.get('slot_size', 0))
+            pixel_format = spec.get('format', 'rgba')
+            pixels = slots.view(
+                spec['slot'],
+                frame_shape(spec['width'], spec['height'], pixel_format)
+            )
+        else:
+            chunk = payload[offset:offset + spec['length']]
+            pixels, pixel_format = FrameProtocol.decode_payload(spec, chunk)
+
+        result = self.process_frame({
+            'pixels': pixels,
+            'format': pixel_format,
+            'output_format': output.get('format', spec.get('format', pixel_format)),
+            'effects': spec.get('effects', effects),
+            'timestamp': spec.get('timestamp', 0)
+        })
+        if result['type'] == 'error':
+            raise RuntimeError(result['message'])
+
+        reply = {
+            'width': result['width'],
+            'height': result['height'],
+            'format': result['format'],
+            'timestamp': result['timestamp'],
+            'processing_time': result['metadata']['processing_time']
+        }
+        frame = result['pixels']
+        encoding = output.get('encoding', 'raw' if 'shm' in spec else spec.get('encoding', 'raw'))
+
+        if 'shm' in spec and encoding == 'raw':
+            out_slot = spec.get('out_slot', spec['slot'])
+            try:
+                target = slots.view(out_slot, frame.shape)
+            except ValueError:
+                target = None  # result larger than a slot; send it inline
+
+            if target is not None:
+                if target.__array_interface__['data'][0] != frame.__array_interface__['data'][0]:
+                    np.copyto(target, frame)
+                reply.update({'shm': slots.name, 'slot': out_slot,
+                              'encoding': 'raw', 'length': 0})
+                return reply, None
+
+        data = FrameProtocol.encode_payload(frame, encoding, quality)
+        reply.update({'encoding': encoding, 'length': data.nbytes})
+        return reply, data
+
+    def attach_slots(self, name: str, slot_size: int = 0) -> SharedFrameSlots:
+        """Map (and cache) a caller's shared-memory slot segment
+
+        Mappings are cached per (segment, slot size): the slot size fixes
+        where each slot starts, so frames naming the same segment with a
+        different (or no) slot_size get their own view of it.
+        """
+        key = (name, slot_size)
+        slots = self.shared_slots.get(key)
+        if slots is None:
+            slots = SharedFrameSlots(name, slot_size=slot_size)
+            self.shared_slots[key] = slots
+        return slots
+
+    def close(self):
+        """Detach from shared-memory segments"""
+        for slots in self.shared_slots.values():
+            slots.close()
+        self.shared_slots.clear()
+
     def decode_frame(self, frame_data: Dict[str, Any]) -> np.ndarray:
         """Decode frame from base64"""
         data = base64.b64decode(frame_data['data'])
@@ -171,12 +932,9 @@ class CVProcessor:
         # Encode to base64
         return base64.b64encode(data).decode('utf-8')
 
-    def apply_effect(self, frame: np.ndarray, effect: Dict[str, Any]) -> np.ndarray:
-        """Apply effect to frame"""
-        effect_name = effect.get('name', '')
-        params = effect.get('params', {})
-
-        effect_map = {
+    def initialize_effect_map(self) -> Dict[str, Callable[[np.ndarray, Dict[str, Any]], np.ndarray]]:
+        """Map effect names to their implementations"""
+        return {
             'gaussian_blur': self.gaussian_blur,
             'bilateral_filter': self.bilateral_filter,
             'median_blur': self.median_blur,
@@ -201,15 +959,48 @@ class CVProcessor:
             'histogram_equalization': self.histogram_equalization,
             'clahe': self.clahe,
             'denoise': self.denoise,
-            'inpaint': self.inpaint
+            'inpaint': self.inpaint,
+            'brightness': self.brightness,
+            'contrast': self.contrast,
+            'gamma': self.gamma,
+            'invert': self.invert,
+            'posterize': self.posterize
         }
 
-        if effect_name in effect_map:
-            return effect_map[effect_name](frame, params)
+    def apply_effect(self, frame: np.ndarray, effect: Dict[str, Any]) -> np.ndarray:
+        """Apply effect to frame"""
+        effect_name = effect.get('name', '')
+        params = effect.get('params', {})
+
+        if effect_name in self.effect_map:
+            return self.effect_map[effect_name](frame, params)
         else:
             print(f"Unknown effect: {effect_name}", file=sys.stderr)
             return frame
 
+    def compile_effects(self, effects: List[Dict[str, Any]]) -> EffectPlan:
+        """Compiled plan for an effect list, cached by the list's contents"""
+        try:
+            key = json.dumps(effects, sort_keys=True)
+        except TypeError:
+            # Unhashable parameters (e.g. an inpaint mask array)
+            self.plan_cache_misses += 1
+            return self.compiler.compile(effects)
+
+        plan = self.plan_cache.get(key)
+        if plan is not None:
+            self.plan_cache.move_to_end(key)
+            self.plan_cache_hits += 1
+            return plan
+
+        self.plan_cache_misses += 1
+        plan = self.compiler.compile(effects)
+        self.plan_cache[key] = plan
+        if len(self.plan_cache) > self.config.plan_cache_size:
+            self.plan_cache.popitem(last=False)
+
+        return plan
+
     # Filter implementations
 
     def gaussian_blur(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
@@ -272,20 +1063,20 @@ class CVProcessor:
         threshold2 = params.get('threshold2', 150)
 
         # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = as_gray(frame)
 
         # Apply Canny
         edges = cv2.Canny(gray, threshold1, threshold2)
 
         # Convert back to BGR
-        return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
+        return gray_like(edges, frame)
 
     def sobel_edge(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
         """Sobel edge detection"""
         ksize = params.get('ksize', 3)
 
         # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = as_gray(frame)
 
         # Apply Sobel in X and Y directions
         sobelx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=ksize)
@@ -296,21 +1087,21 @@ class CVProcessor:
         magnitude = np.uint8(magnitude * 255 / magnitude.max())
 
         # Convert back to BGR
-        return cv2.cvtColor(magnitude, cv2.COLOR_GRAY2BGR)
+        return gray_like(magnitude, frame)
 
     def laplacian_edge(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
         """Laplacian edge detection"""
         ksize = params.get('ksize', 3)
 
         # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = as_gray(frame)
 
         # Apply Laplacian
         laplacian = cv2.Laplacian(gray, cv2.CV_64F, ksize=ksize)
         laplacian = np.uint8(np.absolute(laplacian))
 
         # Convert back to BGR
-        return cv2.cvtColor(laplacian, cv2.COLOR_GRAY2BGR)
+        return gray_like(laplacian, frame)
 
     def dilate(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
         """Apply dilation"""
@@ -469,7 +1260,7 @@ class CVProcessor:
         threshold_type = params.get('type', 'binary')
 
         # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = as_gray(frame)
 
         type_map = {
             'binary': cv2.THRESH_BINARY,
@@ -487,7 +1278,7 @@ class CVProcessor:
         )
 
         # Convert back to BGR
-        return cv2.cvtColor(result, cv2.COLOR_GRAY2BGR)
+        return gray_like(result, frame)
 
     def adaptive_threshold(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
         """Apply adaptive thresholding"""
@@ -498,7 +1289,7 @@ class CVProcessor:
         c = params.get('c', 2)
 
         # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = as_gray(frame)
 
         method_map = {
             'mean': cv2.ADAPTIVE_THRESH_MEAN_C,
@@ -520,7 +1311,7 @@ class CVProcessor:
         )
 
         # Convert back to BGR
-        return cv2.cvtColor(result, cv2.COLOR_GRAY2BGR)
+        return gray_like(result, frame)
 
     def color_space_conversion(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
         """Convert color space"""
@@ -617,6 +1408,26 @@ class CVProcessor:
             method_map.get(method, cv2.INPAINT_TELEA)
         )
 
+    def brightness(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Shift brightness"""
+        return cv2.LUT(frame, _brightness_table(params))
+
+    def contrast(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Scale contrast around mid-gray"""
+        return cv2.LUT(frame, _contrast_table(params))
+
+    def gamma(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Apply gamma correction"""
+        return cv2.LUT(frame, _gamma_table(params))
+
+    def invert(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Invert colors"""
+        return cv2.LUT(frame, _invert_table(params))
+
+    def posterize(self, frame: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """Reduce each channel to a few levels"""
+        return cv2.LUT(frame, _posterize_table(params))
+
     def get_stats(self) -> Dict[str, Any]:
         """Get processing statistics"""
         avg_time = (
@@ -630,11 +1441,51 @@ class CVProcessor:
             'stats': {
                 'frames_processed': self.frame_count,
                 'average_processing_time': avg_time,
-                'average_fps': 1.0 / avg_time if avg_time > 0 else 0
+                'average_fps': 1.0 / avg_time if avg_time > 0 else 0,
+                'effect_plans': {
+                    'cached': len(self.plan_cache),
+                    'hits': self.plan_cache_hits,
+                    'misses': self.plan_cache_misses
+                }
             }
         }
 
 
+def serve_binary(processor: CVProcessor, stdin: BinaryIO, stdout: BinaryIO):
+    """Answer binary protocol messages until stdin closes"""
+    try:
+        while True:
+            try:
+                message = FrameProtocol.read_message(stdin)
+                if message is None:
+                    break
+                header, payload = message
+
+                if header.get('type') == 'process-frame':
+                    reply, payloads = processor.process_binary(header, payload)
+                    FrameProtocol.write_message(stdout, reply, payloads)
+                elif header.get('type') == 'get-stats':
+                    FrameProtocol.write_message(stdout, processor.get_stats())
+                elif header.get('type') == 'set-backend':
+                    processor.config.backend = header['backend']
+                    processor.setup_opencv()
+
+            except (EOFError, ValueError) as e:
+                # Framing is lost; the stream can't be resynchronised
+                print(f"Binary protocol error: {e}", file=sys.stderr)
+                break
+            except Exception as e:
+                FrameProtocol.write_message(stdout, {
+                    'type': 'error',
+                    'message': str(e)
+                })
+
+    except KeyboardInterrupt:
+        pass
+    finally:
+        processor.close()
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description='OpenCV Video Processor')
@@ -644,6 +1495,9 @@ def main():
     parser.add_argument('--backend', default='cpu')
     parser.add_argument('--threads', type=int, default=4)
     parser.add_argument('--quality', default='high')
+    parser.add_argument('--protocol', choices=['json', 'binary'], default='json')
+    parser.add_argument('--jpeg-quality', type=int, default=90)
+    parser.add_argument('--no-fuse-effects', dest='fuse_effects', action='store_false')
 
     args = parser.parse_args()
 
@@ -654,7 +1508,10 @@ def main():
         fps=args.fps,
         backend=args.backend,
         threads=args.threads,
-        quality=args.quality
+        quality=args.quality,
+        protocol=args.protocol,
+        jpeg_quality=args.jpeg_quality,
+        fuse_effects=args.fuse_effects
     )
 
     processor = CVProcessor(config)
@@ -662,6 +1519,10 @@ def main():
     # Signal ready
     print("READY", flush=True)
 
+    if config.protocol == 'binary':
+        serve_binary(processor, sys.stdin.buffer, sys.stdout.buffer)
+        return
+
     # Process frames from stdin
     try:
         for line in sys.stdin:
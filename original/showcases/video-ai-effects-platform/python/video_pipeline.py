@@ -3,6 +3,10 @@ Video Processing Pipeline
 
 Comprehensive video processing pipeline with multi-stage effects,
 real-time optimization, and flexible input/output handling.
+
+Stages run pipelined: capture, every stage and the writer each have
+their own worker thread, connected by bounded queues of pooled frame
+buffers with backpressure (lossless) or latest-wins frame dropping.
 """
 
 import sys
@@ -10,11 +14,11 @@ import json
 import cv2
 import numpy as np
 from typing import List, Dict, Any, Optional, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from collections import deque
 from enum import Enum
 import time
 import threading
-from queue import Queue, Empty
 import argparse
 
 
@@ -52,17 +56,161 @@ class PipelineConfig:
     buffer_size: int = 30
     threads: int = 4
     enable_threading: bool = True
+    queue_size: int = 4
+    drop_policy: str = 'auto'  # auto, latest, lossless
+
+
+class DropPolicy(Enum):
+    """What a full stage queue does with a new frame"""
+    LATEST = "latest"        # Evict the oldest queued frame (live sources)
+    LOSSLESS = "lossless"    # Block the producer until there is room (files)
+
+
+class FrameBufferPool:
+    """
+    Pool of preallocated frame buffers.
+
+    Capture decodes straight into pooled buffers, and buffers return to
+    the pool once the writer (or a drop) is done with the frame, so a
+    running pipeline allocates no full-size frames for capture.
+    """
+
+    def __init__(self, shape: tuple, dtype: Any, max_buffers: int):
+        self.shape = shape
+        self.dtype = dtype
+        self.max_buffers = max_buffers
+        self.allocated = 0
+        self._free: List[np.ndarray] = []
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """Take a buffer, allocating up to max_buffers, else waiting"""
+        with self._condition:
+            while not self._free:
+                if self.allocated < self.max_buffers:
+                    self.allocated += 1
+                    return np.empty(self.shape, dtype=self.dtype)
+                if not self._condition.wait(timeout):
+                    return None
+            return self._free.pop()
+
+    def release(self, buffer: Optional[np.ndarray]) -> None:
+        """Return a buffer to the pool"""
+        if buffer is None:
+            return
+        with self._condition:
+            self._free.append(buffer)
+            self._condition.notify()
+
+
+@dataclass
+class FramePacket:
+    """A frame travelling through the pipeline"""
+    index: int
+    frame: np.ndarray
+    buffer: Optional[np.ndarray]  # Pooled buffer backing the frame
+    captured_at: float
+    end_of_stream: bool = False
+
+
+class FrameQueue:
+    """
+    Bounded queue between two pipeline workers.
+
+    With the LATEST policy a full queue evicts its oldest frame (and returns
+    its buffer to the pool); with LOSSLESS the producer blocks, which
+    propagates backpressure up to capture. End-of-stream markers are never
+    dropped.
+    """
+
+    def __init__(self, maxsize: int, policy: DropPolicy, pool_ref: Callable[[], Optional[FrameBufferPool]]):
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.closed = False
+        self._pool_ref = pool_ref
+        self._items: deque = deque()
+        self._condition = threading.Condition()
+
+    def put(self, packet: FramePacket) -> None:
+        with self._condition:
+            if self.policy == DropPolicy.LOSSLESS or packet.end_of_stream:
+                while len(self._items) >= self.maxsize and not self.closed and not packet.end_of_stream:
+                    self._condition.wait()
+            else:
+                while len(self._items) >= self.maxsize:
+                    oldest = self._items.popleft()
+                    if oldest.end_of_stream:
+                        self._items.appendleft(oldest)
+                        break
+                    self.dropped += 1
+                    pool = self._pool_ref()
+                    if pool is not None:
+                        pool.release(oldest.buffer)
+
+            if self.closed:
+                self._release(packet)
+                return
+            self._items.append(packet)
+            self._condition.notify_all()
+
+    def get(self) -> Optional[FramePacket]:
+        """Next packet, or None once the queue is closed"""
+        with self._condition:
+            while not self._items and not self.closed:
+                self._condition.wait()
+            if not self._items:
+                return None
+            packet = self._items.popleft()
+            self._condition.notify_all()
+            return packet
+
+    def close(self) -> None:
+        """Wake every waiter; queued frames are released"""
+        with self._condition:
+            self.closed = True
+            while self._items:
+                self._release(self._items.popleft())
+            self._condition.notify_all()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _release(self, packet: FramePacket) -> None:
+        pool = self._pool_ref()
+        if pool is not None:
+            pool.release(packet.buffer)
+
+
+@dataclass
+class StageMetrics:
+    """Rolling latency and throughput counters for one pipeline worker"""
+    frames: int = 0
+    errors: int = 0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=100))
+
+    def to_dict(self, queue: Optional[FrameQueue] = None) -> Dict[str, Any]:
+        latencies = list(self.latencies)
+        stats = {
+            'frames': self.frames,
+            'errors': self.errors,
+            'average_latency_ms': round(1000 * sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            'max_latency_ms': round(1000 * max(latencies), 3) if latencies else 0.0
+        }
+        if queue is not None:
+            stats['queue_depth'] = len(queue)
+            stats['queue_capacity'] = queue.maxsize
+            stats['dropped'] = queue.dropped
+        return stats
 
 
 class VideoCapture:
-    """Video capture with buffering"""
+    """Video source read by the pipeline's capture worker (or its single-threaded loop)"""
 
     def __init__(self, config: PipelineConfig):
         self.config = config
         self.capture: Optional[cv2.VideoCapture] = None
-        self.frame_buffer: Queue = Queue(maxsize=config.buffer_size)
-        self.running = False
-        self.capture_thread: Optional[threading.Thread] = None
+        self.finished = False
 
     def open(self):
         """Open video source"""
@@ -81,49 +229,27 @@ class VideoCapture:
 
         print(f"Video source opened: {self.config.input_source}", file=sys.stderr)
 
-    def start(self):
-        """Start capture thread"""
-        if self.config.enable_threading:
-            self.running = True
-            self.capture_thread = threading.Thread(target=self._capture_loop)
-            self.capture_thread.daemon = True
-            self.capture_thread.start()
-            print("Capture thread started", file=sys.stderr)
-
-    def _capture_loop(self):
-        """Continuous frame capture loop"""
-        while self.running:
-            ret, frame = self.capture.read()
-
-            if ret:
-                try:
-                    # Add to buffer (non-blocking)
-                    if not self.frame_buffer.full():
-                        self.frame_buffer.put(frame, block=False)
-                except:
-                    pass  # Drop frame if buffer is full
-            else:
-                # End of stream or error
-                time.sleep(0.1)
-
     def read(self) -> Optional[np.ndarray]:
         """Read next frame"""
-        if self.config.enable_threading:
-            try:
-                return self.frame_buffer.get(timeout=1.0)
-            except Empty:
-                return None
-        else:
-            ret, frame = self.capture.read()
-            return frame if ret else None
+        return self.read_into(None)
+
+    def read_into(self, buffer: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """
+        Decode the next frame, into `buffer` when it has the right shape.
+
+        Returns:
+            The frame, or None on a read failure (sets `finished` at the
+            end of a file)
+        """
+        ret, frame = self.capture.read(buffer) if buffer is not None else self.capture.read()
+        if not ret:
+            if self.config.input_source == 'file':
+                self.finished = True
+            return None
+        return frame
 
     def stop(self):
         """Stop capture"""
-        self.running = False
-
-        if self.capture_thread:
-            self.capture_thread.join(timeout=2.0)
-
         if self.capture:
             self.capture.release()
 
@@ -184,6 +310,9 @@ class VideoWriter:
 class VideoPipeline:
     """Main video processing pipeline"""
 
+    # Metric keys of the capture and writer workers, not usable as stage names
+    RESERVED_STAGE_NAMES = ('capture', 'writer')
+
     def __init__(self, config: PipelineConfig):
         self.config = config
         self.stages: List[PipelineStage] = []
@@ -194,10 +323,23 @@ class VideoPipeline:
             'frames_processed': 0,
             'frames_dropped': 0,
             'average_fps': 0.0,
-            'average_latency': 0.0
+            'average_latency': 0.0,
+            'stages': {}
         }
         self.processing_times: List[float] = []
 
+        # Pipelined execution state
+        self.pool: Optional[FrameBufferPool] = None
+        self.queues: List[FrameQueue] = []
+        self.workers: List[threading.Thread] = []
+        self.stage_metrics: Dict[str, StageMetrics] = {}
+        self._write_times: deque = deque(maxlen=100)
+        self._worker_names: List[str] = []
+        self._stats_lock = threading.Lock()
+        self._stop_lock = threading.Lock()
+        self._stopping = False
+        self._stopped = threading.Event()
+
     def add_stage(
         self,
         name: str,
@@ -206,6 +348,9 @@ class VideoPipeline:
         **params
     ):
         """Add processing stage to pipeline"""
+        if name in self.RESERVED_STAGE_NAMES:
+            raise ValueError(f"Stage name '{name}' is reserved for the pipeline's own workers")
+
         if processor is None:
             # Use built-in processor
             processor = self._get_builtin_processor(name)
@@ -267,24 +412,49 @@ class VideoPipeline:
                 stage.enabled = False
                 break
 
-    def start(self):
-        """Start pipeline"""
+    def start(self, block: bool = True):
+        """
+        Start pipeline
+
+        Args:
+            block: Wait until the stream ends or stop() is called
+        """
         print("Starting video pipeline...", file=sys.stderr)
 
         # Open capture
         self.capture.open()
-        self.capture.start()
 
         # Open writer
         self.writer.open()
 
         self.running = True
+        self._stopping = False
+        self._stopped.clear()
+
+        if self.config.enable_threading:
+            self._start_workers()
+            if block:
+                self.wait()
+        else:
+            # Single-threaded processing loop
+            self._processing_loop()
 
-        # Main processing loop
-        self._processing_loop()
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a pipelined run to finish.
+
+        Returns:
+            True if the pipeline has stopped
+        """
+        try:
+            return self._stopped.wait(timeout)
+        except KeyboardInterrupt:
+            print("Pipeline interrupted", file=sys.stderr)
+            self.stop()
+            return True
 
     def _processing_loop(self):
-        """Main processing loop"""
+        """Single-threaded processing loop (enable_threading=False)"""
         frame_count = 0
 
         try:
@@ -295,6 +465,9 @@ class VideoPipeline:
                 frame = self.capture.read()
 
                 if frame is None:
+                    if self.capture.finished:
+                        break
+                    time.sleep(0.005)
                     continue
 
                 # Process through pipeline
@@ -305,20 +478,13 @@ class VideoPipeline:
 
                 # Update statistics
                 processing_time = time.time() - start_time
-                self.processing_times.append(processing_time)
-
-                if len(self.processing_times) > 100:
-                    self.processing_times.pop(0)
-
-                self.stats['frames_processed'] += 1
-                self.stats['average_latency'] = sum(self.processing_times) / len(self.processing_times)
-                self.stats['average_fps'] = 1.0 / self.stats['average_latency'] if self.stats['average_latency'] > 0 else 0
+                self._record_output(processing_time, time.time())
 
                 frame_count += 1
 
                 # Print stats periodically
                 if frame_count % 30 == 0:
-                    print(f"Stats: {self.stats}", file=sys.stderr)
+                    print(f"Stats: {self.get_stats()}", file=sys.stderr)
 
                 # Maintain frame rate
                 target_time = 1.0 / self.config.fps
@@ -333,31 +499,207 @@ class VideoPipeline:
             self.stop()
 
     def _process_frame(self, frame: np.ndarray) -> np.ndarray:
-        """Process frame through all stages"""
-        result = frame.copy()
+        """Process frame through all stages (frames are owned by the caller)"""
+        result = frame
 
         for stage in self.stages:
-            if not stage.enabled:
+            result = self._run_stage(stage, result)
+
+        return result
+
+    def _run_stage(self, stage: PipelineStage, frame: np.ndarray) -> np.ndarray:
+        """Apply one stage, passing the frame through on error"""
+        if not stage.enabled:
+            return frame
+
+        metrics = self.stage_metrics.setdefault(stage.name, StageMetrics())
+        try:
+            stage_start = time.time()
+            result = stage.processor(frame, stage.params)
+            stage_time = time.time() - stage_start
+
+            metrics.frames += 1
+            metrics.latencies.append(stage_time)
+
+            if stage_time > 0.1:  # Log slow stages
+                print(f"Stage '{stage.name}' took {stage_time:.3f}s", file=sys.stderr)
+
+            return result
+
+        except Exception as e:
+            metrics.errors += 1
+            print(f"Error in stage '{stage.name}': {e}", file=sys.stderr)
+            return frame
+
+    def _drop_policy(self) -> DropPolicy:
+        """Resolve the configured frame-drop policy"""
+        if self.config.drop_policy == 'auto':
+            # Live sources favour freshness, files must not lose frames
+            return DropPolicy.LOSSLESS if self.config.input_source == 'file' else DropPolicy.LATEST
+        return DropPolicy(self.config.drop_policy)
+
+    def _start_workers(self):
+        """Build queues and start the capture, stage and writer workers"""
+        policy = self._drop_policy()
+        stages = list(self.stages)
+        self._worker_names = ['capture'] + [stage.name for stage in stages] + ['writer']
+        self.pool = None
+
+        # capture -> stage 1 -> ... -> stage N -> writer
+        self.queues = [
+            FrameQueue(self.config.queue_size, policy, lambda: self.pool)
+            for _ in range(len(stages) + 1)
+        ]
+        self.stage_metrics = {'capture': StageMetrics(), 'writer': StageMetrics()}
+        for stage in stages:
+            self.stage_metrics[stage.name] = StageMetrics()
+
+        self.workers = [threading.Thread(target=self._capture_worker, name='pipeline-capture', daemon=True)]
+        for position, stage in enumerate(stages):
+            self.workers.append(threading.Thread(
+                target=self._stage_worker,
+                args=(stage, self.queues[position], self.queues[position + 1]),
+                name=f'pipeline-{stage.name}',
+                daemon=True
+            ))
+        self.workers.append(threading.Thread(target=self._writer_worker, name='pipeline-writer', daemon=True))
+
+        for worker in self.workers:
+            worker.start()
+
+        print(f"Pipeline started: {len(stages)} stages, policy={policy.value}, "
+              f"queue_size={self.config.queue_size}", file=sys.stderr)
+
+    def _capture_worker(self):
+        """Decode frames into pooled buffers and feed the first queue"""
+        output = self.queues[0]
+        metrics = self.stage_metrics['capture']
+        pace = 1.0 / self.config.fps if self.config.input_source == 'file' else 0.0
+        index = 0
+        next_due = time.time()
+
+        # Buffers in flight: every queue slot, one per worker, plus slack
+        max_buffers = (self.config.queue_size + 1) * (len(self.queues) + 1) + 2
+
+        while self.running:
+            buffer = self.pool.acquire(timeout=0.5) if self.pool is not None else None
+            if self.pool is not None and buffer is None:
+                continue
+
+            start = time.time()
+            frame = self.capture.read_into(buffer)
+
+            if frame is None:
+                if self.pool is not None:
+                    self.pool.release(buffer)
+                if self.capture.finished:
+                    break
+                time.sleep(0.005)
                 continue
 
-            try:
-                stage_start = time.time()
-                result = stage.processor(result, stage.params)
-                stage_time = time.time() - stage_start
+            if self.pool is None:
+                # First frame fixes the buffer geometry
+                self.pool = FrameBufferPool(frame.shape, frame.dtype, max_buffers)
+                self.pool.allocated = 1
+                buffer = frame
+
+            metrics.frames += 1
+            metrics.latencies.append(time.time() - start)
+
+            output.put(FramePacket(index=index, frame=frame, buffer=buffer, captured_at=start))
+            index += 1
+
+            if pace:
+                next_due += pace
+                delay = next_due - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_due = time.time()
+
+        output.put(FramePacket(index=index, frame=None, buffer=None,
+                               captured_at=time.time(), end_of_stream=True))
+
+    def _stage_worker(self, stage: PipelineStage, source: FrameQueue, output: FrameQueue):
+        """Run one stage on every frame from `source`"""
+        while True:
+            packet = source.get()
+            if packet is None:
+                return
+            if not packet.end_of_stream:
+                packet.frame = self._run_stage(stage, packet.frame)
+            output.put(packet)
+            if packet.end_of_stream:
+                return
+
+    def _writer_worker(self):
+        """Write processed frames and recycle their buffers"""
+        source = self.queues[-1]
+        metrics = self.stage_metrics['writer']
+        frame_count = 0
 
-                if stage_time > 0.1:  # Log slow stages
-                    print(f"Stage '{stage.name}' took {stage_time:.3f}s", file=sys.stderr)
+        while True:
+            packet = source.get()
+            if packet is None or packet.end_of_stream:
+                break
 
-            except Exception as e:
-                print(f"Error in stage '{stage.name}': {e}", file=sys.stderr)
+            start = time.time()
+            self.writer.write(packet.frame)
+            finished = time.time()
 
-        return result
+            metrics.frames += 1
+            metrics.latencies.append(finished - start)
+            self._record_output(finished - packet.captured_at, finished)
+
+            self.pool.release(packet.buffer)
+
+            frame_count += 1
+            if frame_count % 30 == 0:
+                print(f"Stats: {self.get_stats()}", file=sys.stderr)
+
+        threading.Thread(target=self.stop, daemon=True).start()
+
+    def _record_output(self, latency: float, finished_at: float):
+        """Update end-to-end statistics for one written frame"""
+        with self._stats_lock:
+            self.processing_times.append(latency)
+            if len(self.processing_times) > 100:
+                self.processing_times.pop(0)
+            self._write_times.append(finished_at)
+
+            self.stats['frames_processed'] += 1
+            self.stats['average_latency'] = sum(self.processing_times) / len(self.processing_times)
+
+            if len(self._write_times) > 1:
+                span = self._write_times[-1] - self._write_times[0]
+                self.stats['average_fps'] = (len(self._write_times) - 1) / span if span > 0 else 0.0
+            elif self.stats['average_latency'] > 0:
+                self.stats['average_fps'] = 1.0 / self.stats['average_latency']
 
     def stop(self):
         """Stop pipeline"""
+        # The writer stops the pipeline from its own thread at end of
+        # stream, which can race a user call; only the first one cleans up
+        with self._stop_lock:
+            stopping = self._stopping
+            self._stopping = True
+
+        if stopping:
+            if threading.current_thread() not in self.workers:
+                self._stopped.wait()
+            return
+
         self.running = False
+
+        for queue in self.queues:
+            queue.close()
+        for worker in self.workers:
+            if worker is not threading.current_thread():
+                worker.join(timeout=2.0)
+
         self.capture.stop()
         self.writer.close()
+        self._stopped.set()
         print("Pipeline stopped", file=sys.stderr)
 
     # Built-in processors
@@ -512,8 +854,24 @@ class VideoPipeline:
         return frame
 
     def get_stats(self) -> Dict[str, Any]:
-        """Get pipeline statistics"""
-        return self.stats.copy()
+        """Get pipeline statistics, including per-stage latency and queues"""
+        with self._stats_lock:
+            stats = self.stats.copy()
+
+        stage_stats = {}
+        if self.queues:
+            # Queue i feeds worker i + 1
+            for position, name in enumerate(self._worker_names):
+                metrics = self.stage_metrics.get(name, StageMetrics())
+                queue = self.queues[position - 1] if position > 0 else None
+                stage_stats[name] = metrics.to_dict(queue)
+            stats['frames_dropped'] = sum(queue.dropped for queue in self.queues)
+        else:
+            for name, metrics in self.stage_metrics.items():
+                stage_stats[name] = metrics.to_dict()
+
+        stats['stages'] = stage_stats
+        return stats
 
 
 class PipelineBuilder: